@@ -9,6 +9,7 @@ using System;
 using System.Collections;
 using System.Collections.Generic;
 using System.Reflection;
+using System.Runtime.CompilerServices;
 using GameCursor = Il2CppLast.UI.Cursor;
 using FieldMap = Il2Cpp.FieldMap;
 using UserDataManager = Il2CppLast.Management.UserDataManager;
@@ -102,15 +103,57 @@ namespace FFII_ScreenReader.Core
         // Enemy HP display mode (0=Numbers, 1=Percentage, 2=Hidden)
         private static MelonPreferences_Entry<int> prefEnemyHPDisplay;
 
+        // Speech latency tracing (diagnostics, see AnnouncementTrace)
+        private static MelonPreferences_Entry<bool> prefAnnouncementTrace;
+
         public override void OnInitializeMelon()
         {
             Instance = this;
+            StartupTimer.Begin();
             LoggerInstance.Msg("FFII Screen Reader Mod loaded!");
 
             // Subscribe to scene load events
             UnityEngine.SceneManagement.SceneManager.sceneLoaded += (UnityEngine.Events.UnityAction<UnityEngine.SceneManagement.Scene, UnityEngine.SceneManagement.LoadSceneMode>)OnSceneLoaded;
 
             // Initialize preferences
+            StartupTimer.Phase("preferences", InitializePreferences);
+
+            // Initialize Tolk for screen reader support
+            tolk = new TolkWrapper();
+            StartupTimer.Phase("tolk", tolk.Load);
+
+            // Initialize external sound player for distinct audio feedback
+            StartupTimer.Phase("sound", SoundPlayer.Initialize);
+
+            // Initialize entity name translator (Japanese → English)
+            StartupTimer.Phase("translations", EntityTranslator.Initialize);
+
+            // Initialize input manager with event-driven input handling
+            inputManager = new InputManager(this);
+            StartupTimer.Phase("input", inputManager.Initialize);
+
+            // Initialize entity scanner
+            StartupTimer.Phase("entity_scanner", () => entityScanner = new EntityScanner());
+
+            // Apply Harmony patches
+            int patchedMethods = 0;
+            StartupTimer.Phase("harmony", () => patchedMethods = TryManualPatching());
+
+            // Initialize mod menu
+            StartupTimer.Phase("mod_menu", ModMenu.Initialize);
+
+            StartupTimer.End(patchedMethods);
+
+            // NOTE: Audio loops (wall tones, beacons) are NOT started here.
+            // They start from DelayedInitialScan() after scene loads, or from user toggle.
+            // Starting them before scene load causes lag (null checks run repeatedly).
+        }
+
+        /// <summary>
+        /// Creates the preference entries and reads the toggle states.
+        /// </summary>
+        private void InitializePreferences()
+        {
             prefsCategory = MelonPreferences.CreateCategory("FFII_ScreenReader");
             prefPathfindingFilter = prefsCategory.CreateEntry<bool>("PathfindingFilter", false, "Pathfinding Filter", "Only show entities with valid paths when cycling");
             prefMapExitFilter = prefsCategory.CreateEntry<bool>("MapExitFilter", false, "Map Exit Filter", "Filter multiple map exits to the same destination");
@@ -127,125 +170,111 @@ namespace FFII_ScreenReader.Core
             // Enemy HP display mode
             prefEnemyHPDisplay = prefsCategory.CreateEntry<int>("EnemyHPDisplay", 0, "Enemy HP Display", "0=Numbers, 1=Percentage, 2=Hidden");
 
+            // Diagnostics: record speech latency per announcement type to UserData/FFII_ScreenReader/traces
+            prefAnnouncementTrace = prefsCategory.CreateEntry<bool>("AnnouncementTrace", false, "Announcement Trace", "Record announcement latency traces (diagnostics)");
+
             filterByPathfinding = prefPathfindingFilter.Value;
             filterMapExits = prefMapExitFilter.Value;
             enableWallTones = prefWallTones.Value;
             enableFootsteps = prefFootsteps.Value;
             enableAudioBeacons = prefAudioBeacons.Value;
 
-            // Initialize Tolk for screen reader support
-            tolk = new TolkWrapper();
-            tolk.Load();
-
-            // Initialize external sound player for distinct audio feedback
-            SoundPlayer.Initialize();
-
-            // Initialize entity name translator (Japanese → English)
-            EntityTranslator.Initialize();
-
-            // Initialize input manager with event-driven input handling
-            inputManager = new InputManager(this);
-            inputManager.Initialize();
-
-            // Initialize entity scanner
-            entityScanner = new EntityScanner();
-
-            // Apply Harmony patches
-            TryManualPatching();
-
-            // Initialize mod menu
-            ModMenu.Initialize();
-
-            // NOTE: Audio loops (wall tones, beacons) are NOT started here.
-            // They start from DelayedInitialScan() after scene loads, or from user toggle.
-            // Starting them before scene load causes lag (null checks run repeatedly).
+            if (prefAnnouncementTrace.Value)
+                AnnouncementTrace.Enable();
         }
 
         /// <summary>
         /// Attempts to manually apply Harmony patches with detailed error logging.
+        /// Each patch group is timed as a harmony.* startup phase.
+        /// Returns the number of methods patched.
         /// </summary>
-        private void TryManualPatching()
+        private int TryManualPatching()
         {
             LoggerInstance.Msg("Attempting manual Harmony patching...");
 
             var harmony = new HarmonyLib.Harmony("com.ffii.screenreader.manual");
 
             // Patch cursor navigation methods (menus and battle)
-            TryPatchCursorNavigation(harmony);
+            StartupTimer.Phase("harmony.CursorNavigation", () => TryPatchCursorNavigation(harmony));
 
             // Patch dialogue methods via MessageWindowManager
-            MessageWindowPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.MessageWindowPatches", () => MessageWindowPatches.ApplyPatches(harmony));
 
             // Patch scroll/fade messages for intro text
-            ScrollMessagePatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.ScrollMessagePatches", () => ScrollMessagePatches.ApplyPatches(harmony));
 
             // Patch new game character naming screen
-            NewGameNamingPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.NewGameNamingPatches", () => NewGameNamingPatches.ApplyPatches(harmony));
 
             // Patch battle system
-            BattleCommandPatches.ApplyPatches(harmony);
-            BattleMessagePatches.ApplyPatches(harmony);
-            BattleResultPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.BattleCommandPatches", () => BattleCommandPatches.ApplyPatches(harmony));
+            StartupTimer.Phase("harmony.BattleMessagePatches", () => BattleMessagePatches.ApplyPatches(harmony));
+            StartupTimer.Phase("harmony.BattleResultPatches", () => BattleResultPatches.ApplyPatches(harmony));
 
             // Patch equipment menu
-            EquipMenuPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.EquipMenuPatches", () => EquipMenuPatches.ApplyPatches(harmony));
 
             // Patch item menu
-            ItemMenuPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.ItemMenuPatches", () => ItemMenuPatches.ApplyPatches(harmony));
 
             // Patch status menu
-            StatusMenuPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.StatusMenuPatches", () => StatusMenuPatches.ApplyPatches(harmony));
 
             // Patch status details (arrow key navigation)
-            StatusDetailsPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.StatusDetailsPatches", () => StatusDetailsPatches.ApplyPatches(harmony));
 
             // Patch magic menu
-            MagicMenuPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.MagicMenuPatches", () => MagicMenuPatches.ApplyPatches(harmony));
 
             // Patch config menu
-            ConfigMenuPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.ConfigMenuPatches", () => ConfigMenuPatches.ApplyPatches(harmony));
 
             // Patch shop menus
-            ShopPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.ShopPatches", () => ShopPatches.ApplyPatches(harmony));
 
             // Patch battle item menu
-            BattleItemPatchesApplier.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.BattleItemPatchesApplier", () => BattleItemPatchesApplier.ApplyPatches(harmony));
 
             // Patch battle magic menu
-            BattleMagicPatchesApplier.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.BattleMagicPatchesApplier", () => BattleMagicPatchesApplier.ApplyPatches(harmony));
 
             // Patch vehicle/movement state changes
-            MovementSpeechPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.MovementSpeechPatches", () => MovementSpeechPatches.ApplyPatches(harmony));
 
             // Patch vehicle landing announcements
-            VehicleLandingPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.VehicleLandingPatches", () => VehicleLandingPatches.ApplyPatches(harmony));
 
             // Patch keyword system (NPC dialogue and Words menu)
-            KeywordPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.KeywordPatches", () => KeywordPatches.ApplyPatches(harmony));
 
             // Patch popup dialogs (Yes/No confirmations)
-            PopupPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.PopupPatches", () => PopupPatches.ApplyPatches(harmony));
 
             // Patch save/load confirmation popups
-            SaveLoadPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.SaveLoadPatches", () => SaveLoadPatches.ApplyPatches(harmony));
 
             // Patch battle pause menu
-            BattlePausePatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.BattlePausePatches", () => BattlePausePatches.ApplyPatches(harmony));
 
             // Apply transition patches to clear menu states when menus close
-            MenuTransitionPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.MenuTransitionPatches", () => MenuTransitionPatches.ApplyPatches(harmony));
 
             // Patch game state transitions (map changes, battle exit) - event-driven, no polling
-            GameStatePatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.GameStatePatches", () => GameStatePatches.ApplyPatches(harmony));
 
             // Map transition fade detection (suppress wall tones during screen fades)
-            MapTransitionPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.MapTransitionPatches", () => MapTransitionPatches.ApplyPatches(harmony));
 
             // Patch walk/run toggle (F1 key) for accurate state tracking
-            DashFlagPatches.ApplyPatches(harmony);
+            StartupTimer.Phase("harmony.DashFlagPatches", () => DashFlagPatches.ApplyPatches(harmony));
 
             // Patch entity interactions for event-driven entity refresh
-            TryPatchEntityInteractions(harmony);
+            StartupTimer.Phase("harmony.EntityInteractions", () => TryPatchEntityInteractions(harmony));
+
+            int patched = 0;
+            foreach (var _ in harmony.GetPatchedMethods())
+                patched++;
+            return patched;
         }
 
         /// <summary>
@@ -372,6 +401,7 @@ namespace FFII_ScreenReader.Core
             inputManager?.Dispose();
 
             CoroutineManager.CleanupAll();
+            AnnouncementTrace.Flush();
             tolk?.Unload();
         }
 
@@ -380,6 +410,7 @@ namespace FFII_ScreenReader.Core
             try
             {
                 LoggerInstance.Msg($"[Scene] Loaded: {scene.name}");
+                StartupTimer.MarkFirstScene(scene.name);
 
                 // Clear all cached GameObjects from the previous scene
                 GameObjectCache.ClearAll();
@@ -1360,10 +1391,14 @@ namespace FFII_ScreenReader.Core
         /// <summary>
         /// Speak text through the screen reader.
         /// Thread-safe: TolkWrapper uses locking to prevent concurrent native calls.
+        /// Caller info is filled in by the compiler and only used by AnnouncementTrace.
         /// </summary>
-        public static void SpeakText(string text, bool interrupt = true)
+        public static void SpeakText(string text, bool interrupt = true,
+            [CallerFilePath] string callerFile = "", [CallerMemberName] string callerMember = "")
         {
+            var trace = AnnouncementTrace.Speak(callerFile, callerMember);
             tolk?.Speak(text, interrupt);
+            AnnouncementTrace.Output(trace);
         }
     }
 
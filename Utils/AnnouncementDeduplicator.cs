@@ -27,9 +27,13 @@ namespace FFII_ScreenReader.Utils
                 return false;
 
             if (_lastStrings.TryGetValue(context, out var last) && last == text)
+            {
+                AnnouncementTrace.Dropped(context);
                 return false;
+            }
 
             _lastStrings[context] = text;
+            AnnouncementTrace.Event(context);
             return true;
         }
 
@@ -43,9 +47,13 @@ namespace FFII_ScreenReader.Utils
         public static bool ShouldAnnounce(string context, int index)
         {
             if (_lastInts.TryGetValue(context, out var last) && last == index)
+            {
+                AnnouncementTrace.Dropped(context);
                 return false;
+            }
 
             _lastInts[context] = index;
+            AnnouncementTrace.Event(context);
             return true;
         }
 
@@ -66,10 +74,14 @@ namespace FFII_ScreenReader.Utils
             bool textMatch = _lastStrings.TryGetValue(context, out var lastText) && lastText == text;
 
             if (indexMatch && textMatch)
+            {
+                AnnouncementTrace.Dropped(context);
                 return false;
+            }
 
             _lastInts[intKey] = index;
             _lastStrings[context] = text ?? string.Empty;
+            AnnouncementTrace.Event(context);
             return true;
         }
 
@@ -86,9 +98,13 @@ namespace FFII_ScreenReader.Utils
                 return false;
 
             if (_lastObjects.TryGetValue(context, out var last) && ReferenceEquals(last, obj))
+            {
+                AnnouncementTrace.Dropped(context);
                 return false;
+            }
 
             _lastObjects[context] = obj;
+            AnnouncementTrace.Event(context);
             return true;
         }
 
@@ -0,0 +1,305 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Text;
+using MelonLoader;
+using UnityEngine;
+
+namespace FFII_ScreenReader.Utils
+{
+    /// <summary>
+    /// Opt-in latency trace of the speech path (AnnouncementTrace preference, off by default).
+    /// Each stage an announcement passes records a Stopwatch timestamp into a fixed buffer of
+    /// 16-byte records; a full buffer is appended to UserData/FFII_ScreenReader/traces/*.trace
+    /// and reused, and the rest is flushed on shutdown. docs/Scripts/announcement_latency.py reads the files.
+    ///
+    /// Stages, correlated by trace id on the calling thread:
+    ///   Event    - AnnouncementDeduplicator accepted an announcement (type = dedupe context)
+    ///   Dropped  - AnnouncementDeduplicator rejected a duplicate
+    ///   Queued   - SpeechHelper started a one-frame delay
+    ///   Resumed  - the delayed coroutine resumed
+    ///   Speak    - SpeakText was called (type = calling file.member when no Event is pending)
+    ///   Output   - Tolk returned from the screen reader call
+    /// When disabled every call is a single static bool check.
+    /// </summary>
+    public static class AnnouncementTrace
+    {
+        public enum Stage : byte
+        {
+            Event,
+            Dropped,
+            Queued,
+            Resumed,
+            Speak,
+            Output
+        }
+
+        /// <summary>
+        /// Identifies one traced announcement between stages. Default = not traced.
+        /// </summary>
+        public struct Token
+        {
+            public int TraceId;
+            public ushort Type;
+        }
+
+        private struct Record
+        {
+            public long Timestamp;
+            public int TraceId;
+            public Stage Stage;
+            public ushort Type;
+        }
+
+        private const uint MAGIC = 0x4C324646; // "FF2L"
+        private const int VERSION = 1;
+        private const int CAPACITY = 32768;
+        // A pending Event older than this is not joined to the next SpeakText
+        private const double PENDING_EXPIRY_MS = 250.0;
+
+        public static bool Enabled { get; private set; } = false;
+
+        private static readonly Record[] records = new Record[CAPACITY];
+        private static int count = 0;
+        private static int nextTraceId = 1;
+        private static readonly object traceLock = new object();
+
+        private static readonly List<string> typeNames = new List<string>();
+        private static readonly Dictionary<string, ushort> typeIndex = new Dictionary<string, ushort>();
+        private static readonly Dictionary<string, Dictionary<string, ushort>> callerTypes =
+            new Dictionary<string, Dictionary<string, ushort>>();
+
+        private static string tracePath;
+
+        [ThreadStatic] private static int pendingTraceId;
+        [ThreadStatic] private static ushort pendingType;
+        [ThreadStatic] private static long pendingTimestamp;
+
+        /// <summary>
+        /// Enables tracing and opens a new trace file for this session.
+        /// </summary>
+        public static void Enable()
+        {
+            if (Enabled) return;
+
+            try
+            {
+                string gameRoot = Path.GetDirectoryName(Application.dataPath);
+                string traceDir = Path.Combine(gameRoot, "UserData", "FFII_ScreenReader", "traces");
+                Directory.CreateDirectory(traceDir);
+                tracePath = Path.Combine(traceDir, $"announcements_{DateTime.Now:yyyyMMdd_HHmmss}.trace");
+
+                using (var writer = new BinaryWriter(File.Create(tracePath)))
+                {
+                    writer.Write(MAGIC);
+                    writer.Write(VERSION);
+                    writer.Write(Stopwatch.Frequency);
+                }
+
+                Enabled = true;
+                MelonLogger.Msg($"[AnnouncementTrace] Tracing speech latency to {tracePath}");
+            }
+            catch (Exception ex)
+            {
+                MelonLogger.Warning($"[AnnouncementTrace] Could not start trace: {ex.Message}");
+            }
+        }
+
+        /// <summary>
+        /// An announcement of the given type was accepted and is about to be spoken.
+        /// </summary>
+        public static void Event(string type)
+        {
+            if (!Enabled) return;
+            int id = NewTraceId();
+            ushort typeId = InternType(type);
+            long now = Stopwatch.GetTimestamp();
+            pendingTraceId = id;
+            pendingType = typeId;
+            pendingTimestamp = now;
+            Add(now, id, Stage.Event, typeId);
+        }
+
+        /// <summary>
+        /// A duplicate announcement of the given type was suppressed.
+        /// </summary>
+        public static void Dropped(string type)
+        {
+            if (!Enabled) return;
+            Add(Stopwatch.GetTimestamp(), 0, Stage.Dropped, InternType(type));
+        }
+
+        /// <summary>
+        /// A delayed speech coroutine was started; pass the token to Resumed.
+        /// </summary>
+        public static Token Queued()
+        {
+            if (!Enabled) return default;
+            int id = TakePending(out ushort typeId, out long now);
+            if (id == 0)
+            {
+                id = NewTraceId();
+                typeId = InternType("SpeechHelper.Delayed");
+            }
+            Add(now, id, Stage.Queued, typeId);
+            return new Token { TraceId = id, Type = typeId };
+        }
+
+        /// <summary>
+        /// A delayed speech coroutine resumed; the following SpeakText joins the same trace.
+        /// </summary>
+        public static void Resumed(Token token)
+        {
+            if (!Enabled || token.TraceId == 0) return;
+            long now = Stopwatch.GetTimestamp();
+            pendingTraceId = token.TraceId;
+            pendingType = token.Type;
+            pendingTimestamp = now;
+            Add(now, token.TraceId, Stage.Resumed, token.Type);
+        }
+
+        /// <summary>
+        /// SpeakText was called; pass the token to Output.
+        /// Without a pending Event the caller's file and member name become the type.
+        /// </summary>
+        public static Token Speak(string callerFile, string callerMember)
+        {
+            if (!Enabled) return default;
+            int id = TakePending(out ushort typeId, out long now);
+            if (id == 0)
+            {
+                id = NewTraceId();
+                typeId = InternCaller(callerFile, callerMember);
+            }
+            Add(now, id, Stage.Speak, typeId);
+            return new Token { TraceId = id, Type = typeId };
+        }
+
+        /// <summary>
+        /// The screen reader call returned.
+        /// </summary>
+        public static void Output(Token token)
+        {
+            if (!Enabled || token.TraceId == 0) return;
+            Add(Stopwatch.GetTimestamp(), token.TraceId, Stage.Output, token.Type);
+        }
+
+        /// <summary>
+        /// Writes any buffered records. Call on shutdown.
+        /// </summary>
+        public static void Flush()
+        {
+            if (!Enabled) return;
+            lock (traceLock)
+            {
+                WriteChunk();
+            }
+        }
+
+        private static int TakePending(out ushort typeId, out long now)
+        {
+            now = Stopwatch.GetTimestamp();
+            int id = pendingTraceId;
+            typeId = pendingType;
+            pendingTraceId = 0;
+            if (id != 0 && (now - pendingTimestamp) * 1000.0 / Stopwatch.Frequency > PENDING_EXPIRY_MS)
+                id = 0;
+            return id;
+        }
+
+        private static int NewTraceId()
+        {
+            lock (traceLock)
+            {
+                return nextTraceId++;
+            }
+        }
+
+        private static ushort InternType(string type)
+        {
+            if (string.IsNullOrEmpty(type)) type = "(none)";
+            lock (traceLock)
+            {
+                if (typeIndex.TryGetValue(type, out ushort index))
+                    return index;
+                if (typeNames.Count >= ushort.MaxValue)
+                    return 0;
+                index = (ushort)typeNames.Count;
+                typeNames.Add(type);
+                typeIndex[type] = index;
+                return index;
+            }
+        }
+
+        // Two-level lookup so repeated callers don't allocate a combined key
+        private static ushort InternCaller(string callerFile, string callerMember)
+        {
+            lock (traceLock)
+            {
+                if (!callerTypes.TryGetValue(callerFile ?? "", out var members))
+                {
+                    members = new Dictionary<string, ushort>();
+                    callerTypes[callerFile ?? ""] = members;
+                }
+                if (!members.TryGetValue(callerMember ?? "", out ushort index))
+                {
+                    string file = Path.GetFileNameWithoutExtension(callerFile ?? "");
+                    index = InternType($"{file}.{callerMember}");
+                    members[callerMember ?? ""] = index;
+                }
+                return index;
+            }
+        }
+
+        private static void Add(long timestamp, int traceId, Stage stage, ushort type)
+        {
+            lock (traceLock)
+            {
+                if (count == CAPACITY)
+                    WriteChunk();
+
+                records[count].Timestamp = timestamp;
+                records[count].TraceId = traceId;
+                records[count].Stage = stage;
+                records[count].Type = type;
+                count++;
+            }
+        }
+
+        /// <summary>
+        /// Appends one chunk: record count, the type name table so far, then the records.
+        /// Type indices never change, so readers use the last table in the file.
+        /// </summary>
+        private static void WriteChunk()
+        {
+            if (count == 0 || tracePath == null) return;
+
+            try
+            {
+                using (var writer = new BinaryWriter(new FileStream(tracePath, FileMode.Append, FileAccess.Write), Encoding.UTF8))
+                {
+                    writer.Write(count);
+                    writer.Write(typeNames.Count);
+                    foreach (string name in typeNames)
+                        writer.Write(name);
+
+                    for (int i = 0; i < count; i++)
+                    {
+                        writer.Write(records[i].Timestamp);
+                        writer.Write(records[i].TraceId);
+                        writer.Write((byte)records[i].Stage);
+                        writer.Write((byte)0);
+                        writer.Write(records[i].Type);
+                    }
+                }
+            }
+            catch (Exception ex)
+            {
+                MelonLogger.Warning($"[AnnouncementTrace] Failed to write trace, disabling: {ex.Message}");
+                Enabled = false;
+            }
+            count = 0;
+        }
+    }
+}
@@ -10,13 +10,16 @@ namespace FFII_ScreenReader.Utils
 {
     /// <summary>
     /// Translates Japanese entity names to English using a JSON dictionary.
-    /// Loaded from UserData/FFII_ScreenReader/FF2_translations.json
+    /// Loaded from UserData/FFII_ScreenReader/FF2_translations.json, or from the compiled
+    /// FF2_translations.bin next to it when that is at least as new (docs/Scripts/compile_translations.py).
     /// </summary>
     public static class EntityTranslator
     {
         private static Dictionary<string, string> translations = new Dictionary<string, string>();
+        private static TranslationTable compiledTranslations;
         private static bool isInitialized = false;
         private static string translationsPath;
+        private static string compiledTranslationsPath;
 
         // Track untranslated names by map for dumping
         private static Dictionary<string, HashSet<string>> untranslatedNamesByMap = new Dictionary<string, HashSet<string>>();
@@ -42,6 +45,7 @@ namespace FFII_ScreenReader.Utils
                 string gameRoot = Path.GetDirectoryName(gameDataPath);
                 string userDataPath = Path.Combine(gameRoot, "UserData", "FFII_ScreenReader");
                 translationsPath = Path.Combine(userDataPath, "FF2_translations.json");
+                compiledTranslationsPath = Path.Combine(userDataPath, "FF2_translations.bin");
 
                 // Create directory if needed
                 if (!Directory.Exists(userDataPath))
@@ -51,7 +55,7 @@ namespace FFII_ScreenReader.Utils
                 }
 
                 // Load or create translations file
-                if (File.Exists(translationsPath))
+                if (File.Exists(translationsPath) || File.Exists(compiledTranslationsPath))
                 {
                     LoadTranslations();
                 }
@@ -72,10 +76,39 @@ namespace FFII_ScreenReader.Utils
         }
 
         /// <summary>
-        /// Loads translations from the JSON file.
+        /// Loads translations from the compiled table if it is current, otherwise from the JSON file.
         /// </summary>
         private static void LoadTranslations()
         {
+            compiledTranslations = null;
+            if (File.Exists(compiledTranslationsPath) &&
+                (!File.Exists(translationsPath) ||
+                 File.GetLastWriteTimeUtc(compiledTranslationsPath) >= File.GetLastWriteTimeUtc(translationsPath)))
+            {
+                try
+                {
+                    compiledTranslations = TranslationTable.Load(compiledTranslationsPath);
+                    translations = new Dictionary<string, string>();
+                    MelonLogger.Msg($"[EntityTranslator] Loaded {compiledTranslations.Count} compiled translations from {compiledTranslationsPath}");
+                    return;
+                }
+                catch (Exception ex)
+                {
+                    MelonLogger.Warning($"[EntityTranslator] Failed to load compiled translations, using JSON: {ex.Message}");
+                    compiledTranslations = null;
+                }
+            }
+            else if (File.Exists(compiledTranslationsPath))
+            {
+                MelonLogger.Msg("[EntityTranslator] FF2_translations.json is newer than FF2_translations.bin, using JSON (recompile to update)");
+            }
+
+            if (!File.Exists(translationsPath))
+            {
+                translations = new Dictionary<string, string>();
+                return;
+            }
+
             try
             {
                 string json = File.ReadAllText(translationsPath);
@@ -183,12 +216,12 @@ namespace FFII_ScreenReader.Utils
                 Initialize();
 
             // 1. Exact match first (preserves existing behavior)
-            if (translations.TryGetValue(japaneseName, out string englishName))
+            if (TryLookup(japaneseName, out string englishName))
                 return englishName;
 
             // 2. Strip numeric/SC prefix and try base name lookup
             StripPrefix(japaneseName, out string prefix, out string baseName);
-            if (prefix != null && translations.TryGetValue(baseName, out string baseTranslation))
+            if (prefix != null && TryLookup(baseName, out string baseTranslation))
                 return prefix + " " + baseTranslation;
 
             // 3. Track untranslated name by current map (use base name to deduplicate)
@@ -208,6 +241,16 @@ namespace FFII_ScreenReader.Utils
             return japaneseName;
         }
 
+        /// <summary>
+        /// Looks up a name in the compiled table if loaded, otherwise in the JSON dictionary.
+        /// </summary>
+        private static bool TryLookup(string name, out string translation)
+        {
+            if (compiledTranslations != null)
+                return compiledTranslations.TryGetValue(name, out translation);
+            return translations.TryGetValue(name, out translation);
+        }
+
         /// <summary>
         /// Checks if a string contains Japanese characters (hiragana, katakana, or kanji).
         /// </summary>
@@ -463,7 +506,8 @@ namespace FFII_ScreenReader.Utils
         /// </summary>
         public static void Reload()
         {
-            if (!string.IsNullOrEmpty(translationsPath) && File.Exists(translationsPath))
+            if (!string.IsNullOrEmpty(translationsPath) &&
+                (File.Exists(translationsPath) || File.Exists(compiledTranslationsPath)))
             {
                 LoadTranslations();
             }
@@ -472,6 +516,6 @@ namespace FFII_ScreenReader.Utils
         /// <summary>
         /// Gets the count of loaded translations.
         /// </summary>
-        public static int TranslationCount => translations.Count;
+        public static int TranslationCount => compiledTranslations?.Count ?? translations.Count;
     }
 }
@@ -181,6 +181,9 @@ namespace FFII_ScreenReader.Utils
 
             // Audio beacons use direct buffer writes in PlayBeacon() - no pre-caching needed
 
+            // Pre-rendered wall tone loops (optional) - PlayWallTonesLooped falls back to synthesis without it
+            ToneBank.Load();
+
             // Setup wave format (stereo 16-bit 22050Hz - matches our generated tones)
             // 16-bit provides 65536 amplitude levels vs 256 for 8-bit, eliminating quantization noise
             waveFormat = new WAVEFORMATEX
@@ -258,7 +261,20 @@ namespace FFII_ScreenReader.Utils
         /// </summary>
         private static void PlayOnChannel(byte[] wavData, SoundChannel channel, bool loop, int volumePercent)
         {
-            if (wavData == null || !initialized) return;
+            // Skip WAV header (44 bytes)
+            const int WAV_HEADER_SIZE = 44;
+            if (wavData == null || wavData.Length <= WAV_HEADER_SIZE) return;
+
+            PlayOnChannel(wavData, WAV_HEADER_SIZE, wavData.Length - WAV_HEADER_SIZE, channel, loop, volumePercent);
+        }
+
+        /// <summary>
+        /// Plays raw 16-bit stereo PCM from a slice of a byte array (e.g. the shared ToneBank data).
+        /// volumePercent: 0-100 where 50 is default/no change.
+        /// </summary>
+        private static void PlayOnChannel(byte[] pcmData, int offset, int dataLength, SoundChannel channel, bool loop, int volumePercent)
+        {
+            if (pcmData == null || !initialized || dataLength <= 0) return;
 
             int channelIndex = (int)channel;
             var state = channels[channelIndex];
@@ -281,12 +297,8 @@ namespace FFII_ScreenReader.Utils
                     state.IsLooping = false;
                 }
 
-                // Skip WAV header (44 bytes), copy PCM data to unmanaged buffer
-                const int WAV_HEADER_SIZE = 44;
-                if (wavData.Length <= WAV_HEADER_SIZE) return;
-
-                int dataLength = wavData.Length - WAV_HEADER_SIZE;
-                Marshal.Copy(wavData, WAV_HEADER_SIZE, state.BufferPtr, dataLength);
+                // Copy PCM data to unmanaged buffer
+                Marshal.Copy(pcmData, offset, state.BufferPtr, dataLength);
 
                 // Apply volume scaling to the buffer
                 if (volumePercent != 50)
@@ -527,6 +539,13 @@ namespace FFII_ScreenReader.Utils
             currentWallDirectionsMask = newMask;
             lastWallToneVolume = volume;
 
+            // Pre-rendered loop for this direction set and volume: copy a slice, no synthesis or allocation
+            if (ToneBank.TryGetWallLoop(newMask, volume, out byte[] bankData, out int offset, out int length))
+            {
+                PlayOnChannel(bankData, offset, length, SoundChannel.WallTone, loop: true, volumePercent: 50);
+                return;
+            }
+
             // Generate sustain tones with volume baked in during generation
             // This preserves 16-bit dynamic range at low volumes (no post-scaling quantization)
             const float BASE_VOLUME = 0.12f;
@@ -14,7 +14,9 @@ namespace FFII_ScreenReader.Utils
         /// </summary>
         internal static IEnumerator DelayedSpeech(string text)
         {
+            var trace = AnnouncementTrace.Queued();
             yield return null; // Wait one frame
+            AnnouncementTrace.Resumed(trace);
             FFII_ScreenReaderMod.SpeakText(text);
         }
 
@@ -23,7 +25,9 @@ namespace FFII_ScreenReader.Utils
         /// </summary>
         internal static IEnumerator DelayedSpeechNoInterrupt(string text)
         {
+            var trace = AnnouncementTrace.Queued();
             yield return null; // Wait one frame
+            AnnouncementTrace.Resumed(trace);
             FFII_ScreenReaderMod.SpeakText(text, interrupt: false);
         }
     }
@@ -0,0 +1,86 @@
+using System;
+using System.Diagnostics;
+using System.IO;
+using System.Reflection;
+using MelonLoader;
+
+namespace FFII_ScreenReader.Utils
+{
+    /// <summary>
+    /// Structured, timestamped startup phase markers for docs/Scripts/startup_timing.py.
+    /// Every line starts with "[Startup]" followed by key=value fields:
+    ///   [Startup] begin build=1.0.0+1a2b3c4d built=2026-01-31T12:00:00Z process_ms=8123.4
+    ///   [Startup] phase=harmony.MessageWindowPatches start_ms=120.31 ms=14.02
+    ///   [Startup] mark=first_scene at_ms=5321.77 scene=TitleScene
+    ///   [Startup] end ms=812.90 patched=96
+    /// Times are milliseconds since Begin(). Names use '.' for nesting (harmony.X is inside harmony).
+    /// </summary>
+    public static class StartupTimer
+    {
+        private static readonly Stopwatch clock = new Stopwatch();
+        private static bool firstSceneMarked = false;
+
+        /// <summary>
+        /// Starts the clock and logs the build identity (version + module MVID changes every compile).
+        /// </summary>
+        public static void Begin()
+        {
+            clock.Restart();
+            firstSceneMarked = false;
+
+            var assembly = Assembly.GetExecutingAssembly();
+            string version = assembly.GetName().Version?.ToString() ?? "0";
+            string mvid = assembly.ManifestModule.ModuleVersionId.ToString("N").Substring(0, 8);
+            string built = "unknown";
+            double processMs = -1;
+            try
+            {
+                if (!string.IsNullOrEmpty(assembly.Location))
+                    built = File.GetLastWriteTimeUtc(assembly.Location).ToString("yyyy-MM-ddTHH:mm:ssZ");
+                processMs = (DateTime.Now - Process.GetCurrentProcess().StartTime).TotalMilliseconds;
+            }
+            catch { }
+
+            MelonLogger.Msg($"[Startup] begin build={version}+{mvid} built={built} process_ms={processMs:F1}");
+        }
+
+        /// <summary>
+        /// Runs one startup phase and logs its start offset and duration.
+        /// Exceptions propagate after the phase is logged with failed=1.
+        /// </summary>
+        public static void Phase(string name, Action action)
+        {
+            double start = ElapsedMs;
+            bool failed = true;
+            try
+            {
+                action();
+                failed = false;
+            }
+            finally
+            {
+                MelonLogger.Msg($"[Startup] phase={name} start_ms={start:F2} ms={ElapsedMs - start:F2}{(failed ? " failed=1" : "")}");
+            }
+        }
+
+        /// <summary>
+        /// Logs the end of OnInitializeMelon.
+        /// </summary>
+        public static void End(int patchedMethods)
+        {
+            MelonLogger.Msg($"[Startup] end ms={ElapsedMs:F2} patched={patchedMethods}");
+        }
+
+        /// <summary>
+        /// Logs the first scene load after startup (once per session).
+        /// </summary>
+        public static void MarkFirstScene(string sceneName)
+        {
+            if (firstSceneMarked || !clock.IsRunning) return;
+            firstSceneMarked = true;
+            MelonLogger.Msg($"[Startup] mark=first_scene at_ms={ElapsedMs:F2} scene={sceneName}");
+        }
+
+        private static double ElapsedMs => clock.Elapsed.TotalMilliseconds;
+    }
+}
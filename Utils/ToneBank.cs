@@ -0,0 +1,140 @@
+using System;
+using System.IO;
+using MelonLoader;
+using UnityEngine;
+
+namespace FFII_ScreenReader.Utils
+{
+    /// <summary>
+    /// Pre-rendered wall tone loops for every direction combination and volume step.
+    /// Loaded once from UserData/FFII_ScreenReader/FF2_tones.bin (built by docs/Scripts/tone_bank.py).
+    /// Lookups return a slice of one shared byte[], so volume and direction changes
+    /// don't synthesize or allocate. Missing file = SoundPlayer synthesizes at runtime.
+    /// </summary>
+    public static class ToneBank
+    {
+        private const string BANK_FILE = "FF2_tones.bin";
+        private const uint MAGIC = 0x54324646; // "FF2T"
+        private const int VERSION = 1;
+        private const int HEADER_SIZE = 16;
+        private const int ENTRY_SIZE = 12;
+        private const int SAMPLE_RATE = 22050;
+        private const int MAX_MASK = 15;
+        private const int MAX_VOLUME = 100;
+        // Matches the SoundPlayer channel buffer size
+        private const int MAX_ENTRY_BYTES = 32768;
+
+        private static byte[] bankData;
+        // Indexed by mask * (MAX_VOLUME + 1) + volume; -1 = not in bank
+        private static int[] loopOffsets;
+        private static int[] loopLengths;
+
+        public static bool IsLoaded => bankData != null;
+
+        /// <summary>
+        /// Loads the bank file if present. Safe to call more than once.
+        /// </summary>
+        public static void Load()
+        {
+            if (bankData != null) return;
+
+            try
+            {
+                string gameRoot = Path.GetDirectoryName(Application.dataPath);
+                string bankPath = Path.Combine(gameRoot, "UserData", "FFII_ScreenReader", BANK_FILE);
+                if (!File.Exists(bankPath))
+                {
+                    MelonLogger.Msg("[ToneBank] No tone bank found, wall tones will be synthesized at runtime");
+                    return;
+                }
+
+                byte[] data = File.ReadAllBytes(bankPath);
+                if (!Parse(data))
+                    return;
+
+                bankData = data;
+                MelonLogger.Msg($"[ToneBank] Loaded {data.Length / 1024} KB tone bank from {bankPath}");
+            }
+            catch (Exception ex)
+            {
+                MelonLogger.Warning($"[ToneBank] Failed to load tone bank: {ex.Message}");
+                loopOffsets = null;
+                loopLengths = null;
+            }
+        }
+
+        /// <summary>
+        /// Reads the header and entry table into the offset/length lookup arrays.
+        /// </summary>
+        private static bool Parse(byte[] data)
+        {
+            if (data.Length < HEADER_SIZE || BitConverter.ToUInt32(data, 0) != MAGIC
+                || BitConverter.ToUInt16(data, 4) != VERSION)
+            {
+                MelonLogger.Warning("[ToneBank] Not a tone bank file (bad magic or version)");
+                return false;
+            }
+
+            int count = BitConverter.ToUInt16(data, 6);
+            int sampleRate = BitConverter.ToInt32(data, 8);
+            int pcmOffset = BitConverter.ToInt32(data, 12);
+            if (sampleRate != SAMPLE_RATE || pcmOffset < HEADER_SIZE + count * ENTRY_SIZE || pcmOffset > data.Length)
+            {
+                MelonLogger.Warning($"[ToneBank] Unsupported tone bank ({sampleRate} Hz, PCM at {pcmOffset})");
+                return false;
+            }
+
+            var offsets = new int[(MAX_MASK + 1) * (MAX_VOLUME + 1)];
+            var lengths = new int[offsets.Length];
+            for (int i = 0; i < offsets.Length; i++)
+                offsets[i] = -1;
+
+            for (int i = 0; i < count; i++)
+            {
+                int entry = HEADER_SIZE + i * ENTRY_SIZE;
+                int mask = data[entry];
+                int volume = data[entry + 1];
+                int offset = pcmOffset + BitConverter.ToInt32(data, entry + 4);
+                int length = BitConverter.ToInt32(data, entry + 8);
+
+                if (mask < 1 || mask > MAX_MASK || volume > MAX_VOLUME)
+                    continue;
+                if (length <= 0 || length > MAX_ENTRY_BYTES || length % 4 != 0
+                    || offset < pcmOffset || offset > data.Length - length)
+                {
+                    MelonLogger.Warning($"[ToneBank] Skipping bad entry {i} (mask {mask}, volume {volume})");
+                    continue;
+                }
+
+                int slot = mask * (MAX_VOLUME + 1) + volume;
+                offsets[slot] = offset;
+                lengths[slot] = length;
+            }
+
+            loopOffsets = offsets;
+            loopLengths = lengths;
+            return true;
+        }
+
+        /// <summary>
+        /// Gets the mixed sustain loop for a direction bitmask (SoundPlayer.DirectionsToBitmask)
+        /// at a wall tone volume. Returns false if the bank isn't loaded or lacks that volume.
+        /// </summary>
+        public static bool TryGetWallLoop(int mask, int volume, out byte[] data, out int offset, out int length)
+        {
+            data = bankData;
+            offset = 0;
+            length = 0;
+            if (bankData == null || mask < 1 || mask > MAX_MASK || volume < 0 || volume > MAX_VOLUME)
+                return false;
+
+            int slot = mask * (MAX_VOLUME + 1) + volume;
+            if (loopOffsets[slot] < 0)
+                return false;
+
+            offset = loopOffsets[slot];
+            length = loopLengths[slot];
+            return true;
+        }
+    }
+}
@@ -0,0 +1,142 @@
+using System;
+using System.IO;
+using System.Text;
+
+namespace FFII_ScreenReader.Utils
+{
+    /// <summary>
+    /// Compiled translation dictionary (FF2_translations.bin, built by docs/Scripts/compile_translations.py).
+    /// Entries are sorted by a precomputed FNV-1a hash, so loading is a single file read and
+    /// lookups are a binary search comparing characters in place - no parsing at startup.
+    /// Value strings are created on first use and cached.
+    /// </summary>
+    public sealed class TranslationTable
+    {
+        private const uint MAGIC = 0x58324646; // "FF2X"
+        private const int VERSION = 1;
+        private const int HEADER_SIZE = 16;
+        private const int ENTRY_SIZE = 16;
+
+        private const uint FNV_OFFSET = 0x811C9DC5;
+        private const uint FNV_PRIME = 0x01000193;
+
+        private readonly byte[] data;
+        private readonly int count;
+        private readonly int stringOffset;
+        private readonly string[] values;
+
+        private TranslationTable(byte[] data, int count, int stringOffset)
+        {
+            this.data = data;
+            this.count = count;
+            this.stringOffset = stringOffset;
+            values = new string[count];
+        }
+
+        public int Count => count;
+
+        /// <summary>
+        /// Reads a compiled table. Throws InvalidDataException if the file is not a valid table.
+        /// </summary>
+        public static TranslationTable Load(string path)
+        {
+            byte[] data = File.ReadAllBytes(path);
+            if (data.Length < HEADER_SIZE || BitConverter.ToUInt32(data, 0) != MAGIC
+                || BitConverter.ToUInt16(data, 4) != VERSION)
+                throw new InvalidDataException("not a compiled translation table (bad magic or version)");
+
+            int count = BitConverter.ToInt32(data, 8);
+            int stringOffset = BitConverter.ToInt32(data, 12);
+            if (count < 0 || stringOffset != HEADER_SIZE + (long)count * ENTRY_SIZE || stringOffset > data.Length)
+                throw new InvalidDataException($"corrupt header ({count} entries, strings at {stringOffset})");
+
+            // Validate string ranges once so lookups can index without checks
+            long stringBytes = data.Length - stringOffset;
+            for (int i = 0; i < count; i++)
+            {
+                int entry = HEADER_SIZE + i * ENTRY_SIZE;
+                long keyEnd = BitConverter.ToUInt32(data, entry + 4) + 2L * BitConverter.ToUInt16(data, entry + 12);
+                long valueEnd = BitConverter.ToUInt32(data, entry + 8) + 2L * BitConverter.ToUInt16(data, entry + 14);
+                if (keyEnd > stringBytes || valueEnd > stringBytes)
+                    throw new InvalidDataException($"entry {i} points outside the string block");
+            }
+
+            return new TranslationTable(data, count, stringOffset);
+        }
+
+        /// <summary>
+        /// 32-bit FNV-1a over the string's UTF-16 code units (matches compile_translations.fnv1a).
+        /// </summary>
+        public static uint Hash(string text)
+        {
+            uint hash = FNV_OFFSET;
+            for (int i = 0; i < text.Length; i++)
+            {
+                hash ^= text[i];
+                hash *= FNV_PRIME;
+            }
+            return hash;
+        }
+
+        /// <summary>
+        /// Looks up a key. Only allocates the first time a given value is returned.
+        /// </summary>
+        public bool TryGetValue(string key, out string value)
+        {
+            value = null;
+            if (key == null || count == 0) return false;
+
+            uint hash = Hash(key);
+
+            // Lower bound on hash
+            int lo = 0;
+            int hi = count;
+            while (lo < hi)
+            {
+                int mid = lo + ((hi - lo) >> 1);
+                if (EntryHash(mid) < hash)
+                    lo = mid + 1;
+                else
+                    hi = mid;
+            }
+
+            // Hash collisions are adjacent - compare keys in place
+            for (int i = lo; i < count && EntryHash(i) == hash; i++)
+            {
+                if (!KeyEquals(i, key)) continue;
+
+                value = values[i];
+                if (value == null)
+                {
+                    int entry = HEADER_SIZE + i * ENTRY_SIZE;
+                    int valueStart = stringOffset + (int)BitConverter.ToUInt32(data, entry + 8);
+                    int valueLength = BitConverter.ToUInt16(data, entry + 14);
+                    value = Encoding.Unicode.GetString(data, valueStart, valueLength * 2);
+                    values[i] = value;
+                }
+                return true;
+            }
+            return false;
+        }
+
+        private uint EntryHash(int index)
+        {
+            return BitConverter.ToUInt32(data, HEADER_SIZE + index * ENTRY_SIZE);
+        }
+
+        private bool KeyEquals(int index, string key)
+        {
+            int entry = HEADER_SIZE + index * ENTRY_SIZE;
+            int keyLength = BitConverter.ToUInt16(data, entry + 12);
+            if (keyLength != key.Length) return false;
+
+            int pos = stringOffset + (int)BitConverter.ToUInt32(data, entry + 4);
+            for (int i = 0; i < keyLength; i++, pos += 2)
+            {
+                if ((char)(data[pos] | (data[pos + 1] << 8)) != key[i])
+                    return false;
+            }
+            return true;
+        }
+    }
+}
@@ -0,0 +1,221 @@
+"""Per-announcement-type speech latency and dedupe drop rates from trace files.
+
+Runs under regular CPython 3 with NumPy (not inside Ghidra).
+
+With the AnnouncementTrace preference on, the mod writes
+UserData/FFII_ScreenReader/traces/announcements_<date>.trace: a Stopwatch
+timestamp for every stage an announcement passes through (AnnouncementTrace.cs):
+
+    Event     AnnouncementDeduplicator accepted it (type = dedupe context)
+    Dropped   AnnouncementDeduplicator suppressed a duplicate
+    Queued    SpeechHelper started a one-frame delay
+    Resumed   the delayed coroutine ran
+    Speak     SpeakText was called (type = calling File.Member if no Event)
+    Output    Tolk returned from the screen reader call
+
+For each type this reports how many announcements were accepted, spoken and
+dropped, and p50/p95/p99 of the end-to-end latency (first stage to Output),
+split into postfix work (Event -> Queued for deferred announcements, else
+Event -> Speak), frame delay (Queued -> Resumed) and the Tolk call
+(Speak -> Output). Accepted events that never reached SpeakText
+within the mod's 250 ms join window count as "unspoken".
+
+File layout (little-endian, .NET BinaryWriter):
+
+    header   u32 "FF2L", i32 version, i64 Stopwatch ticks per second
+    chunks   i32 record count, i32 type count, type names (7-bit length-prefixed UTF-8),
+             records: i64 timestamp, i32 trace id, u8 stage, u8 reserved, u16 type
+
+Usage:
+    python announcement_latency.py <trace files or dirs...> [--type Shop] [--min-count 5]
+        [--sort p95|count|drop|type] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = 0x4C324646
+VERSION = 1
+HEADER = struct.Struct("<Iiq")
+CHUNK = struct.Struct("<ii")
+RECORD = np.dtype([("timestamp", "<i8"), ("trace", "<i4"), ("stage", "u1"), ("reserved", "u1"), ("type", "<u2")])
+
+STAGES = ("Event", "Dropped", "Queued", "Resumed", "Speak", "Output")
+EVENT, DROPPED, QUEUED, RESUMED, SPEAK, OUTPUT = range(len(STAGES))
+PERCENTILES = (50, 95, 99)
+
+
+def read_dotnet_string(data, pos):
+    """(string, next position) for a BinaryWriter.Write(string) value."""
+    length = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        length |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+        shift += 7
+    return data[pos:pos + length].decode("utf-8"), pos + length
+
+
+def read_trace(path):
+    """(ticks per second, type names, record array) for one trace file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, frequency = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{}: not a version {} announcement trace".format(path, VERSION))
+    pos = HEADER.size
+    names = []
+    chunks = []
+    while pos + CHUNK.size <= len(data):
+        count, type_count = CHUNK.unpack_from(data, pos)
+        pos += CHUNK.size
+        names = []
+        for _ in range(type_count):
+            name, pos = read_dotnet_string(data, pos)
+            names.append(name)
+        end = pos + count * RECORD.itemsize
+        if end > len(data):
+            print("WARNING {}: truncated chunk ignored (game closed while writing?)".format(path))
+            break
+        chunks.append(np.frombuffer(data, dtype=RECORD, count=count, offset=pos))
+        pos = end
+    records = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RECORD)
+    return frequency, names, records
+
+
+def trace_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".trace"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def stage_times(records, frequency):
+    """(type per trace, ms per trace x stage with NaN for missing stages) for one file's traced records."""
+    traced = records[records["trace"] != 0]
+    if not len(traced):
+        # Header-only file (crash or silent session) or dropped records only
+        return traced["type"], np.zeros((0, len(STAGES)))
+    ids, inverse = np.unique(traced["trace"], return_inverse=True)
+    times = np.full((len(ids), len(STAGES)), np.nan)
+    ms = traced["timestamp"].astype(np.float64) * (1000.0 / frequency)
+    np.fmin.at(times, (inverse, traced["stage"].astype(np.intp)), ms)
+    # All records of a trace carry its type; take the first one's
+    order = np.lexsort((traced["timestamp"], inverse))
+    starts = np.r_[0, np.flatnonzero(np.diff(inverse[order])) + 1]
+    first = traced["type"][order[starts]]
+    return first, times
+
+
+def percentiles(values):
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return dict(("p{}".format(p), None) for p in PERCENTILES)
+    return dict(("p{}".format(p), float(np.percentile(values, p))) for p in PERCENTILES)
+
+
+def analyze(paths):
+    """{type: accumulated arrays and counts} over every trace file."""
+    by_type = {}
+    sessions = 0
+    for path in trace_files(paths):
+        frequency, names, records = read_trace(path)
+        sessions += 1
+        name_of = lambda index: names[index] if index < len(names) else "type#{}".format(index)
+
+        dropped = records[records["stage"] == DROPPED]
+        for type_index, count in zip(*np.unique(dropped["type"], return_counts=True)):
+            entry = by_type.setdefault(name_of(int(type_index)), new_entry())
+            entry["dropped"] += int(count)
+
+        types, times = stage_times(records, frequency)
+        start = np.fmin(np.fmin(times[:, EVENT], times[:, QUEUED]), times[:, SPEAK])
+        for type_index in np.unique(types):
+            rows = types == type_index
+            entry = by_type.setdefault(name_of(int(type_index)), new_entry())
+            t = times[rows]
+            entry["accepted"] += int(np.count_nonzero(~np.isnan(t[:, EVENT])))
+            entry["unspoken"] += int(np.count_nonzero(~np.isnan(t[:, EVENT]) & np.isnan(t[:, SPEAK])))
+            entry["spoken"] += int(np.count_nonzero(~np.isnan(t[:, OUTPUT])))
+            entry["total"].append(t[:, OUTPUT] - start[rows])
+            # A deferred announcement's Event -> Speak includes the frame wait counted in "frame"
+            postfix_end = np.where(np.isnan(t[:, QUEUED]), t[:, SPEAK], t[:, QUEUED])
+            entry["postfix"].append(postfix_end - t[:, EVENT])
+            entry["frame"].append(t[:, RESUMED] - t[:, QUEUED])
+            entry["tolk"].append(t[:, OUTPUT] - t[:, SPEAK])
+    return sessions, by_type
+
+
+def new_entry():
+    return {"accepted": 0, "dropped": 0, "unspoken": 0, "spoken": 0,
+            "total": [], "postfix": [], "frame": [], "tolk": []}
+
+
+def summarize(by_type):
+    rows = []
+    for name, entry in by_type.items():
+        row = {"type": name, "accepted": entry["accepted"], "dropped": entry["dropped"],
+               "unspoken": entry["unspoken"], "spoken": entry["spoken"]}
+        offered = entry["accepted"] + entry["dropped"]
+        row["drop_rate"] = entry["dropped"] / float(offered) if offered else None
+        for part in ("total", "postfix", "frame", "tolk"):
+            values = np.concatenate(entry[part]) if entry[part] else np.zeros(0)
+            row[part] = percentiles(values)
+        rows.append(row)
+    return rows
+
+
+SORT_KEYS = {
+    "p95": lambda r: -(r["total"]["p95"] if r["total"]["p95"] is not None else -1.0),
+    "count": lambda r: -(r["spoken"] + r["dropped"]),
+    "drop": lambda r: -(r["drop_rate"] or 0.0),
+    "type": lambda r: r["type"],
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("traces", nargs="+", help="*.trace files or directories holding them")
+    parser.add_argument("--type", help="only types containing this text")
+    parser.add_argument("--min-count", type=int, default=1, help="hide types with fewer spoken + dropped")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="p95")
+    parser.add_argument("--json", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    sessions, by_type = analyze(args.traces)
+    rows = [r for r in summarize(by_type)
+            if r["spoken"] + r["dropped"] >= args.min_count and (not args.type or args.type in r["type"])]
+    rows.sort(key=lambda r: (SORT_KEYS[args.sort](r), r["type"]))
+
+    fmt = lambda v, spec=".1f": "-" if v is None else format(v, spec)
+    print("{} trace file(s), {} announcement types".format(sessions, len(rows)))
+    print("{:<40} {:>6} {:>6} {:>6} {:>6} {:>8} {:>8} {:>8}  {:>7} {:>7} {:>7}".format(
+        "type", "spoken", "drop", "drop%", "lost", "p50 ms", "p95 ms", "p99 ms", "postfix", "frame", "tolk"))
+    for r in rows:
+        print("{:<40} {:>6} {:>6} {:>6} {:>6} {:>8} {:>8} {:>8}  {:>7} {:>7} {:>7}".format(
+            r["type"][:40], r["spoken"], r["dropped"],
+            fmt(None if r["drop_rate"] is None else 100 * r["drop_rate"], ".0f"), r["unspoken"],
+            fmt(r["total"]["p50"]), fmt(r["total"]["p95"]), fmt(r["total"]["p99"]),
+            fmt(r["postfix"]["p50"], ".2f"), fmt(r["frame"]["p50"]), fmt(r["tolk"]["p50"], ".2f")))
+    print("")
+    print("lost = accepted by the deduplicator but never spoken; postfix/frame/tolk are p50 ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"sessions": sessions, "types": rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Compare the decompile pipeline under Jython 2.7 and PyGhidra (CPython 3).
+
+Runs under regular CPython 3 (not inside Ghidra). Both runtimes run
+decompile_manifest.py on the same manifest against the existing project
+(-readOnly, so neither run changes it). The manifest is built from an
+existing decompiled_<group>.c. Each run's per-phase wall times are read from
+the .timings.json file decompile_engine.py writes next to its output.
+
+The report also checks that both runtimes produced the same normalized body
+hash for every function.
+
+Usage:
+    python benchmark_runtimes.py status_ui --runs 3
+    python benchmark_runtimes.py magic --ghidra-home D:\\Games\\Dev\\ghidra --runtimes jython
+    python benchmark_runtimes.py --offline D:\\Games\\Dev\\Unity\\FFPR\\ff2\\script.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from decomp_corpus import SCRIPT_DIR, parse_file
+
+GHIDRA_HOME = "D:\\Games\\Dev\\ghidra"
+PROJECT_DIR = "D:\\Games\\Dev\\ghidra\\projects"
+PROJECT_NAME = "FF2_Analysis"
+BENCH_DIR = os.path.join(SCRIPT_DIR, "benchmark")
+
+# Launchers under <ghidra>/support; pyghidraRun --headless forwards to analyzeHeadless
+LAUNCHERS = {
+    "jython": ["analyzeHeadless.bat"],
+    "pyghidra": ["pyghidraRun.bat", "--headless"],
+}
+
+
+def manifest_from_corpus(group, path):
+    """Write a decompile_engine manifest listing every function in decompiled_<group>.c."""
+    source = os.path.join(SCRIPT_DIR, "decompiled_" + group + ".c")
+    lines, functions = parse_file(source)
+    title = lines[1].split(" - ", 1)[1] if len(lines) > 1 and " - " in lines[1] else group
+    manifest = {
+        "group": group,
+        "banner": "FF2 Runtime Benchmark - " + group,
+        "title": title,
+        "purpose": "Runtime benchmark (benchmark_runtimes.py)",
+        "notes": [],
+        "targets": dict(("0x{:X}".format(f.rva), f.name) for f in functions),
+        "output_path": "",
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return len(functions)
+
+
+def run_once(runtime, args, manifest_path, output_path):
+    """One headless run; returns (process seconds, timings dict)."""
+    launcher = LAUNCHERS[runtime]
+    command = [os.path.join(args.ghidra_home, "support", launcher[0])] + launcher[1:] + [
+        args.project_dir, args.project_name, "-process", "GameAssembly.dll", "-noanalysis", "-readOnly",
+        "-scriptPath", SCRIPT_DIR, "-postScript", "decompile_manifest.py", manifest_path, output_path]
+    log_path = os.path.splitext(output_path)[0] + ".log"
+    started = time.time()
+    with open(log_path, "w", encoding="utf-8") as log:
+        code = subprocess.call(command, stdout=log, stderr=subprocess.STDOUT)
+    elapsed = time.time() - started
+    timings_path = os.path.splitext(output_path)[0] + ".timings.json"
+    if code != 0 or not os.path.exists(timings_path):
+        raise RuntimeError("{} run failed (exit {}), see {}".format(runtime, code, log_path))
+    with open(timings_path, encoding="utf-8") as f:
+        return elapsed, json.load(f)
+
+
+def read_hashes(output_path):
+    hashes = {}
+    with open(os.path.splitext(output_path)[0] + ".jsonl", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            hashes[record["name"]] = record["hash"]
+    return hashes
+
+
+def benchmark(args):
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    manifest_path = os.path.join(BENCH_DIR, args.group + ".manifest.json")
+    count = manifest_from_corpus(args.group, manifest_path)
+    print("Manifest: {} ({} functions)".format(manifest_path, count))
+
+    results = {}
+    hashes = {}
+    for runtime in args.runtimes:
+        output_path = os.path.join(BENCH_DIR, runtime, "decompiled_" + args.group + ".c")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        runs = []
+        for i in range(args.runs):
+            elapsed, timings = run_once(runtime, args, manifest_path, output_path)
+            print("  {:<9} run {}: {:7.2f}s process, {:7.2f}s script ({})".format(
+                runtime, i + 1, elapsed, timings["total"], timings["runtime"]))
+            runs.append((elapsed, timings))
+        results[runtime] = runs
+        hashes[runtime] = read_hashes(output_path)
+
+    phases = []
+    for runs in results.values():
+        for name in runs[0][1]["phases"]:
+            if name not in phases:
+                phases.append(name)
+
+    print("")
+    print("Median seconds over {} run(s):".format(args.runs))
+    print("  {:<12}".format("phase") + "".join("{:>12}".format(r) for r in results))
+    for name in phases + ["script", "process"]:
+        row = []
+        for runs in results.values():
+            if name == "process":
+                values = [elapsed for elapsed, _ in runs]
+            elif name == "script":
+                values = [timings["total"] for _, timings in runs]
+            else:
+                values = [timings["phases"].get(name, 0.0) for _, timings in runs]
+            row.append(statistics.median(values))
+        print("  {:<12}".format(name) + "".join("{:>12.2f}".format(v) for v in row))
+
+    if len(hashes) == 2:
+        first, second = list(hashes.values())
+        differing = sorted(name for name in set(first) | set(second) if first.get(name) != second.get(name))
+        print("")
+        if differing:
+            print("Output differs between runtimes for {} function(s):".format(len(differing)))
+            for name in differing:
+                print("  " + name)
+            return 1
+        print("Both runtimes produced identical normalized output for all {} functions".format(len(first)))
+    return 0
+
+
+def benchmark_offline(script_json_path, runs):
+    """script.json parse time: stdlib json vs orjson (the CPython-only fast path)."""
+    with open(script_json_path, "rb") as f:
+        raw = f.read()
+    print("script.json: {:.1f} MB".format(len(raw) / 1e6))
+    parsers = [("json", lambda: json.loads(raw.decode("utf-8")))]
+    try:
+        import orjson
+        parsers.append(("orjson", lambda: orjson.loads(raw)))
+    except ImportError:
+        print("  orjson not installed (pip install orjson)")
+    for name, parse in parsers:
+        times = []
+        for _ in range(runs):
+            started = time.time()
+            parse()
+            times.append(time.time() - started)
+        print("  {:<8} median {:.2f}s".format(name, statistics.median(times)))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the decompile pipeline under Jython and PyGhidra.")
+    parser.add_argument("group", nargs="?", help="decompiled_<group>.c to take the manifest from")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--runtimes", nargs="+", default=["jython", "pyghidra"], choices=sorted(LAUNCHERS))
+    parser.add_argument("--ghidra-home", default=GHIDRA_HOME)
+    parser.add_argument("--project-dir", default=PROJECT_DIR)
+    parser.add_argument("--project-name", default=PROJECT_NAME)
+    parser.add_argument("--offline", metavar="SCRIPT_JSON", help="only time script.json parsing in this interpreter")
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        return benchmark_offline(args.offline, max(args.runs, 3))
+    if not args.group:
+        parser.error("group is required unless --offline is given")
+    return benchmark(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
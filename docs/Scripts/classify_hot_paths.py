@@ -0,0 +1,239 @@
+# Ghidra headless script that ranks the mod's Harmony patch targets by how close they sit to per-frame code
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Uses il2cpp_program.py for script.json and patch_targets.json from extract_patch_targets.py
+#
+# Every Harmony hook pays a managed <-> IL2CPP transition per call, so a postfix
+# on a method that runs every frame costs far more than one on a menu event.
+# For each patch target this walks the static call graph of GameAssembly.dll
+# backwards (callers of callers, up to MAX_DEPTH calls) and records which
+# entry points reach it:
+#
+#   update     - MonoBehaviour Update / LateUpdate / FixedUpdate (every frame)
+#   coroutine  - compiler-generated <Foo>d__N$$MoveNext (every frame while the coroutine runs)
+#
+# Targets reached from an update root are "per-frame", ranked by call depth and
+# number of roots; "coroutine" targets follow; the rest are "event" (only
+# reached from input callbacks, UI events or not at all within MAX_DEPTH).
+#
+# Limits: only direct calls are edges (thunks are followed). IL2CPP virtual and
+# interface calls go through the vtable and delegates through Invoke, so a
+# target reached only that way shows up as "event" - treat the report as a
+# lower bound on what runs per frame.
+#
+# Output: hot_paths.json ({"targets": [...], "roots": {...}}) plus a ranked table.
+#
+# Usage (run_ghidra_analysis.bat hot_paths analyze):
+#   -postScript classify_hot_paths.py [patch_targets.json] [max depth]
+
+from collections import deque
+from decomp_corpus import SCRIPT_DIR
+from decompile_engine import Manifest, write_text
+from il2cpp_program import SCRIPT_JSON_PATH, load_script_json
+import json
+import os
+import time
+
+PATCH_TARGETS_PATH = os.path.join(SCRIPT_DIR, "patch_targets.json")
+OUTPUT_PATH = os.path.join(SCRIPT_DIR, "hot_paths.json")
+
+UPDATE_METHODS = ("Update", "LateUpdate", "FixedUpdate")
+MAX_DEPTH = 6
+# Stop a single target's search after this many functions (fan-in explodes near utility code)
+MAX_VISITED = 200000
+
+
+def root_kind(name):
+    """'update', 'coroutine' or None for a script.json method name."""
+    type_name, _, method = name.partition("$$")
+    if method in UPDATE_METHODS:
+        return "update"
+    if method == "MoveNext" and ">d__" in type_name:
+        return "coroutine"
+    return None
+
+
+class CallerGraph(object):
+    """Direct callers of each function, read lazily from the reference manager."""
+
+    def __init__(self, program):
+        self.references = program.getReferenceManager()
+        self.functions = program.getFunctionManager()
+        self.cache = {}
+
+    def callers(self, func):
+        """[(caller, is_thunk)] of func."""
+        entry = func.getEntryPoint()
+        key = entry.getOffset()
+        if key not in self.cache:
+            found = {}
+            for ref in self.references.getReferencesTo(entry):
+                caller = self.functions.getFunctionContaining(ref.getFromAddress())
+                if caller is None:
+                    continue
+                if ref.getReferenceType().isCall() or caller.isThunk():
+                    found[caller.getEntryPoint().getOffset()] = (caller, caller.isThunk())
+            self.cache[key] = list(found.values())
+        return self.cache[key]
+
+
+def reverse_search(graph, func, roots, max_depth):
+    """Roots reaching func: ({root entry: depth}, {entry: next entry towards func}, functions visited).
+
+    0-1 BFS over callers: a thunk adds no depth, a direct call adds one.
+    """
+    start = func.getEntryPoint().getOffset()
+    depth = {start: 0}
+    next_hop = {}
+    reached = {}
+    queue = deque([func])
+    while queue and len(depth) < MAX_VISITED:
+        current = queue.popleft()
+        entry = current.getEntryPoint().getOffset()
+        current_depth = depth[entry]
+        if entry in roots and entry not in reached:
+            reached[entry] = current_depth
+        if current_depth >= max_depth:
+            continue
+        for caller, is_thunk in graph.callers(current):
+            caller_entry = caller.getEntryPoint().getOffset()
+            caller_depth = current_depth if is_thunk else current_depth + 1
+            if caller_entry in depth and depth[caller_entry] <= caller_depth:
+                continue
+            depth[caller_entry] = caller_depth
+            next_hop[caller_entry] = entry
+            if is_thunk:
+                queue.appendleft(caller)
+            else:
+                queue.append(caller)
+    return reached, next_hop, len(depth)
+
+
+def call_path(root, next_hop, target, describe):
+    path = [describe(root)]
+    entry = root
+    while entry != target and entry in next_hop:
+        entry = next_hop[entry]
+        path.append(describe(entry))
+    return path
+
+
+def classify(reached, roots):
+    """(class, depth, update roots, coroutine roots) for one target."""
+    update = [d for entry, d in reached.items() if roots[entry] == "update"]
+    coroutine = [d for entry, d in reached.items() if roots[entry] == "coroutine"]
+    if update:
+        return "per-frame", min(update), len(update), len(coroutine)
+    if coroutine:
+        return "coroutine", min(coroutine), 0, len(coroutine)
+    return "event", None, 0, 0
+
+
+RANK = {"per-frame": 0, "coroutine": 1, "event": 2}
+
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Patch Hot-Path Classification")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    args = list(getScriptArgs())
+    manifest_path = args[0] if args else PATCH_TARGETS_PATH
+    max_depth = int(args[1]) if len(args) > 1 else MAX_DEPTH
+    if not os.path.exists(manifest_path):
+        print("ERROR: patch target manifest not found: " + manifest_path)
+        print("       run: python extract_patch_targets.py --script-json <script.json>")
+        return
+    manifest = Manifest.load(manifest_path)
+    print("Patch targets: {} ({})".format(len(manifest.targets), manifest_path))
+    print("Max depth: {}".format(max_depth))
+
+    data = load_script_json(SCRIPT_JSON_PATH)
+    if data is None:
+        print("ERROR: script.json is required for entry point names")
+        return
+    image_base = program.getImageBase().getOffset()
+    name_by_entry = {}
+    roots = {}
+    for method in data.get("ScriptMethod", []):
+        rva = method.get("Address")
+        name = method.get("Name")
+        if not rva or not name:
+            continue
+        name_by_entry.setdefault(image_base + rva, name)
+        kind = root_kind(name)
+        if kind:
+            roots[image_base + rva] = kind
+    data = None
+    print("Entry points: {} update, {} coroutine".format(
+        sum(1 for k in roots.values() if k == "update"), sum(1 for k in roots.values() if k == "coroutine")))
+    print("")
+
+    space = program.getAddressFactory().getDefaultAddressSpace()
+    function_manager = program.getFunctionManager()
+
+    def describe(entry):
+        name = name_by_entry.get(entry)
+        if name:
+            return name
+        func = function_manager.getFunctionAt(space.getAddress(entry))
+        return "%s" % func.getName() if func is not None else "0x{:X}".format(entry - image_base)
+
+    graph = CallerGraph(program)
+    started = time.time()
+    results = []
+    for rva, name in sorted(manifest.targets.items(), key=lambda item: item[1]):
+        func = function_manager.getFunctionAt(space.getAddress(image_base + rva))
+        if func is None:
+            results.append({"name": name, "rva": "0x{:X}".format(rva), "class": "event", "depth": None,
+                            "update_roots": 0, "coroutine_roots": 0, "path": [], "error": "no function"})
+            continue
+        reached, next_hop, visited = reverse_search(graph, func, roots, max_depth)
+        hot_class, depth, update_roots, coroutine_roots = classify(reached, roots)
+        path = []
+        if depth is not None:
+            kind = "update" if hot_class == "per-frame" else "coroutine"
+            nearest = min((d, describe(entry), entry) for entry, d in reached.items() if roots[entry] == kind)
+            path = call_path(nearest[2], next_hop, image_base + rva, describe)
+        results.append({"name": name, "rva": "0x{:X}".format(rva), "class": hot_class, "depth": depth,
+                        "update_roots": update_roots, "coroutine_roots": coroutine_roots,
+                        "visited": visited, "truncated": visited >= MAX_VISITED, "path": path})
+
+    results.sort(key=lambda r: (RANK[r["class"]], r["depth"] if r["depth"] is not None else max_depth + 1,
+                                -r["update_roots"], -r["coroutine_roots"], r["name"]))
+    summary = {
+        "program": "%s" % program.getName(),
+        "manifest": manifest_path,
+        "max_depth": max_depth,
+        "roots": {"update": sum(1 for k in roots.values() if k == "update"),
+                  "coroutine": sum(1 for k in roots.values() if k == "coroutine")},
+        "seconds": time.time() - started,
+        "targets": results,
+    }
+    write_text(OUTPUT_PATH, json.dumps(summary, indent=2, sort_keys=True))
+
+    print("{:<10} {:>5} {:>7} {:>6}  {}".format("class", "depth", "update", "corout", "target"))
+    for result in results:
+        print("{:<10} {:>5} {:>7} {:>6}  {}{}".format(
+            result["class"], "-" if result["depth"] is None else result["depth"], result["update_roots"],
+            result["coroutine_roots"], result["name"], "  (truncated)" if result.get("truncated") else ""))
+        if result["path"]:
+            print("{:>32}{}".format("", " -> ".join(result["path"])))
+
+    counts = {}
+    for result in results:
+        counts[result["class"]] = counts.get(result["class"], 0) + 1
+    print("")
+    print("=" * 70)
+    print("Classified {} targets in {:.0f}s: {}".format(
+        len(results), summary["seconds"], ", ".join("{} {}".format(counts[c], c) for c in sorted(counts, key=RANK.get))))
+    print("  Output: " + OUTPUT_PATH)
+    print("=" * 70)
+
+# Run the script
+run()
@@ -0,0 +1,307 @@
+"""Validate, merge and compile the entity name translations for EntityTranslator.
+
+Runs under regular CPython 3 (not inside Ghidra).
+
+EntityTranslator reads FF2_translations.json ({"Japanese": "English", ...})
+with a hand-written string scanner at startup, and the dump hotkey writes
+untranslated names per map to EntityNames.json ({"Map": {"Japanese": ""}}).
+Once translators fill in those dumps, this tool:
+
+  - validates every file (duplicate keys, empty keys, stray whitespace,
+    values still containing Japanese, non-string values)
+  - merges the dumps into the translations; the translations file wins,
+    and conflicting non-empty values are reported with their sources
+  - compiles the result into FF2_translations.bin, which the mod loads with
+    one read and looks up by binary search, so startup cost does not grow
+    with the dictionary
+  - optionally rewrites the merged JSON (sorted) and lists names still
+    missing a translation
+
+Compiled layout (little-endian, strings UTF-16LE like .NET strings):
+
+    header   "FF2X", u16 version, u16 reserved, u32 entry count, u32 string offset
+    entries  u32 hash, u32 key offset, u32 value offset, u16 key length, u16 value length
+             (sorted by hash then key; offsets from the string block, lengths in chars)
+    strings  key and value characters, no terminators
+
+hash is 32-bit FNV-1a over the UTF-16 code units (TranslationTable.Hash in
+the mod). Exit status is 1 on validation errors, or on conflicts with --strict.
+
+Usage:
+    python compile_translations.py FF2_translations.json [EntityNames.json ...]
+        [-o FF2_translations.bin] [--write-json merged.json] [--missing missing.txt] [--strict]
+    python compile_translations.py --check FF2_translations.bin [FF2_translations.json]
+
+Copy FF2_translations.bin next to FF2_translations.json in
+<game>/UserData/FFII_ScreenReader/; the mod uses it while it is at least as
+new as the JSON.
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import sys
+
+MAGIC = b"FF2X"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<IIIHH")
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+MAX_CHARS = 0xFFFF
+
+# Same ranges as EntityTranslator.ContainsJapanese
+JAPANESE = re.compile("[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]")
+
+
+def fnv1a(text):
+    """32-bit FNV-1a over UTF-16 code units, as TranslationTable.Hash computes it."""
+    units = text.encode("utf-16-le")
+    h = FNV_OFFSET
+    for i in range(0, len(units), 2):
+        h ^= units[i] | (units[i + 1] << 8)
+        h = (h * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def utf16_length(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+class Report(object):
+    """Collects validation errors, warnings and merge conflicts."""
+
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.conflicts = []
+
+    def error(self, source, message):
+        self.errors.append("{}: {}".format(source, message))
+
+    def warn(self, source, message):
+        self.warnings.append("{}: {}".format(source, message))
+
+
+def load_json(path, report):
+    """Parse a JSON file (BOM allowed, as the mod's StreamWriter writes one), reporting duplicate keys."""
+    def pairs_hook(pairs):
+        seen = {}
+        for key, value in pairs:
+            if key in seen and seen[key] != value:
+                report.error(path, "duplicate key {!r} ({!r} and {!r})".format(key, seen[key], value))
+            elif key in seen:
+                report.warn(path, "duplicate key {!r}".format(key))
+            seen[key] = value
+        return seen
+
+    with open(path, encoding="utf-8-sig") as f:
+        try:
+            return json.load(f, object_pairs_hook=pairs_hook)
+        except ValueError as e:
+            report.error(path, "invalid JSON: {}".format(e))
+            return None
+
+
+def validate_pairs(source, pairs, report, allow_empty):
+    """{key: value} of the usable pairs from one flat dictionary.
+
+    An empty value in a dump (allow_empty) is an untranslated placeholder and is dropped. An empty value
+    in the translations file is kept, warned about, so the table maps it to "" exactly as the JSON loader
+    in EntityTranslator does.
+    """
+    usable = {}
+    for key, value in pairs.items():
+        where = "{} [{}]".format(source, key)
+        if not isinstance(value, str):
+            report.error(where, "value is {}, not a string".format(type(value).__name__))
+            continue
+        if not key:
+            report.error(source, "empty key")
+            continue
+        if utf16_length(key) > MAX_CHARS or utf16_length(value) > MAX_CHARS:
+            report.error(where, "longer than {} characters".format(MAX_CHARS))
+            continue
+        if key != key.strip():
+            report.warn(where, "key has leading/trailing whitespace")
+        if not value:
+            if allow_empty:
+                continue
+            report.warn(where, "empty translation")
+            usable[key] = value
+            continue
+        if value != value.strip():
+            report.warn(where, "value has leading/trailing whitespace")
+        if JAPANESE.search(value):
+            report.warn(where, "translation still contains Japanese: {!r}".format(value))
+        if not JAPANESE.search(key):
+            report.warn(where, "key has no Japanese characters")
+        usable[key] = value
+    return usable
+
+
+def merge(translations_path, dump_paths, report):
+    """(merged {key: value}, {key: [maps]} of names with no translation anywhere)."""
+    merged = {}
+    sources = {}
+    data = load_json(translations_path, report)
+    if data is not None:
+        if not isinstance(data, dict):
+            report.error(translations_path, "expected an object of name -> translation")
+        else:
+            for key, value in validate_pairs(translations_path, data, report, False).items():
+                merged[key] = value
+                sources[key] = translations_path
+
+    missing = {}
+    for dump_path in dump_paths:
+        data = load_json(dump_path, report)
+        if data is None:
+            continue
+        if not isinstance(data, dict) or not all(isinstance(v, dict) for v in data.values()):
+            report.error(dump_path, "expected an object of map -> {name: translation}")
+            continue
+        for map_name, names in sorted(data.items()):
+            source = "{} ({})".format(dump_path, map_name)
+            for key, value in sorted(validate_pairs(source, names, report, True).items()):
+                if key not in merged:
+                    merged[key] = value
+                    sources[key] = source
+                elif merged[key] != value:
+                    report.conflicts.append((key, merged[key], sources[key], value, source))
+            for key, value in names.items():
+                if value == "" and key:
+                    missing.setdefault(key, []).append(map_name)
+    missing = dict((key, maps) for key, maps in missing.items() if key not in merged)
+    return merged, missing
+
+
+def compile_table(translations):
+    """Compiled table bytes for {key: value}."""
+    entries = sorted((fnv1a(key), key, value) for key, value in translations.items())
+    strings = bytearray()
+    packed = []
+    for h, key, value in entries:
+        key_units = key.encode("utf-16-le")
+        value_units = value.encode("utf-16-le")
+        packed.append(ENTRY.pack(h, len(strings), len(strings) + len(key_units),
+                                 len(key_units) // 2, len(value_units) // 2))
+        strings += key_units + value_units
+    string_offset = HEADER.size + ENTRY.size * len(entries)
+    return HEADER.pack(MAGIC, VERSION, 0, len(entries), string_offset) + b"".join(packed) + bytes(strings)
+
+
+def read_table(data):
+    """[(hash, key, value)] from compiled bytes, in file order."""
+    magic, version, _, count, string_offset = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a version {} translation table".format(VERSION))
+    entries = []
+    for i in range(count):
+        h, key_offset, value_offset, key_len, value_len = ENTRY.unpack_from(data, HEADER.size + i * ENTRY.size)
+        key = data[string_offset + key_offset:string_offset + key_offset + key_len * 2].decode("utf-16-le")
+        value = data[string_offset + value_offset:string_offset + value_offset + value_len * 2].decode("utf-16-le")
+        entries.append((h, key, value))
+    return entries
+
+
+def lookup(entries, key):
+    """Binary search the way TranslationTable.TryGetValue does; returns the value or None."""
+    h = fnv1a(key)
+    lo, hi = 0, len(entries)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if entries[mid][0] < h:
+            lo = mid + 1
+        else:
+            hi = mid
+    while lo < len(entries) and entries[lo][0] == h:
+        if entries[lo][1] == key:
+            return entries[lo][2]
+        lo += 1
+    return None
+
+
+def check(table_path, translations_path):
+    """Verify a compiled table: hashes, ordering, lookups, and optionally the source JSON."""
+    with open(table_path, "rb") as f:
+        data = f.read()
+    entries = read_table(data)
+    problems = 0
+    for i, (h, key, value) in enumerate(entries):
+        if fnv1a(key) != h:
+            print("BAD HASH entry {} {!r}".format(i, key))
+            problems += 1
+        if i and entries[i - 1][:2] >= (h, key):
+            print("OUT OF ORDER entry {} {!r}".format(i, key))
+            problems += 1
+        if lookup(entries, key) != value:
+            print("LOOKUP FAILED {!r}".format(key))
+            problems += 1
+    if translations_path:
+        report = Report()
+        source = load_json(translations_path, report) or {}
+        for key, value in source.items():
+            if isinstance(value, str) and key and value and lookup(entries, key) != value:
+                print("NOT IN TABLE {!r}".format(key))
+                problems += 1
+    collisions = len(entries) - len(set(h for h, _, _ in entries))
+    print("{}: {} entries, {} hash collisions, {} bytes, {} problems".format(
+        table_path, len(entries), collisions, len(data), problems))
+    return 1 if problems else 0
+
+
+def write_json(path, translations):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(json.dumps(translations, ensure_ascii=False, indent=2, sort_keys=True))
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("translations", help="FF2_translations.json (or the .bin with --check)")
+    parser.add_argument("dumps", nargs="*", help="EntityNames.json dump files to merge")
+    parser.add_argument("-o", "--output", help="compiled table (default: <translations>.bin)")
+    parser.add_argument("--write-json", metavar="PATH", help="write the merged translations as sorted JSON")
+    parser.add_argument("--missing", metavar="PATH", help="write names still lacking a translation")
+    parser.add_argument("--strict", action="store_true", help="fail on merge conflicts")
+    parser.add_argument("--check", action="store_true", help="verify a compiled table (optional JSON to compare)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return check(args.translations, args.dumps[0] if args.dumps else None)
+
+    report = Report()
+    merged, missing = merge(args.translations, args.dumps, report)
+
+    for warning in report.warnings:
+        print("WARNING " + warning)
+    for key, kept, kept_source, other, other_source in report.conflicts:
+        print("CONFLICT {!r}: {!r} ({}) kept over {!r} ({})".format(key, kept, kept_source, other, other_source))
+    for error in report.errors:
+        print("ERROR " + error)
+    if report.errors or (args.strict and report.conflicts):
+        print("Not compiled: {} errors, {} conflicts".format(len(report.errors), len(report.conflicts)))
+        return 1
+
+    output = args.output or os.path.splitext(args.translations)[0] + ".bin"
+    data = compile_table(merged)
+    with open(output, "wb") as f:
+        f.write(data)
+    if args.write_json:
+        write_json(args.write_json, merged)
+    if args.missing:
+        with open(args.missing, "w", encoding="utf-8", newline="\n") as f:
+            for key in sorted(missing):
+                f.write("{}\t{}\n".format(key, ", ".join(sorted(set(missing[key])))))
+
+    print("Compiled {} translations ({} bytes, {} warnings, {} conflicts, {} still missing): {}".format(
+        len(merged), len(data), len(report.warnings), len(report.conflicts), len(missing), output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
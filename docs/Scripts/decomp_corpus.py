@@ -0,0 +1,118 @@
+# Reader for the decompiled_*.c files written by the decompile_*.py scripts
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# Each output file is a header comment followed by class banners and one block
+# per function:
+#
+#   /********************************************************************/
+#   /* Class$$Method
+#    * RVA: 0x913900
+#    * Address: 0x180913900
+#    *******************************************************************/
+#   <two blank lines>
+#   <decompiled C, or /* DECOMPILATION FAILED: ... */>
+#
+# parse_file() returns the lines plus one DecompiledFunction per block with the
+# 0-based line span of its code, so post-processing passes can rewrite bodies
+# in place and keep everything else byte-identical.
+
+import glob
+import io
+import os
+import re
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FUNCTION_BANNER = "/" + "*" * 68 + "/"
+CLASS_BANNER = "/" + "=" * 68 + "/"
+
+_NAME_RE = re.compile(r"^/\* (\S+)\s*$")
+_RVA_RE = re.compile(r"^ \* RVA: 0x([0-9A-Fa-f]+)")
+_ADDRESS_RE = re.compile(r"^ \* Address: 0x([0-9A-Fa-f]+)")
+_BANNER_END = " " + "*" * 67 + "/"
+
+
+class DecompiledFunction(object):
+    """One function block: name, RVA/address and the [code_start, code_end) line span."""
+
+    def __init__(self, name, rva, address, banner_line, code_start, code_end, lines):
+        self.name = name
+        self.rva = rva
+        self.address = address
+        self.banner_line = banner_line
+        self.code_start = code_start
+        self.code_end = code_end
+        self._lines = lines
+
+    @property
+    def class_name(self):
+        return self.name.split("$$")[0] if "$$" in self.name else "Unknown"
+
+    @property
+    def code_lines(self):
+        return self._lines[self.code_start:self.code_end]
+
+    @property
+    def code(self):
+        return "\n".join(self.code_lines).strip("\n")
+
+    @property
+    def failed(self):
+        return self.code.startswith("/* DECOMPILATION FAILED")
+
+    def __repr__(self):
+        return "DecompiledFunction({}, rva=0x{:X}, lines {}-{})".format(
+            self.name, self.rva, self.code_start + 1, self.code_end)
+
+
+def read_lines(path):
+    with io.open(path, "r", encoding="utf-8") as f:
+        return f.read().split("\n")
+
+
+def parse_lines(lines):
+    """Locate every function block in a decompiled_*.c line list."""
+    functions = []
+    i = 0
+    count = len(lines)
+    while i < count:
+        if lines[i] != FUNCTION_BANNER or i + 4 >= count:
+            i += 1
+            continue
+        name_match = _NAME_RE.match(lines[i + 1])
+        rva_match = _RVA_RE.match(lines[i + 2])
+        address_match = _ADDRESS_RE.match(lines[i + 3])
+        if not (name_match and rva_match and address_match and lines[i + 4] == _BANNER_END):
+            i += 1
+            continue
+        code_start = i + 5
+        code_end = code_start
+        while code_end < count and lines[code_end] not in (FUNCTION_BANNER, CLASS_BANNER):
+            code_end += 1
+        functions.append(DecompiledFunction(
+            name_match.group(1), int(rva_match.group(1), 16), int(address_match.group(1), 16),
+            i, code_start, code_end, lines))
+        i = code_end
+    return functions
+
+
+def parse_file(path):
+    """Return (lines, functions) for one decompiled_*.c file."""
+    lines = read_lines(path)
+    return lines, parse_lines(lines)
+
+
+def group_name(path):
+    """decompiled_pathfinding.c (or .folded.c, .fields.c, .jsonl) -> pathfinding"""
+    base = os.path.basename(path).split(".")[0]
+    return base[len("decompiled_"):] if base.startswith("decompiled_") else base
+
+
+def is_derived(path):
+    """Post-processed copies (decompiled_x.folded.c, decompiled_x.fields.c) are not corpus files."""
+    return os.path.basename(path).count(".") > 1
+
+
+def corpus_files(directory=SCRIPT_DIR):
+    """Raw decompiled_*.c files (derived copies excluded), sorted by group."""
+    return sorted(p for p in glob.glob(os.path.join(directory, "decompiled_*.c")) if not is_derived(p))
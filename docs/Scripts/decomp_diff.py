@@ -0,0 +1,178 @@
+# Semantic diff of decompiled_*.c output between two runs or game versions
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# A game patch shifts GameAssembly.dll, so every FUN_/LAB_/DAT_ name and every
+# Ghidra-generated local (uVar3, local_38, ...) changes even where the code did
+# not. Each function body is normalized before comparing:
+#
+#   FUN_180913900 / thunk_FUN_...   -> FUN_0, FUN_1, ...   (order of first use)
+#   LAB_1809139a4                   -> LAB_0, LAB_1, ...
+#   DAT_182279950 / PTR_ / s_..._   -> DAT_0, DAT_1, ...
+#   uVar3, lVar12, local_38, ...    -> uVar_0, lVar_0, local_0, ...
+#   0x18xxxxxxx absolute addresses  -> ADDR
+#   /* Lnn-mm */ fold notes, whitespace runs
+#
+# Field offsets, constants, named (symbolized) callees and control flow are
+# kept, so a changed offset or branch still shows up. Functions are matched by
+# name (Class$$Method, overloads numbered in file order), not by RVA.
+#
+# Usage:
+#   python decomp_diff.py OLD NEW             # two files, or two directories of decompiled_*.c
+#   python decomp_diff.py OLD NEW --diff      # also print a unified diff of each changed body
+#   python decomp_diff.py OLD NEW --json out.json
+
+import argparse
+import difflib
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+
+from decomp_corpus import corpus_files, group_name, parse_file
+
+_FOLD_NOTE = re.compile(r"\s*/\* L\d+(?:-\d+)? \*/")
+_WHITESPACE = re.compile(r"[ \t]+")
+_ABSOLUTE_ADDRESS = re.compile(r"\b0x18[0-9a-fA-F]{7}\b")
+
+# (kind, pattern) in priority order; each kind gets its own first-use numbering
+_TOKEN_KINDS = [
+    ("FUN", r"\b(?:thunk_)?FUN_[0-9a-fA-F]+\b"),
+    ("LAB", r"\bLAB_[0-9a-fA-F]+\b"),
+    ("DAT", r"\b(?:DAT|PTR_\w+?|s_\w+?|u_\w+?)_[0-9a-fA-F]{8,}\b"),
+    ("local", r"\b(?:local_res|local_|auStack_|stack0x)[0-9a-fA-F]+\b"),
+    ("in", r"\b(?:in|extraout|unaff)_\w+\b"),
+    ("var", r"\b[a-z]+Var\d+\b"),
+]
+_TOKEN = re.compile("|".join("(?P<{}>{})".format(kind, pattern) for kind, pattern in _TOKEN_KINDS))
+_VAR_PREFIX = re.compile(r"^([a-z]+Var)\d+$")
+
+
+def normalize(code):
+    """Canonical form of one function body; equal output means equal logic."""
+    code = _FOLD_NOTE.sub("", code)
+    names = {}
+    counters = {}
+
+    def replace(match):
+        token = match.group(0)
+        if token in names:
+            return names[token]
+        kind = match.lastgroup
+        if kind == "var":
+            kind = _VAR_PREFIX.match(token).group(1)
+        index = counters.get(kind, 0)
+        counters[kind] = index + 1
+        names[token] = "{}_{}".format(kind, index)
+        return names[token]
+
+    lines = []
+    for line in code.split("\n"):
+        line = _WHITESPACE.sub(" ", line).strip()
+        if line:
+            lines.append(_TOKEN.sub(replace, _ABSOLUTE_ADDRESS.sub("ADDR", line)))
+    return "\n".join(lines)
+
+
+def body_hash(normalized):
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def function_key(seen, name):
+    """Class$$Method, with #2, #3 ... for later overloads of the same name."""
+    seen[name] = seen.get(name, 0) + 1
+    return name if seen[name] == 1 else "{}#{}".format(name, seen[name])
+
+
+def fingerprint_file(path, keep_bodies=False):
+    """Return {key: (rva, hash, normalized or None)} for one decompiled file."""
+    _, functions = parse_file(path)
+    seen = {}
+    result = {}
+    for func in functions:
+        normalized = normalize(func.code)
+        result[function_key(seen, func.name)] = (
+            func.rva, body_hash(normalized), normalized if keep_bodies else None)
+    return result
+
+
+def corpus_pairs(old, new):
+    """Pair up files by group; a file given directly is its own group."""
+    if os.path.isfile(old) and os.path.isfile(new):
+        return [(group_name(new), old, new)]
+    if not (os.path.isdir(old) and os.path.isdir(new)):
+        raise ValueError("OLD and NEW must both be files or both be directories")
+    old_files = dict((group_name(p), p) for p in corpus_files(old))
+    new_files = dict((group_name(p), p) for p in corpus_files(new))
+    return [(group, old_files.get(group), new_files.get(group))
+            for group in sorted(set(old_files) | set(new_files))]
+
+
+def compare(old, new, keep_bodies=False):
+    """Compare two runs; returns a list of per-group reports."""
+    reports = []
+    for group, old_path, new_path in corpus_pairs(old, new):
+        before = fingerprint_file(old_path, keep_bodies) if old_path else {}
+        after = fingerprint_file(new_path, keep_bodies) if new_path else {}
+        changed = [key for key in after if key in before and after[key][1] != before[key][1]]
+        reports.append({
+            "group": group,
+            "functions": len(after),
+            "unchanged": sum(1 for key in after if key in before and after[key][1] == before[key][1]),
+            "changed": changed,
+            "added": [key for key in after if key not in before],
+            "removed": [key for key in before if key not in after],
+            "moved": sum(1 for key in after if key in before and after[key][0] != before[key][0]),
+            "_before": before,
+            "_after": after,
+        })
+    return reports
+
+
+def print_report(reports, show_diff=False):
+    total_changed = 0
+    for report in reports:
+        before, after = report["_before"], report["_after"]
+        print("{:<16} {:>4} functions  {:>4} unchanged  {:>3} changed  {:>3} added  {:>3} removed  ({} moved RVA)".format(
+            report["group"], report["functions"], report["unchanged"], len(report["changed"]),
+            len(report["added"]), len(report["removed"]), report["moved"]))
+        for key in report["changed"]:
+            print("    ~ {}  0x{:X} -> 0x{:X}".format(key, before[key][0], after[key][0]))
+            if show_diff:
+                for line in difflib.unified_diff(before[key][2].split("\n"), after[key][2].split("\n"),
+                                                 "old", "new", lineterm="", n=2):
+                    print("      " + line)
+        for key in report["added"]:
+            print("    + {}  0x{:X}".format(key, after[key][0]))
+        for key in report["removed"]:
+            print("    - {}  0x{:X}".format(key, before[key][0]))
+        total_changed += len(report["changed"]) + len(report["added"]) + len(report["removed"])
+    print("")
+    print("{} function(s) differ".format(total_changed))
+    return total_changed
+
+
+def write_json(reports, path):
+    public = [dict((k, v) for k, v in report.items() if not k.startswith("_")) for report in reports]
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(public, indent=2, sort_keys=True))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report functions whose decompiled logic changed between two runs.")
+    parser.add_argument("old", help="earlier decompiled_*.c file or directory")
+    parser.add_argument("new", help="later decompiled_*.c file or directory")
+    parser.add_argument("--diff", action="store_true", help="print a unified diff of each changed (normalized) body")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    reports = compare(args.old, args.new, keep_bodies=args.diff)
+    differ = print_report(reports, args.diff)
+    if args.json:
+        write_json(reports, args.json)
+    return 1 if differ else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
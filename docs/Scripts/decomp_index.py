@@ -0,0 +1,287 @@
+# Inverted index and query CLI over the decompiled corpus
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# Every function body is tokenized into typed terms:
+#
+#   off:0x188       field offset of a dereference     *(longlong *)(lVar3 + 0x188)
+#   vcall:0x180     virtual call through a vtable slot (**(code **)(*plVar + 0x180))(...)
+#   call:FUN_x      direct call                        FUN_1802af540(...)
+#   sym:DAT_x       global referenced (DAT_/PTR_)      DAT_182279950
+#   const:0x2b      any other numeric literal          == 0x2b
+#   str:word        word from a string literal or from the Class$$Method name
+#
+# and stored per file as term -> [function index]. The index is cached in
+# decomp_index.json and refreshed incrementally: a file is only re-tokenized
+# when its content hash changes, so re-decompiling one group re-indexes that
+# group alone. decompiled_<group>.jsonl sidecars (one {"name", "rva", "code"}
+# record per line) are read instead of the .c file when present.
+#
+# Usage:
+#   python decomp_index.py build                        # (re)index changed files
+#   python decomp_index.py query off:0x188              # functions reading +0x188
+#   python decomp_index.py query call:FUN_1802af540     # callers
+#   python decomp_index.py query off:0x18 const:0x2b    # terms are ANDed
+#   python decomp_index.py query vcall:0x180 --show     # print matching lines
+#   python decomp_index.py terms off: --top 20          # most common terms of a kind
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+
+from decomp_corpus import SCRIPT_DIR, corpus_files, group_name, parse_file
+
+INDEX_PATH = os.path.join(SCRIPT_DIR, "decomp_index.json")
+INDEX_VERSION = 2
+
+_DEREF = re.compile(r"\*\([\w$ ]+ \*+\)\(")
+_OFFSET = re.compile(r"\+ (0x[0-9a-fA-F]+|\d+)$")
+_VCALL = re.compile(r"\(\*\*\(code \*\*\)\(\*\w+ \+ (0x[0-9a-fA-F]+|\d+)\)\)")
+_CALL = re.compile(r"\b([A-Za-z_][\w$]*)\(")
+_SYMBOL = re.compile(r"\b((?:DAT|PTR_\w+?)_[0-9a-fA-F]{8,})\b")
+_NUMBER = re.compile(r"(?<![\w$.])(0x[0-9a-fA-F]+|\d+)(?![\w.])")
+_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_WORD = re.compile(r"[A-Za-z][a-z0-9]*|[A-Z]+(?![a-z])|\d+")
+_NOT_CALLS = frozenset(["if", "while", "for", "switch", "return", "sizeof", "swi", "CONCAT44", "SUB84",
+                        "ZEXT816", "SEXT48"])
+
+
+def _hex(literal):
+    return "0x{:x}".format(int(literal, 0))
+
+
+def field_offsets(line):
+    """Offsets added last inside a dereference, *(T *)(base + N); loop bounds and index math are not."""
+    offsets = []
+    for match in _DEREF.finditer(line):
+        depth = 1
+        for end in range(match.end(), len(line)):
+            if line[end] == "(":
+                depth += 1
+            elif line[end] == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+        if depth:
+            continue
+        offset = _OFFSET.search(line[match.end():end])
+        if offset:
+            offsets.append(offset.group(1))
+    return offsets
+
+
+def tokenize(name, code):
+    """Set of typed terms for one function."""
+    terms = set()
+    for word in _WORD.findall(name.replace("$$", " ")):
+        terms.add("str:" + word.lower())
+    for line in code.split("\n"):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("/*"):
+            continue
+        for literal in _STRING.findall(line):
+            for word in _WORD.findall(literal):
+                terms.add("str:" + word.lower())
+        line = _STRING.sub('""', line)
+        for offset in _VCALL.findall(line):
+            terms.add("vcall:" + _hex(offset))
+        offsets = field_offsets(line)
+        for offset in offsets:
+            terms.add("off:" + _hex(offset))
+        for callee in _CALL.findall(line):
+            if callee not in _NOT_CALLS:
+                terms.add("call:" + callee)
+        for symbol in _SYMBOL.findall(line):
+            terms.add("sym:" + symbol)
+        for literal in _NUMBER.findall(_SYMBOL.sub("", line)):
+            if literal not in offsets:
+                terms.add("const:" + _hex(literal))
+    return terms
+
+
+def read_functions(path):
+    """[(name, rva, code)] from a decompiled_*.c file or its .jsonl sidecar."""
+    if path.endswith(".jsonl"):
+        functions = []
+        with io.open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    functions.append((record["name"], int(record["rva"]), record.get("code") or ""))
+        return functions
+    _, parsed = parse_file(path)
+    return [(func.name, func.rva, func.code) for func in parsed]
+
+
+def source_files(directory=SCRIPT_DIR):
+    """One source per group: the .jsonl sidecar when present, else the raw .c file."""
+    sources = dict((group_name(path), path) for path in corpus_files(directory))
+    for path in sorted(glob.glob(os.path.join(directory, "decompiled_*.jsonl"))):
+        sources[group_name(path)] = path
+    return sources
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_file(path):
+    """Index entry for one source: function table plus term -> [function index]."""
+    functions = read_functions(path)
+    postings = {}
+    for i, (name, _, code) in enumerate(functions):
+        for term in tokenize(name, code):
+            postings.setdefault(term, []).append(i)
+    return {
+        "source": os.path.basename(path),
+        "sha1": file_hash(path),
+        "functions": [[name, rva] for name, rva, _ in functions],
+        "postings": postings,
+    }
+
+
+def load_index(path=INDEX_PATH):
+    if not os.path.exists(path):
+        return {"version": INDEX_VERSION, "groups": {}}
+    with io.open(path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("version") != INDEX_VERSION:
+        return {"version": INDEX_VERSION, "groups": {}}
+    return index
+
+
+def save_index(index, path=INDEX_PATH):
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(index, separators=(",", ":"), sort_keys=True))
+
+
+def update_index(index, directory=SCRIPT_DIR, verbose=False):
+    """Re-index groups whose source changed; returns the list of groups touched."""
+    sources = source_files(directory)
+    touched = []
+    for group in list(index["groups"]):
+        if group not in sources:
+            del index["groups"][group]
+            touched.append(group)
+    for group, path in sorted(sources.items()):
+        entry = index["groups"].get(group)
+        if entry and entry["source"] == os.path.basename(path) and entry["sha1"] == file_hash(path):
+            continue
+        index["groups"][group] = index_file(path)
+        touched.append(group)
+        if verbose:
+            print("  indexed {:<16} {:>4} functions  {:>6} terms".format(
+                group, len(index["groups"][group]["functions"]), len(index["groups"][group]["postings"])))
+    return touched
+
+
+def query(index, terms):
+    """[(group, name, rva)] of functions containing every term."""
+    hits = []
+    for group, entry in sorted(index["groups"].items()):
+        matched = None
+        for term in terms:
+            ids = set(entry["postings"].get(term, ()))
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                break
+        for i in sorted(matched or ()):
+            name, rva = entry["functions"][i]
+            hits.append((group, name, rva))
+    return hits
+
+
+def term_counts(index, prefix):
+    """{term: function count} over the whole corpus for terms starting with prefix."""
+    counts = {}
+    for entry in index["groups"].values():
+        for term, ids in entry["postings"].items():
+            if term.startswith(prefix):
+                counts[term] = counts.get(term, 0) + len(ids)
+    return counts
+
+
+def matching_lines(path, name, terms):
+    """Lines of one function that carry any of the query terms."""
+    for func_name, _, code in read_functions(path):
+        if func_name != name:
+            continue
+        for line in code.split("\n"):
+            if tokenize("", line) & terms:
+                yield line.strip()
+        return
+
+
+def parse_term(text):
+    kind, _, value = text.partition(":")
+    if not value:
+        raise ValueError("term must be kind:value, e.g. off:0x188 (got {!r})".format(text))
+    if kind in ("off", "vcall", "const"):
+        value = _hex(value)
+    elif kind == "str":
+        value = value.lower()
+    return kind + ":" + value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inverted index over the decompiled_*.c corpus.")
+    parser.add_argument("--dir", default=SCRIPT_DIR, help="directory holding decompiled_*.c (default: script dir)")
+    parser.add_argument("--index", default=INDEX_PATH, help="index file (default: decomp_index.json)")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("build", help="index new or changed files")
+    query_parser = commands.add_parser("query", help="functions containing every given term")
+    query_parser.add_argument("terms", nargs="+", help="off:/vcall:/call:/sym:/const:/str: terms")
+    query_parser.add_argument("--show", action="store_true", help="print the matching lines of each hit")
+    query_parser.add_argument("--no-update", action="store_true", help="skip the freshness check")
+    terms_parser = commands.add_parser("terms", help="most common terms with a prefix")
+    terms_parser.add_argument("prefix", help="e.g. off: or call:FUN_1802")
+    terms_parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    index = load_index(args.index)
+    if args.command == "build" or not getattr(args, "no_update", False):
+        start = time.time()
+        if update_index(index, args.dir, verbose=args.command == "build"):
+            save_index(index, args.index)
+        if args.command == "build":
+            print("Index up to date ({} groups, {:.2f}s)".format(len(index["groups"]), time.time() - start))
+            return 0
+
+    if args.command == "terms":
+        counts = term_counts(index, args.prefix)
+        for term, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:args.top]:
+            print("{:>5}  {}".format(count, term))
+        return 0
+
+    try:
+        terms = [parse_term(text) for text in args.terms]
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.time()
+    hits = query(index, terms)
+    elapsed = time.time() - start
+    for group, name, rva in hits:
+        print("{:<16} 0x{:<8X} {}".format(group, rva, name))
+        if args.show:
+            path = os.path.join(args.dir, index["groups"][group]["source"])
+            for line in matching_lines(path, name, set(terms)):
+                print("        " + line)
+    print("{} function(s) ({:.1f} ms)".format(len(hits), elapsed * 1000))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# MinHash / LSH similarity index over the decompiled corpus
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# The UI ships parallel KeyInput_* and Touch_* controllers whose methods do the
+# same thing with different RVAs and field offsets (StatusDetailsController:
+# skillLevelContentList 0x80 vs 0x78, targetData 0x48 vs 0x30). To pair them
+# - or any other sibling functions - each body is:
+#
+#   1. normalized with decomp_diff.normalize (FUN_/LAB_/DAT_/locals renumbered)
+#   2. tokenized, with numeric literals masked to "#" and the KeyInput_/Touch_
+#      prefixes dropped from identifiers, so offsets and variant names do not
+#      count as differences
+#   3. cut into SHINGLE_SIZE-token shingles and MinHashed (NUM_HASHES values)
+#
+# Signatures are split into LSH bands; functions sharing a band bucket are
+# candidates and are ranked by estimated Jaccard similarity, so a lookup only
+# touches its own buckets. For each match the offset divergence is reported:
+# literals at aligned positions that differ between the two bodies.
+#
+# Signatures are cached in decomp_similarity.json and refreshed per group when
+# its source (decompiled_<group>.c or .jsonl) changes, like decomp_index.py.
+#
+# Usage:
+#   python decomp_similarity.py build
+#   python decomp_similarity.py similar KeyInput_StatusDetailsController$$UpdateView [--top 5]
+#   python decomp_similarity.py pairs --between KeyInput_ Touch_          # variant pairs + offset changes
+#   python decomp_similarity.py pairs --threshold 0.8                     # every near-duplicate pair
+
+import argparse
+import difflib
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+import zlib
+
+from decomp_corpus import SCRIPT_DIR
+from decomp_diff import normalize
+from decomp_index import file_hash, read_functions, source_files
+
+SIMILARITY_PATH = os.path.join(SCRIPT_DIR, "decomp_similarity.json")
+SIMILARITY_VERSION = 1
+
+SHINGLE_SIZE = 5
+NUM_HASHES = 128
+BANDS = 32                  # 32 bands x 4 rows: pairs above ~0.42 Jaccard are likely candidates
+DEFAULT_THRESHOLD = 0.5
+VARIANT_PREFIXES = ("KeyInput_", "Touch_")
+
+_MERSENNE = (1 << 61) - 1
+_random = random.Random(0x46463252)   # fixed seed: signatures stay comparable across runs
+_HASH_PARAMS = [(_random.randrange(1, _MERSENNE), _random.randrange(0, _MERSENNE)) for _ in range(NUM_HASHES)]
+
+_TOKEN = re.compile(r"0x[0-9a-fA-F]+|\d+|[A-Za-z_][\w$]*|->|[^\s\w]")
+_NUMBER = re.compile(r"^(?:0x[0-9a-fA-F]+|\d+)$")
+_VARIANT = re.compile(r"\b(?:" + "|".join(VARIANT_PREFIXES) + r")")
+
+
+def tokens(code):
+    """Normalized body as a token list (literals kept)."""
+    return _TOKEN.findall(normalize(code))
+
+
+def mask(token):
+    if _NUMBER.match(token):
+        return "#"
+    return _VARIANT.sub("", token)
+
+
+def shingles(masked):
+    if len(masked) < SHINGLE_SIZE:
+        return set([" ".join(masked)]) if masked else set()
+    return set(" ".join(masked[i:i + SHINGLE_SIZE]) for i in range(len(masked) - SHINGLE_SIZE + 1))
+
+
+def minhash(shingle_set):
+    """NUM_HASHES minimum hash values of the shingle set (empty list for an empty body)."""
+    if not shingle_set:
+        return []
+    values = [zlib.crc32(s.encode("utf-8")) & 0xffffffff for s in shingle_set]
+    return [min((a * x + b) % _MERSENNE for x in values) for a, b in _HASH_PARAMS]
+
+
+def estimate(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / float(NUM_HASHES)
+
+
+def band_keys(signature):
+    rows = NUM_HASHES // BANDS
+    return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(BANDS)]
+
+
+def offset_divergence(code_a, code_b):
+    """[(literal in a, literal in b, count)] at positions the two bodies align on."""
+    tokens_a = tokens(code_a)
+    tokens_b = tokens(code_b)
+    matcher = difflib.SequenceMatcher(None, [mask(t) for t in tokens_a], [mask(t) for t in tokens_b],
+                                      autojunk=False)
+    counts = {}
+    order = []
+    for i, j, size in matcher.get_matching_blocks():
+        for k in range(size):
+            a, b = tokens_a[i + k], tokens_b[j + k]
+            if _NUMBER.match(a) and int(a, 0) != int(b, 0):
+                key = ("0x{:x}".format(int(a, 0)), "0x{:x}".format(int(b, 0)))
+                if key not in counts:
+                    order.append(key)
+                counts[key] = counts.get(key, 0) + 1
+    return [(a, b, counts[(a, b)]) for a, b in order]
+
+
+# -- cached signatures -----------------------------------------------------------
+
+def signature_file(path):
+    """Cache entry for one source: [name, rva, signature] per function."""
+    return {
+        "source": os.path.basename(path),
+        "sha1": file_hash(path),
+        "functions": [[name, rva, minhash(shingles([mask(t) for t in tokens(code)]))]
+                      for name, rva, code in read_functions(path)],
+    }
+
+
+def load_signatures(path=SIMILARITY_PATH):
+    if not os.path.exists(path):
+        return {"version": SIMILARITY_VERSION, "groups": {}}
+    with io.open(path, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    if cache.get("version") != SIMILARITY_VERSION:
+        return {"version": SIMILARITY_VERSION, "groups": {}}
+    return cache
+
+
+def save_signatures(cache, path=SIMILARITY_PATH):
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(u"%s" % json.dumps(cache, separators=(",", ":"), sort_keys=True))
+
+
+def update_signatures(cache, directory=SCRIPT_DIR, verbose=False):
+    """Re-hash groups whose source changed; returns the list of groups touched."""
+    sources = source_files(directory)
+    touched = []
+    for group in list(cache["groups"]):
+        if group not in sources:
+            del cache["groups"][group]
+            touched.append(group)
+    for group, path in sorted(sources.items()):
+        entry = cache["groups"].get(group)
+        if entry and entry["source"] == os.path.basename(path) and entry["sha1"] == file_hash(path):
+            continue
+        cache["groups"][group] = signature_file(path)
+        touched.append(group)
+        if verbose:
+            print("  hashed {:<16} {:>4} functions".format(group, len(cache["groups"][group]["functions"])))
+    return touched
+
+
+class SimilarityIndex(object):
+    """LSH buckets over every cached signature."""
+
+    def __init__(self, cache):
+        self.entries = []       # (group, name, rva, signature)
+        self.buckets = {}
+        for group, entry in sorted(cache["groups"].items()):
+            for name, rva, signature in entry["functions"]:
+                self.entries.append((group, name, rva, signature))
+        for i, (_, _, _, signature) in enumerate(self.entries):
+            if signature:
+                for key in band_keys(signature):
+                    self.buckets.setdefault(key, []).append(i)
+
+    def find(self, name):
+        return [i for i, entry in enumerate(self.entries) if entry[1] == name]
+
+    def candidates(self, i):
+        found = set()
+        signature = self.entries[i][3]
+        if signature:
+            for key in band_keys(signature):
+                found.update(self.buckets.get(key, ()))
+        found.discard(i)
+        return found
+
+    def similar(self, i, threshold=0.0, top=None):
+        """[(score, j)] best first, from LSH candidates only."""
+        signature = self.entries[i][3]
+        scored = [(estimate(signature, self.entries[j][3]), j) for j in self.candidates(i)]
+        scored = [item for item in scored if item[0] >= threshold]
+        scored.sort(key=lambda item: (-item[0], self.entries[item[1]][1], item[1]))
+        return scored[:top] if top else scored
+
+    def pairs(self, threshold=DEFAULT_THRESHOLD, between=None):
+        """[(score, i, j)] for candidate pairs at or above threshold (i < j).
+
+        With between=(a, b), only pairs where one name starts with a and the other
+        with b are kept, and each a-function is paired with its best b-match.
+        """
+        found = {}
+        for i in range(len(self.entries)):
+            for score, j in self.similar(i, threshold):
+                if between:
+                    if not (self.entries[i][1].startswith(between[0]) and
+                            self.entries[j][1].startswith(between[1])):
+                        continue
+                    best = found.get(i)
+                    if best is None or score > best[0]:
+                        found[i] = (score, i, j)
+                elif i < j:
+                    found[(i, j)] = (score, i, j)
+        return sorted(found.values(), key=lambda item: (-item[0], self.entries[item[1]][1]))
+
+
+def function_code(sources, group, name, rva):
+    for func_name, func_rva, code in read_functions(sources[group]):
+        if func_name == name and func_rva == rva:
+            return code
+    return ""
+
+
+def format_divergence(divergence, limit=8):
+    if not divergence:
+        return "same literals"
+    parts = ["{} -> {}{}".format(a, b, " (x{})".format(n) if n > 1 else "") for a, b, n in divergence[:limit]]
+    if len(divergence) > limit:
+        parts.append("... {} more".format(len(divergence) - limit))
+    return ", ".join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MinHash/LSH similarity over the decompiled_*.c corpus.")
+    parser.add_argument("--dir", default=SCRIPT_DIR, help="directory holding decompiled_*.c (default: script dir)")
+    parser.add_argument("--cache", default=SIMILARITY_PATH, help="signature cache (default: decomp_similarity.json)")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("build", help="hash new or changed files")
+    similar_parser = commands.add_parser("similar", help="nearest siblings of one function")
+    similar_parser.add_argument("name", help="Class$$Method")
+    similar_parser.add_argument("--top", type=int, default=5)
+    similar_parser.add_argument("--threshold", type=float, default=0.0)
+    pairs_parser = commands.add_parser("pairs", help="similar pairs across the corpus")
+    pairs_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    pairs_parser.add_argument("--between", nargs=2, metavar=("PREFIX_A", "PREFIX_B"),
+                              help="pair PREFIX_A functions with their best PREFIX_B match, e.g. KeyInput_ Touch_")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    start = time.time()
+    cache = load_signatures(args.cache)
+    if update_signatures(cache, args.dir, verbose=args.command == "build"):
+        save_signatures(cache, args.cache)
+    if args.command == "build":
+        count = sum(len(entry["functions"]) for entry in cache["groups"].values())
+        print("Signatures up to date ({} functions, {:.2f}s)".format(count, time.time() - start))
+        return 0
+
+    index = SimilarityIndex(cache)
+    sources = source_files(args.dir)
+
+    def describe(i):
+        group, name, rva, _ = index.entries[i]
+        return group, name, rva, function_code(sources, group, name, rva)
+
+    if args.command == "similar":
+        matches = index.find(args.name)
+        if not matches:
+            print("Function not found: " + args.name)
+            return 1
+        for i in matches:
+            group, name, rva, code = describe(i)
+            print("{} (0x{:X}, {})".format(name, rva, group))
+            results = index.similar(i, args.threshold, args.top)
+            if not results:
+                print("  no candidates")
+            for score, j in results:
+                other_group, other_name, other_rva, other_code = describe(j)
+                print("  {:.2f}  0x{:<8X} {:<16} {}".format(score, other_rva, other_group, other_name))
+                print("        " + format_divergence(offset_divergence(code, other_code)))
+        return 0
+
+    for score, i, j in index.pairs(args.threshold, args.between):
+        _, name, rva, code = describe(i)
+        _, other_name, other_rva, other_code = describe(j)
+        print("{:.2f}  {} (0x{:X})  ~  {} (0x{:X})".format(score, name, rva, other_name, other_rva))
+        print("      " + format_divergence(offset_divergence(code, other_code)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# Ghidra headless script that runs decompile manifests over several builds in one session
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Uses decompile_engine.py (run_manifest with a SharedSession)
+#
+# Each run_ghidra_analysis.bat call pays the JVM and analyzer start-up for one
+# program and one output. This script takes a batch file listing builds (game
+# versions or other Pixel Remaster titles), each with its own script.json,
+# il2cpp_ghidra.h and manifests, and processes them all in one headless session:
+#
+#   - one decompiler process, re-pointed at each program (closeProgram/openProgram)
+#   - each distinct header is parsed once and copied into every program using it
+#   - each distinct script.json is loaded once
+#
+# Batch file (JSON):
+#   {"output_dir": "D:\\...\\batch",                          default for builds
+#    "builds": [
+#      {"title": "FF2",
+#       "program": "/GameAssembly.dll",                       project path; default: the -process program
+#       "binary": "D:\\...\\GameAssembly.dll",                imported and analyzed if "program" is missing
+#       "script_json": "D:\\...\\script.json",
+#       "header": "D:\\...\\il2cpp_ghidra.h",
+#       "manifests": ["manifests\\magic.json", ...],          decompile_engine.Manifest JSON files
+#       "groups": ["status_ui", ...],                         and/or every function of decompiled_<group>.c
+#       "resolve_names": true,                                 re-resolve target RVAs by name via script_json
+#       "output_dir": "D:\\...\\batch\\FF2"}]}                  default: <output_dir>/<title>
+#
+# resolve_names lets FF2 manifests run against FF1/FF3 builds, where the same
+# Class$$Method lives at another RVA. Outputs per build are the usual
+# decompiled_<group>.c/.jsonl/.timings.json; batch_summary.json in output_dir
+# lists every build and manifest with success/failure counts and times.
+#
+# decompile_batch.example.json is a starting point.
+#
+# Usage (run_ghidra_analysis.bat batch analyze):
+#   -postScript decompile_batch.py [batch.json]    # default: decompile_batch.json next to this script
+
+from decomp_corpus import SCRIPT_DIR, parse_file
+from decompile_engine import Manifest, SharedSession, run_manifest, write_text
+from il2cpp_program import IL2CPP_HEADER_PATH, SCRIPT_JSON_PATH
+from ghidra.util.task import ConsoleTaskMonitor
+from java.io import File
+from java.lang import Object
+import codecs
+import json
+import os
+import time
+
+DEFAULT_BATCH_PATH = os.path.join(SCRIPT_DIR, "decompile_batch.json")
+
+
+def corpus_manifest(group):
+    """Manifest listing every function already in decompiled_<group>.c."""
+    lines, functions = parse_file(os.path.join(SCRIPT_DIR, "decompiled_" + group + ".c"))
+    title = lines[1].split(" - ", 1)[1].strip() if len(lines) > 1 and " - " in lines[1] else group
+    return Manifest(group, "FF2 Batch Decompiler - " + group, title, "Batch decompile (decompile_batch.py)", [],
+                    dict((f.rva, f.name) for f in functions), "decompiled_" + group + ".c")
+
+
+def build_manifests(build, base_dir):
+    """[(source, Manifest)] for the build's manifest files and corpus groups."""
+    manifests = []
+    for manifest_path in build.get("manifests", []):
+        if not os.path.isabs(manifest_path):
+            manifest_path = os.path.join(base_dir, manifest_path)
+        manifests.append((manifest_path, Manifest.load(manifest_path)))
+    for group in build.get("groups", []):
+        manifests.append(("decompiled_" + group + ".c", corpus_manifest(group)))
+    return manifests
+
+
+def resolve_targets(manifest, data):
+    """Re-map manifest targets to this build's RVAs by name; returns the names not found."""
+    rvas_by_name = {}
+    for method in (data or {}).get("ScriptMethod", []):
+        if method.get("Address") and method.get("Name"):
+            rvas_by_name.setdefault(method["Name"], []).append(method["Address"])
+    targets = {}
+    missing = []
+    for name in sorted(set(manifest.targets.values())):
+        rvas = rvas_by_name.get(name)
+        if not rvas:
+            missing.append(name)
+            continue
+        for rva in rvas:
+            targets[rva] = name
+    manifest.targets = targets
+    return missing
+
+
+def open_program(build, consumer, monitor):
+    """(program, domain file, release function) for one build entry.
+
+    The current (-process) program is used as is: no domain file, no release.
+    """
+    project_path = build.get("program")
+    current = getCurrentProgram()
+    if not project_path and not build.get("binary"):
+        return current, None, None
+    if project_path and current is not None and current.getDomainFile().getPathname() == project_path:
+        return current, None, None
+
+    project_data = getState().getProject().getProjectData()
+    domain_file = project_data.getFile(project_path) if project_path else None
+    if domain_file is not None:
+        print("Opening " + project_path)
+        program = domain_file.getDomainObject(consumer, True, False, monitor)
+        return program, domain_file, lambda: program.release(consumer)
+
+    binary = build.get("binary")
+    if not binary or not os.path.exists(binary):
+        raise IOError("program {} not in project and no binary to import".format(project_path))
+    print("Importing and analyzing " + binary + " (one-time, may take a while)...")
+    program = importFile(File(binary))
+    analyzeAll(program)
+    folder = project_data.getRootFolder()
+    name = build.get("title", "build") + "_" + os.path.basename(binary)
+    domain_file = folder.createFile(name, program, monitor)
+    print("Saved to project as /" + name)
+    # importFile opened it for the script itself, so the script has to close it
+    return program, domain_file, lambda: closeProgram(program)
+
+
+def run_build(build, defaults, session, consumer, monitor):
+    """Run every manifest of one build; returns its summary entry."""
+    title = build.get("title", "build")
+    output_dir = build.get("output_dir") or os.path.join(defaults["output_dir"], title)
+    script_json_path = build.get("script_json", SCRIPT_JSON_PATH)
+    header_path = build.get("header", IL2CPP_HEADER_PATH)
+    entry = {"title": title, "output_dir": output_dir, "manifests": [], "error": None}
+    started = time.time()
+    program, domain_file, release = open_program(build, consumer, monitor)
+    if program is None:
+        raise IOError("no program for build " + title)
+    entry["program"] = "%s" % program.getName()
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    transaction = program.startTransaction("FF2 batch decompile")
+    try:
+        for source, manifest in build_manifests(build, defaults["base_dir"]):
+            manifest.output_path = os.path.join(output_dir, os.path.basename(manifest.output_path))
+            missing = []
+            if build.get("resolve_names"):
+                missing = resolve_targets(manifest, session.load_script_json(script_json_path))
+                if missing:
+                    print("{} targets not found in {} script.json: {}".format(
+                        len(missing), title, ", ".join(missing[:10])))
+            summary = run_manifest(program, manifest, script_json_path, header_path, session)
+            summary["manifest"] = source
+            summary["unresolved"] = missing
+            entry["manifests"].append(summary)
+    finally:
+        program.endTransaction(transaction, True)
+        if release is not None:
+            if program.isChanged() and domain_file.canSave():
+                domain_file.save(monitor)
+            release()
+    entry["seconds"] = time.time() - started
+    return entry
+
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Batch Decompiler")
+    print("=" * 70)
+
+    args = getScriptArgs()
+    batch_path = "%s" % args[0] if args else DEFAULT_BATCH_PATH
+    if not os.path.exists(batch_path):
+        print("ERROR: batch file not found: " + batch_path)
+        return
+    with codecs.open(batch_path, 'r', 'utf-8') as f:
+        batch = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(batch_path))
+    defaults = {"base_dir": base_dir, "output_dir": batch.get("output_dir") or os.path.join(base_dir, "batch")}
+    builds = batch.get("builds", [])
+    print("Batch: " + batch_path)
+    print("Builds: " + ", ".join(b.get("title", "?") for b in builds))
+    print("")
+
+    session = SharedSession()
+    consumer = Object()
+    monitor = ConsoleTaskMonitor()
+    started = time.time()
+    entries = []
+    try:
+        for build in builds:
+            try:
+                entries.append(run_build(build, defaults, session, consumer, monitor))
+            except Exception as e:
+                print("ERROR in build {}: {}".format(build.get("title", "?"), e))
+                entries.append({"title": build.get("title", "?"), "error": str(e), "manifests": []})
+    finally:
+        session.dispose()
+
+    summary = {"batch": batch_path, "seconds": time.time() - started, "builds": entries}
+    if not os.path.isdir(defaults["output_dir"]):
+        os.makedirs(defaults["output_dir"])
+    summary_path = os.path.join(defaults["output_dir"], "batch_summary.json")
+    write_text(summary_path, json.dumps(summary, indent=2, sort_keys=True))
+
+    print("")
+    print("=" * 70)
+    print("Batch summary ({:.0f}s total)".format(summary["seconds"]))
+    for entry in entries:
+        if entry.get("error"):
+            print("  {:<10} ERROR: {}".format(entry["title"], entry["error"]))
+            continue
+        for result in entry["manifests"]:
+            print("  {:<10} {:<16} {:>4} ok {:>4} failed {:>4} unresolved {:>7.1f}s".format(
+                entry["title"], result["group"], result["success"], result["failed"],
+                len(result["unresolved"]), result["seconds"]))
+    print("  Summary: " + summary_path)
+    print("=" * 70)
+
+# Run the script
+run()
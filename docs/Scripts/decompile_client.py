@@ -0,0 +1,109 @@
+"""Command-line client for decompile_server.py.
+
+Runs under regular CPython 3 (not inside Ghidra). Sends one request per
+invocation to the server started with "run_ghidra_analysis.bat server analyze".
+
+Usage:
+    python decompile_client.py ping
+    python decompile_client.py decompile BattleUtility$$GetSkillLevel
+    python decompile_client.py decompile 0x913900 -o out.c
+    python decompile_client.py xref 0x382120
+    python decompile_client.py lookup GetSkillLevel
+    python decompile_client.py shutdown
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+DEFAULT_PORT = 18733
+
+
+def request(payload, port=DEFAULT_PORT, timeout=300):
+    """Send one JSON request and return the decoded reply."""
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        reader = sock.makefile("r", encoding="utf-8")
+        line = reader.readline()
+    if not line:
+        raise ConnectionError("server closed the connection without replying")
+    return json.loads(line)
+
+
+def target(value):
+    """0x... is an RVA, anything else a Class$$Method name."""
+    return {"rva": value} if value.lower().startswith("0x") else {"name": value}
+
+
+def print_function_list(title, entries):
+    print("{} ({}):".format(title, len(entries)))
+    for entry in entries:
+        suffix = "  from " + entry["from"] if "from" in entry else ""
+        print("  {:<10} {}{}".format(entry["rva"], entry.get("name") or "?", suffix))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query a running decompile_server.py.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--json", action="store_true", help="print the raw JSON reply")
+    commands = parser.add_subparsers(dest="cmd")
+    commands.add_parser("ping")
+    commands.add_parser("shutdown")
+    decompile = commands.add_parser("decompile")
+    decompile.add_argument("function", help="Class$$Method or 0xRVA")
+    decompile.add_argument("-o", "--output", help="write the C to a file instead of stdout")
+    xref = commands.add_parser("xref")
+    xref.add_argument("function", help="Class$$Method or 0xRVA")
+    lookup = commands.add_parser("lookup")
+    lookup.add_argument("query", help="name substring or 0xRVA")
+    lookup.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+    if args.cmd is None:
+        parser.print_help()
+        return 1
+
+    payload = {"cmd": args.cmd}
+    if args.cmd in ("decompile", "xref"):
+        payload.update(target(args.function))
+    elif args.cmd == "lookup":
+        payload.update({"query": args.query, "limit": args.limit})
+
+    try:
+        reply = request(payload, args.port)
+    except OSError as e:
+        print("ERROR: cannot reach decompile server on port {}: {}".format(args.port, e), file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(reply, indent=2))
+        return 0 if reply.get("ok") else 1
+    if not reply.get("ok"):
+        print("ERROR: " + reply.get("error", "unknown error"), file=sys.stderr)
+        return 1
+
+    if args.cmd == "decompile":
+        header = "/* {}\n * RVA: {}\n * Address: {}\n */\n".format(reply["name"], reply["rva"], reply["address"])
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(header + reply["code"])
+            print("Wrote {} ({}s)".format(args.output, reply["seconds"]))
+        else:
+            print(header + reply["code"])
+    elif args.cmd == "xref":
+        print("{} {}".format(reply["rva"], reply.get("name") or ""))
+        print_function_list("Callers", reply["callers"])
+        print_function_list("Callees", reply["callees"])
+        if reply["references"]:
+            print_function_list("Data references", reply["references"])
+    elif args.cmd == "lookup":
+        for match in reply["matches"]:
+            print("{:<10} {}".format(match["rva"], match["name"]))
+        if reply.get("total", 0) > len(reply["matches"]):
+            print("... {} more".format(reply["total"] - len(reply["matches"])))
+    elif args.cmd == "ping":
+        print("{} ({} methods indexed)".format(reply["program"], reply["functions"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+# Shared decompile pipeline for the decompile_*.py headless scripts
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Imported by the decompile scripts (script directory is on sys.path)
+#
+# A Manifest is everything that differs between the decompile scripts: the
+# target RVA -> name table, the output file and the header text. run_manifest()
+# does the rest - header types, script.json symbols, decompilation - and writes:
+#
+#   decompiled_<group>.c              - same layout as before (decomp_corpus.py reads it)
+#   decompiled_<group>.jsonl          - one {"name", "rva", "address", "code", "failed", "hash"}
+#                                       record per function; "hash" is the decomp_diff.py
+#                                       normalized body hash, so diffs and the index skip
+#                                       re-parsing the .c file
+#   decompiled_<group>.timings.json   - per-phase wall time and the runtime used, which
+#                                       benchmark_runtimes.py compares across runtimes
+#   decompiled_<group>.ir/<rva>_<hash>.json - the HighFunction as serialized p-code (pcode_ir.py),
+#                                       only re-exported when the body hash or RVA changes
+#
+# Manifests can also be stored as JSON (Manifest.save/load) so decompile_manifest.py
+# can run the same target list under either runtime. decompile_batch.py passes a
+# SharedSession so one decompiler process, script.json load and parsed header
+# serve every manifest and program in the session.
+
+from ghidra.app.decompiler import DecompInterface
+from ghidra.util.task import ConsoleTaskMonitor
+from decomp_diff import body_hash, normalize
+from il2cpp_program import (IL2CPP_HEADER_PATH, SCRIPT_JSON_PATH, apply_header_archive, apply_il2cpp_symbols,
+                            create_missing_functions, ensure_il2cpp_types, get_or_create_function, header_types_present,
+                            load_script_json, parse_header_archive, runtime_name)
+from pcode_ir import IRCache, export_high_function
+import codecs
+import json
+import os
+import time
+
+DECOMPILE_TIMEOUT_SECONDS = 120
+
+
+class Manifest(object):
+    """Target list and header text for one decompiled_<group>.c file."""
+
+    def __init__(self, group, banner, title, purpose, notes, targets, output_path):
+        self.group = group
+        self.banner = banner
+        self.title = title
+        self.purpose = purpose
+        self.notes = list(notes)
+        self.targets = dict(targets)
+        self.output_path = output_path
+
+    def to_dict(self):
+        return {
+            "group": self.group,
+            "banner": self.banner,
+            "title": self.title,
+            "purpose": self.purpose,
+            "notes": self.notes,
+            "targets": dict(("0x{:X}".format(rva), name) for rva, name in self.targets.items()),
+            "output_path": self.output_path,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        targets = dict((int(rva, 16), name) for rva, name in data["targets"].items())
+        return cls(data["group"], data.get("banner", "FF2 Decompiler"), data.get("title", data["group"]),
+                   data.get("purpose", ""), data.get("notes", []), targets, data["output_path"])
+
+    def save(self, path):
+        with codecs.open(path, 'w', 'utf-8') as f:
+            f.write(json.dumps(self.to_dict(), indent=2, sort_keys=True))
+
+    @classmethod
+    def load(cls, path):
+        with codecs.open(path, 'r', 'utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class SharedSession(object):
+    """Decompiler process, script.json data and parsed headers reused across run_manifest calls."""
+
+    def __init__(self):
+        self.decompiler = None
+        self.script_data = {}
+        self.header_archives = {}
+
+    def load_script_json(self, path):
+        if path not in self.script_data:
+            self.script_data[path] = load_script_json(path)
+        return self.script_data[path]
+
+    def ensure_types(self, program, header_path):
+        """Apply the header to program, parsing it only once per session."""
+        if header_types_present(program):
+            print("IL2CPP types already present in program - skipping header parse")
+            return True
+        if header_path not in self.header_archives:
+            self.header_archives[header_path] = parse_header_archive(header_path)
+        archive = self.header_archives[header_path]
+        return archive is not None and apply_header_archive(program, archive)
+
+    def open_decompiler(self, program):
+        if self.decompiler is None:
+            self.decompiler = DecompInterface()
+        self.decompiler.openProgram(program)
+        return self.decompiler
+
+    def close_decompiler(self):
+        # Keeps the decompiler process alive for the next program
+        if self.decompiler is not None:
+            self.decompiler.closeProgram()
+
+    def dispose(self):
+        if self.decompiler is not None:
+            self.decompiler.dispose()
+            self.decompiler = None
+        for archive in self.header_archives.values():
+            if archive is not None:
+                archive.close()
+        self.header_archives = {}
+        self.script_data = {}
+
+
+class PhaseTimer(object):
+    """Records wall time per named phase."""
+
+    def __init__(self):
+        self.phases = []
+        self.started = time.time()
+        self.current = None
+
+    def start(self, name):
+        self.stop()
+        self.current = (name, time.time())
+
+    def stop(self):
+        if self.current is not None:
+            name, started = self.current
+            self.phases.append((name, time.time() - started))
+            self.current = None
+
+    def total(self):
+        return time.time() - self.started
+
+
+def decompile_function(decompiler, program, rva, name):
+    """Decompile function at given RVA and return (C code, error, HighFunction)."""
+    abs_addr = program.getImageBase().getOffset() + rva
+    try:
+        func = get_or_create_function(program, rva, name)
+        if func is None:
+            return None, "Could not create function at 0x{:X}".format(abs_addr), None
+
+        results = decompiler.decompileFunction(func, DECOMPILE_TIMEOUT_SECONDS, ConsoleTaskMonitor())
+        if results.decompileCompleted():
+            decomp_func = results.getDecompiledFunction()
+            if decomp_func:
+                return "%s" % decomp_func.getC(), None, results.getHighFunction()
+            return None, "Decompilation returned no result", None
+        error_msg = results.getErrorMessage()
+        if error_msg:
+            return None, "Decompilation failed: " + str(error_msg), None
+        return None, "Decompilation failed (unknown error)", None
+    except Exception as e:
+        return None, "Exception: " + str(e), None
+
+
+def header_lines(manifest, program, types_parsed):
+    lines = ["/*",
+             " * FF2 Decompiled Functions - " + manifest.title,
+             " * Generated by Ghidra headless analysis",
+             " * Program: " + program.getName(),
+             " * Image Base: 0x{:X}".format(program.getImageBase().getOffset()),
+             " * IL2CPP types applied: " + str(types_parsed),
+             " *",
+             " * Purpose: " + manifest.purpose,
+             " *"]
+    lines.extend(" * " + note if note else " *" for note in manifest.notes)
+    lines.extend([" */", ""])
+    return lines
+
+
+def write_text(path, text):
+    try:
+        with codecs.open(path, 'w', 'utf-8') as f:
+            f.write(text)
+        return True
+    except Exception as e:
+        print("ERROR writing output file: " + str(e))
+        try:
+            with open(path, 'w') as f:
+                f.write(text)
+            print("Output written (fallback mode): " + path)
+            return True
+        except Exception as e2:
+            print("FALLBACK ALSO FAILED: " + str(e2))
+            return False
+
+
+def run_manifest(program, manifest, script_json_path=SCRIPT_JSON_PATH, header_path=IL2CPP_HEADER_PATH, session=None):
+    """Decompile every target in manifest and write the .c, .jsonl and .timings.json outputs.
+
+    Returns a summary dict (written, functions, success, failed, seconds), or None
+    without a program.
+    """
+    print("=" * 70)
+    print(manifest.banner)
+    print("=" * 70)
+
+    if program is None:
+        print("ERROR: No program loaded!")
+        return None
+
+    timer = PhaseTimer()
+    image_base = program.getImageBase().getOffset()
+    print("Program: " + program.getName())
+    print("Image Base: 0x{:X}".format(image_base))
+    print("Runtime: " + runtime_name())
+    print("Output: " + manifest.output_path)
+    print("")
+
+    # Step 1: Parse IL2CPP header for type information
+    print("-" * 70)
+    print("STEP 1: Parsing IL2CPP type definitions")
+    print("-" * 70)
+    timer.start("types")
+    if session is not None:
+        types_parsed = session.ensure_types(program, header_path)
+    else:
+        types_parsed = ensure_il2cpp_types(program, header_path)
+    if types_parsed:
+        print("Type parsing completed successfully")
+    else:
+        print("Type parsing failed or skipped - decompilation will use generic types")
+    print("")
+
+    # Step 2: Apply symbol names from script.json
+    print("-" * 70)
+    print("STEP 2: Applying IL2CPP symbol names")
+    print("-" * 70)
+    timer.start("script_json")
+    data = session.load_script_json(script_json_path) if session is not None else load_script_json(script_json_path)
+    timer.start("symbols")
+    apply_il2cpp_symbols(program, data, manifest.targets.values())
+    data = None
+    print("")
+
+    # Step 3: Create missing target functions in one batch (one scoped analysis pass)
+    print("-" * 70)
+    print("STEP 3: Creating missing target functions")
+    print("-" * 70)
+    timer.start("functions")
+    created = create_missing_functions(program, manifest.targets)
+    print("Created " + str(created) + " functions")
+    print("")
+
+    # Step 4: Decompile target functions
+    print("-" * 70)
+    print("STEP 4: Decompiling target functions")
+    print("-" * 70)
+    print("Initializing decompiler...")
+    timer.start("decompile")
+    if session is not None:
+        decompiler = session.open_decompiler(program)
+    else:
+        decompiler = DecompInterface()
+        decompiler.openProgram(program)
+
+    results = header_lines(manifest, program, types_parsed)
+    records = []
+    success_count = 0
+    fail_count = 0
+    ir_cache = IRCache(manifest.output_path)
+    ir_exported = 0
+    ir_cached = 0
+    ir_seconds = 0.0
+
+    # Group functions by class for better organization
+    current_class = ""
+    try:
+        for rva, name in sorted(manifest.targets.items(), key=lambda x: x[1]):
+            abs_addr = image_base + rva
+
+            class_name = name.split("$$")[0] if "$$" in name else "Unknown"
+            if class_name != current_class:
+                current_class = class_name
+                results.append("")
+                results.append("/" + "=" * 68 + "/")
+                results.append("/* " + class_name)
+                results.append(" " + "=" * 67 + "/")
+
+            print("")
+            print("Decompiling: " + name)
+            print("  RVA: 0x{:X} -> Absolute: 0x{:X}".format(rva, abs_addr))
+
+            code, error, high = decompile_function(decompiler, program, rva, name)
+
+            results.append("")
+            results.append("/" + "*" * 68 + "/")
+            results.append("/* " + name)
+            results.append(" * RVA: 0x{:X}".format(rva))
+            results.append(" * Address: 0x{:X}".format(abs_addr))
+            results.append(" " + "*" * 67 + "/")
+            results.append("")
+
+            if code:
+                results.append(code)
+                print("  SUCCESS")
+                success_count += 1
+            else:
+                code = "/* DECOMPILATION FAILED: " + str(error) + " */"
+                results.append(code)
+                print("  FAILED: " + str(error))
+                fail_count += 1
+            digest = body_hash(normalize(code))
+            records.append({"name": name, "rva": rva, "address": abs_addr, "code": code,
+                            "failed": error is not None, "hash": digest})
+
+            # The HighFunction only lives until the next decompile, so export the IR now
+            if high is not None and not ir_cache.is_current(digest, rva):
+                started = time.time()
+                try:
+                    ir_cache.save(export_high_function(program, high, name, rva, digest))
+                    ir_exported += 1
+                except Exception as e:
+                    print("  IR export failed: " + str(e))
+                ir_seconds += time.time() - started
+            elif high is not None:
+                ir_cached += 1
+    finally:
+        if session is not None:
+            session.close_decompiler()
+        else:
+            decompiler.dispose()
+
+    # Write output
+    timer.start("write")
+    print("")
+    print("=" * 70)
+    base = os.path.splitext(manifest.output_path)[0]
+    written = write_text(manifest.output_path, '\n'.join(results))
+    write_text(base + ".jsonl", "".join(json.dumps(r, sort_keys=True) + "\n" for r in records))
+    timer.stop()
+    write_text(base + ".timings.json", json.dumps({
+        "runtime": runtime_name(),
+        "group": manifest.group,
+        "functions": len(records),
+        "phases": dict(timer.phases),
+        "total": timer.total(),
+    }, indent=2, sort_keys=True))
+
+    if written:
+        print("Decompilation complete!")
+        print("  Success: " + str(success_count))
+        print("  Failed:  " + str(fail_count))
+        print("  Output:  " + manifest.output_path)
+        print("  IR:      {} exported ({:.2f}s of decompile), {} cached".format(
+            ir_exported, ir_seconds, ir_cached))
+    for name, seconds in timer.phases:
+        print("  {:<12} {:>8.2f}s".format(name, seconds))
+    print("=" * 70)
+    return {"group": manifest.group, "output": manifest.output_path, "written": written,
+            "functions": len(records), "success": success_count, "failed": fail_count, "seconds": timer.total()}
@@ -0,0 +1,27 @@
+# Ghidra headless script to decompile the targets listed in a JSON manifest
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Parses il2cpp.h for type information before decompiling (decompile_engine.py)
+#
+# Same pipeline as the decompile_*.py scripts, but the target list comes from a
+# manifest file (see decompile_engine.Manifest) instead of the script body.
+# benchmark_runtimes.py uses this to run one target list under both runtimes.
+#
+# Usage:
+#   -postScript decompile_manifest.py <manifest.json> [output .c path]
+
+from decompile_engine import Manifest, run_manifest
+
+
+def run():
+    """Main script entry point."""
+    args = getScriptArgs()
+    if not args:
+        print("ERROR: usage: decompile_manifest.py <manifest.json> [output .c path]")
+        return
+    manifest = Manifest.load(args[0])
+    if len(args) > 1:
+        manifest.output_path = args[1]
+    run_manifest(getCurrentProgram(), manifest)
+
+# Run the script
+run()
@@ -0,0 +1,207 @@
+# Ghidra headless script that keeps the FF2 program open and serves decompile requests
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Uses il2cpp_program.py for header types and script.json symbols
+#
+# Every run_ghidra_analysis.bat invocation pays ~10 s of headless startup,
+# opens the project and re-applies types before decompiling anything. This
+# script does that once and then answers requests on a localhost socket until
+# told to shut down, so decompiling one more function takes seconds.
+#
+# Protocol: one JSON object per line in each direction (UTF-8).
+#   {"cmd": "ping"}
+#   {"cmd": "decompile", "name": "BattleUtility$$GetSkillLevel"}   or "rva": "0x913900"
+#   {"cmd": "xref", "rva": "0x382120"}                              callers + callees (or data refs)
+#   {"cmd": "lookup", "query": "GetSkillLevel", "limit": 20}        name <-> RVA via script.json
+#   {"cmd": "shutdown"}
+# Replies are {"ok": true, ...} or {"ok": false, "error": "..."}.
+#
+# Usage (run_ghidra_analysis.bat server analyze), then from another shell:
+#   python decompile_client.py decompile BattleUtility$$GetSkillLevel
+#   -postScript decompile_server.py [port]                     # default 18733
+
+from ghidra.app.decompiler import DecompInterface
+from ghidra.util.task import ConsoleTaskMonitor
+from il2cpp_program import (SCRIPT_JSON_PATH, apply_il2cpp_symbols, ensure_il2cpp_types, get_or_create_function,
+                            load_script_json, string_types)
+from java.io import BufferedReader, InputStreamReader, OutputStreamWriter, PrintWriter
+from java.net import InetAddress, ServerSocket
+import json
+import time
+
+DEFAULT_PORT = 18733
+DECOMPILE_TIMEOUT_SECONDS = 120
+
+
+class DecompileService(object):
+    """Request handlers over one open program."""
+
+    def __init__(self, program, data):
+        self.program = program
+        self.data = data
+        self.image_base = program.getImageBase().getOffset()
+        self.space = program.getAddressFactory().getDefaultAddressSpace()
+        self.rva_by_name = {}
+        self.name_by_rva = {}
+        for method in (data or {}).get("ScriptMethod", []):
+            name = method.get("Name")
+            addr = method.get("Address")
+            if name and addr:
+                self.rva_by_name.setdefault(name, addr)
+                self.name_by_rva.setdefault(addr, name)
+        self.decompiler = DecompInterface()
+        self.decompiler.openProgram(program)
+        self.labelled = set()
+
+    def dispose(self):
+        self.decompiler.dispose()
+
+    # -- helpers -------------------------------------------------------------
+
+    def target_rva(self, request):
+        if request.get("rva") is not None:
+            rva = request["rva"]
+            return int(rva, 16) if isinstance(rva, string_types) else int(rva)
+        name = request.get("name")
+        if name in self.rva_by_name:
+            return self.rva_by_name[name]
+        raise ValueError("unknown function: " + str(name))
+
+    def describe(self, address):
+        """{"rva", "name"} for the function containing address (or the bare address)."""
+        func = self.program.getFunctionManager().getFunctionContaining(address)
+        entry = func.getEntryPoint().getOffset() if func is not None else address.getOffset()
+        rva = entry - self.image_base
+        return {"rva": "0x{:X}".format(rva),
+                "name": self.name_by_rva.get(rva) or (func.getName() if func is not None else None)}
+
+    # -- commands ------------------------------------------------------------
+
+    def ping(self, request):
+        return {"program": self.program.getName(), "functions": len(self.rva_by_name)}
+
+    def decompile(self, request):
+        rva = self.target_rva(request)
+        name = self.name_by_rva.get(rva) or request.get("name") or "FUN_{:X}".format(self.image_base + rva)
+        if name not in self.labelled:
+            apply_il2cpp_symbols(self.program, self.data, [name])
+            self.labelled.add(name)
+        func = get_or_create_function(self.program, rva, name)
+        if func is None:
+            raise ValueError("could not create function at 0x{:X}".format(self.image_base + rva))
+        started = time.time()
+        results = self.decompiler.decompileFunction(func, DECOMPILE_TIMEOUT_SECONDS, ConsoleTaskMonitor())
+        if not results.decompileCompleted() or results.getDecompiledFunction() is None:
+            raise ValueError("Decompilation failed: " + str(results.getErrorMessage()))
+        return {"name": name, "rva": "0x{:X}".format(rva), "address": "0x{:X}".format(self.image_base + rva),
+                "code": results.getDecompiledFunction().getC(),
+                "seconds": round(time.time() - started, 3)}
+
+    def xref(self, request):
+        rva = self.target_rva(request)
+        address = self.space.getAddress(self.image_base + rva)
+        refs = self.program.getReferenceManager().getReferencesTo(address)
+        callers = []
+        data_refs = []
+        for ref in refs:
+            entry = self.describe(ref.getFromAddress())
+            entry["from"] = "0x{:X}".format(ref.getFromAddress().getOffset() - self.image_base)
+            (callers if ref.getReferenceType().isCall() else data_refs).append(entry)
+        callees = []
+        func = self.program.getFunctionManager().getFunctionAt(address)
+        if func is not None:
+            for callee in func.getCalledFunctions(ConsoleTaskMonitor()):
+                callees.append(self.describe(callee.getEntryPoint()))
+        return {"rva": "0x{:X}".format(rva), "name": self.name_by_rva.get(rva),
+                "callers": callers, "callees": sorted(callees, key=lambda c: c["rva"]), "references": data_refs}
+
+    def lookup(self, request):
+        query = request.get("query", "")
+        limit = int(request.get("limit", 20))
+        if query.lower().startswith("0x"):
+            rva = int(query, 16)
+            if rva >= self.image_base:
+                rva -= self.image_base
+            name = self.name_by_rva.get(rva)
+            return {"matches": [{"name": name, "rva": "0x{:X}".format(rva)}] if name else []}
+        needle = query.lower()
+        matches = [{"name": name, "rva": "0x{:X}".format(rva)}
+                   for name, rva in self.rva_by_name.items() if needle in name.lower()]
+        matches.sort(key=lambda m: m["name"])
+        return {"matches": matches[:limit], "total": len(matches)}
+
+    def handle(self, request):
+        handler = {"ping": self.ping, "decompile": self.decompile, "xref": self.xref,
+                   "lookup": self.lookup}.get(request.get("cmd"))
+        if handler is None:
+            raise ValueError("unknown cmd: " + str(request.get("cmd")))
+        return handler(request)
+
+
+def serve(service, port):
+    """Accept one client at a time until a shutdown request arrives."""
+    server = ServerSocket(port, 4, InetAddress.getByName("127.0.0.1"))
+    print("Listening on 127.0.0.1:" + str(port))
+    running = True
+    try:
+        while running:
+            client = server.accept()
+            reader = BufferedReader(InputStreamReader(client.getInputStream(), "UTF-8"))
+            writer = PrintWriter(OutputStreamWriter(client.getOutputStream(), "UTF-8"), True)
+            try:
+                while True:
+                    line = reader.readLine()
+                    if line is None:
+                        break
+                    line = "%s" % line
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        if request.get("cmd") == "shutdown":
+                            writer.println(json.dumps({"ok": True}))
+                            running = False
+                            break
+                        reply = service.handle(request)
+                        reply["ok"] = True
+                    except Exception as e:
+                        reply = {"ok": False, "error": str(e)}
+                    print("  {} -> {}".format(line.strip()[:80], "ok" if reply.get("ok") else reply["error"]))
+                    writer.println(json.dumps(reply))
+            finally:
+                client.close()
+    finally:
+        server.close()
+
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Decompile Server")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    args = getScriptArgs()
+    port = int(args[0]) if args else DEFAULT_PORT
+    print("Program: " + program.getName())
+    print("Image Base: 0x{:X}".format(program.getImageBase().getOffset()))
+    print("")
+
+    ensure_il2cpp_types(program)
+    service = DecompileService(program, load_script_json(SCRIPT_JSON_PATH))
+    print("Indexed " + str(len(service.rva_by_name)) + " methods")
+    print("")
+    try:
+        serve(service, port)
+    finally:
+        service.dispose()
+
+    print("=" * 70)
+    print("Server stopped")
+    print("=" * 70)
+
+# Run the script
+run()
@@ -0,0 +1,410 @@
+# Ghidra headless script to sweep FF2 StatusUpProvider growth functions over input grids
+# Compatible with Jython 2.7 (Ghidra's Python interpreter)
+# Uses emulation_harness.py (p-code emulator) - no header parsing needed
+#
+# FF2-specific: Stats and skills grow through use. The growth decisions live in
+# StatusUpProvider (see decompiled_weapon_skill.c) and depend on static
+# dictionaries built in StatusUpProvider$$.cctor plus UnityEngine.Random.Range.
+# This script models those dictionaries from the .cctor, enumerates every
+# Random.Range outcome, and writes the exact outcome distribution for each grid
+# point so battle-result announcements and predictions can read a table.
+#
+# Output per sweep: growth_<sweep>.csv with one row per (grid point, outcome):
+#   <axis columns>,result,probability
+# Sweeps are processed in batches and resumable: grid points already present in
+# the CSV are skipped, so an interrupted run continues where it stopped.
+# sweep_tables.py (CPython) converts the CSVs to NumPy arrays.
+#
+# ExecutionParameterUpHp/Mp read two things the emulator has no copy of: the
+# growth amount table (FUN_1808ac2e0) and the config caps (FUN_180383970).
+# Those two accessors are served from a master dump, statusup_master.csv next
+# to the output (see load_statusup_dump); everything else in the functions is
+# emulated, and the character accessors return the grid point's values.
+
+from emulation_harness import EmulationError, FunctionEmulator, RngEnumerator, sweep_distribution
+import codecs
+import csv
+import io
+import os
+
+# ============================================================
+# Runtime helpers called from StatusUpProvider (RVAs, FF2 PR build)
+# ============================================================
+RVA_DICT_TRY_GET_VALUE = 0x13C22B0    # Dictionary<int,int>.TryGetValue
+RVA_DICT_GET_ITEM = 0x14145C0         # Dictionary<int,int>.get_Item
+RVA_RANDOM_RANGE = 0xFACEE0           # UnityEngine.Random.Range(int, int)
+RVA_MATH_MIN = 0xF99DE0               # Math.Min(int, int)
+RVA_STATUSUP_CLASS = 0x225D108        # DAT_18225d108 - StatusUpProvider class pointer
+
+# Master/config lookups in ExecutionParameterUpHp/Mp (roles from decompiled_weapon_skill.c)
+RVA_GROWTH_CONFIG = 0x5E5510          # returns object; +0xa8 -> +0x20 bool (HP growth assist)
+RVA_PARAMETER_LIMIT = 0x383970        # int config lookup (cap), called once per growth stage
+RVA_GROWTH_TABLE = 0x8AC390           # growth table singleton
+RVA_GROWTH_AMOUNT = 0x8AC2E0          # growth amount lookup (table, level)
+
+# OwnedCharacterData fields and OwnedCharacterData.Parameter vtable slots
+CHARACTER_PARAMETER = 0x78
+CHARACTER_BATTLE_COUNT = 0x98         # HP: battles without growth, counted while assist is on
+HP_MAX_SLOT = 0x180                   # max HP, divided by damage taken for the roll
+HP_LEVEL_SLOT = 0x1B0                 # growth level, Math.Min(level, 99) -> growth amount lookup
+MP_MAX_SLOT = 0x190
+MP_LEVEL_SLOT = 0x240
+
+# OwnedCharacterData.Parameter accessors
+RVA_HP_GET_CURRENT_MAX = 0xA1E190
+RVA_HP_GET_ADDITIONAL = 0xA203F0
+RVA_HP_SET_ADDITIONAL = 0xA211B0
+RVA_HP_GET_SECOND_LIMIT_VALUE = 0xA1E580
+RVA_HP_GET_SECOND_ADDITIONAL = 0xA20470
+RVA_HP_SET_SECOND_ADDITIONAL = 0xA21230
+RVA_MP_GET_CURRENT_MAX = 0xA1E330
+RVA_MP_GET_ADDITIONAL = 0xA20410
+RVA_MP_SET_ADDITIONAL = 0xA211D0
+RVA_MP_GET_SECOND_LIMIT_VALUE = 0xA1E0A0
+RVA_MP_GET_SECOND_ADDITIONAL = 0xA203D0
+RVA_MP_SET_SECOND_ADDITIONAL = 0xA21190
+
+# Value the additional getters return; setters write it plus the growth amount,
+# so the recorded gain (written - base) does not depend on it
+ADDITIONAL_BASE = 100
+
+# ============================================================
+# StatusUpProvider static dictionaries, transcribed from StatusUpProvider$$.cctor
+# ============================================================
+# static_fields+0x00: weapon category -> SkillLevelTarget
+SKILL_UP_WEAPON_TARGET_FROM_CATEGORY = {1: 0, 5: 1, 6: 2, 8: 3, 10: 4, 12: 5, 0x2B: 7}
+# static_fields+0x08: parameter type -> random range upper bound
+PARAMETER_UP_RANGE = {4: 0x2D, 8: 0x19, 9: 0x0F, 6: 0xFF, 5: 9, 0xE: 9, 2: 9, 3: 9}
+# static_fields+0x10: parameter type -> increment on success
+PARAMETER_UP_VALUE = {4: 1, 8: 1, 9: 1, 6: 1, 5: 1, 0xE: 1}
+
+# ============================================================
+# Sweep grids (edit ranges to trade resolution for run time)
+# ============================================================
+PARAMETER_TYPES = sorted(PARAMETER_UP_RANGE.keys())
+USAGE_VALUES = range(0, 101, 5)           # param_3: stat/usage value compared to the roll
+RANK_VALUES = range(0, 17)                # param_4: cap, MonsterAverageRank in callers
+MAX_HP_VALUES = range(0, 10000, 500)
+DAMAGE_VALUES = [0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 9999]
+MAX_MP_VALUES = range(0, 1000, 50)
+MP_USED_VALUES = [0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 999]
+GROWTH_LEVELS = [0, 1, 5, 10, 25, 50, 75, 99, 120]
+SECOND_LIMIT_VALUES = [0, 1, 10, 50, 99, 100, 500, 999, 9999]
+# (assist flag, battle count): the count only matters while the assist flag is set
+ASSIST_STATES = [(0, 0)] + [(1, count) for count in range(0, 10)]
+WEAPON_CATEGORIES = range(0, 64)
+
+# Grid points per batch before results are flushed to disk
+BATCH_SIZE = 256
+
+# Paths
+OUTPUT_DIR = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\ff2-screen-reader\\docs\\Scripts"
+
+def grid(*axes):
+    """Cartesian product of axis value lists (itertools.product is not in every Jython)."""
+    points = [()]
+    for axis in axes:
+        points = [p + (v,) for p in points for v in axis]
+    return points
+
+def with_assist(points):
+    """Grid points extended by every (assist, battle count) state."""
+    return [p + state for p in points for state in ASSIST_STATES]
+
+def install_statusup_fixtures(emulator, rng):
+    """Fake StatusUpProvider statics and the helpers every growth function calls."""
+    klass, statics = emulator.fake_class(RVA_STATUSUP_CLASS)
+    emulator.write_pointer(statics + 0x00, emulator.fake_dictionary(SKILL_UP_WEAPON_TARGET_FROM_CATEGORY))
+    emulator.write_pointer(statics + 0x08, emulator.fake_dictionary(PARAMETER_UP_RANGE))
+    emulator.write_pointer(statics + 0x10, emulator.fake_dictionary(PARAMETER_UP_VALUE))
+    emulator.stub(RVA_DICT_TRY_GET_VALUE, emulator.dictionary_try_get_value)
+    emulator.stub(RVA_DICT_GET_ITEM, emulator.dictionary_get_item)
+    emulator.stub(RVA_RANDOM_RANGE, rng.handler)
+    emulator.stub(RVA_MATH_MIN, lambda h: min(h.read_int_arg(0), h.read_int_arg(1)))
+
+def setter_recorder(key):
+    """Stub for a parameter setter(value): remember the growth it applied."""
+    def handler(harness):
+        harness.run_state[key] = harness.read_int_arg(1) - ADDITIONAL_BASE
+        return 0
+    return handler
+
+def nth_call(values):
+    """Stub returning values[i] on the i-th call within one run (last value repeats)."""
+    def handler(harness):
+        count = harness.run_state.get(id(values), 0)
+        harness.run_state[id(values)] = count + 1
+        return values[min(count, len(values) - 1)]
+    return handler
+
+def character_with_parameter(emulator, vtable, fields=None):
+    """OwnedCharacterData stand-in whose +0x78 parameter object uses the given vtable."""
+    parameter = emulator.fake_object(vtable=vtable)
+    fields = dict(fields or {})
+    fields[CHARACTER_PARAMETER] = parameter
+    return emulator.fake_object(fields=fields)
+
+# ------------------------------------------------------------
+# Master data: growth amounts and config caps
+# ------------------------------------------------------------
+# statusup_master.csv, header table,key,value:
+#   amount,<level>,<increase>   growth table row read by FUN_1808ac2e0(table, level)
+#   config,<name>,<value>       FUN_180383970 caps: hp_limit, hp_second_limit,
+#                               mp_limit, mp_second_limit
+STATUSUP_DUMP_NAME = "statusup_master.csv"
+
+def load_statusup_dump(path):
+    """({level: growth amount}, {config name: value}) from a StatusUp master dump."""
+    amounts = {}
+    config = {}
+    with io.open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+    for row in rows[1:]:
+        table, key, value = [cell.strip() for cell in row[:3]]
+        if table == "amount":
+            amounts[int(key, 0)] = int(value, 0)
+        elif table == "config":
+            config[key] = int(value, 0)
+        else:
+            raise ValueError("{}: unknown table {!r}".format(path, table))
+    return amounts, config
+
+def statusup_master():
+    path = os.path.join(OUTPUT_DIR, STATUSUP_DUMP_NAME)
+    if not os.path.exists(path):
+        raise EmulationError("growth amounts and caps are master data; {} not found".format(STATUSUP_DUMP_NAME))
+    return load_statusup_dump(path)
+
+def growth_amount_stub(amounts):
+    """Stub for the growth amount lookup (table, level) backed by the dump."""
+    def handler(harness):
+        level = harness.read_int_arg(1)
+        if level not in amounts:
+            raise EmulationError("{} has no growth amount for level {}".format(STATUSUP_DUMP_NAME, level))
+        return amounts[level]
+    return handler
+
+# ------------------------------------------------------------
+# Sweep definitions
+# ------------------------------------------------------------
+
+def setup_calc_additional(emulator, rng):
+    install_statusup_fixtures(emulator, rng)
+    return lambda p: [0, p[0], p[1], p[2], p[3], 0]
+
+def setup_weapon_target(emulator, rng):
+    install_statusup_fixtures(emulator, rng)
+    mark = emulator.mark()
+
+    def make_args(point):
+        emulator.release(mark)
+        # weapon (+0x50) -> master row (+0x18) -> int[] with category at index 3
+        values = emulator.alloc(0x30)
+        emulator.write_int(values + 0x18, 4)
+        emulator.write_int(values + 0x2C, point[0])
+        master = emulator.fake_object(fields={0x18: values})
+        weapon = emulator.fake_object(fields={0x50: master})
+        return [0, weapon, 0]
+    return make_args
+
+# Accessors of one parameter: (max slot, level slot, current max, get/set additional,
+# second limit value, get/set second additional, config cap names)
+HP_ACCESSORS = (HP_MAX_SLOT, HP_LEVEL_SLOT, RVA_HP_GET_CURRENT_MAX, RVA_HP_GET_ADDITIONAL, RVA_HP_SET_ADDITIONAL,
+                RVA_HP_GET_SECOND_LIMIT_VALUE, RVA_HP_GET_SECOND_ADDITIONAL, RVA_HP_SET_SECOND_ADDITIONAL,
+                ("hp_limit", "hp_second_limit"))
+MP_ACCESSORS = (MP_MAX_SLOT, MP_LEVEL_SLOT, RVA_MP_GET_CURRENT_MAX, RVA_MP_GET_ADDITIONAL, RVA_MP_SET_ADDITIONAL,
+                RVA_MP_GET_SECOND_LIMIT_VALUE, RVA_MP_GET_SECOND_ADDITIONAL, RVA_MP_SET_SECOND_ADDITIONAL,
+                ("mp_limit", "mp_second_limit"))
+
+# Sweep axis -> input of setup_parameter_up; inputs without an axis stay 0
+PARAMETER_INPUTS = {"max_hp": "max", "max_mp": "max", "damage": "used", "mp_used": "used",
+                    "growth_level": "level", "second_limit_value": "second", "assist": "assist",
+                    "battle_count": "battles"}
+
+def setup_parameter_up(accessors, axes):
+    """Shared setup for ExecutionParameterUpHp/Mp; results come from the setter stubs.
+
+    The character's max (the roll divisor and the current max checked against
+    the first cap), growth level, second limit value and battle count come
+    from the grid point. The config lookup's key is a runtime metadata value,
+    so its stub serves the dump's two caps in call order (first, then second
+    growth stage).
+    """
+    (max_slot, level_slot, current_max, get_additional, set_additional, second_limit_value,
+     get_second_additional, set_second_additional, limit_names) = accessors
+
+    def setup(emulator, rng):
+        amounts, config = statusup_master()
+        missing = [name for name in limit_names if name not in config]
+        if missing:
+            raise EmulationError("{} has no config {}".format(STATUSUP_DUMP_NAME, ", ".join(missing)))
+        install_statusup_fixtures(emulator, rng)
+        current = {}
+        assist = emulator.fake_object()
+        growth_config = emulator.fake_object(fields={0xA8: assist})
+        emulator.stub(RVA_GROWTH_CONFIG, lambda h: growth_config)
+        emulator.stub(RVA_PARAMETER_LIMIT, nth_call([config[name] for name in limit_names]))
+        growth_table = emulator.fake_object()
+        emulator.stub(RVA_GROWTH_TABLE, lambda h: growth_table)
+        emulator.stub(RVA_GROWTH_AMOUNT, growth_amount_stub(amounts))
+        emulator.stub(current_max, lambda h: current["max"])
+        emulator.stub(get_additional, lambda h: ADDITIONAL_BASE)
+        emulator.stub(set_additional, setter_recorder("gain"))
+        emulator.stub(second_limit_value, lambda h: current["second"])
+        emulator.stub(get_second_additional, lambda h: ADDITIONAL_BASE)
+        emulator.stub(set_second_additional, setter_recorder("second_gain"))
+        mark = emulator.mark()
+
+        def make_args(point):
+            emulator.release(mark)
+            inputs = dict((key, 0) for key in PARAMETER_INPUTS.values())
+            for axis, value in zip(axes, point):
+                inputs[PARAMETER_INPUTS[axis]] = value
+            current.clear()
+            current.update(inputs)
+            emulator.write_int(assist + 0x20, inputs["assist"], 1)
+            character = character_with_parameter(emulator, {
+                max_slot: lambda h: current["max"],
+                level_slot: lambda h: current["level"],
+            }, {CHARACTER_BATTLE_COUNT: inputs["battles"]})
+            return [0, character, inputs["used"], 0]
+        return make_args
+    return setup
+
+def gain(key):
+    return lambda harness, rax: harness.run_state.get(key, 0)
+
+HP_AXES = ["max_hp", "damage", "growth_level", "assist", "battle_count"]
+HP_SECOND_AXES = ["max_hp", "damage", "second_limit_value"]
+MP_AXES = ["max_mp", "mp_used", "growth_level"]
+MP_SECOND_AXES = ["max_mp", "mp_used", "second_limit_value"]
+
+# name -> (entry RVA, description, axis names, grid points, setup, result extractor)
+SWEEPS = [
+    ("calc_additional_parameter", 0x474A00,
+        "StatusUpProvider$$CalcAdditionalParameterValue(type, value, cap, isGreater)",
+        ["parameter_type", "value", "cap", "is_greater"],
+        grid(PARAMETER_TYPES, USAGE_VALUES, RANK_VALUES, [0, 1]),
+        setup_calc_additional, None),
+    ("skill_up_weapon_target", 0x4779F0,
+        "StatusUpProvider$$GetSkillUpWeaponTarget(weapon category)",
+        ["weapon_category"],
+        grid(WEAPON_CATEGORIES),
+        setup_weapon_target, None),
+    ("parameter_up_hp", 0x474B40,
+        "StatusUpProvider$$ExecutionParameterUpHp(max HP, damage taken, growth level, assist, battle count)"
+        " -> max HP gain",
+        HP_AXES, with_assist(grid(MAX_HP_VALUES, DAMAGE_VALUES, GROWTH_LEVELS)),
+        setup_parameter_up(HP_ACCESSORS, HP_AXES), gain("gain")),
+    ("parameter_up_hp_second", 0x474B40,
+        "StatusUpProvider$$ExecutionParameterUpHp(max HP, damage taken, second limit value)"
+        " -> second limit gain",
+        HP_SECOND_AXES, grid(MAX_HP_VALUES, DAMAGE_VALUES, SECOND_LIMIT_VALUES),
+        setup_parameter_up(HP_ACCESSORS, HP_SECOND_AXES), gain("second_gain")),
+    ("parameter_up_mp", 0x474ED0,
+        "StatusUpProvider$$ExecutionParameterUpMp(max MP, MP used, growth level) -> max MP gain",
+        MP_AXES, grid(MAX_MP_VALUES, MP_USED_VALUES, GROWTH_LEVELS),
+        setup_parameter_up(MP_ACCESSORS, MP_AXES), gain("gain")),
+    ("parameter_up_mp_second", 0x474ED0,
+        "StatusUpProvider$$ExecutionParameterUpMp(max MP, MP used, second limit value) -> second limit gain",
+        MP_SECOND_AXES, grid(MAX_MP_VALUES, MP_USED_VALUES, SECOND_LIMIT_VALUES),
+        setup_parameter_up(MP_ACCESSORS, MP_SECOND_AXES), gain("second_gain")),
+]
+
+def load_completed(csv_path, axes):
+    """Return grid points already written by a previous (possibly interrupted) run."""
+    completed = set()
+    if not os.path.exists(csv_path):
+        return completed
+    axis_count = len(axes)
+    header = ",".join(axes + ["result", "probability"])
+    with codecs.open(csv_path, 'r', 'utf-8') as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            if not line[:1].isdigit():
+                if line.strip() != header:
+                    raise EmulationError("{} has columns {} (expected {}); delete it to re-run".format(
+                        csv_path, line.strip(), header))
+                continue
+            parts = line.strip().split(",")
+            completed.add(tuple(int(v) for v in parts[:axis_count]))
+    return completed
+
+def run_sweep(program, name, rva, description, axes, points, setup, result):
+    csv_path = os.path.join(OUTPUT_DIR, "growth_" + name + ".csv")
+    completed = load_completed(csv_path, axes)
+    pending = [p for p in points if p not in completed]
+    print("  Grid points: {} ({} already done)".format(len(points), len(points) - len(pending)))
+    if not pending:
+        return csv_path, 0
+
+    is_new = not os.path.exists(csv_path)
+    rng = RngEnumerator()
+    emulator = FunctionEmulator(program, rva)
+    try:
+        make_args = setup(emulator, rng)
+        with codecs.open(csv_path, 'a', 'utf-8') as f:
+            if is_new:
+                f.write("# " + description + "\n")
+                f.write(",".join(axes + ["result", "probability"]) + "\n")
+            for start in range(0, len(pending), BATCH_SIZE):
+                batch = pending[start:start + BATCH_SIZE]
+                lines = []
+                for point in batch:
+                    distribution = sweep_distribution(emulator, rng, point, make_args, result)
+                    for value in sorted(distribution.keys()):
+                        lines.append(",".join([str(v) for v in point] +
+                                              [str(value), "{:.9f}".format(distribution[value])]))
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                print("  Batch {}-{} of {} written".format(start + 1, start + len(batch), len(pending)))
+    finally:
+        emulator.dispose()
+    return csv_path, len(pending)
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 StatusUpProvider Growth Sweep")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    # Optional script args select sweeps by name: -postScript emulate_growth.py parameter_up_hp
+    selected = set(getScriptArgs())
+
+    print("Program: " + program.getName())
+    print("Output: " + OUTPUT_DIR)
+    print("")
+
+    success_count = 0
+    fail_count = 0
+
+    for name, rva, description, axes, points, setup, result in SWEEPS:
+        if selected and name not in selected:
+            continue
+        print("-" * 70)
+        print("Sweep: " + name + " - " + description)
+        print("  RVA: 0x{:X}".format(rva))
+        print("-" * 70)
+        try:
+            csv_path, count = run_sweep(program, name, rva, description, axes, points, setup, result)
+            print("  Wrote {} grid points to {}".format(count, csv_path))
+            success_count += 1
+        except EmulationError as e:
+            print("  FAILED: " + str(e))
+            fail_count += 1
+
+    print("")
+    print("=" * 70)
+    print("Sweep complete!")
+    print("  Success: " + str(success_count))
+    print("  Failed:  " + str(fail_count))
+    print("=" * 70)
+
+# Run the script
+run()
@@ -0,0 +1,366 @@
+# Ghidra headless script to emulate FF2 skill level functions into lookup tables
+# Compatible with Jython 2.7 (Ghidra's Python interpreter)
+# Uses emulation_harness.py (p-code emulator) - no header parsing needed
+#
+# Purpose: Replace hand-reimplemented exp -> level formulas with exact tables.
+# Each table runs the game's own compiled function for every exp value in its
+# domain, so boundary handling and clamping match the UI exactly.
+#
+# Output per table:
+#   skill_level_<table>.csv  - exp,level rows (human readable, diffable)
+#   skill_level_<table>.bin  - one byte per exp (level), index = exp - domain start
+# The .bin files are what the mod loads: File.ReadAllBytes once, then
+# level = table[exp] is an O(1) array lookup. SkillLevelProvider's table,
+# skill_level_gauge.csv, adds the gauge fill the magic menu shows (exp,level,fill).
+#
+# ExpUtility$$GetExpLevel / GetNextExp / GetExpDifference are emulated, not
+# stubbed. The one thing the emulator has no copy of is the Exp master they
+# read, so only the master-data accessors (MASTER_ACCESSORS, resolved through
+# script.json) are stubbed, serving rows from a dump of the Exp master
+# (exp_table.csv next to the output, see load_exp_dump). Row field offsets come
+# from the program's il2cpp types. Any other unmodelled call, null reference or
+# fault fails the table; nothing falls back to a model of the formula.
+
+from emulation_harness import EmulationError, FunctionEmulator, sweep
+from il2cpp_program import SCRIPT_JSON_PATH, find_data_type, load_script_json
+from ghidra.program.model.data import Structure
+import codecs
+import csv
+import io
+import os
+
+# ExpUtility (static, (startLevel, exp, ExpTableType, MethodInfo*))
+RVA_EXP_GET_EXP_LEVEL = 0x382120
+RVA_EXP_GET_NEXT_EXP = 0x382D30
+RVA_EXP_GET_EXP_DIFFERENCE = 0x381C40
+EXP_FUNCTIONS = [RVA_EXP_GET_EXP_LEVEL, RVA_EXP_GET_NEXT_EXP, RVA_EXP_GET_EXP_DIFFERENCE]
+
+# Class pointer slots checked before class init (zeroed fake classes skip the cctor)
+RVA_EXPUTILITY_CLASS = 0x2279950      # DAT_182279950
+RVA_CONFIG_CLASS = 0x227E378          # DAT_18227e378, before the config lookup
+
+# Callers the tables run (decompiled_skill_level.c)
+RVA_PARAMETER_GET_SKILL_LEVEL = 0x6A0570      # ParameterProvider$$GetSkillLevel(exp): spells
+RVA_BATTLE_GET_SKILL_LEVEL = 0x913900         # BattleUtility$$GetSkillLevel(character, SkillLevelTarget)
+RVA_SETTING_SKILL_LEVEL = 0x6FC630            # SkillLevelProvider$$SettingSkillLevel(exp, text, gauge)
+
+# BattleUtility$$GetSkillLevel reads the exp from character+0x58, a
+# Dictionary<int, int> keyed by SkillLevelTarget. Targets 0-7 (weapons) call
+# GetExpLevel(1, exp, 1); 8-9 use exp / 100 + 1; 10-11 (RightArm/LeftArm) pass
+# ExpTableType 0xC9. Ghidra prints that call with three arguments because it is
+# a tail call (return GetExpLevel(...)), where R9 (MethodInfo*) is never set;
+# 0xC9 is the third argument, R8. BattleUtility$$GetJobLevel has the same shape
+# with 0x65, so the ExpTableType values step by 100 (1, 101, 201). The arm
+# table runs BattleUtility$$GetSkillLevel itself, so the type comes from the
+# binary, not from this script.
+CHARACTER_SKILL_EXP = 0x58
+SKILL_TARGET_WEAPON = 0
+SKILL_TARGET_RIGHT_ARM = 10
+RVA_DICT_TRY_GET_VALUE = 0x13C22B0    # Dictionary<int,int>.TryGetValue
+
+# SkillLevelProvider$$SettingSkillLevel helpers (roles from decompiled_skill_level.c)
+RVA_INT32_TO_STRING = 0xD7CC10        # Int32.ToString(int*): level and cap as text
+RVA_STRING_EQUALS = 0x10236D0         # String.op_Equality(level text, cap text)
+RVA_TEXT_SET_TEXT = 0xC9D330          # Text.set_text(text, level text)
+RVA_GAUGE_SET_FILL = 0x5335A0         # gauge fill setter(gauge, float)
+RVA_CONFIG_INT = 0x383970             # config int lookup: the skill level cap
+# Config value served for the cap lookup: skill levels run 1-16 (decompile_skill_level.py)
+MAX_SKILL_LEVEL = 16
+
+# Master-data accessors GetExpLevel may use, as named in script.json; generic
+# instantiations (GetList<object>) match their base name. These are the only
+# stubs backed by the dump. Dictionary<int, object> access on the returned list
+# is served by the harness dictionary stubs, bound by callee name.
+MASTER_ACCESSORS = {
+    "MasterManager$$get_Instance": "instance",
+    "MasterManager$$GetList": "list",
+    "MasterManager$$GetData": "data",
+}
+DICTIONARY_METHODS = {
+    "TryGetValue": "dictionary_try_get_value",
+    "get_Item": "dictionary_get_item",
+    "ContainsKey": "dictionary_contains_key",
+    "get_Count": "dictionary_count",
+}
+
+# Exp master row type in il2cpp_ghidra.h and the dump columns mapped onto it
+EXP_ROW_TYPE = "Last_Data_Master_Exp_o"
+EXP_DUMP_NAME = "exp_table.csv"
+_EXP_COLUMNS = {
+    "id": ("id",),
+    "type": ("type", "type_id", "exp_table_type", "table_type"),
+    "level": ("lv", "level"),
+    "exp": ("exp", "value"),
+}
+
+# Tables to emit: (name, entry RVA, description, exp domain)
+# Domains cover every exp value the save data can hold for that skill type.
+SKILL_LEVEL_TABLES = [
+    ("spell", RVA_PARAMETER_GET_SKILL_LEVEL, "ParameterProvider$$GetSkillLevel(exp)", range(0, 10000)),
+    ("weapon", RVA_BATTLE_GET_SKILL_LEVEL, "BattleUtility$$GetSkillLevel(character, target 0)", range(0, 10000)),
+    ("arm", RVA_BATTLE_GET_SKILL_LEVEL, "BattleUtility$$GetSkillLevel(character, target 10)", range(0, 10000)),
+]
+GAUGE_TABLE = ("gauge", RVA_SETTING_SKILL_LEVEL, "SkillLevelProvider$$SettingSkillLevel(exp) -> level text, fill",
+               range(0, 10000))
+
+# Extra stubs for callees reported as "Unmodelled call" (RVA -> handler(harness)).
+EXTRA_STUBS = {}
+
+# Paths
+OUTPUT_DIR = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\ff2-screen-reader\\docs\\Scripts"
+
+def _normalize(name):
+    """'<Lv>k__BackingField' / '_lv' / 'lv' -> 'lv'."""
+    name = name.lower().replace("<", "").replace(">", "")
+    if name.endswith("k__backingfield"):
+        name = name[:-len("k__backingfield")]
+    return name.strip("_")
+
+def load_exp_dump(path):
+    """[{id, type, level, exp}] rows from a dump of the Exp master (header row names the columns)."""
+    with io.open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+    header = [_normalize(cell.strip()) for cell in rows[0]]
+    columns = {}
+    for key, names in _EXP_COLUMNS.items():
+        found = [header.index(name) for name in names if name in header]
+        if not found:
+            raise ValueError("{}: no {} column (expected one of {})".format(path, key, ", ".join(names)))
+        columns[key] = found[0]
+    return [dict((key, int(row[index], 0)) for key, index in columns.items()) for row in rows[1:]]
+
+def exp_row_layout(program):
+    """{dump column: offset in an Exp object} from the program's il2cpp types."""
+    row_type = find_data_type(program.getDataTypeManager(), EXP_ROW_TYPE)
+    if row_type is None:
+        raise EmulationError("{} not in the program's data types (run an analyze pass with the header)".format(
+            EXP_ROW_TYPE))
+    offsets = {}
+    for component in row_type.getComponents():
+        data_type = component.getDataType()
+        if component.getFieldName() == "fields" and isinstance(data_type, Structure):
+            for field in data_type.getComponents():
+                if field.getFieldName():
+                    offsets[_normalize(field.getFieldName())] = component.getOffset() + field.getOffset()
+    layout = {}
+    for key, names in _EXP_COLUMNS.items():
+        found = [offsets[name] for name in names if name in offsets]
+        if not found:
+            raise EmulationError("{} has no {} field (fields: {})".format(
+                EXP_ROW_TYPE, key, ", ".join(sorted(offsets))))
+        layout[key] = found[0]
+    return layout
+
+def accessor_rvas(data):
+    """{rva: role} for MASTER_ACCESSORS, every generic instantiation included."""
+    found = {}
+    for method in data.get("ScriptMethod", []):
+        short = (method.get("Name") or "").split(".")[-1]
+        for name, role in MASTER_ACCESSORS.items():
+            if short == name or short.startswith(name + "<"):
+                found[method["Address"]] = role
+    return found
+
+def install_exp_master(emulator, master):
+    """Stub the master-data accessors with Exp rows from the dump."""
+    rows, layout, accessors = master
+    objects = {}
+    for row in rows:
+        obj = emulator.alloc(max(layout.values()) + 8)
+        for key, offset in layout.items():
+            emulator.write_int(obj + offset, row[key])
+        objects[row["id"]] = obj
+    table = emulator.fake_dictionary(objects, value_size=8)
+    manager = emulator.fake_object()
+    handlers = {
+        "instance": lambda h: manager,
+        "list": lambda h: table,
+        "data": lambda h: objects.get(h.read_int_arg(1), 0),
+    }
+    for rva, role in accessors.items():
+        emulator.stub(rva, handlers[role])
+    for target, name in emulator.callees().items():
+        if "Dictionary" not in name:
+            continue
+        for method, handler in DICTIONARY_METHODS.items():
+            if name.endswith(method):
+                emulator.stub(target - emulator.image_base, getattr(emulator, handler))
+
+def build_emulator(program, rva, master):
+    """Create a strict emulator for rva following the ExpUtility functions."""
+    emulator = FunctionEmulator(program, rva, follow=EXP_FUNCTIONS)
+    emulator.fake_class(RVA_EXPUTILITY_CLASS)
+    emulator.fake_class(RVA_CONFIG_CLASS)
+    install_exp_master(emulator, master)
+    emulator.stub(RVA_DICT_TRY_GET_VALUE, emulator.dictionary_try_get_value)
+    for stub_rva, handler in EXTRA_STUBS.items():
+        emulator.stub(stub_rva, handler)
+    return emulator
+
+def skill_level_args(emulator, rva, name):
+    """make_args(exp) for one table's entry function."""
+    if rva != RVA_BATTLE_GET_SKILL_LEVEL:
+        return lambda exp: [0, exp, 0]
+    target = SKILL_TARGET_RIGHT_ARM if name == "arm" else SKILL_TARGET_WEAPON
+    mark = emulator.mark()
+
+    def make_args(exp):
+        emulator.release(mark)
+        skill_exp = emulator.fake_dictionary({target: exp})
+        character = emulator.fake_object(fields={CHARACTER_SKILL_EXP: skill_exp})
+        return [character, target, 0]
+    return make_args
+
+def install_gauge_stubs(emulator):
+    """Record SettingSkillLevel's level text and gauge fill in run_state."""
+    strings = {}
+
+    def to_string(harness):
+        value = harness.read_int(harness.read_arg(0))
+        if value not in strings:
+            strings[value] = emulator.alloc(0x20)
+        return strings[value]
+    text_of = lambda pointer: [v for v, p in strings.items() if p == pointer][0]
+
+    def set_text(harness):
+        harness.run_state["level"] = text_of(harness.read_arg(1))
+        return 0
+
+    def set_fill(harness):
+        harness.run_state["fill"] = harness.read_float_arg(1)
+        return 0
+    emulator.stub(RVA_INT32_TO_STRING, to_string)
+    emulator.stub(RVA_STRING_EQUALS, lambda h: 1 if h.read_arg(0) == h.read_arg(1) else 0)
+    emulator.stub(RVA_TEXT_SET_TEXT, set_text)
+    emulator.stub(RVA_GAUGE_SET_FILL, set_fill)
+    emulator.stub(RVA_CONFIG_INT, lambda h: MAX_SKILL_LEVEL)
+
+def sweep_gauge(emulator, domain):
+    """[(exp, level, fill)] from SkillLevelProvider$$SettingSkillLevel."""
+    install_gauge_stubs(emulator)
+    text = emulator.fake_object()
+    gauge = emulator.fake_object()
+    rows = []
+    for exp in domain:
+        emulator.call([exp, text, gauge, 0])
+        if "level" not in emulator.run_state or "fill" not in emulator.run_state:
+            raise EmulationError("SettingSkillLevel returned without setting the text and gauge (exp {})".format(exp))
+        rows.append((exp, emulator.run_state["level"], emulator.run_state["fill"]))
+    return rows
+
+def write_table(name, description, rows):
+    """Write CSV and packed byte table for one sweep."""
+    csv_path = os.path.join(OUTPUT_DIR, "skill_level_" + name + ".csv")
+    bin_path = os.path.join(OUTPUT_DIR, "skill_level_" + name + ".bin")
+
+    with codecs.open(csv_path, 'w', 'utf-8') as f:
+        f.write("# " + description + "\n")
+        f.write("exp,level\n")
+        for exp, level in rows:
+            f.write("{},{}\n".format(exp, level))
+
+    with open(bin_path, 'wb') as f:
+        f.write(bytearray([level & 0xFF for _, level in rows]))
+
+    return csv_path, bin_path
+
+def write_gauge_table(name, description, rows):
+    """Write the exp,level,fill CSV for SkillLevelProvider."""
+    csv_path = os.path.join(OUTPUT_DIR, "skill_level_" + name + ".csv")
+    with codecs.open(csv_path, 'w', 'utf-8') as f:
+        f.write("# " + description + "\n")
+        f.write("exp,level,fill\n")
+        for exp, level, fill in rows:
+            f.write("{},{},{:.6f}\n".format(exp, level, fill))
+    return csv_path
+
+def level_thresholds(rows):
+    """Return [(level, first exp)] - the compact form used to sanity check tables."""
+    thresholds = []
+    last_level = None
+    for exp, level in rows:
+        if level != last_level:
+            thresholds.append((level, exp))
+            last_level = level
+    return thresholds
+
+def load_master(program):
+    """(dump rows, Exp field offsets, accessor RVAs) - raises EmulationError if any is missing."""
+    dump_path = os.path.join(OUTPUT_DIR, EXP_DUMP_NAME)
+    if not os.path.exists(dump_path):
+        raise EmulationError("GetExpLevel reads the Exp master table; {} not found".format(EXP_DUMP_NAME))
+    data = load_script_json(SCRIPT_JSON_PATH)
+    if data is None:
+        raise EmulationError("script.json is needed to find the master-data accessors")
+    accessors = accessor_rvas(data)
+    if not accessors:
+        raise EmulationError("none of {} found in script.json".format(", ".join(sorted(MASTER_ACCESSORS))))
+    return load_exp_dump(dump_path), exp_row_layout(program), accessors
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Skill Level Table Emulator")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    print("Program: " + program.getName())
+    print("Image Base: 0x{:X}".format(program.getImageBase().getOffset()))
+    print("Output: " + OUTPUT_DIR)
+    try:
+        master = load_master(program)
+    except EmulationError as e:
+        print("ERROR: " + str(e))
+        return
+    print("Exp master dump: {} rows, accessors at {}".format(
+        len(master[0]), ", ".join("0x{:X}".format(rva) for rva in sorted(master[2]))))
+    print("")
+
+    success_count = 0
+    fail_count = 0
+
+    for name, rva, description, domain in SKILL_LEVEL_TABLES + [GAUGE_TABLE]:
+        print("-" * 70)
+        print("Table: " + name + " - " + description)
+        print("  RVA: 0x{:X}  Domain: {}..{}".format(rva, domain[0], domain[-1]))
+        print("-" * 70)
+
+        emulator = None
+        try:
+            emulator = build_emulator(program, rva, master)
+            if rva == RVA_SETTING_SKILL_LEVEL:
+                gauge_rows = sweep_gauge(emulator, domain)
+                rows = [(exp, level) for exp, level, _ in gauge_rows]
+            else:
+                rows = sweep(emulator, domain, skill_level_args(emulator, rva, name))
+        except EmulationError as e:
+            print("  FAILED: " + str(e))
+            fail_count += 1
+            continue
+        finally:
+            if emulator is not None:
+                emulator.dispose()
+
+        if rva == RVA_SETTING_SKILL_LEVEL:
+            paths = [write_gauge_table(name, description, gauge_rows)]
+        else:
+            paths = write_table(name, description, rows)
+        for level, first_exp in level_thresholds(rows):
+            print("  level {:>3} from exp {}".format(level, first_exp))
+        for path in paths:
+            print("  Wrote: " + path)
+        success_count += 1
+
+    print("")
+    print("=" * 70)
+    print("Emulation complete!")
+    print("  Success: " + str(success_count))
+    print("  Failed:  " + str(fail_count))
+    print("=" * 70)
+
+# Run the script
+run()
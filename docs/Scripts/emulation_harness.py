@@ -0,0 +1,475 @@
+# P-code emulation harness for pure IL2CPP functions
+# Compatible with Jython 2.7 (Ghidra's Python interpreter)
+# Imported by the emulate_*.py headless scripts (script directory is on sys.path)
+#
+# Runs a single function through Ghidra's EmulatorHelper using the Windows x64
+# calling convention. IL2CPP boilerplate (metadata init thunk, class init,
+# exception throw helper) is stubbed out so formula functions such as
+# ExpUtility.GetExpLevel can be swept across their whole input domain.
+#
+# Strict mode: every direct call reachable from the entry point must either be
+# stubbed or explicitly followed. Anything else stops the run with an
+# EmulationError naming the callee, so a table is never emitted from a path
+# that silently touched runtime state the emulator does not model.
+
+from ghidra.app.emulator import EmulatorHelper
+from ghidra.pcode.memstate import MemoryFaultHandler
+from ghidra.util.task import ConsoleTaskMonitor
+from ghidra.util.task import TimeoutTaskMonitor
+from java.math import BigInteger
+from java.util.concurrent import TimeUnit
+import codecs
+import jarray
+import json
+import struct
+
+# Windows x64: first four integer arguments in registers, rest on the stack
+ARG_REGISTERS = ["RCX", "RDX", "R8", "R9"]
+
+# Scratch regions well away from the image (0x180000000) and each other
+STACK_TOP = 0x2FFF0000
+STACK_SIZE = 0x10000
+HEAP_BASE = 0x30000000
+FAKE_METHOD_BASE = 0x3F000000
+RETURN_SENTINEL = 0x2FFFF000
+
+# IL2CPP runtime helpers seen in every decompiled body (RVAs, FF2 PR build)
+RVA_METADATA_INIT = 0x1FEF70      # thunk_FUN_1801fef70 - lazy metadata init
+RVA_THROW_HELPER = 0x237AF0       # FUN_180237af0 - raises NullReferenceException
+IL2CPP_CLASS_INIT = "il2cpp_runtime_class_init"
+
+# Il2CppClass layout used by fake_class(): static_fields pointer and total size
+IL2CPP_CLASS_STATIC_FIELDS = 0xB8
+IL2CPP_CLASS_SIZE = 0x138
+
+# Per-call timeout so a runaway loop cannot hang a whole sweep
+CALL_TIMEOUT_SECONDS = 5
+
+MASK_64 = (1 << 64) - 1
+
+
+class EmulationError(Exception):
+    """Raised when a run leaves the modelled, side-effect free path."""
+    pass
+
+
+class _StrictFaultHandler(MemoryFaultHandler):
+    """Records reads of memory that is neither in the image nor written by us."""
+
+    def __init__(self, harness):
+        self.harness = harness
+
+    def uninitializedRead(self, address, size, buf, bufOffset):
+        offset = address.getOffset()
+        if STACK_TOP - STACK_SIZE <= offset < STACK_TOP:
+            return True
+        self.harness.faults.append("uninitialized read of {} bytes at 0x{:X}".format(size, offset))
+        return True
+
+    def unknownAddress(self, address, write):
+        self.harness.faults.append("unknown address 0x{:X} ({})".format(
+            address.getOffset(), "write" if write else "read"))
+        return False
+
+
+def load_method_rvas(script_json_path, names):
+    """Resolve IL2CPP method names (Class$$Method) to RVAs using script.json."""
+    wanted = set(names)
+    found = {}
+    with codecs.open(script_json_path, 'r', 'utf-8') as f:
+        data = json.load(f)
+    for method in data.get("ScriptMethod", []):
+        name = method.get("Name")
+        if not name:
+            continue
+        short = name.split(".")[-1] if "$$" in name.split(".")[-1] else name
+        for candidate in (name, name.replace(".", "$$"), short):
+            if candidate in wanted and candidate not in found:
+                found[candidate] = method.get("Address")
+    return found
+
+
+class FunctionEmulator(object):
+    """Emulates one function (plus any followed callees) with stubbed IL2CPP helpers."""
+
+    def __init__(self, program, rva, follow=None, strict=True):
+        self.program = program
+        self.image_base = program.getImageBase().getOffset()
+        self.space = program.getAddressFactory().getDefaultAddressSpace()
+        self.entry = self.image_base + rva
+        self.strict = strict
+        self.stubs = {}
+        self.faults = []
+        self.heap_next = HEAP_BASE
+        self.fake_method_next = FAKE_METHOD_BASE
+        self.fixtures = []
+        self.dictionaries = {}
+        self.dictionary_value_sizes = {}
+        self.run_state = {}
+
+        self.emu = EmulatorHelper(program)
+        if strict:
+            self.emu.setMemoryFaultHandler(_StrictFaultHandler(self))
+
+        self.stub(RVA_METADATA_INIT, lambda h: 0)
+        self.stub(RVA_THROW_HELPER, self._raise_il2cpp_exception)
+        self._stub_by_name(IL2CPP_CLASS_INIT, lambda h: 0)
+
+        self.followed = set([self.entry])
+        for callee_rva in (follow or []):
+            self.followed.add(self.image_base + callee_rva)
+
+        self.emu.setBreakpoint(self._addr(RETURN_SENTINEL))
+        if strict:
+            self._trap_unmodelled_calls()
+
+    # ------------------------------------------------------------------
+    # Setup helpers
+    # ------------------------------------------------------------------
+
+    def _addr(self, offset):
+        return self.space.getAddress(offset)
+
+    def stub(self, rva, handler):
+        """Replace the function at rva with handler(harness) -> return value."""
+        abs_addr = self.image_base + rva
+        self.stubs[abs_addr] = handler
+        self.emu.setBreakpoint(self._addr(abs_addr))
+
+    def _stub_by_name(self, name, handler):
+        for symbol in self.program.getSymbolTable().getSymbols(name):
+            if not symbol.getAddress().isMemoryAddress():
+                continue
+            abs_addr = symbol.getAddress().getOffset()
+            self.stubs[abs_addr] = handler
+            self.emu.setBreakpoint(symbol.getAddress())
+
+    def _raise_il2cpp_exception(self, harness):
+        raise EmulationError("il2cpp exception helper reached (null reference or bad cast)")
+
+    def callees(self):
+        """{absolute address: symbol name} of every direct callee of the followed functions."""
+        listing = self.program.getListing()
+        function_manager = self.program.getFunctionManager()
+        pending = list(self.followed)
+        seen = set()
+        found = {}
+        while pending:
+            abs_addr = pending.pop()
+            if abs_addr in seen:
+                continue
+            seen.add(abs_addr)
+            func = function_manager.getFunctionAt(self._addr(abs_addr))
+            if func is None:
+                raise EmulationError("No function at 0x{:X}".format(abs_addr))
+            for instr in listing.getInstructions(func.getBody(), True):
+                for ref in instr.getReferencesFrom():
+                    if not ref.getReferenceType().isCall() or not ref.getToAddress().isMemoryAddress():
+                        continue
+                    target = ref.getToAddress().getOffset()
+                    if target in self.followed:
+                        pending.append(target)
+                    elif target not in found:
+                        found[target] = self._symbol_name(target)
+        return found
+
+    def _trap_unmodelled_calls(self):
+        """Breakpoint every direct callee that is neither stubbed nor followed."""
+        for target, name in self.callees().items():
+            if target not in self.stubs:
+                self.stubs[target] = self._unmodelled(name, target)
+                self.emu.setBreakpoint(self._addr(target))
+
+    def _unmodelled(self, name, target):
+        def handler(harness):
+            raise EmulationError("Unmodelled call to {} at 0x{:X}".format(name, target))
+        return handler
+
+    def _symbol_name(self, abs_addr):
+        symbol = self.program.getSymbolTable().getPrimarySymbol(self._addr(abs_addr))
+        if symbol is not None:
+            return symbol.getName()
+        return "FUN_{:x}".format(abs_addr)
+
+    # ------------------------------------------------------------------
+    # Fixtures (fake runtime objects in scratch memory)
+    # ------------------------------------------------------------------
+
+    def alloc(self, size):
+        """Allocate zeroed scratch memory and return its absolute address."""
+        addr = self.heap_next
+        self.emu.writeMemory(self._addr(addr), jarray.zeros(size, 'b'))
+        self.heap_next += (size + 0xF) & ~0xF
+        return addr
+
+    def write_pointer(self, abs_addr, value):
+        self.emu.writeMemoryValue(self._addr(abs_addr), 8, value)
+        self.fixtures.append((abs_addr, 8, value))
+
+    def write_int(self, abs_addr, value, size=4):
+        self.emu.writeMemoryValue(self._addr(abs_addr), size, value)
+        self.fixtures.append((abs_addr, size, value))
+
+    def fake_class(self, class_ptr_rva, static_size=0x100):
+        """Back a DAT_ class pointer slot with a zeroed Il2CppClass and static field block.
+
+        A zeroed class has no pending cctor (flags at +0x12f clear), so the
+        il2cpp_runtime_class_init guard is skipped. Returns (klass, statics).
+        """
+        klass = self.alloc(IL2CPP_CLASS_SIZE)
+        statics = self.alloc(static_size)
+        self.write_pointer(klass + IL2CPP_CLASS_STATIC_FIELDS, statics)
+        self.write_pointer(self.image_base + class_ptr_rva, klass)
+        return klass, statics
+
+    def mark(self):
+        """Snapshot scratch allocations; release(mark) frees everything allocated after it."""
+        return (self.heap_next, len(self.fixtures), self.fake_method_next)
+
+    def release(self, mark):
+        """Drop per-call objects so long sweeps do not accumulate fixtures."""
+        heap_next, fixture_count, fake_method_next = mark
+        for addr in range(fake_method_next, self.fake_method_next, 0x10):
+            self.stubs.pop(addr, None)
+            self.emu.clearBreakpoint(self._addr(addr))
+        self.heap_next = heap_next
+        self.fake_method_next = fake_method_next
+        del self.fixtures[fixture_count:]
+
+    def fake_method(self, handler):
+        """Return an address that behaves like a method implemented by handler.
+
+        Used to fill fake vtable slots so virtual calls land in a stub.
+        """
+        addr = self.fake_method_next
+        self.fake_method_next += 0x10
+        self.stubs[addr] = handler
+        self.emu.setBreakpoint(self._addr(addr))
+        return addr
+
+    def fake_object(self, fields=None, vtable=None, size=0x100):
+        """Allocate an IL2CPP object; fields maps offset -> pointer/int64 value.
+
+        vtable maps klass-relative slot offsets (e.g. 0x180) to handlers; the
+        matching MethodInfo slot (offset + 8) is left zero.
+        """
+        obj = self.alloc(size)
+        if vtable:
+            klass = self.alloc(max(vtable.keys()) + 0x10)
+            for offset, handler in vtable.items():
+                self.write_pointer(klass + offset, self.fake_method(handler))
+            self.write_pointer(obj, klass)
+        for offset, value in (fields or {}).items():
+            self.write_pointer(obj + offset, value)
+        return obj
+
+    def fake_dictionary(self, contents, value_size=4):
+        """Allocate a Dictionary<int, int> stand-in served by the dictionary stubs.
+
+        value_size=8 makes it a Dictionary<int, object> whose values are pointers.
+        """
+        obj = self.alloc(0x20)
+        self.dictionaries[obj] = dict(contents)
+        self.dictionary_value_sizes[obj] = value_size
+        return obj
+
+    def _dictionary(self, name):
+        contents = self.dictionaries.get(self.read_arg(0))
+        if contents is None:
+            raise EmulationError("{} on unknown dictionary 0x{:X}".format(name, self.read_arg(0)))
+        return contents
+
+    def dictionary_try_get_value(self, harness):
+        """Stub for Dictionary<int, V>.TryGetValue(key, out value)."""
+        contents = self._dictionary("TryGetValue")
+        key = self.read_int_arg(1)
+        found = key in contents
+        self.emu.writeMemoryValue(self._addr(self.read_arg(2)), self.dictionary_value_sizes[self.read_arg(0)],
+                                  contents[key] if found else 0)
+        return 1 if found else 0
+
+    def dictionary_contains_key(self, harness):
+        """Stub for Dictionary<int, V>.ContainsKey(key)."""
+        return 1 if self.read_int_arg(1) in self._dictionary("ContainsKey") else 0
+
+    def dictionary_count(self, harness):
+        """Stub for Dictionary<int, V>.get_Count()."""
+        return len(self._dictionary("get_Count"))
+
+    def dictionary_get_item(self, harness):
+        """Stub for Dictionary<int, V>.get_Item(key); missing keys throw in the game."""
+        contents = self.dictionaries.get(self.read_arg(0))
+        key = self.read_int_arg(1)
+        if contents is None or key not in contents:
+            raise EmulationError("KeyNotFoundException for key {}".format(key))
+        return contents[key]
+
+    def read_int(self, abs_addr, size=4, signed=True):
+        raw = self.emu.readMemory(self._addr(abs_addr), size)
+        value = 0
+        for i in range(size):
+            value |= (raw[i] & 0xFF) << (8 * i)
+        if signed and value >= 1 << (8 * size - 1):
+            value -= 1 << (8 * size)
+        return value
+
+    def read_arg(self, index):
+        """Read integer argument index (0-based) at a stub breakpoint."""
+        if index < len(ARG_REGISTERS):
+            return self.emu.readRegister(ARG_REGISTERS[index]).longValue()
+        rsp = self.emu.readRegister("RSP").longValue()
+        # Return address + 0x20 shadow space precede stack arguments
+        return self.read_int(rsp + 8 + 0x20 + 8 * (index - len(ARG_REGISTERS)), 8)
+
+    def read_float_arg(self, index):
+        """Read float argument index (XMM0-XMM3) at a stub breakpoint."""
+        bits = self.emu.readRegister("XMM{}".format(index)).longValue() & 0xFFFFFFFF
+        return struct.unpack("<f", struct.pack("<I", bits))[0]
+
+    def read_int_arg(self, index):
+        """Read argument index as a C# int: the low 32 bits, sign-extended."""
+        value = self.read_arg(index) & 0xFFFFFFFF
+        return value - 0x100000000 if value & 0x80000000 else value
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _write_reg(self, name, value):
+        self.emu.writeRegister(name, BigInteger(str(value & MASK_64)))
+
+    def _restore_fixtures(self):
+        for abs_addr, size, value in self.fixtures:
+            self.emu.writeMemoryValue(self._addr(abs_addr), size, value)
+
+    def call(self, args, ret_bits=32, signed=True):
+        """Call the entry function with integer args and return RAX."""
+        self.faults = []
+        self.run_state = {}
+        self._restore_fixtures()
+
+        rsp = STACK_TOP - 0x100
+        # Stack arguments beyond the fourth, above the shadow space
+        for i, value in enumerate(args[len(ARG_REGISTERS):]):
+            self.emu.writeMemoryValue(self._addr(rsp + 8 + 0x20 + 8 * i), 8, value & MASK_64)
+        self.emu.writeMemoryValue(self._addr(rsp), 8, RETURN_SENTINEL)
+        for reg, value in zip(ARG_REGISTERS, args):
+            self._write_reg(reg, value)
+        for reg in ARG_REGISTERS[len(args):]:
+            self._write_reg(reg, 0)
+        self._write_reg("RSP", rsp)
+        self._write_reg("RAX", 0)
+        self.emu.writeRegister(self.emu.getPCRegister(), BigInteger(str(self.entry)))
+
+        while True:
+            monitor = TimeoutTaskMonitor.timeoutIn(CALL_TIMEOUT_SECONDS, TimeUnit.SECONDS, ConsoleTaskMonitor())
+            stopped = self.emu.run(monitor)
+            pc = self.emu.getExecutionAddress().getOffset()
+            if self.faults:
+                raise EmulationError("; ".join(self.faults))
+            if not stopped:
+                raise EmulationError("Emulation stopped at 0x{:X}: {}".format(pc, self.emu.getLastError()))
+            if pc == RETURN_SENTINEL:
+                break
+            handler = self.stubs.get(pc)
+            if handler is None:
+                raise EmulationError("Unexpected breakpoint at 0x{:X}".format(pc))
+            self._return_from_stub(handler(self))
+
+        value = self.emu.readRegister("RAX").longValue() & ((1 << ret_bits) - 1)
+        if signed and value >= 1 << (ret_bits - 1):
+            value -= 1 << ret_bits
+        return value
+
+    def _return_from_stub(self, value):
+        """Emulate `ret` out of a stubbed callee with value in RAX."""
+        rsp = self.emu.readRegister("RSP").longValue()
+        return_addr = self.read_int(rsp, 8, signed=False)
+        self._write_reg("RAX", value or 0)
+        self._write_reg("RSP", rsp + 8)
+        self.emu.writeRegister(self.emu.getPCRegister(), BigInteger(str(return_addr)))
+
+    def dispose(self):
+        self.emu.dispose()
+
+
+def sweep(emulator, domain, make_args, ret_bits=32, signed=True):
+    """Run emulator over every input in domain; returns (input, result) pairs."""
+    rows = []
+    for value in domain:
+        rows.append((value, emulator.call(make_args(value), ret_bits, signed)))
+    return rows
+
+
+class RngEnumerator(object):
+    """Stub for UnityEngine.Random.Range(int min, int max) that walks every outcome.
+
+    Each emulated call consumes the next scheduled roll; rolls past the end of
+    the schedule start at min. advance() then moves to the next untried
+    combination like an odometer, so repeated runs cover every roll path once.
+    """
+
+    def __init__(self):
+        self.schedule = []
+        self.ranges = []
+        self.position = 0
+
+    def reset(self):
+        self.schedule = []
+        self.ranges = []
+        self.position = 0
+
+    def handler(self, harness):
+        low = harness.read_int_arg(0)
+        high = harness.read_int_arg(1)
+        if high <= low:
+            # Random.Range returns min when the range is empty: a one-outcome roll,
+            # recorded so later rolls keep their place in schedule and ranges
+            high = low + 1
+        if self.position < len(self.schedule):
+            self.ranges[self.position] = (low, high)
+        else:
+            self.schedule.append(low)
+            self.ranges.append((low, high))
+        value = self.schedule[self.position]
+        self.position += 1
+        return value
+
+    def probability(self):
+        """Probability of the roll path taken by the last run."""
+        p = 1.0
+        for low, high in self.ranges[:self.position]:
+            p /= (high - low)
+        return p
+
+    def advance(self):
+        """Move to the next roll path; False once every path has been taken."""
+        del self.schedule[self.position:]
+        del self.ranges[self.position:]
+        while self.schedule:
+            low, high = self.ranges[-1]
+            if self.schedule[-1] + 1 < high:
+                self.schedule[-1] += 1
+                self.position = 0
+                return True
+            self.schedule.pop()
+            self.ranges.pop()
+        return False
+
+
+def sweep_distribution(emulator, rng, point, make_args, result=None, ret_bits=32, signed=True):
+    """Run one grid point over every RNG path; returns {result: probability}.
+
+    result(harness, rax) extracts the value of interest (defaults to RAX), for
+    functions whose effect is a setter call rather than a return value.
+    """
+    distribution = {}
+    rng.reset()
+    while True:
+        rng.position = 0
+        rax = emulator.call(make_args(point), ret_bits, signed)
+        value = result(emulator, rax) if result is not None else rax
+        distribution[value] = distribution.get(value, 0.0) + rng.probability()
+        if not rng.advance():
+            break
+    return distribution
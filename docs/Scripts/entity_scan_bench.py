@@ -0,0 +1,394 @@
+"""Replay entity snapshots through EntityScanner's scan/filter/sort and candidate replacements.
+
+Runs under regular CPython 3 (no Ghidra imports).
+
+EntityScanner.ScanEntities runs on every NextEntity/PreviousEntity with an
+empty list and on every manual rescan:
+
+    currentSet = new HashSet(fieldEntities)            # all entities
+    toRemove = entityMap.Keys.Where(!currentSet.Contains).ToList()
+    entities = entityMap.Values.ToList()
+    ApplyFilter: filtered = entities.Where(category).ToList()
+                 filtered = filtered.OrderBy(Vector3.Distance to player).ToList()
+
+This models that algorithm and three alternatives over the same snapshots:
+
+    current      - the code above, collection for collection
+    incremental  - generation stamps instead of the HashSet, one list kept in
+                   place and re-sorted in place (nearly sorted between scans)
+    buckets      - incremental, plus one list per EntityCategory, so a
+                   category filter sorts only its own bucket
+    grid         - uniform grid of GRID_CELL world units updated on moves;
+                   entities come out ring by ring around the player through a
+                   heap, so --nearest K stops after K
+
+Every strategy must return the same order (distance, then entity id), which is
+checked on every scan. Reported per entity count: median and p95 scan
+latency, and allocations per scan. "allocs" counts the managed collections
+and copied element slots the C# equivalent would allocate. "bytes" is the
+Python peak from tracemalloc and only serves as a cross-check.
+
+Snapshots: JSON lines, one scan per line:
+    {"map": 12, "player": [x, y, z], "entities": [[id, x, y, z, category], ...]}
+Without --snapshots, a synthetic walk is generated: entities scattered over
+a map, the player moving each scan, and a few entities appearing or
+disappearing (--churn) as NPCs spawn and chests open.
+
+Usage:
+    python entity_scan_bench.py                                   # counts 25..800, all categories
+    python entity_scan_bench.py --counts 50 200 1000 --category 2 # NPCs only
+    python entity_scan_bench.py --nearest 5                       # only the 5 nearest are needed
+    python entity_scan_bench.py --snapshots scans.jsonl
+"""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+CATEGORY_ALL = 0
+CATEGORIES = (1, 2, 3, 4, 5)              # Chests, NPCs, MapExits, Events, Vehicles
+CATEGORY_WEIGHTS = (0.15, 0.45, 0.15, 0.2, 0.05)
+CELL_SIZE = 16.0                          # world units per map cell
+GRID_CELL = CELL_SIZE * 8
+DEFAULT_COUNTS = (25, 50, 100, 200, 400, 800)
+
+
+def distance(a, b):
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+
+# -- snapshots ------------------------------------------------------------------------
+
+def synthetic_snapshots(count, scans, churn=0.02, map_cells=128, seed=1):
+    """[snapshot] for a player walking a map with count entities, some coming and going."""
+    rng = random.Random(seed)
+    half = map_cells * CELL_SIZE / 2
+    next_id = [0]
+
+    def new_entity():
+        next_id[0] += 1
+        category = rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+        return [next_id[0], rng.uniform(-half, half), rng.uniform(-half, half), 0.0, category]
+
+    entities = [new_entity() for _ in range(count)]
+    player = [0.0, 0.0, 0.0]
+    heading = (CELL_SIZE, 0.0)
+    snapshots = []
+    for _ in range(scans):
+        if rng.random() < 0.2:
+            heading = rng.choice(((CELL_SIZE, 0.0), (-CELL_SIZE, 0.0), (0.0, CELL_SIZE), (0.0, -CELL_SIZE)))
+        player = [min(max(player[0] + heading[0], -half), half), min(max(player[1] + heading[1], -half), half), 0.0]
+        for _ in range(int(round(count * churn))):
+            entities[rng.randrange(len(entities))] = new_entity()
+        for entity in rng.sample(entities, max(1, count // 20)):        # NPCs wander
+            entity[1] += rng.choice((-CELL_SIZE, 0.0, CELL_SIZE))
+            entity[2] += rng.choice((-CELL_SIZE, 0.0, CELL_SIZE))
+        snapshots.append({"map": 1, "player": list(player), "entities": [list(e) for e in entities]})
+    return snapshots
+
+
+def load_snapshots(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# -- strategies -----------------------------------------------------------------------
+
+class Strategy(object):
+    """One scan algorithm; scan() returns entity ids in announcement order."""
+
+    name = ""
+
+    def __init__(self, category, nearest=None):
+        self.category = category
+        self.nearest = nearest
+        self.allocations = 0
+        self.map = None
+
+    def allocate(self, slots):
+        """Count one managed collection of slots elements."""
+        self.allocations += 1 + slots
+
+    def reset_for(self, snapshot):
+        if snapshot.get("map") != self.map:
+            self.map = snapshot.get("map")
+            self.clear()                            # ForceRescan on map change
+
+    def clear(self):
+        raise NotImplementedError
+
+    def scan(self, snapshot):
+        raise NotImplementedError
+
+
+class Current(Strategy):
+    """EntityScanner.ScanEntities + ApplyFilter as written."""
+
+    name = "current"
+
+    def clear(self):
+        self.entity_map = {}
+
+    def scan(self, snapshot):
+        self.reset_for(snapshot)
+        field_entities = snapshot["entities"]
+        current_set = set(e[0] for e in field_entities)
+        self.allocate(len(current_set))
+        to_remove = [k for k in self.entity_map if k not in current_set]
+        self.allocate(len(to_remove))
+        for key in to_remove:
+            del self.entity_map[key]
+        for e in field_entities:
+            if e[0] not in self.entity_map:
+                self.entity_map[e[0]] = (e[0], (e[1], e[2], e[3]), e[4])
+                self.allocate(0)                    # NavigableEntity
+            else:
+                self.entity_map[e[0]] = (e[0], (e[1], e[2], e[3]), e[4])
+        entities = list(self.entity_map.values())
+        self.allocate(len(entities))
+        if self.category == CATEGORY_ALL:
+            filtered = list(entities)
+        else:
+            filtered = [e for e in entities if e[2] == self.category]
+        self.allocate(len(filtered))
+        player = snapshot["player"]
+        filtered = sorted(filtered, key=lambda e: (distance(e[1], player), e[0]))
+        self.allocate(2 * len(filtered))            # OrderBy key buffer + ToList
+        ids = [e[0] for e in filtered]
+        return ids[:self.nearest] if self.nearest else ids
+
+
+class Incremental(Strategy):
+    """Generation stamps and one list re-sorted in place."""
+
+    name = "incremental"
+
+    def clear(self):
+        self.records = {}                           # id -> [id, position, category, generation]
+        self.ordered = []
+        self.generation = 0
+
+    def update(self, snapshot):
+        """Apply one snapshot; returns (added records, whether anything was removed)."""
+        self.generation += 1
+        added = []
+        for e in snapshot["entities"]:
+            record = self.records.get(e[0])
+            if record is None:
+                record = [e[0], (e[1], e[2], e[3]), e[4], self.generation]
+                self.records[e[0]] = record
+                self.allocate(0)
+                added.append(record)
+            else:
+                record[1] = (e[1], e[2], e[3])
+                record[3] = self.generation
+        stale = len(self.records) != len(snapshot["entities"])
+        if stale:
+            for key in [k for k, r in self.records.items() if r[3] != self.generation]:
+                self.removed(self.records.pop(key))
+        return added, stale
+
+    def removed(self, record):
+        pass
+
+    def matches(self, record):
+        return self.category == CATEGORY_ALL or record[2] == self.category
+
+    def sort_in_place(self, records, player):
+        records.sort(key=lambda r: (distance(r[1], player), r[0]))
+        self.allocate(len(records))                 # List.Sort with a key array; no new list
+
+    def scan(self, snapshot):
+        self.reset_for(snapshot)
+        added, stale = self.update(snapshot)
+        if stale:
+            generation = self.generation
+            self.ordered[:] = [r for r in self.ordered if r[3] == generation]    # RemoveAll, in place
+        self.ordered.extend(r for r in added if self.matches(r))
+        self.sort_in_place(self.ordered, snapshot["player"])
+        ids = [r[0] for r in (self.ordered[:self.nearest] if self.nearest else self.ordered)]
+        return ids
+
+
+class Buckets(Incremental):
+    """Incremental, with one list per category."""
+
+    name = "buckets"
+
+    def clear(self):
+        Incremental.clear(self)
+        self.buckets = dict((category, []) for category in CATEGORIES)
+
+    def scan(self, snapshot):
+        self.reset_for(snapshot)
+        added, stale = self.update(snapshot)
+        for record in added:
+            self.buckets[record[2]].append(record)
+        wanted = CATEGORIES if self.category == CATEGORY_ALL else (self.category,)
+        if stale:
+            generation = self.generation
+            for category in CATEGORIES:
+                bucket = self.buckets[category]
+                bucket[:] = [r for r in bucket if r[3] == generation]
+        player = snapshot["player"]
+        for category in wanted:
+            self.sort_in_place(self.buckets[category], player)
+        if len(wanted) == 1:
+            ordered = self.buckets[wanted[0]]
+        else:
+            ordered = list(heapq.merge(*[self.buckets[c] for c in wanted],
+                                       key=lambda r: (distance(r[1], player), r[0])))
+            self.allocate(len(ordered))
+        return [r[0] for r in (ordered[:self.nearest] if self.nearest else ordered)]
+
+
+class Grid(Incremental):
+    """Uniform grid over world positions; nearest-first traversal ring by ring."""
+
+    name = "grid"
+
+    def clear(self):
+        Incremental.clear(self)
+        self.cells = {}                             # (cx, cy) -> {id: record}; record[4] is its cell
+
+    @staticmethod
+    def cell_of(position):
+        return int(math.floor(position[0] / GRID_CELL)), int(math.floor(position[1] / GRID_CELL))
+
+    def removed(self, record):
+        self.cells[record[4]].pop(record[0], None)
+
+    def scan(self, snapshot):
+        self.reset_for(snapshot)
+        self.update(snapshot)
+        for record in self.records.values():
+            cell = self.cell_of(record[1])
+            if len(record) == 4:
+                record.append(cell)
+                self.cells.setdefault(cell, {})[record[0]] = record
+            elif record[4] != cell:
+                self.cells[record[4]].pop(record[0], None)
+                record[4] = cell
+                self.cells.setdefault(cell, {})[record[0]] = record
+        return self.nearest_first(snapshot["player"])
+
+    def nearest_first(self, player):
+        """Ids by distance: ring r is pushed before anything farther than (r - 1) cells is popped."""
+        center = self.cell_of(player)
+        wanted = self.nearest or len(self.records)
+        heap = []
+        result = []
+        occupied = [c for c, members in self.cells.items() if members]
+        max_ring = max([max(abs(c[0] - center[0]), abs(c[1] - center[1])) for c in occupied] or [0])
+        ring = 0
+        while len(result) < wanted and (heap or ring <= max_ring):
+            if ring <= max_ring:
+                for cell in ring_cells(center, ring):
+                    for record in self.cells.get(cell, {}).values():
+                        if self.matches(record):
+                            heapq.heappush(heap, (distance(record[1], player), record[0]))
+                # anything within (ring * GRID_CELL) of the player is final once ring is pushed
+                bound = ring * GRID_CELL
+                ring += 1
+            else:
+                bound = float("inf")
+            while heap and heap[0][0] <= bound and len(result) < wanted:
+                result.append(heapq.heappop(heap)[1])
+        self.allocate(len(result) + len(heap))
+        return result
+
+
+def ring_cells(center, ring):
+    cx, cy = center
+    if ring == 0:
+        return [center]
+    cells = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+    cells += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+    cells += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+    cells += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+    return cells
+
+
+STRATEGIES = (Current, Incremental, Buckets, Grid)
+
+
+# -- benchmark ------------------------------------------------------------------------
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_strategy(cls, snapshots, category, nearest):
+    """(order per scan, latencies, allocations per scan, peak bytes per scan)."""
+    strategy = cls(category, nearest)
+    orders = []
+    latencies = []
+    for snapshot in snapshots:
+        started = time.perf_counter()
+        orders.append(strategy.scan(snapshot))
+        latencies.append(time.perf_counter() - started)
+    allocations = strategy.allocations / float(len(snapshots))
+
+    strategy = cls(category, nearest)
+    tracemalloc.start()
+    peaks = []
+    for snapshot in snapshots:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        strategy.scan(snapshot)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return orders, latencies, allocations, sum(peaks) / float(len(peaks))
+
+
+def bench(label, snapshots, category, nearest):
+    print("{} ({} scans)".format(label, len(snapshots)))
+    print("  {:<12} {:>10} {:>10} {:>10} {:>10}".format("strategy", "median ms", "p95 ms", "allocs", "bytes"))
+    reference = None
+    failed = False
+    for cls in STRATEGIES:
+        orders, latencies, allocations, peak = run_strategy(cls, snapshots, category, nearest)
+        if reference is None:
+            reference = orders
+        elif orders != reference:
+            scan = next(i for i, (a, b) in enumerate(zip(orders, reference)) if a != b)
+            print("  {:<12} ORDER MISMATCH at scan {}".format(cls.name, scan))
+            failed = True
+            continue
+        print("  {:<12} {:>10.3f} {:>10.3f} {:>10.0f} {:>10.0f}".format(
+            cls.name, percentile(latencies, 0.5) * 1000, percentile(latencies, 0.95) * 1000, allocations, peak))
+    print("")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EntityScanner scan/filter/sort strategies over entity snapshots.")
+    parser.add_argument("--snapshots", help="recorded snapshots (JSON lines); default: synthetic")
+    parser.add_argument("--counts", type=int, nargs="+", default=list(DEFAULT_COUNTS), help="synthetic entity counts")
+    parser.add_argument("--scans", type=int, default=200, help="synthetic scans per count")
+    parser.add_argument("--churn", type=float, default=0.02, help="fraction of entities replaced per scan")
+    parser.add_argument("--category", type=int, default=CATEGORY_ALL, help="EntityCategory filter (0 = All)")
+    parser.add_argument("--nearest", type=int, help="only the K nearest entities are needed")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print("Category: {}  Nearest: {}".format(args.category, args.nearest or "all"))
+    print("")
+    failed = False
+    if args.snapshots:
+        failed = bench(args.snapshots, load_snapshots(args.snapshots), args.category, args.nearest)
+    else:
+        for count in args.counts:
+            snapshots = synthetic_snapshots(count, args.scans, args.churn, seed=args.seed)
+            failed |= bench("{} entities".format(count), snapshots, args.category, args.nearest)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# Ghidra headless script that exports per-function signature features for signature_db.py
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Uses il2cpp_program.py for script.json
+#
+# Every Pixel Remaster title is an IL2CPP build of the same engine, so most of
+# FF2's target functions exist in FF1/FF3 with other RVAs (and sometimes other
+# field offsets). This writes, for every ScriptMethod that has a function in
+# the analyzed program, the features signature_db.py turns into a MinHash
+# signature:
+#
+#   - p-code op mnemonic 4-grams of the raw instruction p-code (no decompile,
+#     so the whole binary exports in minutes; constants and registers are
+#     left out, so shifted offsets and register allocation still match)
+#   - "call:<name>" for every callee that script.json names (stable across
+#     titles because the class/method names are)
+#
+# Features are stored as CRC32 values. Output: signatures_<title>.jsonl - one
+# header line {"title", "program", "image_base", "sha256", "functions"} then one
+# {"name", "rva", "size", "instructions", "calls", "features"} line per function.
+# Import with: python signature_db.py import signatures_<title>.jsonl
+#
+# Usage (run_ghidra_analysis.bat signatures analyze):
+#   -postScript export_signatures.py [title] [output.jsonl] [name prefix ...]
+
+from ghidra.program.model.pcode import PcodeOp
+from ghidra.util.task import ConsoleTaskMonitor
+from il2cpp_program import SCRIPT_JSON_PATH, load_script_json
+import codecs
+import json
+import os
+import time
+import zlib
+
+# Paths
+OUTPUT_DIR = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\ff2-screen-reader\\docs\\Scripts"
+DEFAULT_TITLE = "FF2"
+
+NGRAM_SIZE = 4
+# Functions larger than this are exported by name only (features are too diluted to help)
+MAX_INSTRUCTIONS = 20000
+PROGRESS_EVERY = 5000
+
+
+def feature_hash(text):
+    return zlib.crc32(text.encode("utf-8")) & 0xffffffff
+
+
+def function_features(program, func, name_by_entry):
+    """(instruction count, call count, sorted feature hashes) for one function."""
+    listing = program.getListing()
+    mnemonics = []
+    callees = set()
+    calls = 0
+    instructions = 0
+    for instruction in listing.getInstructions(func.getBody(), True):
+        instructions += 1
+        if instructions > MAX_INSTRUCTIONS:
+            return instructions, calls, []
+        for op in instruction.getPcode():
+            opcode = op.getOpcode()
+            mnemonics.append("%s" % PcodeOp.getMnemonic(opcode))
+            if opcode == PcodeOp.CALL:
+                calls += 1
+                target = name_by_entry.get(op.getInput(0).getOffset())
+                if target:
+                    callees.add(target)
+    features = set()
+    for i in range(max(1, len(mnemonics) - NGRAM_SIZE + 1)):
+        features.add(feature_hash(" ".join(mnemonics[i:i + NGRAM_SIZE])))
+    for callee in callees:
+        features.add(feature_hash("call:" + callee))
+    return instructions, calls, sorted(features)
+
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Signature Export")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    args = list(getScriptArgs())
+    title = args[0] if args else DEFAULT_TITLE
+    output_path = args[1] if len(args) > 1 else os.path.join(OUTPUT_DIR, "signatures_" + title + ".jsonl")
+    prefixes = tuple(args[2:])
+    image_base = program.getImageBase().getOffset()
+    print("Program: " + program.getName())
+    print("Title: " + title)
+    print("Output: " + output_path)
+    if prefixes:
+        print("Name prefixes: " + ", ".join(prefixes))
+    print("")
+
+    data = load_script_json(SCRIPT_JSON_PATH)
+    if data is None:
+        print("ERROR: script.json is required for function names")
+        return
+    methods = []
+    name_by_entry = {}
+    for method in data.get("ScriptMethod", []):
+        addr = method.get("Address")
+        name = method.get("Name")
+        if addr and name:
+            name_by_entry.setdefault(image_base + addr, name)
+            if not prefixes or name.startswith(prefixes):
+                methods.append((addr, name))
+    data = None
+    methods.sort()
+    print("Methods: " + str(len(methods)))
+
+    space = program.getAddressFactory().getDefaultAddressSpace()
+    function_manager = program.getFunctionManager()
+    monitor = ConsoleTaskMonitor()
+    started = time.time()
+    exported = 0
+    missing = 0
+    lines = []
+    seen = set()
+    for i, (rva, name) in enumerate(methods):
+        if monitor.isCancelled():
+            break
+        if i and i % PROGRESS_EVERY == 0:
+            print("  {} / {} ({:.0f}s)".format(i, len(methods), time.time() - started))
+        if rva in seen:
+            continue    # shared bodies (generic sharing, identical folding) are exported once
+        seen.add(rva)
+        func = function_manager.getFunctionAt(space.getAddress(image_base + rva))
+        if func is None:
+            missing += 1
+            continue
+        instructions, calls, features = function_features(program, func, name_by_entry)
+        lines.append(json.dumps({"name": name, "rva": rva, "size": func.getBody().getNumAddresses(),
+                                 "instructions": instructions, "calls": calls, "features": features},
+                                separators=(",", ":")))
+        exported += 1
+
+    header = {"title": title, "program": "%s" % program.getName(), "image_base": image_base,
+              "sha256": "%s" % (program.getExecutableSHA256() or ""), "functions": exported}
+    with codecs.open(output_path, 'w', 'utf-8') as f:
+        f.write(json.dumps(header, sort_keys=True) + "\n")
+        for line in lines:
+            f.write(line + "\n")
+
+    print("")
+    print("=" * 70)
+    print("Exported {} functions ({} without a function body) in {:.0f}s".format(
+        exported, missing, time.time() - started))
+    print("  Output: " + output_path)
+    print("=" * 70)
+
+# Run the script
+run()
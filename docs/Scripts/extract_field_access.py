@@ -0,0 +1,424 @@
+# Ghidra headless script to resolve pointer offsets in decompiled code to IL2CPP field names
+# Compatible with Jython 2.7 (Ghidra's Python interpreter)
+# Uses il2cpp_program.py for header types and script.json signatures
+#
+# Decompiled bodies read like
+#     *(longlong *)(*(longlong *)(param_2 + 0x20) + 0x188)
+# and every offset used to be matched to a field by hand from dump.cs. This
+# walks the high p-code of each function instead: every LOAD/STORE address is
+# traced back through INT_ADD/PTRSUB/PTRADD/CAST to a typed root (a parameter
+# typed from the script.json method signature, a ScriptMetadata global such as
+# Foo_TypeInfo, or the return value of a known method), and each step is looked
+# up in the il2cpp_ghidra.h structs (Foo_o -> Foo_Fields, Foo_c -> static_fields,
+# vtable slots, array items).
+#
+# Functions are the ones already in decompiled_<group>.c, so the output lines
+# up with the existing corpus. Output per group:
+#   decompiled_<group>.fields.c    - decompiled C with /* Class.field */ notes per
+#                                    line and a "Fields touched" table per function
+#   decompiled_<group>.fields.csv  - function,rva,access,class,field,offset,type,chain
+#
+# Usage (run_ghidra_analysis.bat fields analyze):
+#   -postScript extract_field_access.py [group ...]   # default: every group
+
+from ghidra.app.decompiler import DecompInterface
+from ghidra.app.decompiler.component import DecompilerUtils
+from ghidra.program.model.data import Array, Pointer, Structure, TypeDef
+from ghidra.program.model.pcode import HighParam, PcodeOp
+from ghidra.util.task import ConsoleTaskMonitor
+from decomp_corpus import SCRIPT_DIR, corpus_files, group_name, parse_file
+from il2cpp_program import (SCRIPT_JSON_PATH, ensure_il2cpp_types, find_data_type, get_or_create_function,
+                            load_script_json, metadata_globals, method_signatures)
+import codecs
+import os
+
+# Paths
+OUTPUT_DIR = SCRIPT_DIR
+
+# How far back a value is traced through casts, copies and phi nodes
+MAX_TRACE_DEPTH = 12
+
+# il2cpp_ghidra.h struct suffixes -> how the owning class is shown
+STRUCT_SUFFIXES = ["_StaticFields", "_Fields", "_VTable", "_o", "_c"]
+
+
+def strip_typedefs(dt):
+    while isinstance(dt, TypeDef):
+        dt = dt.getBaseDataType()
+    return dt
+
+
+def class_label(struct_name):
+    """SkillLevelContentView_o -> SkillLevelContentView, Foo_c stays Foo_c (class object)."""
+    for suffix in STRUCT_SUFFIXES:
+        if struct_name.endswith(suffix):
+            if suffix in ("_c", "_StaticFields", "_VTable"):
+                return struct_name
+            return struct_name[:-len(suffix)]
+    return struct_name
+
+
+class TypeResolver(object):
+    """Parses script.json C type strings into program data types (cached)."""
+
+    def __init__(self, program):
+        self.dtm = program.getDataTypeManager()
+        self.cache = {}
+
+    def parse(self, ctype):
+        ctype = (ctype or "").replace("const ", "").strip()
+        if not ctype:
+            return None
+        if ctype in self.cache:
+            return self.cache[ctype]
+        depth = ctype.count("*")
+        base = find_data_type(self.dtm, ctype.replace("*", "").strip())
+        result = None
+        if base is not None:
+            result = base
+            for _ in range(depth):
+                result = self.dtm.getPointer(result)
+        self.cache[ctype] = result
+        return result
+
+
+def field_at(dt, offset):
+    """Descend dt to the leaf member at offset; returns (owner struct name, path list, leaf type, rest)."""
+    owner = None
+    path = []
+    while True:
+        dt = strip_typedefs(dt)
+        if isinstance(dt, Structure):
+            if owner is None:
+                owner = dt.getName()
+            if hasattr(dt, "getComponentContaining"):
+                comp = dt.getComponentContaining(offset)
+            else:
+                comp = dt.getComponentAt(offset)
+            if comp is None:
+                return owner, path, None, offset
+            path.append(comp.getFieldName() or "field_0x{:x}".format(comp.getOffset()))
+            offset -= comp.getOffset()
+            dt = comp.getDataType()
+        elif isinstance(dt, Array) and path:
+            size = dt.getElementLength() or 1
+            path[-1] += "[{}]".format(offset // size)
+            offset -= (offset // size) * size
+            dt = dt.getDataType()
+        else:
+            return owner, path, dt, offset
+        if offset == 0 and not isinstance(strip_typedefs(dt), (Structure, Array)):
+            return owner, path, dt, 0
+
+
+class FieldAccess(object):
+    """One resolved (or unresolved) LOAD/STORE."""
+
+    def __init__(self, kind, offset, owner, path, field_type, chain):
+        self.kind = kind
+        self.offset = offset
+        self.owner = owner
+        self.path = path
+        self.field_type = field_type
+        self.chain = chain
+
+    @property
+    def resolved(self):
+        return self.owner is not None and bool(self.path)
+
+    @property
+    def field_name(self):
+        path = list(self.path)
+        if path and path[0] == "fields" and len(path) > 1:
+            path = path[1:]
+        return ".".join(path)
+
+    @property
+    def label(self):
+        if not self.resolved:
+            return "+0x{:x}".format(self.offset)
+        return class_label(self.owner) + "." + self.field_name
+
+
+class FieldExtractor(object):
+    """Traces LOAD/STORE addresses in one HighFunction back to typed roots."""
+
+    def __init__(self, program, signatures, globals_by_rva):
+        self.program = program
+        self.image_base = program.getImageBase().getOffset()
+        self.signatures = signatures
+        self.globals_by_rva = globals_by_rva
+        self.types = TypeResolver(program)
+        self.param_types = []
+
+    def begin(self, rva):
+        entry = self.signatures.get(rva)
+        self.param_types = [self.types.parse(t) for t in entry[2]] if entry else []
+
+    # -- value types ---------------------------------------------------------
+
+    def type_of(self, vn, depth=0):
+        """Data type of the value in vn, when it can be derived from IL2CPP metadata."""
+        if vn is None or depth > MAX_TRACE_DEPTH or vn.isConstant():
+            return None
+        if vn.isAddress():
+            entry = self.globals_by_rva.get(vn.getOffset() - self.image_base)
+            return self.types.parse(entry[1]) if entry else None
+        high = vn.getHigh()
+        if isinstance(high, HighParam) and vn.getDef() is None:
+            slot = high.getSlot()
+            return self.param_types[slot] if slot < len(self.param_types) else None
+        op = vn.getDef()
+        if op is None:
+            return None
+        code = op.getOpcode()
+        if code in (PcodeOp.CAST, PcodeOp.COPY, PcodeOp.INDIRECT):
+            return self.type_of(op.getInput(0), depth + 1)
+        if code == PcodeOp.MULTIEQUAL:
+            for i in range(op.getNumInputs()):
+                found = self.type_of(op.getInput(i), depth + 1)
+                if found is not None:
+                    return found
+            return None
+        if code == PcodeOp.LOAD:
+            access = self.resolve(op.getInput(1), "R", depth + 1)
+            return access.field_type if access is not None and access.resolved else None
+        if code == PcodeOp.CALL:
+            target = op.getInput(0)
+            entry = self.signatures.get(target.getOffset() - self.image_base)
+            return self.types.parse(entry[1]) if entry else None
+        return None
+
+    def root_name(self, vn, depth=0):
+        if vn is None or depth > MAX_TRACE_DEPTH:
+            return "?"
+        if vn.isConstant():
+            return "0x{:x}".format(vn.getOffset())
+        if vn.isAddress():
+            entry = self.globals_by_rva.get(vn.getOffset() - self.image_base)
+            return entry[0] if entry else "DAT_{:x}".format(vn.getOffset())
+        op = vn.getDef()
+        if op is not None:
+            code = op.getOpcode()
+            if code in (PcodeOp.CAST, PcodeOp.COPY, PcodeOp.INDIRECT):
+                return self.root_name(op.getInput(0), depth + 1)
+            if code == PcodeOp.LOAD:
+                access = self.resolve(op.getInput(1), "R", depth + 1)
+                return access.chain if access is not None else "*?"
+            if code == PcodeOp.CALL:
+                target = op.getInput(0).getOffset() - self.image_base
+                entry = self.signatures.get(target)
+                return (entry[0] if entry else "FUN_{:x}".format(op.getInput(0).getOffset())) + "()"
+        high = vn.getHigh()
+        name = high.getName() if high is not None else None
+        return name or "?"
+
+    # -- addresses -----------------------------------------------------------
+
+    def split_address(self, vn, depth=0):
+        """(base varnode, constant offset) for an address expression."""
+        op = vn.getDef()
+        if op is None or depth > MAX_TRACE_DEPTH:
+            return vn, 0
+        code = op.getOpcode()
+        if code in (PcodeOp.INT_ADD, PcodeOp.PTRSUB) and op.getInput(1).isConstant():
+            base, inner = self.split_address(op.getInput(0), depth + 1)
+            return base, inner + op.getInput(1).getOffset()
+        if code == PcodeOp.PTRADD and op.getInput(1).isConstant() and op.getInput(2).isConstant():
+            base, inner = self.split_address(op.getInput(0), depth + 1)
+            return base, inner + op.getInput(1).getOffset() * op.getInput(2).getOffset()
+        if code in (PcodeOp.CAST, PcodeOp.COPY):
+            return self.split_address(op.getInput(0), depth + 1)
+        return vn, 0
+
+    def resolve(self, address_vn, kind, depth=0):
+        """FieldAccess for the memory reference at address_vn."""
+        if address_vn is None or depth > MAX_TRACE_DEPTH:
+            return None
+        base, offset = self.split_address(address_vn)
+        base_type = strip_typedefs(self.type_of(base, depth + 1))
+        owner, path, field_type = None, [], None
+        if isinstance(base_type, Pointer) and base_type.getDataType() is not None:
+            owner, path, field_type, rest = field_at(base_type.getDataType(), offset)
+            if rest:
+                path = path + ["+0x{:x}".format(rest)]
+        parent = self.root_name(base, depth + 1)
+        access = FieldAccess(kind, offset, owner, path, field_type, "")
+        step = access.field_name if access.resolved else "+0x{:x}".format(offset)
+        access.chain = parent + "->" + step
+        return access
+
+    def extract(self, high_function):
+        """{op seqnum: FieldAccess} for every LOAD/STORE, plus the address ops that feed them."""
+        accesses = {}
+        ops = high_function.getPcodeOps()
+        while ops.hasNext():
+            op = ops.next()
+            code = op.getOpcode()
+            if code not in (PcodeOp.LOAD, PcodeOp.STORE):
+                continue
+            access = self.resolve(op.getInput(1), "R" if code == PcodeOp.LOAD else "W")
+            if access is None:
+                continue
+            accesses[op.getSeqnum()] = access
+            address_op = op.getInput(1).getDef()
+            if address_op is not None and address_op.getSeqnum() not in accesses:
+                accesses[address_op.getSeqnum()] = access
+        return accesses
+
+
+def annotate(markup, accesses):
+    """Render the C markup line by line, appending /* Class.field */ for resolved accesses."""
+    lines = []
+    for line in DecompilerUtils.toLines(markup):
+        text = "".join(token.toString() for token in line.getAllTokens())
+        labels = []
+        for token in line.getAllTokens():
+            op = token.getPcodeOp()
+            access = accesses.get(op.getSeqnum()) if op is not None else None
+            if access is not None and access.resolved and access.label not in labels:
+                labels.append(access.label)
+        if labels:
+            text += "  /* " + ", ".join(labels) + " */"
+        lines.append(line.getIndentString() + text)
+    return "\n".join(lines)
+
+
+def field_table(accesses):
+    """Unique (kind, label, chain) rows, sorted by label."""
+    rows = []
+    seen = set()
+    for access in sorted(accesses.values(), key=lambda a: (a.label, a.kind)):
+        key = (access.kind, access.label, access.chain)
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append(access)
+    return rows
+
+
+def table_comment(rows):
+    if not rows:
+        return "/* Fields touched: none resolved */"
+    out = ["/* Fields touched:"]
+    for access in rows:
+        type_name = access.field_type.getName() if access.field_type is not None else "?"
+        out.append(" *   {}  {:<48} +0x{:<4x} {:<28} {}".format(
+            access.kind, access.label, access.offset, type_name, access.chain))
+    out.append(" */")
+    return "\n".join(out)
+
+
+def csv_field(value):
+    value = str(value)
+    if any(c in value for c in ",\"\n"):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def process_group(decompiler, program, extractor, path):
+    """Annotate every function listed in one decompiled_<group>.c file."""
+    group = group_name(path)
+    _, functions = parse_file(path)
+    out_c = ["/*",
+             " * FF2 Field Access Annotations - " + group,
+             " * Generated by extract_field_access.py from " + os.path.basename(path),
+             " * Program: " + program.getName(),
+             " */", ""]
+    out_csv = ["function,rva,access,class,field,offset,type,chain"]
+    resolved = 0
+    unresolved = 0
+    current_class = ""
+    for func in functions:
+        if func.class_name != current_class:
+            current_class = func.class_name
+            out_c.extend(["", "/" + "=" * 68 + "/", "/* " + current_class, " " + "=" * 67 + "/"])
+        out_c.extend(["", "/" + "*" * 68 + "/", "/* " + func.name, " * RVA: 0x{:X}".format(func.rva),
+                      " * Address: 0x{:X}".format(func.address), " " + "*" * 67 + "/", ""])
+        print("  " + func.name)
+        ghidra_func = get_or_create_function(program, func.rva, func.name)
+        results = decompiler.decompileFunction(ghidra_func, 120, ConsoleTaskMonitor()) if ghidra_func else None
+        if results is None or not results.decompileCompleted() or results.getHighFunction() is None:
+            out_c.append("/* DECOMPILATION FAILED */")
+            continue
+        extractor.begin(func.rva)
+        accesses = extractor.extract(results.getHighFunction())
+        rows = field_table(accesses)
+        out_c.append(table_comment(rows))
+        out_c.append(annotate(results.getCCodeMarkup(), accesses))
+        for access in rows:
+            if access.resolved:
+                resolved += 1
+            else:
+                unresolved += 1
+            out_csv.append(",".join(csv_field(v) for v in [
+                func.name, "0x{:X}".format(func.rva), access.kind,
+                class_label(access.owner) if access.owner else "", access.field_name if access.resolved else "",
+                "0x{:x}".format(access.offset),
+                access.field_type.getName() if access.field_type is not None else "", access.chain]))
+
+    base = os.path.join(OUTPUT_DIR, "decompiled_" + group)
+    with codecs.open(base + ".fields.c", 'w', 'utf-8') as f:
+        f.write("\n".join(out_c))
+    with codecs.open(base + ".fields.csv", 'w', 'utf-8') as f:
+        f.write("\n".join(out_csv) + "\n")
+    print("  {} resolved / {} unresolved accesses -> {}".format(resolved, unresolved, base + ".fields.c"))
+    return resolved, unresolved
+
+
+def run():
+    """Main script entry point."""
+    print("=" * 70)
+    print("FF2 Field Access Extractor")
+    print("=" * 70)
+
+    program = getCurrentProgram()
+    if program is None:
+        print("ERROR: No program loaded!")
+        return
+
+    groups = set(getScriptArgs())
+    paths = [p for p in corpus_files(OUTPUT_DIR) if not groups or group_name(p) in groups]
+    print("Program: " + program.getName())
+    print("Groups: " + ", ".join(group_name(p) for p in paths))
+    print("")
+
+    print("-" * 70)
+    print("STEP 1: IL2CPP types and signatures")
+    print("-" * 70)
+    if not ensure_il2cpp_types(program):
+        print("WARNING: no IL2CPP types - offsets will be reported unresolved")
+    data = load_script_json(SCRIPT_JSON_PATH)
+    extractor = FieldExtractor(program, method_signatures(data), metadata_globals(data))
+    data = None
+    print("")
+
+    print("-" * 70)
+    print("STEP 2: Extracting field access chains")
+    print("-" * 70)
+    decompiler = DecompInterface()
+    decompiler.toggleSyntaxTree(True)
+    decompiler.setSimplificationStyle("decompile")
+    decompiler.openProgram(program)
+
+    total_resolved = 0
+    total_unresolved = 0
+    try:
+        for path in paths:
+            print("")
+            print("Group: " + group_name(path))
+            resolved, unresolved = process_group(decompiler, program, extractor, path)
+            total_resolved += resolved
+            total_unresolved += unresolved
+    finally:
+        decompiler.dispose()
+
+    print("")
+    print("=" * 70)
+    print("Field extraction complete!")
+    print("  Resolved:   " + str(total_resolved))
+    print("  Unresolved: " + str(total_unresolved))
+    print("=" * 70)
+
+# Run the script
+run()
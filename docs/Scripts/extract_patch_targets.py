@@ -0,0 +1,600 @@
+"""Static inventory of the mod's Harmony patch targets.
+
+Runs under regular CPython 3 (no Ghidra imports). The mod hooks game methods
+through AccessTools.Method / Type.GetMethod / GetMethods() loops /
+[HarmonyPatch] attributes spread over Patches/*.cs and Core/*.cs. This script
+finds every target in the C# sources without building the mod:
+
+  - type expressions are resolved through typeof(), local Type variables,
+    AccessTools.TypeByName strings, using aliases and the file's using
+    namespaces; generic helpers (TryPatchSetActive<T>) are expanded for every
+    call site
+  - only lookups whose result reaches harmony.Patch(...) count, so prefix and
+    postfix lookups on the mod's own classes are left out
+  - overload hints (new[] { typeof(int) }, ParameterType.Name == "Cursor",
+    parameters.Length == 2) are kept and matched against the script.json
+    Signature of each candidate
+
+Each target is resolved against Il2CppDumper's script.json (Il2CppLast.* maps
+to Last.*, Il2CppSerial.* to Serial.*, Il2Cpp.* to the global namespace) and
+reported as ok, missing (no such method in this build), ambiguous or
+unresolved (type or name only known at runtime). Resolved targets are written
+as a decompile_engine.Manifest for decompile_manifest.py or decompile_batch.py.
+
+Usage:
+    python extract_patch_targets.py [--script-json PATH] [--manifest patch_targets.json]
+    python extract_patch_targets.py --no-resolve             # list targets only
+    python extract_patch_targets.py --csv patch_targets.csv
+
+Exits with 1 when a target is missing from script.json, so a game update that
+renames or removes a hooked method shows up before the mod is rebuilt.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+
+from decomp_corpus import SCRIPT_DIR
+
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "..", ".."))
+SCRIPT_JSON_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\script.json"
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, "patch_targets.json")
+OUTPUT_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\ff2-screen-reader\\docs\\Scripts\\decompiled_patch_targets.c"
+SKIP_DIRS = ("bin", "obj", "docs", ".git")
+MAX_RESOLVE_DEPTH = 6
+
+# C# keyword types as they appear in Il2CppDumper signatures
+PRIMITIVE_TYPES = {
+    "bool": "bool", "Boolean": "bool",
+    "byte": "uint8_t", "Byte": "uint8_t", "sbyte": "int8_t", "SByte": "int8_t",
+    "short": "int16_t", "Int16": "int16_t", "ushort": "uint16_t", "UInt16": "uint16_t",
+    "int": "int32_t", "Int32": "int32_t", "uint": "uint32_t", "UInt32": "uint32_t",
+    "long": "int64_t", "Int64": "int64_t", "ulong": "uint64_t", "UInt64": "uint64_t",
+    "float": "float", "Single": "float", "double": "double", "Double": "double",
+    "string": "System_String_o*", "String": "System_String_o*",
+}
+
+_STRING = r'@"(?:[^"]|"")*"|\$?"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)\''
+_COMMENT_OR_STRING = re.compile(r'//[^\n]*|/\*.*?\*/|' + _STRING, re.S)
+_STRING_AT = re.compile(_STRING)
+_USING_ALIAS = re.compile(r'^\s*using\s+(\w+)\s*=\s*([\w.]+)\s*;', re.M)
+_USING_NAMESPACE = re.compile(r'^\s*using\s+([\w.]+)\s*;', re.M)
+_TYPE_STRING = re.compile(r'^(?:[\w.]+\.)?(?:TypeByName|FindType|GetType)\s*\(\s*"([\w.]+)[^"]*"\s*\)$')
+_CLASS = re.compile(r'\b(?:class|struct)\s+(\w+)')
+_METHOD_DECLARATION = re.compile(r'\b(\w+)\s*(?:<\s*(\w+)\s*>)?\s*\(([^(){};]*)\)\s*(?:where\s+[^{;]*)?\{')
+_NOT_METHODS = ("if", "for", "foreach", "while", "switch", "catch", "using", "lock", "fixed", "when")
+_ACCESS_METHOD = re.compile(r'AccessTools\.(?:Method|DeclaredMethod)\s*\(')
+_ACCESS_PROPERTY = re.compile(r'AccessTools\.(?:Declared)?Property(Getter|Setter)\s*\(')
+_GET_METHOD = re.compile(r'(typeof\s*\(\s*[\w.]+\s*\)|\b\w+)\s*\.\s*GetMethod\s*\(')
+_GET_METHODS = re.compile(r'(typeof\s*\(\s*[\w.]+\s*\)|\b\w+)\s*\.\s*GetMethods\s*\(')
+_ASSIGNED_TO = re.compile(r'(\w+)\s*=\s*$')
+_NAME_COMPARE = re.compile(r'(?<!ParameterType)\.Name\s*==\s*"(\w+)"')
+_PARAM_TYPE_HINT = re.compile(r'\[\s*(\d+)\s*\]\s*\.ParameterType\.Name\s*==\s*"(\w+)"')
+_PARAM_COUNT_HINT = re.compile(r'\.Length\s*(==|>=)\s*(\d+)')
+_HARMONY_ATTRIBUTE = re.compile(r'\[HarmonyPatch\s*\(\s*typeof\s*\(\s*([\w.]+)\s*\)\s*,\s*')
+_TYPEOF = re.compile(r'typeof\s*\(\s*([\w.<>, ]+?)\s*\)')
+
+
+class Target(object):
+    """One patched method as written in the C# sources."""
+
+    def __init__(self, path, line, type_name, method, arg_types=None, param_hints=None, min_params=None,
+                 exact_params=None, kind="method", note=""):
+        self.path = path
+        self.line = line
+        self.type_name = type_name          # C# type as written ("KeyInputItemListController")
+        self.full_types = []                # candidate Il2Cpp* full names from aliases/usings
+        self.method = method                # None when the name is only known at runtime
+        self.arg_types = arg_types          # new[] { typeof(...) } list, or None
+        self.param_hints = param_hints or {}    # {index: ParameterType.Name}
+        self.min_params = min_params
+        self.exact_params = exact_params
+        self.kind = kind
+        self.note = note
+        self.status = "unresolved"
+        self.entries = []                   # resolved (script.json name, rva)
+
+    def location(self):
+        return "{}:{}".format(os.path.relpath(self.path, REPO_ROOT).replace(os.sep, "/"), self.line)
+
+    def hints(self):
+        parts = []
+        if self.arg_types is not None:
+            parts.append("(" + ", ".join(self.arg_types) + ")")
+        for index, name in sorted(self.param_hints.items()):
+            parts.append("[{}]={}".format(index, name))
+        if self.exact_params is not None:
+            parts.append("params=={}".format(self.exact_params))
+        elif self.min_params is not None:
+            parts.append("params>={}".format(self.min_params))
+        return " ".join(parts)
+
+    def key(self):
+        return (self.type_name, self.method, tuple(self.arg_types or ()), tuple(sorted(self.param_hints.items())),
+                self.min_params, self.exact_params)
+
+
+# -- C# source scanning ------------------------------------------------------------
+
+def strip_comments(text):
+    """Comments blanked out (newlines kept, so offsets and line numbers stay valid)."""
+    def blank(match):
+        token = match.group(0)
+        if token.startswith("/"):
+            return re.sub(r"[^\n]", " ", token)
+        return token
+    return _COMMENT_OR_STRING.sub(blank, text)
+
+
+def call_arguments(text, open_paren):
+    """(top-level arguments, end offset) of the call whose '(' is at open_paren."""
+    depth = 0
+    args = []
+    start = open_paren + 1
+    i = open_paren
+    while i < len(text):
+        c = text[i]
+        string = _STRING_AT.match(text, i) if c in "@$\"'" else None
+        if string:
+            i = string.end()
+            continue
+        elif c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+            if depth == 0:
+                args.append(text[start:i].strip())
+                return [a for a in args if a], i + 1
+        elif c == "," and depth == 1:
+            args.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+    return [a for a in args if a], len(text)
+
+
+def name_argument(arg):
+    """Method name from '"Name"' or 'nameof(Type.Name)'; None for anything computed at runtime."""
+    match = re.match(r'^"(\w+)"$', arg)
+    if match:
+        return match.group(1)
+    match = re.match(r'^nameof\s*\(\s*([\w.]+)\s*\)$', arg)
+    if match:
+        return match.group(1).split(".")[-1]
+    return None
+
+
+def argument_types(arg):
+    """['int', 'GameCursor'] from 'new[] { typeof(int), typeof(GameCursor) }'; [] for Type.EmptyTypes."""
+    if re.match(r'^(?:Type\.)?EmptyTypes$', arg):
+        return []
+    if not re.match(r'^new\s*(?:Type\s*)?\[\s*\]', arg):
+        return None
+    return [t.strip() for t in _TYPEOF.findall(arg)]
+
+
+def short_type(name):
+    """'Il2CppSystem.Collections.Generic.IEnumerable<X>' -> 'IEnumerable'"""
+    return name.split("<", 1)[0].strip().split(".")[-1]
+
+
+class SourceFile(object):
+    """One .cs file: comment-free text plus the context needed to resolve type expressions."""
+
+    def __init__(self, path):
+        self.path = path
+        with io.open(path, "r", encoding="utf-8-sig") as f:
+            self.text = strip_comments(f.read())
+        self.aliases = dict(_USING_ALIAS.findall(self.text))
+        self.namespaces = [ns for ns in _USING_NAMESPACE.findall(self.text) if ns not in self.aliases]
+        self.classes = set(_CLASS.findall(self.text))
+        self.methods = self._methods()
+        self._line_starts = [0] + [m.end() for m in re.finditer(r"\n", self.text)]
+
+    def _methods(self):
+        """[(start, end, name, generic parameter or None, [parameter declarations])] for method bodies."""
+        methods = []
+        for match in _METHOD_DECLARATION.finditer(self.text):
+            if match.group(1) in _NOT_METHODS:
+                continue
+            _, end = call_arguments(self.text, match.end() - 1)
+            params = [p.strip() for p in match.group(3).split(",") if p.strip()]
+            methods.append((match.start(), end, match.group(1), match.group(2), params))
+        return methods
+
+    def line_of(self, offset):
+        lo, hi = 0, len(self._line_starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._line_starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1
+
+    def method_at(self, offset):
+        """Innermost method declaration whose body contains offset, or None."""
+        found = None
+        for method in self.methods:
+            if method[0] <= offset < method[1] and (found is None or method[0] > found[0]):
+                found = method
+        return found
+
+    def call_sites(self, method, generic):
+        """[(offset, argument list or generic argument)] for calls of method outside its declaration."""
+        sites = []
+        if generic:
+            pattern = r'\b' + re.escape(method[2]) + r'\s*<\s*([\w.]+)\s*>\s*\('
+        else:
+            pattern = r'\b' + re.escape(method[2]) + r'\s*\('
+        for match in re.finditer(pattern, self.text):
+            if match.start() == method[0]:
+                continue
+            if generic:
+                sites.append((match.start(), match.group(1)))
+            else:
+                sites.append((match.start(), call_arguments(self.text, match.end() - 1)[0]))
+        return sites
+
+    def type_names(self, expr, offset, depth=0):
+        """[(C# type name, via)] that expr can hold at offset; empty when only known at runtime.
+
+        Follows typeof(), FindType/TypeByName/GetType strings, assignments in the
+        enclosing method, FullName comparisons, and Type or generic parameters
+        through the method's call sites in this file.
+        """
+        expr = expr.strip()
+        if depth > MAX_RESOLVE_DEPTH:
+            return []
+        if "??" in expr:
+            found = []
+            for part in expr.split("??"):
+                found.extend(self.type_names(part, offset, depth + 1))
+            return found
+        match = _TYPE_STRING.match(expr)
+        if match:
+            return [(match.group(1), "")]
+        match = re.match(r'^typeof\s*\(\s*([\w.]+)\s*\)$', expr)
+        if match:
+            method = self.method_at(offset)
+            if method is None or match.group(1) != method[3]:
+                return [(match.group(1), "")]
+            return [(argument, "via {}<> line {}".format(method[2], self.line_of(site)))
+                    for site, argument in self.call_sites(method, True)]
+        if not re.match(r'^\w+$', expr):
+            return []
+        method = self.method_at(offset)
+        begin = method[0] if method else 0
+        assigned = None
+        for match in re.finditer(r'\b' + re.escape(expr) + r'\s*=(?!=)\s*([^;]+);', self.text[begin:offset]):
+            if match.group(1).strip() != "null":
+                assigned = match.group(1)
+        if assigned:
+            return self.type_names(assigned, begin + match.start(), depth + 1)
+        compared = re.findall(r'\b' + re.escape(expr) + r'\.FullName\s*==\s*"([\w.]+)"', self.text[begin:offset])
+        if compared:
+            return [(compared[-1], "")]
+        if method is None:
+            return []
+        for index, param in enumerate(method[4]):
+            if re.match(r'^(?:System\.)?Type\s+' + re.escape(expr) + r'\b', param):
+                found = []
+                for site, args in self.call_sites(method, False):
+                    if index < len(args):
+                        for type_name, _ in self.type_names(args[index], site, depth + 1):
+                            found.append((type_name, "via {} line {}".format(method[2], self.line_of(site))))
+                return found
+        return []
+
+    def parameter_type(self, type_name):
+        """Alias-resolved type with namespaces dropped: 'Il2CppSystem.Collections.Generic.IEnumerable<X>' -> 'IEnumerable<X>'."""
+        base, _, rest = type_name.partition("<")
+        base = self.aliases.get(base.strip(), base.strip())
+        return re.sub(r'\b\w+\.', "", base + ("<" + rest if rest else "")).replace(" ", "")
+
+    def full_types(self, type_name):
+        """Candidate fully qualified C# names for type_name in this file."""
+        if type_name in self.aliases:
+            return [self.aliases[type_name]]
+        if "." in type_name:
+            return [type_name]
+        return [ns + "." + type_name for ns in self.namespaces if ns.startswith("Il2Cpp")] + [type_name]
+
+    def patched(self, variable, offset):
+        """True if variable is handed to a .Patch( call after offset."""
+        return re.search(r'\.Patch\s*\(\s*' + re.escape(variable) + r'\b', self.text[offset:]) is not None
+
+    def patch_target(self, start, end):
+        """True if the lookup at start..end flows into harmony.Patch (assigned and patched, or inline)."""
+        before = self.text[max(0, start - 200):start]
+        assigned = _ASSIGNED_TO.search(before)
+        if assigned:
+            return self.patched(assigned.group(1), end)
+        return re.search(r'\.Patch\s*\(\s*$', before) is not None
+
+
+def source_paths(root):
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if name.endswith(".cs"):
+                yield os.path.join(directory, name)
+
+
+def scan_file(source, own_classes):
+    """Every patch target looked up in one file."""
+    targets = []
+    text = source.text
+
+    def add(offset, type_expr, method, **kwargs):
+        if kwargs.get("arg_types"):
+            kwargs["arg_types"] = [source.parameter_type(t) for t in kwargs["arg_types"]]
+        found = source.type_names(type_expr, offset)
+        if not found:
+            targets.append(Target(source.path, source.line_of(offset), type_expr, method,
+                                  note="type only known at runtime", **kwargs))
+        for type_name, via in found:
+            if short_type(type_name) in own_classes:
+                continue
+            target = Target(source.path, source.line_of(offset), type_name, method, note=via, **kwargs)
+            target.full_types = source.full_types(type_name)
+            targets.append(target)
+
+    for match in _ACCESS_METHOD.finditer(text):
+        args, end = call_arguments(text, match.end() - 1)
+        if len(args) < 2 or not source.patch_target(match.start(), end):
+            continue
+        add(match.start(), args[0], name_argument(args[1]),
+            arg_types=argument_types(args[2]) if len(args) > 2 else None)
+
+    for match in _ACCESS_PROPERTY.finditer(text):
+        args, end = call_arguments(text, match.end() - 1)
+        if len(args) < 2 or not source.patch_target(match.start(), end):
+            continue
+        name = name_argument(args[1])
+        add(match.start(), args[0], ("get_" if match.group(1) == "Getter" else "set_") + name if name else None,
+            kind="property")
+
+    for match in _GET_METHOD.finditer(text):
+        args, end = call_arguments(text, match.end() - 1)
+        if not args or not source.patch_target(match.start(), end):
+            continue
+        arg_types = None
+        for arg in args[1:]:
+            if argument_types(arg) is not None:
+                arg_types = argument_types(arg)
+        add(match.start(), match.group(1), name_argument(args[0]), arg_types=arg_types)
+
+    for match in _GET_METHODS.finditer(text):
+        # foreach (var m in type.GetMethods()) { if (m.Name == "X" && <hints>) found = m; } ... .Patch(found, ...)
+        patch = re.search(r'\.Patch\s*\(\s*(\w+)', text[match.end():])
+        if patch is None:
+            continue
+        region = text[match.end():match.end() + patch.start()]
+        names = sorted(set(_NAME_COMPARE.findall(region)))
+        hints = dict((int(i), name) for i, name in _PARAM_TYPE_HINT.findall(region))
+        exact = minimum = None
+        for op, count in _PARAM_COUNT_HINT.findall(region):
+            if op == "==":
+                exact = int(count)
+            else:
+                minimum = int(count)
+        for name in names or [None]:
+            add(match.start(), match.group(1), name, param_hints=hints, min_params=minimum, exact_params=exact)
+
+    for match in _HARMONY_ATTRIBUTE.finditer(text):
+        args, _ = call_arguments(text, text.index("(", match.start()))
+        if len(args) < 2:
+            continue
+        add(match.start(), "typeof(" + match.group(1) + ")", name_argument(args[1]),
+            arg_types=argument_types(args[2]) if len(args) > 2 else None, kind="attribute")
+
+    return targets
+
+
+def extract_targets(root=REPO_ROOT):
+    """Every patch target in the C# sources under root, in file/line order."""
+    sources = [SourceFile(path) for path in source_paths(root)]
+    own_classes = set()
+    for source in sources:
+        own_classes.update(source.classes)
+    seen = set()
+    targets = []
+    for source in sources:
+        for target in scan_file(source, own_classes):
+            identity = (target.path, target.line, target.note) + target.key()
+            if identity not in seen:
+                seen.add(identity)
+                targets.append(target)
+    return sorted(targets, key=lambda t: (t.path, t.line))
+
+
+# -- script.json resolution --------------------------------------------------------
+
+def il2cpp_name(csharp_name):
+    """Il2CppInterop namespace -> Il2CppDumper namespace: Il2CppLast.UI.X -> Last.UI.X, Il2Cpp.X -> X."""
+    if csharp_name.startswith("Il2Cpp."):
+        return csharp_name[len("Il2Cpp."):]
+    if csharp_name.startswith("Il2Cpp"):
+        return csharp_name[len("Il2Cpp"):]
+    return csharp_name
+
+
+def parameter_types(signature):
+    """Managed parameter C types of a Signature (no __this, no trailing MethodInfo)."""
+    if not signature or "(" not in signature:
+        return []
+    inner = signature[signature.index("(") + 1:signature.rindex(")")].strip()
+    types = []
+    for param in inner.split(",") if inner else []:
+        param = param.strip()
+        cut = max(param.rfind(" "), param.rfind("*"))
+        ctype, name = (param[:cut + 1].strip(), param[cut + 1:].strip()) if cut >= 0 else (param, "")
+        if name == "__this" or ctype == "const MethodInfo*":
+            continue
+        types.append(ctype)
+    return types
+
+
+def type_matches(csharp_type, ctype):
+    """Loose match of a C# parameter type name against an Il2CppDumper C type."""
+    if "<" in csharp_type:
+        base, _, rest = csharp_type.partition("<")
+        return type_matches(base, ctype) and all(("_" + arg + "_") in ctype for arg in re.findall(r'\w+', rest))
+    if csharp_type in PRIMITIVE_TYPES:
+        return PRIMITIVE_TYPES[csharp_type] == ctype
+    if not ctype.endswith("*"):
+        return ctype in ("int32_t", "uint8_t", "int16_t", "int64_t", "uint32_t")   # enums are passed by value
+    return re.search(r'(?:^|_)' + re.escape(csharp_type) + r'(?:_[A-Za-z0-9]+)*_[oac]\*$', ctype) is not None \
+        or ("_" + csharp_type + "_") in ctype
+
+
+def overload_matches(target, signature):
+    params = parameter_types(signature)
+    if target.arg_types is not None:
+        return len(params) == len(target.arg_types) and all(
+            type_matches(t, c) for t, c in zip(target.arg_types, params))
+    if target.exact_params is not None and len(params) != target.exact_params:
+        return False
+    if target.min_params is not None and len(params) < target.min_params:
+        return False
+    return all(index < len(params) and type_matches(name, params[index])
+               for index, name in target.param_hints.items())
+
+
+class MethodTable(object):
+    """script.json ScriptMethod entries by full and short Class$$Method name."""
+
+    def __init__(self, data):
+        self.by_name = {}
+        self.by_short = {}
+        for method in data.get("ScriptMethod", []):
+            name = method.get("Name")
+            if not method.get("Address") or not name or "$$" not in name:
+                continue
+            entry = (name, method["Address"], method.get("Signature", ""))
+            self.by_name.setdefault(name, []).append(entry)
+            type_name, method_name = name.split("$$", 1)
+            self.by_short.setdefault(type_name.split(".")[-1] + "$$" + method_name, []).append(entry)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(json.loads(f.read().decode("utf-8")))
+
+    def candidates(self, target):
+        for full_type in target.full_types:
+            found = self.by_name.get(il2cpp_name(full_type) + "$$" + target.method)
+            if found:
+                return found
+        return self.by_short.get(short_type(target.type_name) + "$$" + target.method, [])
+
+    def resolve(self, target):
+        if target.method is None or not target.full_types:
+            target.status = "unresolved"
+            return
+        found = self.candidates(target)
+        if not found:
+            target.status = "missing"
+            return
+        matching = [entry for entry in found if overload_matches(target, entry[2])]
+        if not matching and len(found) == 1 and target.arg_types is None and not target.param_hints:
+            matching = found
+        target.entries = sorted(set((entry[0], entry[1]) for entry in matching or found))
+        if not matching:
+            target.status = "missing"      # the name exists but no overload fits the hints
+        elif len(set(name for name, _ in target.entries)) > 1 or \
+                (len(matching) > 1 and target.arg_types is None and not target.param_hints):
+            target.status = "ambiguous"
+        else:
+            target.status = "ok"
+
+
+def build_manifest(targets, output_path=OUTPUT_PATH):
+    """decompile_engine.Manifest JSON (as a dict) for every resolved target."""
+    names = {}
+    for target in targets:
+        if target.status in ("ok", "ambiguous"):
+            for name, rva in target.entries:
+                names[rva] = name
+    return {
+        "group": "patch_targets",
+        "banner": "FF2 Patch Target Decompiler",
+        "title": "Harmony patch targets",
+        "purpose": "Every game method the mod patches (extract_patch_targets.py)",
+        "notes": ["{} {}$${} {}".format(t.location(), t.type_name, t.method, t.hints()).rstrip()
+                  for t in targets if t.status in ("ok", "ambiguous")],
+        "targets": dict(("0x{:X}".format(rva), name) for rva, name in sorted(names.items())),
+        "output_path": output_path,
+    }
+
+
+def write_csv(targets, path):
+    with io.open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["location", "kind", "type", "method", "hints", "status", "names", "rvas", "note"])
+        for t in targets:
+            writer.writerow([t.location(), t.kind, t.type_name, t.method or "", t.hints(), t.status,
+                             " ".join(sorted(set(name for name, _ in t.entries))),
+                             " ".join("0x{:X}".format(rva) for _, rva in t.entries), t.note])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the mod's Harmony patch targets and resolve them in script.json.")
+    parser.add_argument("--sources", default=REPO_ROOT, help="C# source root (default: repository root)")
+    parser.add_argument("--script-json", default=SCRIPT_JSON_PATH, help="Il2CppDumper script.json")
+    parser.add_argument("--no-resolve", action="store_true", help="only list the targets found in the sources")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="decompile manifest to write (default: patch_targets.json)")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="output_path recorded in the manifest")
+    parser.add_argument("--csv", help="also write the target table as CSV")
+    args = parser.parse_args(argv)
+
+    targets = extract_targets(args.sources)
+    resolve = not args.no_resolve
+    if resolve and not os.path.exists(args.script_json):
+        print("script.json not found at: {} (listing targets only)".format(args.script_json))
+        resolve = False
+    if resolve:
+        table = MethodTable.load(args.script_json)
+        for target in targets:
+            table.resolve(target)
+
+    for target in targets:
+        method = target.method or "?"
+        line = "{:<42} {:<44} {:<28} {}".format(target.location(), target.type_name + "." + method,
+                                                target.hints(), target.status if resolve else "")
+        if target.entries:
+            line += "  " + " ".join("0x{:X}".format(rva) for _, rva in target.entries[:3])
+        if target.note:
+            line += "  (" + target.note + ")"
+        print(line.rstrip())
+
+    counts = {}
+    for target in targets:
+        counts[target.status] = counts.get(target.status, 0) + 1
+    print("")
+    print("{} patch targets in {} files".format(len(targets), len(set(t.path for t in targets))))
+    if not resolve:
+        if args.csv:
+            write_csv(targets, args.csv)
+        return 0
+    print("  " + ", ".join("{} {}".format(counts[status], status) for status in sorted(counts)))
+
+    manifest = build_manifest(targets, args.output)
+    with io.open(args.manifest, "w", encoding="utf-8") as f:
+        f.write(u"%s" % json.dumps(manifest, indent=2, sort_keys=True))
+    print("Manifest: {} ({} functions)".format(args.manifest, len(manifest["targets"])))
+    if args.csv:
+        write_csv(targets, args.csv)
+        print("CSV: " + args.csv)
+    missing = [t for t in targets if t.status == "missing"]
+    for target in missing:
+        print("MISSING: {} {}.{} {}".format(target.location(), target.type_name, target.method, target.hints()).rstrip())
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
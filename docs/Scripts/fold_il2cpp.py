@@ -0,0 +1,514 @@
+# Fold IL2CPP runtime boilerplate in decompiled_*.c into single guard lines
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# Most of every decompiled body is IL2CPP plumbing rather than game logic:
+#
+#   if (DAT_181f73ae9 == '\0') {                      IL2CPP_METADATA_INIT(DAT_1817e733c);
+#     thunk_FUN_1801fef70(DAT_1817e733c);       ->
+#     DAT_181f73ae9 = '\x01';
+#   }
+#
+#   if (((*(byte *)(K + 0x12f) & 2) != 0) && (*(int *)(K + 0xe0) == 0)) {
+#     il2cpp_runtime_class_init(K);             ->    IL2CPP_CLASS_INIT(K);
+#   }
+#
+#   FUN_180237af0();
+#   pcVar1 = (code *)swi(3);                    ->    IL2CPP_THROW_NULL_REFERENCE();
+#   uVar4 = (*pcVar1)();
+#   return uVar4;
+#
+#   if (x == 0) { <throw> }                     ->    IL2CPP_NULL_CHECK(x);
+#
+# Null-check ladders (each link a null test, optionally loading the next
+# pointer first) fold the same way, keeping the loads as arguments:
+#
+#   if ((a == 0) ||                             ->    IL2CPP_NULL_CHECK(a, v = *(a + 0x188), v = *(v + 0x40));
+#      ((v = *(a + 0x188), v == 0 ||
+#       (v = *(v + 0x40), v == 0)))) { [LAB_x:] <throw> }
+#   if (<same ladder>) goto LAB_x;              ->    (LAB_x being a null-reference throw)
+#
+#   if (x != 0) {                               ->    IL2CPP_NULL_CHECK(x, y);
+#     if (y != 0) {                                     ...
+#       ...                                             return r;
+#       return r;
+#     }
+#   }
+#   <throw>
+#
+# A throw label is dropped only once no goto is left pointing at it, and a
+# nested ladder only folds when its innermost block ends in return, so the
+# fall-through into the throw is exactly the failed check.
+#
+# Each folded line carries a /* Lnn-mm */ note with the original line range and
+# the side table (<file>.folded.map.json) maps every output line back to the
+# original file, so anything found in the folded copy can be located in the raw
+# decompiler output.
+#
+# Usage:
+#   python fold_il2cpp.py                       # every decompiled_*.c next to this script
+#   python fold_il2cpp.py decompiled_magic.c    # specific files
+#   python fold_il2cpp.py --jobs 4              # fold files in parallel (CPython only)
+
+import io
+import json
+import os
+import re
+import sys
+
+from decomp_corpus import corpus_files, parse_lines, read_lines
+
+# Throw helpers in this build (FF2 PR GameAssembly.dll) and the macro they fold to.
+# Unknown helpers followed by swi(3) still fold, as IL2CPP_THROW(<call>).
+THROW_HELPERS = {
+    "FUN_180237af0": "IL2CPP_THROW_NULL_REFERENCE",   # il2cpp_codegen_raise_null_reference_exception
+    "FUN_180237ac0": "IL2CPP_RAISE",                  # il2cpp_codegen_raise_exception(ex, lastManagedFrame)
+    "FUN_180237720": "IL2CPP_THROW_INVALID_CAST",     # il2cpp_codegen_raise_invalid_cast(obj, klass)
+}
+EXCEPTION_FACTORIES = {
+    "thunk_FUN_1801f53e0": "IndexOutOfRangeException",
+    "FUN_180237af0": "NullReferenceException",
+}
+
+_METADATA_IF = re.compile(r"^(\s*)if \((DAT_[0-9a-fA-F]+) == '\\0'\) \{$")
+_METADATA_CALL = re.compile(r"^\s*(\w+)\(([^()]*)\);$")
+_CLASS_INIT_START = re.compile(r"^(\s*)if \(\(\(\*\(byte \*\)\(")
+_CLASS_INIT_COND = re.compile(
+    r"^if \(\(\(\*\(byte \*\)\((\S+) \+ 0x12f\) & 2\) != 0\) && "
+    r"\(\*\(int \*\)\(\1 \+ 0xe0\) == 0\)\) \{$")
+_CLASS_INIT_CALL = re.compile(r"^\s*il2cpp_runtime_class_init\(([^()]*)\);$")
+_CALL = re.compile(r"^(\s*)(?:(\w+) = )?(\w+)\(([^()]*)\);$")
+_SWI = re.compile(r"^\s*(pcVar\d+) = \(code \*\)swi\(3\);$")
+_INVOKE = re.compile(r"^\s*(?:(\w+) = )?(?:\([^()]*\))?\(\*(pcVar\d+)\)\(\);$")
+_RETURN = re.compile(r"^\s*return(?: (\w+))?;$")
+_NULL_IF = re.compile(r"^(\s*)if \((.+) == (?:\([^()]*\))?0(?:x0)?\) \{$")
+_THROW_LINE = re.compile(r"^\s*IL2CPP_\w+\(.*\); /\* L\d+(?:-\d+)? \*/$")
+_CODE_DECL = re.compile(r"^\s*code \*(pcVar\d+);$")
+_LABEL = re.compile(r"^(LAB_\w+):$")
+_IF_START = re.compile(r"^(\s*)if \(")
+_GOTO_IF = re.compile(r"^if \((.*)\) goto (LAB_\w+);$")
+_BLOCK_IF = re.compile(r"^if \((.*)\) \{$")
+_NOT_NULL_IF = re.compile(r"^(\s*)if \((.+) != (?:\([^()]*\))?0(?:x0)?\) \{$")
+_GOTO = re.compile(r"\bgoto (LAB_\w+);")
+_IS_ZERO = re.compile(r"^(.+) == (?:\([^()]*\))?0(?:x0)?$")
+_ASSIGN = re.compile(r"^(\w+) = (.+)$")
+_EXITS = re.compile(r"^\s*(?:return\b.*|goto LAB_\w+);(?: /\* L\d+(?:-\d+)? \*/)?$")
+
+
+def _note(start, end):
+    """Original 1-based line range for a fold spanning 0-based [start, end)."""
+    if end - start == 1:
+        return "/* L{} */".format(start + 1)
+    return "/* L{}-{} */".format(start + 1, end)
+
+
+def _match_metadata_init(body, i):
+    """if (flag == 0) { init(x); flag = 1; } -> IL2CPP_METADATA_INIT(x);"""
+    if i + 3 >= len(body):
+        return None
+    m = _METADATA_IF.match(body[i][1])
+    if not m:
+        return None
+    call = _METADATA_CALL.match(body[i + 1][1])
+    if not call or body[i + 2][1].strip() != "{} = '\\x01';".format(m.group(2)) or body[i + 3][1].strip() != "}":
+        return None
+    return 4, "{}IL2CPP_METADATA_INIT({});".format(m.group(1), call.group(2))
+
+
+def _match_class_init(body, i):
+    """The class-init guard; its condition may wrap and its brace may sit on its own line."""
+    m = _CLASS_INIT_START.match(body[i][1])
+    if not m:
+        return None
+    joined = ""
+    j = i
+    while j < len(body) and j < i + 3:
+        joined = (joined + " " + body[j][1].strip()).strip()
+        j += 1
+        if joined.endswith("{"):
+            break
+    cond = _CLASS_INIT_COND.match(joined.replace("&&  ", "&& ").replace("( ", "("))
+    if not cond or j + 1 >= len(body):
+        return None
+    call = _CLASS_INIT_CALL.match(body[j][1])
+    if not call or body[j + 1][1].strip() != "}":
+        return None
+    return j + 2 - i, "{}IL2CPP_CLASS_INIT({});".format(m.group(1), cond.group(1))
+
+
+def _match_throw(body, i):
+    """[exc = factory();] helper(args); pcVar = swi(3); [r =] (*pcVar)(); [return r;]"""
+    start = i
+    factory = None
+    m = _CALL.match(body[i][1])
+    if m and m.group(2) and not m.group(4) and i + 1 < len(body):
+        follow = _CALL.match(body[i + 1][1])
+        if follow and m.group(2) in follow.group(4).split(","):
+            factory = m.group(3)
+            i += 1
+            m = follow
+    if not m or i + 2 >= len(body):
+        return None
+    swi = _SWI.match(body[i + 1][1])
+    invoke = _INVOKE.match(body[i + 2][1])
+    if not swi or not invoke or invoke.group(2) != swi.group(1):
+        return None
+    end = i + 3
+    if end < len(body):
+        ret = _RETURN.match(body[end][1])
+        if ret and ret.group(1) in (None, invoke.group(1)):
+            end += 1
+    indent, helper, args = m.group(1), m.group(3), m.group(4)
+    macro = THROW_HELPERS.get(helper)
+    if factory is not None:
+        exception = EXCEPTION_FACTORIES.get(factory, factory + "()")
+        return end - start, "{}IL2CPP_THROW({});".format(indent, exception)
+    if macro is None:
+        return end - start, "{}IL2CPP_THROW({}({}));".format(indent, helper, args)
+    return end - start, "{}{}({});".format(indent, macro, args)
+
+
+def _match_null_check(body, i):
+    """if (x == 0) { <folded throw> } -> IL2CPP_NULL_CHECK(x);"""
+    if i + 2 >= len(body):
+        return None
+    m = _NULL_IF.match(body[i][1])
+    if not m or not _THROW_LINE.match(body[i + 1][1]) or body[i + 2][1].strip() != "}":
+        return None
+    if "IL2CPP_THROW_NULL_REFERENCE" not in body[i + 1][1]:
+        return None
+    return 3, "{}IL2CPP_NULL_CHECK({});".format(m.group(1), m.group(2))
+
+
+def _balanced(text):
+    depth = 0
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+
+def _strip_parens(text):
+    """Remove parentheses that wrap the whole expression."""
+    text = text.strip()
+    while text.startswith("(") and text.endswith(")") and _balanced(text[1:-1]):
+        text = text[1:-1].strip()
+    return text
+
+
+def _split_top(text, separator):
+    """Split at separator where it is outside every parenthesis."""
+    parts = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, i):
+            parts.append(text[start:i].strip())
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+    parts.append(text[start:].strip())
+    return parts
+
+
+def _null_terms(condition):
+    """[x, v = load, ...] if condition is an || chain of null tests, else None."""
+    condition = _strip_parens(condition)
+    parts = _split_top(condition, "||")
+    if len(parts) > 1:
+        terms = []
+        for part in parts:
+            sub = _null_terms(part)
+            if sub is None:
+                return None
+            terms.extend(sub)
+        return terms
+    comma = _split_top(condition, ",")
+    if len(comma) == 2:
+        assign = _ASSIGN.match(comma[0])
+        test = _IS_ZERO.match(_strip_parens(comma[1]))
+        if assign and test and _strip_parens(test.group(1)) == assign.group(1) and _balanced(assign.group(2)):
+            return [comma[0]]
+        return None
+    test = _IS_ZERO.match(condition)
+    if test and _balanced(test.group(1)) and "&&" not in condition and "=" not in test.group(1):
+        return [_strip_parens(test.group(1))]
+    return None
+
+
+def _is_null_throw(text):
+    return _THROW_LINE.match(text) is not None and "IL2CPP_THROW_NULL_REFERENCE" in text
+
+
+def _gather_if(body, i, limit=12):
+    """(joined condition statement, entry count) for an if spanning several lines, or None."""
+    joined = ""
+    j = i
+    while j < len(body) and j < i + limit:
+        joined = (joined + " " + body[j][2].strip()).strip()
+        j += 1
+        if joined.endswith("{") or joined.endswith(";"):
+            return joined, j - i
+    return None
+
+
+def _fold_null_guards(body):
+    """Fold null-check ladders on [(orig_start, orig_end, text)] (see the header)."""
+    null_labels = set()
+    for k in range(len(body) - 1):
+        label = _LABEL.match(body[k][2].strip())
+        if label and _is_null_throw(body[k + 1][2]):
+            null_labels.add(label.group(1))
+
+    # if (<ladder>) goto LAB_x;
+    out = []
+    i = 0
+    while i < len(body):
+        start = _IF_START.match(body[i][2])
+        gathered = _gather_if(body, i) if start else None
+        goto = _GOTO_IF.match(gathered[0]) if gathered else None
+        terms = _null_terms(goto.group(1)) if goto and goto.group(2) in null_labels else None
+        if terms:
+            count = gathered[1]
+            first, last = body[i][0], body[i + count - 1][1]
+            out.append((first, last, "{}IL2CPP_NULL_CHECK({}); {}".format(
+                start.group(1), ", ".join(terms), _note(first, last))))
+            i += count
+        else:
+            out.append(body[i])
+            i += 1
+    body = out
+
+    # if (<ladder>) { [LAB_x:] <throw> }, once nothing jumps to LAB_x any more
+    remaining = {}
+    for entry in body:
+        for label in _GOTO.findall(entry[2]):
+            remaining[label] = remaining.get(label, 0) + 1
+    out = []
+    i = 0
+    while i < len(body):
+        start = _IF_START.match(body[i][2])
+        gathered = _gather_if(body, i) if start else None
+        block = _BLOCK_IF.match(gathered[0]) if gathered else None
+        terms = _null_terms(block.group(1)) if block else None
+        if terms:
+            k = i + gathered[1]
+            label = _LABEL.match(body[k][2].strip()) if k < len(body) else None
+            if label:
+                k += 1 if not remaining.get(label.group(1)) else len(body)
+            if k + 1 < len(body) and _is_null_throw(body[k][2]) and body[k + 1][2].strip() == "}":
+                first, last = body[i][0], body[k + 1][1]
+                out.append((first, last, "{}IL2CPP_NULL_CHECK({}); {}".format(
+                    start.group(1), ", ".join(terms), _note(first, last))))
+                i = k + 2
+                continue
+        out.append(body[i])
+        i += 1
+    return _fold_nested_ladders(out)
+
+
+def _closing(body, i):
+    """Index of the entry closing the block opened on body[i] (a line ending in '{')."""
+    depth = 0
+    for k in range(i, len(body)):
+        text = body[k][2]
+        depth += text.count("{") - text.count("}")
+        if depth == 0:
+            return k
+    return None
+
+
+def _fold_nested_ladders(body):
+    """if (x != 0) { if (y != 0) { ... return; } } <throw>  ->  IL2CPP_NULL_CHECK(x, y); ..."""
+    out = []
+    i = 0
+    while i < len(body):
+        outer = _NOT_NULL_IF.match(body[i][2])
+        if outer:
+            terms = []
+            opener = i
+            closer = _closing(body, i)
+            # Descend while the block holds nothing but the next null test
+            while True:
+                test = _NOT_NULL_IF.match(body[opener][2])
+                end = _closing(body, opener)
+                if not test or end is None or (terms and end != closing_above - 1):
+                    break
+                terms.append(_strip_parens(test.group(2)))
+                closing_above = end
+                opener += 1
+            depth = len(terms)
+            inner_end = closer - depth + 1 if closer is not None else None
+            throw = closer + 1 if closer is not None else None
+            if depth and throw < len(body) and _is_null_throw(body[throw][2]) and \
+                    all(body[k][2].strip() == "}" for k in range(inner_end, closer + 1)) and \
+                    inner_end > i + depth and _EXITS.match(body[inner_end - 1][2]) and \
+                    "=" not in "".join(terms):
+                first, last = body[i][0], body[i + depth - 1][1]
+                out.append((first, last, "{}IL2CPP_NULL_CHECK({}); {}".format(
+                    outer.group(1), ", ".join(terms), _note(first, last))))
+                indent = " " * (2 * depth)
+                out.extend((a, b, text[len(indent):] if text.startswith(indent) else text)
+                           for a, b, text in _fold_nested_ladders(body[i + depth:inner_end]))
+                i = throw + 1
+                continue
+        out.append(body[i])
+        i += 1
+    return out
+
+
+def _apply(body, matchers):
+    """One pass of pattern folding over [(orig_start, orig_end, text)]."""
+    view = [(entry[:2], entry[2]) for entry in body]
+    out = []
+    i = 0
+    while i < len(body):
+        folded = None
+        for matcher in matchers:
+            folded = matcher(view, i)
+            if folded:
+                break
+        if folded:
+            count, text = folded
+            start, end = body[i][0], body[i + count - 1][1]
+            note = _note(start, end)
+            out.append((start, end, text + " " + note))
+            i += count
+        else:
+            out.append(body[i])
+            i += 1
+    return out
+
+
+def fold_body(lines, start, end):
+    """Fold lines[start:end]; returns [(orig_start, orig_end, text)] (0-based, end exclusive)."""
+    body = [(n, n + 1, lines[n]) for n in range(start, end)]
+    body = _apply(body, [_match_metadata_init, _match_class_init, _match_throw])
+    body = _apply(body, [_match_null_check])
+    body = _fold_null_guards(body)
+
+    # Drop `code *pcVarN;` declarations the folds made unused
+    text = "\n".join(entry[2] for entry in body)
+    kept = []
+    for entry in body:
+        decl = _CODE_DECL.match(entry[2])
+        if decl and len(re.findall(r"\b" + decl.group(1) + r"\b", text)) == 1:
+            continue
+        kept.append(entry)
+    return kept
+
+
+def fold_lines(lines):
+    """Fold every function body; returns (output lines, segments).
+
+    segments is a list of [out_start, orig_start, out_count, orig_count]
+    (0-based). Unchanged runs have out_count == orig_count; a fold is one
+    output line covering orig_count original lines; a dropped declaration
+    has out_count == 0.
+    """
+    entries = []
+    cursor = 0
+    for func in parse_lines(lines):
+        entries.extend((n, n + 1, lines[n]) for n in range(cursor, func.code_start))
+        entries.extend(fold_body(lines, func.code_start, func.code_end))
+        cursor = func.code_end
+    entries.extend((n, n + 1, lines[n]) for n in range(cursor, len(lines)))
+
+    output = []
+    segments = []
+    expected = 0
+    for start, end, text in entries:
+        if start != expected:
+            # Original lines [expected, start) were dropped
+            segments.append([len(output), expected, 0, start - expected])
+        if end - start == 1 and segments and segments[-1][2] == segments[-1][3] and \
+                segments[-1][0] + segments[-1][2] == len(output) and \
+                segments[-1][1] + segments[-1][3] == start:
+            segments[-1][2] += 1
+            segments[-1][3] += 1
+        else:
+            segments.append([len(output), start, 1, end - start])
+        output.append(text)
+        expected = end
+    return output, segments
+
+
+def original_lines(segments, out_line):
+    """Map a 1-based folded line number to the 1-based original (first, last) lines."""
+    index = out_line - 1
+    for out_start, orig_start, out_count, orig_count in segments:
+        if out_count and out_start <= index < out_start + out_count:
+            if out_count == orig_count:
+                n = orig_start + (index - out_start) + 1
+                return n, n
+            return orig_start + 1, orig_start + orig_count
+    raise ValueError("line {} is outside the folded file".format(out_line))
+
+
+def fold_file(path):
+    """Write <name>.folded.c and <name>.folded.map.json; returns (orig lines, folded lines)."""
+    lines = read_lines(path)
+    output, segments = fold_lines(lines)
+    base = path[:-2] if path.endswith(".c") else path
+    folded_path = base + ".folded.c"
+    map_path = base + ".folded.map.json"
+    with io.open(folded_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(output))
+    with io.open(map_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "source": os.path.basename(path),
+            "folded": os.path.basename(folded_path),
+            "segments": segments,
+        }, separators=(",", ":")))
+    return len(lines), len(output)
+
+
+def fold_files(paths, jobs=1):
+    """[(orig lines, folded lines)] per path; jobs > 1 uses a process pool where available."""
+    if jobs > 1 and len(paths) > 1:
+        try:
+            from multiprocessing import Pool
+        except ImportError:
+            Pool = None
+        if Pool is not None:
+            pool = Pool(min(jobs, len(paths)))
+            try:
+                return pool.map(fold_file, paths)
+            finally:
+                pool.close()
+                pool.join()
+    return [fold_file(path) for path in paths]
+
+
+def main(argv):
+    jobs = 1
+    if "--jobs" in argv:
+        position = argv.index("--jobs")
+        jobs = int(argv[position + 1])
+        argv = argv[:position] + argv[position + 2:]
+    paths = argv or corpus_files()
+    total_before = 0
+    total_after = 0
+    for path, (before, after) in zip(paths, fold_files(paths, jobs)):
+        total_before += before
+        total_after += after
+        print("{:<32} {:>6} -> {:>6} lines ({:.0%})".format(
+            os.path.basename(path), before, after, 1 - float(after) / before if before else 0))
+    if len(paths) > 1 and total_before:
+        print("{:<32} {:>6} -> {:>6} lines ({:.0%})".format(
+            "total", total_before, total_after, 1 - float(total_after) / total_before))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,276 @@
+# Split il2cpp_ghidra.h into independent partitions that can be parsed concurrently
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# CParser handles the whole header as one string on one thread. Most of the
+# header is thousands of small, unrelated class structs, so it can be split:
+#
+#   1. Cut the header into top-level declarations (brace depth 0, ending in ';').
+#   2. Build the dependency graph. A by-value use (an embedded X_Fields, a typedef,
+#      an enum field) ties two declarations together. A use through a pointer
+#      ("struct Y_o *field") only needs a forward declaration, so it adds no edge.
+#   3. Declarations used by value almost everywhere (the Il2Cpp runtime structs),
+#      preprocessor lines and forward typedefs form a prelude that every
+#      partition repeats. The rest splits into connected components.
+#   4. Components are packed into N partitions, largest first into the smallest
+#      partition. Each partition keeps header order and gets "struct Y;" forward
+#      declarations for the pointer targets that live in other partitions.
+#
+# The result is deterministic for a given header and partition count.
+# il2cpp_program.parse_il2cpp_header parses the partitions on separate threads
+# into separate data type managers and merges them into the program.
+#
+# Usage (offline statistics / dump):
+#   python header_partitions.py il2cpp_ghidra.h --parts 8 [--write outdir]
+
+import io
+import os
+import re
+import sys
+
+# A declaration used by value from more than this many others goes to the prelude
+HUB_THRESHOLD = 64
+
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_IDENT = re.compile(r"[A-Za-z_]\w*")
+_C_WORDS = frozenset("""
+    auto break case char const continue default do double else enum extern float for goto if inline int long
+    register restrict return short signed sizeof static struct switch typedef union unsigned void volatile while
+    _Bool bool __cdecl __stdcall __fastcall __thiscall __declspec __attribute__ __int64 __int32 __int16 __int8
+""".split())
+_TAGGED = re.compile(r"\b(struct|union|enum)\s+([A-Za-z_]\w*)")
+_ALIAS = re.compile(r"^typedef\s+(struct|union)\s+([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*;$")
+_FORWARD = re.compile(r"^(struct|union)\s+([A-Za-z_]\w*)\s*;$")
+
+
+class Declaration(object):
+    """One top-level declaration and the names it defines and uses."""
+
+    def __init__(self, index, text):
+        self.index = index
+        self.text = text
+        self.defines = set()
+        self.tags = set()            # struct/union tags this declaration defines with a body
+        self.value_refs = set()
+        self.pointer_refs = set()    # names only reached through "struct Name *"
+        self.prelude = False
+        self.forward_only = False    # "struct X;" or "typedef struct X X;"
+        self._analyze()
+
+    def _analyze(self):
+        text = " ".join(self.text.split())
+        if text.startswith("#"):
+            self.prelude = True
+            return
+        alias = _ALIAS.match(text)
+        forward = _FORWARD.match(text)
+        if alias or forward:
+            # Forward declarations are cheap and needed everywhere
+            self.prelude = True
+            self.forward_only = True
+            self.defines.update(alias.groups()[1:] if alias else [forward.group(2)])
+            return
+
+        head = text.split("{", 1)[0]
+        tagged = _TAGGED.search(head)
+        if tagged and "{" in text:
+            self.defines.add(tagged.group(2))
+            if tagged.group(1) in ("struct", "union"):
+                self.tags.add(tagged.group(2))
+        if "{" in text and tagged and tagged.group(1) == "enum":
+            body = text.split("{", 1)[1].rsplit("}", 1)[0]
+            for item in body.split(","):
+                name = _IDENT.match(item.strip())
+                if name:
+                    self.defines.add(name.group(0))
+        if text.startswith("typedef"):
+            tail = text.rsplit("}", 1)[1] if "}" in text else text
+            pointer_typedef = re.search(r"\(\s*\*\s*([A-Za-z_]\w*)\s*\)", tail)
+            if pointer_typedef:
+                self.defines.add(pointer_typedef.group(1))
+            else:
+                names = _IDENT.findall(tail.rstrip(";"))
+                if names:
+                    self.defines.add(names[-1])
+
+        tag_uses = set(m.group(2) for m in _TAGGED.finditer(text))
+        for match in _IDENT.finditer(text):
+            name = match.group(0)
+            if name in _C_WORDS or name in self.defines:
+                continue
+            rest = text[match.end():].lstrip()
+            if rest.startswith("*") and name in tag_uses:
+                self.pointer_refs.add(name)
+            else:
+                self.value_refs.add(name)
+        self.pointer_refs -= self.value_refs
+
+
+def split_declarations(text):
+    """Top-level declarations (and preprocessor lines) in header order."""
+    text = _COMMENT.sub(" ", text)
+    declarations = []
+    current = []
+    depth = 0
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if depth == 0 and not current and stripped.startswith("#"):
+            declarations.append(Declaration(len(declarations), stripped))
+            continue
+        if not stripped:
+            continue
+        current.append(line)
+        for ch in line:
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+        if depth == 0 and stripped.endswith(";"):
+            declarations.append(Declaration(len(declarations), "\n".join(current)))
+            current = []
+    if current:
+        declarations.append(Declaration(len(declarations), "\n".join(current)))
+    return declarations
+
+
+class _UnionFind(object):
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # Lower index wins so roots (and therefore ordering) are deterministic
+            if b < a:
+                a, b = b, a
+            self.parent[b] = a
+
+
+class Partitioning(object):
+    """Prelude text plus one text per partition."""
+
+    def __init__(self, prelude, partitions, components, largest_component):
+        self.prelude = prelude
+        self.partitions = partitions
+        self.components = components
+        self.largest_component = largest_component
+
+    def texts(self):
+        """Full parser input per partition (prelude + partition body)."""
+        return [self.prelude + "\n" + body for body in self.partitions]
+
+
+def partition_header(text, parts, hub_threshold=HUB_THRESHOLD):
+    """Split header text into at most `parts` independently parseable partitions."""
+    declarations = split_declarations(text)
+    owner = {}
+    for forward_only in (False, True):
+        for decl in declarations:
+            if decl.forward_only == forward_only:
+                for name in decl.defines:
+                    owner.setdefault(name, decl.index)
+
+    # Hubs: used by value from many declarations -> prelude, with their value dependencies
+    users = {}
+    for decl in declarations:
+        for name in decl.value_refs:
+            target = owner.get(name)
+            if target is not None and target != decl.index:
+                users.setdefault(target, set()).add(decl.index)
+    pending = [i for i, who in users.items() if len(who) > hub_threshold]
+    while pending:
+        decl = declarations[pending.pop()]
+        if decl.prelude:
+            continue
+        decl.prelude = True
+        for name in decl.value_refs | decl.pointer_refs:
+            target = owner.get(name)
+            if target is not None and not declarations[target].prelude:
+                pending.append(target)
+
+    union_find = _UnionFind(len(declarations))
+    for decl in declarations:
+        if decl.prelude:
+            continue
+        for name in decl.value_refs:
+            target = owner.get(name)
+            if target is not None and not declarations[target].prelude:
+                union_find.union(decl.index, target)
+        for name in decl.pointer_refs:
+            target = owner.get(name)
+            if target is not None and not declarations[target].prelude and name not in declarations[target].tags:
+                union_find.union(decl.index, target)
+
+    components = {}
+    for decl in declarations:
+        if not decl.prelude:
+            components.setdefault(union_find.find(decl.index), []).append(decl)
+    ordered = sorted(components.values(), key=lambda c: (-sum(len(d.text) for d in c), c[0].index))
+
+    parts = max(1, parts)
+    bins = [[] for _ in range(parts)]
+    sizes = [0] * parts
+    for component in ordered:
+        target = min(range(parts), key=lambda i: (sizes[i], i))
+        bins[target].extend(component)
+        sizes[target] += sum(len(d.text) for d in component)
+
+    prelude = "\n".join(d.text for d in declarations if d.prelude)
+    bodies = []
+    for members in bins:
+        if not members:
+            continue
+        members.sort(key=lambda d: d.index)
+        local = set()
+        for decl in members:
+            local.update(decl.defines)
+        forwards = set()
+        for decl in members:
+            for name in decl.pointer_refs:
+                target = owner.get(name)
+                if target is not None and name not in local and not declarations[target].prelude:
+                    forwards.add(name)
+        lines = ["struct {};".format(name) for name in sorted(forwards)]
+        lines.extend(d.text for d in members)
+        bodies.append("\n".join(lines))
+    largest = max([sum(len(d.text) for d in c) for c in ordered] or [0])
+    return Partitioning(prelude, bodies, len(ordered), largest)
+
+
+def main(argv):
+    if not argv:
+        print("usage: python header_partitions.py il2cpp_ghidra.h [--parts N] [--write DIR]")
+        return 1
+    parts = 8
+    out_dir = None
+    if "--parts" in argv:
+        parts = int(argv[argv.index("--parts") + 1])
+    if "--write" in argv:
+        out_dir = argv[argv.index("--write") + 1]
+    with io.open(argv[0], "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    result = partition_header(text, parts)
+    total = float(len(text)) or 1.0
+    print("Header:            {:>12,} bytes".format(len(text)))
+    print("Prelude:           {:>12,} bytes ({:.1%})".format(len(result.prelude), len(result.prelude) / total))
+    print("Components:        {:>12,}".format(result.components))
+    print("Largest component: {:>12,} bytes ({:.1%})".format(result.largest_component,
+                                                              result.largest_component / total))
+    for i, body in enumerate(result.partitions):
+        print("  partition {:>2}:    {:>12,} bytes".format(i, len(body)))
+    if out_dir:
+        if not os.path.isdir(out_dir):
+            os.makedirs(out_dir)
+        for i, full in enumerate(result.texts()):
+            with io.open(os.path.join(out_dir, "partition_{:02d}.h".format(i)), "w", encoding="utf-8") as f:
+                f.write(full)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,367 @@
+# Shared IL2CPP program setup for the Ghidra headless scripts
+# Compatible with Jython 2.7 (Ghidra's Python interpreter) and PyGhidra (CPython 3)
+# Imported by analysis scripts (script directory is on sys.path)
+#
+# Modules cannot use the GhidraScript flat API (getFunctionAt, createFunction,
+# ...), so everything here works from the Program object and Ghidra commands.
+# Under CPython, script.json is parsed with orjson when it is installed.
+#
+# The IL2CPP header is split by header_partitions.py and the partitions are
+# parsed on PARSE_WORKERS threads, each into its own StandAloneDataTypeManager.
+# The results are merged into the program in partition order (types sorted by
+# path) with REPLACE_EMPTY_STRUCTS_OR_RENAME_AND_ADD_HANDLER: the prelude types
+# every partition repeats resolve to one copy, and a forward-declared (empty)
+# struct is replaced by its full definition from another partition. Any failure
+# falls back to the single-threaded parse of the whole header.
+
+from ghidra.app.cmd.function import CreateFunctionCmd
+from ghidra.app.plugin.core.analysis import AutoAnalysisManager
+from ghidra.app.util.cparser.C import CParser
+from ghidra.program.model.address import AddressSet
+from ghidra.program.model.data import DataTypeConflictHandler, StandAloneDataTypeManager
+from ghidra.program.model.symbol import SourceType
+from ghidra.util.task import ConsoleTaskMonitor
+from header_partitions import partition_header
+from java.lang import Runtime
+from java.util import ArrayList
+import codecs
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+IS_JYTHON = sys.platform.startswith("java")
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+# Default locations (same as the decompile_*.py scripts)
+SCRIPT_JSON_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\script.json"
+IL2CPP_HEADER_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\il2cpp_ghidra.h"
+
+# Marker type from il2cpp_ghidra.h; if present the header was parsed in an earlier run
+HEADER_MARKER_TYPE = "Il2CppObject"
+
+# Header partitions parsed concurrently; 1 disables the partitioned parse
+PARSE_WORKERS = Runtime.getRuntime().availableProcessors()
+
+
+def runtime_name():
+    """'Jython 2.7.3' or 'CPython 3.12.1' (+ orjson when available)."""
+    name = ("Jython " if IS_JYTHON else "CPython ") + sys.version.split()[0]
+    return name + (" + orjson" if orjson is not None else "")
+
+
+def header_types_present(program):
+    """True if the program's data type manager already holds the IL2CPP types."""
+    return find_data_type(program.getDataTypeManager(), HEADER_MARKER_TYPE) is not None
+
+
+def _parse_partition(index, text, results):
+    """Thread body: parse one partition into a fresh data type manager (or record the error)."""
+    part_dtm = StandAloneDataTypeManager("il2cpp_partition_{:02d}".format(index))
+    transaction = part_dtm.startTransaction("Parse IL2CPP header partition")
+    try:
+        CParser(part_dtm).parse(text)
+        results[index] = part_dtm
+    except Exception as e:
+        results[index] = e
+    finally:
+        part_dtm.endTransaction(transaction, True)
+
+
+def parse_partitioned(dtm, header_content, workers=PARSE_WORKERS):
+    """Parse the header as independent partitions in parallel and merge them into dtm.
+
+    Raises if any partition fails to parse; the caller falls back to the serial parse.
+    """
+    started = time.time()
+    partitioning = partition_header(header_content, workers)
+    texts = partitioning.texts()
+    print("Partitioned header in {:.1f}s: {} components -> {} partitions, prelude {} bytes".format(
+        time.time() - started, partitioning.components, len(texts), len(partitioning.prelude)))
+
+    results = [None] * len(texts)
+    threads = [threading.Thread(target=_parse_partition, args=(i, text, results)) for i, text in enumerate(texts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print("Parsed {} partitions in {:.1f}s".format(len(texts), time.time() - started))
+
+    try:
+        for i, result in enumerate(results):
+            if not isinstance(result, StandAloneDataTypeManager):
+                raise RuntimeError("partition {} failed: {}".format(i, result))
+        merge_data_types(dtm, results)
+    finally:
+        for result in results:
+            if isinstance(result, StandAloneDataTypeManager):
+                result.close()
+    print("Header types merged in {:.1f}s total".format(time.time() - started))
+    return True
+
+
+def merge_data_types(dtm, sources):
+    """Add every type of each source manager to dtm; returns the number merged.
+
+    Deterministic: sources in order, then data type path within a source. Prints
+    the types the conflict handler had to rename.
+    """
+    handler = DataTypeConflictHandler.REPLACE_EMPTY_STRUCTS_OR_RENAME_AND_ADD_HANDLER
+    conflicts = []
+    merged = 0
+    for source in sources:
+        types = []
+        iterator = source.getAllDataTypes()
+        while iterator.hasNext():
+            types.append(iterator.next())
+        types.sort(key=lambda dt: "%s" % dt.getPathName())
+        for data_type in types:
+            resolved = dtm.addDataType(data_type, handler)
+            merged += 1
+            if resolved is not None and ".conflict" in ("%s" % resolved.getName()):
+                conflicts.append("%s" % resolved.getPathName())
+    print("Merged {} data types".format(merged))
+    if conflicts:
+        print("WARNING: {} conflicting definitions were renamed:".format(len(conflicts)))
+        for path in conflicts[:20]:
+            print("  " + path)
+    return merged
+
+
+def parse_il2cpp_header(program, header_path=IL2CPP_HEADER_PATH, workers=PARSE_WORKERS):
+    """Parse il2cpp_ghidra.h into the program's data type manager."""
+    return parse_header_into(program.getDataTypeManager(), header_path, workers)
+
+
+def parse_header_archive(header_path=IL2CPP_HEADER_PATH, workers=PARSE_WORKERS):
+    """Parse il2cpp_ghidra.h once into an in-memory archive, or None on failure.
+
+    decompile_batch.py applies the archive to every program that uses the same
+    header (apply_header_archive) instead of parsing it again per program.
+    """
+    archive = StandAloneDataTypeManager(os.path.basename(header_path))
+    transaction = archive.startTransaction("Parse IL2CPP header")
+    try:
+        parsed = parse_header_into(archive, header_path, workers)
+    finally:
+        archive.endTransaction(transaction, True)
+    if not parsed:
+        archive.close()
+        return None
+    return archive
+
+
+def apply_header_archive(program, archive):
+    """Copy the types of a parse_header_archive() result into the program."""
+    if header_types_present(program):
+        print("IL2CPP types already present in program - skipping header archive")
+        return True
+    started = time.time()
+    merge_data_types(program.getDataTypeManager(), [archive])
+    print("Applied header archive in {:.1f}s".format(time.time() - started))
+    return True
+
+
+def parse_header_into(dtm, header_path=IL2CPP_HEADER_PATH, workers=PARSE_WORKERS):
+    """Parse il2cpp_ghidra.h into dtm (partitioned when workers > 1, serial as fallback)."""
+    if not os.path.exists(header_path):
+        print("WARNING: il2cpp_ghidra.h not found at: " + header_path)
+        return False
+
+    print("Parsing IL2CPP header: " + header_path)
+    print("This may take a few minutes for large headers...")
+    try:
+        with open(header_path, 'r') as f:
+            header_content = f.read()
+        print("Header size: " + str(len(header_content)) + " bytes")
+        if workers > 1:
+            try:
+                return parse_partitioned(dtm, header_content, workers)
+            except Exception as partition_error:
+                print("Partitioned parse failed: " + str(partition_error))
+                print("Falling back to single-threaded parse...")
+        CParser(dtm).parse(header_content)
+        return True
+    except Exception as parse_error:
+        print("C Parser error: " + str(parse_error))
+        print("Attempting alternative parsing method...")
+        try:
+            from ghidra.app.util.cparser.C import CParserUtils
+            from ghidra.app.util import MessageLog
+            log = MessageLog()
+            CParserUtils.parseHeaderFiles(dtm, [header_path], [], log, ConsoleTaskMonitor())
+            if log.hasMessages():
+                print("Parser messages: " + log.toString())
+            return True
+        except Exception as alt_error:
+            print("Alternative parsing also failed: " + str(alt_error))
+            return False
+
+
+def ensure_il2cpp_types(program, header_path=IL2CPP_HEADER_PATH):
+    """Parse the header unless a previous run already saved its types in the project."""
+    if header_types_present(program):
+        print("IL2CPP types already present in program - skipping header parse")
+        return True
+    return parse_il2cpp_header(program, header_path)
+
+
+def load_script_json(script_json_path=SCRIPT_JSON_PATH):
+    """Load Il2CppDumper's script.json, or None if it is missing."""
+    if not os.path.exists(script_json_path):
+        print("script.json not found at: " + script_json_path)
+        return None
+    print("Loading IL2CPP symbols from: " + script_json_path)
+    if orjson is not None:
+        with open(script_json_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with codecs.open(script_json_path, 'r', 'utf-8') as f:
+        return json.load(f)
+
+
+def clean_symbol_name(name):
+    return name.replace("$$", "__").replace("<", "_").replace(">", "_").replace(",", "_")
+
+
+def apply_il2cpp_symbols(program, data, target_names):
+    """Label every ScriptMethod whose name is in target_names; returns the count applied."""
+    if data is None:
+        return 0
+    wanted = set(target_names)
+    symbol_table = program.getSymbolTable()
+    image_base = program.getImageBase().getOffset()
+    space = program.getAddressFactory().getDefaultAddressSpace()
+    applied = 0
+    for method in data.get("ScriptMethod", []):
+        addr = method.get("Address")
+        name = method.get("Name")
+        if not addr or not name:
+            continue
+        if name in wanted or name.replace(".", "$$") in wanted:
+            try:
+                symbol_table.createLabel(space.getAddress(image_base + addr), clean_symbol_name(name),
+                                         SourceType.IMPORTED)
+                applied += 1
+            except Exception:
+                pass
+    print("Applied " + str(applied) + " IL2CPP symbols")
+    return applied
+
+
+def get_or_create_function(program, rva, name):
+    """Function at image base + rva, creating it if auto-analysis never did."""
+    address = program.getAddressFactory().getDefaultAddressSpace().getAddress(
+        program.getImageBase().getOffset() + rva)
+    func = program.getFunctionManager().getFunctionAt(address)
+    if func is not None:
+        return func
+    print("    Creating function at 0x{:X}...".format(address.getOffset()))
+    cmd = CreateFunctionCmd(name.replace("$$", "_"), address, None, SourceType.ANALYSIS)
+    if not cmd.applyTo(program, ConsoleTaskMonitor()):
+        return None
+    return program.getFunctionManager().getFunctionAt(address)
+
+
+def create_missing_functions(program, targets, analyze=True):
+    """Create every missing function in targets ({rva: name}) in one transaction.
+
+    Auto-analysis ignores the individual creations; afterwards one analysis pass
+    runs over just the new function bodies. Returns the number created.
+    """
+    image_base = program.getImageBase().getOffset()
+    space = program.getAddressFactory().getDefaultAddressSpace()
+    function_manager = program.getFunctionManager()
+    missing = [(space.getAddress(image_base + rva), name) for rva, name in sorted(targets.items())
+               if function_manager.getFunctionAt(space.getAddress(image_base + rva)) is None]
+    if not missing:
+        return 0
+
+    print("Creating {} missing functions...".format(len(missing)))
+    monitor = ConsoleTaskMonitor()
+    manager = AutoAnalysisManager.getAnalysisManager(program)
+    was_ignoring = manager.setIgnoreChanges(True)
+    bodies = AddressSet()
+    created = 0
+    transaction = program.startTransaction("Create target functions")
+    try:
+        for address, name in missing:
+            cmd = CreateFunctionCmd(name.replace("$$", "_"), address, None, SourceType.ANALYSIS)
+            func = function_manager.getFunctionAt(address) if cmd.applyTo(program, monitor) else None
+            if func is None:
+                print("    Could not create function at 0x{:X}".format(address.getOffset()))
+                continue
+            bodies.add(func.getBody())
+            created += 1
+    finally:
+        program.endTransaction(transaction, True)
+        manager.setIgnoreChanges(was_ignoring)
+
+    if analyze and not bodies.isEmpty():
+        print("Analyzing {} new function bodies ({} bytes)...".format(created, bodies.getNumAddresses()))
+        manager.reAnalyzeAll(bodies)
+        manager.startAnalysis(monitor)
+    return created
+
+
+def find_data_type(dtm, name):
+    """First data type called name in any category, or None."""
+    found = ArrayList()
+    dtm.findDataTypes(name, found)
+    return found.get(0) if found.size() > 0 else None
+
+
+def split_signature(signature):
+    """'void X__M (X_o* __this, int32_t v, const MethodInfo* method);' -> ['X_o*', 'int32_t', 'const MethodInfo*']"""
+    if not signature or "(" not in signature:
+        return []
+    inner = signature[signature.index("(") + 1:signature.rindex(")")].strip()
+    if not inner:
+        return []
+    types = []
+    for param in inner.split(","):
+        param = param.strip()
+        cut = max(param.rfind(" "), param.rfind("*"))
+        types.append(param[:cut + 1].strip() if cut >= 0 else param)
+    return types
+
+
+def return_type(signature):
+    """'X_o* X__get_Instance (const MethodInfo* method);' -> 'X_o*'"""
+    if not signature or "(" not in signature:
+        return ""
+    head = signature[:signature.index("(")].strip()
+    cut = max(head.rfind(" "), head.rfind("*"))
+    return head[:cut + 1].strip() if cut >= 0 else ""
+
+
+def method_signatures(data):
+    """{rva: (name, return C type, [parameter C types])} from ScriptMethod entries."""
+    signatures = {}
+    if data is None:
+        return signatures
+    for method in data.get("ScriptMethod", []):
+        if method.get("Address") and method.get("Name"):
+            signature = method.get("Signature")
+            signatures[method["Address"]] = (method["Name"], return_type(signature), split_signature(signature))
+    return signatures
+
+
+def metadata_globals(data):
+    """{rva: (name, C type)} for ScriptMetadata globals such as Foo_TypeInfo (Foo_c*)."""
+    globals_by_rva = {}
+    if data is None:
+        return globals_by_rva
+    for entry in data.get("ScriptMetadata", []):
+        if entry.get("Address") and entry.get("Name"):
+            globals_by_rva[entry["Address"]] = (entry["Name"], entry.get("Signature") or "")
+    return globals_by_rva
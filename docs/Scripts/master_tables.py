@@ -0,0 +1,320 @@
+"""Bulk-decode the game's master data CSVs into memory-mappable columnar tables.
+
+Runs under regular CPython 3 with NumPy (not inside Ghidra).
+
+Master records (Ability, Item, Map, ...) are built from one CSV line each by
+<Class>$$ctor_masterLine (decompile_magic.py). The decompiled getters show the
+resulting layout: every record keeps an int array at +0x18 and a string array
+at +0x10, and each property reads one fixed slot, e.g.
+
+    Ability$$get_Id              ints[0]     Ability$$get_AbilityLv  ints[2]
+    Ability$$get_AbilityGroupId  ints[3]     Ability$$get_UseValue   ints[8]  (MP cost)
+    Map$$get_MapName             strings[0]  Map$$get_AssetName      strings[1]
+
+so the line's integer columns fill ints[] in order and its text columns fill
+strings[] in order. `layouts` recovers these slot names from the
+decompiled_*.c corpus; `decode` parses exported master CSVs (a header row is
+optional) the same way, names the slots from the corpus and the header, sorts
+rows by Id and writes per table:
+
+    <table>.ints.npy          int32 [int column, row], one contiguous column per slot
+    <table>.strings.bin       UTF-8 text of every string cell
+    <table>.string_index.npy  int64 [string column, row + 1] offsets into strings.bin
+    <table>.json              class, columns (slot, name, header), row count, source
+
+All arrays open with mmap_mode="r"; MasterTable does Id lookups with a binary
+search over ints[0], so a query touches a few pages instead of calling a
+getter per field through IL2CPP.
+
+Usage:
+    python master_tables.py layouts
+    python master_tables.py decode ability.csv item.csv map.csv [-o master] [--class ability=Ability]
+    python master_tables.py query master ability 101 102 [--columns AbilityLv,UseValue]
+
+The CSVs come from the game's master data assets (exported text assets,
+one file per table); the output directory is a generated artifact.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from decomp_corpus import SCRIPT_DIR, corpus_files, parse_file
+
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "master")
+
+INT_ARRAY_OFFSET = 0x18
+STRING_ARRAY_OFFSET = 0x10
+ARRAY_DATA_OFFSET = 0x20
+
+_ARRAY_LOAD = re.compile(r"(\w+) = \*\(longlong \*\)\(param_1 \+ (0x1[08])\);")
+_INT_RE = re.compile(r"^[+-]?\d+$")
+
+
+def _slot_read(var):
+    return re.compile(r"return \(?(?:ulonglong\))?\*\((uint|int|undefined8) \*\)\(" + re.escape(var) +
+                      r" \+ (0x[0-9a-fA-F]+)\);")
+
+
+def _bounds_check(var):
+    return re.compile(r"\*\((?:uint|int) \*\)\(" + re.escape(var) + r" \+ 0x18\)")
+
+
+def recover_layouts(paths=None):
+    """{class: {"ints": {slot: property}, "strings": {slot: property}}} from master getters in the corpus."""
+    layouts = {}
+    for path in paths or corpus_files():
+        _, functions = parse_file(path)
+        for func in functions:
+            class_name, _, method = func.name.partition("$$")
+            if not method.startswith("get_") or func.failed:
+                continue
+            code = func.code
+            load = _ARRAY_LOAD.search(code)
+            if not load or not _bounds_check(load.group(1)).search(code):
+                continue
+            read = _slot_read(load.group(1)).search(code)
+            if not read:
+                continue
+            is_string = int(load.group(2), 16) == STRING_ARRAY_OFFSET
+            width = 8 if is_string else 4
+            if is_string != (read.group(1) == "undefined8"):
+                continue
+            slot = (int(read.group(2), 16) - ARRAY_DATA_OFFSET) // width
+            kind = "strings" if is_string else "ints"
+            layout = layouts.setdefault(class_name, {"ints": {}, "strings": {}})
+            layout[kind][slot] = method[len("get_"):]
+    return layouts
+
+
+def read_master_csv(path):
+    """(header or None, rows) from a master CSV; a first row with non-numeric cells over numeric data is a header."""
+    with io.open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row and any(cell.strip() for cell in row)]
+    if len(rows) > 1:
+        first, second = rows[0], rows[1]
+        numeric_below = [i for i, cell in enumerate(second) if _INT_RE.match(cell.strip())]
+        if numeric_below and all(i < len(first) and not _INT_RE.match(first[i].strip()) for i in numeric_below):
+            return [cell.strip() for cell in first], rows[1:]
+    return None, rows
+
+
+def column_kinds(rows, width):
+    """'int' for columns whose cells are all integers (blank counts as 0), else 'string'."""
+    kinds = []
+    for column in range(width):
+        cells = [row[column].strip() for row in rows if column < len(row)]
+        is_int = all(cell == "" or _INT_RE.match(cell) for cell in cells) and any(cells)
+        kinds.append("int" if is_int else "string")
+    return kinds
+
+
+def build_table(header, rows, layout):
+    """(ints [n_int, rows] int32, string columns [[str]], column metadata) with rows sorted by Id."""
+    width = max(len(row) for row in rows)
+    kinds = column_kinds(rows, width)
+    int_columns = [c for c in range(width) if kinds[c] == "int"]
+    string_columns = [c for c in range(width) if kinds[c] == "string"]
+
+    ints = np.zeros((len(int_columns), len(rows)), dtype=np.int64)
+    for slot, column in enumerate(int_columns):
+        ints[slot] = [int(row[column]) if column < len(row) and row[column].strip() else 0 for row in rows]
+    if len(int_columns) and (ints.min() < np.iinfo(np.int32).min or ints.max() > np.iinfo(np.int32).max):
+        raise ValueError("integer column out of int32 range")
+    strings = [[row[column] if column < len(row) else "" for row in rows] for column in string_columns]
+
+    order = np.argsort(ints[0], kind="stable") if len(int_columns) else np.arange(len(rows))
+    ints = ints[:, order].astype(np.int32)
+    strings = [[column[i] for i in order] for column in strings]
+
+    def describe(kind, slots, columns):
+        named = layout.get(kind, {}) if layout else {}
+        described = []
+        for slot, column in enumerate(columns):
+            header_name = header[column] if header and column < len(header) else None
+            name = named.get(slot) or header_name or "{}{}".format(kind[:-1], slot)
+            described.append({"slot": slot, "csv_column": column, "name": name, "header": header_name,
+                              "from_getter": slot in named})
+        return described
+
+    columns = {"ints": describe("ints", len(int_columns), int_columns),
+               "strings": describe("strings", len(string_columns), string_columns)}
+    return ints, strings, columns
+
+
+def write_table(output_dir, table, class_name, source, ints, strings, columns):
+    blob = bytearray()
+    offsets = np.zeros((len(strings), (len(strings[0]) if strings else 0) + 1), dtype=np.int64)
+    for c, column in enumerate(strings):
+        for r, text in enumerate(column):
+            offsets[c, r] = len(blob)
+            blob += text.encode("utf-8")
+        offsets[c, len(column)] = len(blob)
+    base = os.path.join(output_dir, table)
+    np.save(base + ".ints.npy", np.ascontiguousarray(ints))
+    np.save(base + ".string_index.npy", offsets)
+    with open(base + ".strings.bin", "wb") as f:
+        f.write(bytes(blob))
+    meta = {"table": table, "class": class_name, "source": os.path.abspath(source), "rows": int(ints.shape[1]),
+            "columns": columns}
+    with io.open(base + ".json", "w", encoding="utf-8", newline="\n") as f:
+        f.write(json.dumps(meta, indent=2, sort_keys=True))
+        f.write("\n")
+
+
+class MasterTable(object):
+    """Read-only, memory-mapped view of one decoded table."""
+
+    def __init__(self, directory, table):
+        base = os.path.join(directory, table)
+        with io.open(base + ".json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.ints = np.load(base + ".ints.npy", mmap_mode="r")
+        self.string_index = np.load(base + ".string_index.npy", mmap_mode="r")
+        size = os.path.getsize(base + ".strings.bin")
+        self.strings = np.memmap(base + ".strings.bin", dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+        self.columns = {}
+        for kind in ("ints", "strings"):
+            for column in self.meta["columns"][kind]:
+                self.columns.setdefault(column["name"], (kind, column["slot"]))
+
+    @property
+    def ids(self):
+        return self.ints[0]
+
+    def rows_of(self, ids):
+        """Row index per Id (-1 if absent), vectorized."""
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, ids)
+        found = rows < len(self.ids)
+        found[found] = self.ids[rows[found]] == ids[found]
+        return np.where(found, rows, -1)
+
+    def column(self, name):
+        kind, slot = self.columns[name]
+        if kind != "ints":
+            raise KeyError("{} is a string column; use text()".format(name))
+        return self.ints[slot]
+
+    def text(self, name, row):
+        kind, slot = self.columns[name]
+        start, end = self.string_index[slot, row], self.string_index[slot, row + 1]
+        return bytes(self.strings[start:end]).decode("utf-8")
+
+    def get(self, record_id, name):
+        """One value by Id and column name; None if the Id is missing."""
+        row = int(self.rows_of([record_id])[0])
+        if row < 0:
+            return None
+        kind, _ = self.columns[name]
+        return int(self.column(name)[row]) if kind == "ints" else self.text(name, row)
+
+    def lookup(self, ids, name):
+        """Int column values for many Ids at once (missing Ids -> fill 0, mask returned)."""
+        rows = self.rows_of(ids)
+        values = np.asarray(self.column(name))[np.maximum(rows, 0)]
+        return np.where(rows >= 0, values, 0), rows >= 0
+
+
+def guess_class(table, layouts):
+    by_lower = dict((name.lower(), name) for name in layouts)
+    key = table.lower().replace("_", "")
+    return by_lower.get(key) or by_lower.get(key.rstrip("s"))
+
+
+def cmd_layouts(args):
+    layouts = recover_layouts()
+    for class_name in sorted(layouts):
+        layout = layouts[class_name]
+        print(class_name)
+        for kind in ("ints", "strings"):
+            for slot in sorted(layout[kind]):
+                print("  {}[{}] {}".format(kind, slot, layout[kind][slot]))
+    return 0
+
+
+def cmd_decode(args):
+    layouts = recover_layouts()
+    overrides = dict(item.split("=", 1) for item in args.class_map)
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    status = 0
+    for path in args.csv:
+        table = os.path.splitext(os.path.basename(path))[0]
+        class_name = overrides.get(table) or guess_class(table, layouts)
+        layout = layouts.get(class_name) if class_name else None
+        header, rows = read_master_csv(path)
+        if not rows:
+            print("{}: no rows".format(path))
+            status = 1
+            continue
+        ints, strings, columns = build_table(header, rows, layout)
+        ids = ints[0] if len(ints) else np.zeros(0, np.int32)
+        duplicates = int(np.count_nonzero(np.diff(ids) == 0)) if len(ids) else 0
+        if layout:
+            for kind, count in (("ints", len(ints)), ("strings", len(strings))):
+                beyond = [name for slot, name in layout[kind].items() if slot >= count]
+                if beyond:
+                    print("WARNING {}: {} has getters past the {} {} columns found: {} "
+                          "(a column was typed differently than the game parses it)".format(
+                              table, class_name, count, kind, ", ".join(beyond)))
+                    status = 1
+        if duplicates:
+            print("WARNING {}: {} duplicate Ids (lookups return the first)".format(table, duplicates))
+        write_table(args.output, table, class_name, path, ints, strings, columns)
+        named = sum(1 for kind in columns for c in columns[kind] if c["from_getter"])
+        print("{:<24} {:>6} rows  {:>3} int {:>3} string columns  {:>3} named from getters  class {}".format(
+            table, len(rows), len(ints), len(strings), named, class_name or "-"))
+    print("Output: " + args.output)
+    return status
+
+
+def cmd_query(args):
+    table = MasterTable(args.directory, args.table)
+    names = args.columns.split(",") if args.columns else \
+        [c["name"] for c in table.meta["columns"]["ints"] if c["slot"]] + \
+        [c["name"] for c in table.meta["columns"]["strings"]]
+    unknown = [name for name in names if name not in table.columns]
+    if unknown:
+        print("Unknown columns: {} (have: {})".format(", ".join(unknown), ", ".join(sorted(table.columns))))
+        return 1
+    print("\t".join(["Id"] + names))
+    status = 0
+    for record_id in args.ids:
+        if int(table.rows_of([record_id])[0]) < 0:
+            print("{}\t(not found)".format(record_id))
+            status = 1
+            continue
+        print("\t".join([str(record_id)] + [str(table.get(record_id, name)) for name in names]))
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    layouts = sub.add_parser("layouts", help="list master getter slots recovered from decompiled_*.c")
+    layouts.set_defaults(func=cmd_layouts)
+    decode = sub.add_parser("decode", help="decode master CSVs into columnar tables")
+    decode.add_argument("csv", nargs="+")
+    decode.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    decode.add_argument("--class", dest="class_map", action="append", default=[], metavar="TABLE=Class",
+                        help="class whose getters name a table's columns (default: from the file name)")
+    decode.set_defaults(func=cmd_decode)
+    query = sub.add_parser("query", help="look up records by Id")
+    query.add_argument("directory")
+    query.add_argument("table")
+    query.add_argument("ids", nargs="+", type=int)
+    query.add_argument("--columns", help="comma-separated column names (default: all)")
+    query.set_defaults(func=cmd_query)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+# Cached high p-code IR for the decompiled targets
+# Runs under CPython 3 and Jython 2.7; export_high_function() takes Ghidra
+# objects but needs no Ghidra imports, everything else is plain Python
+#
+# Looking at a function again (its callees, which offsets it loads, the
+# arithmetic of a formula) used to mean another Ghidra run. decompile_engine.py
+# now serializes each target's HighFunction while it has it and stores it next
+# to the C output, keyed by RVA and the normalized body hash from decomp_diff.py:
+#
+#   decompiled_<group>.ir/<rva>_<hash>.json
+#
+# The hash alone is not unique: normalization erases callee and DAT identity,
+# so sibling getters such as OwnedAbility$$get_MesIdName/get_MesIdDescription
+# share one. An unchanged body at the same RVA is not exported again; saving a
+# new body removes the function's older files. Layout,
+# with every address stored as an RVA and every reference as a list index:
+#
+#   {"version": 1, "name", "rva", "hash", "return": type, "params": [[name, type]],
+#    "highs":    [[name, type, kind]],                 kind: Local/Param/Global/Constant/Other
+#    "varnodes": [[space, offset, size, high]],         high: index into highs or -1
+#    "ops":      [[rva, time, mnemonic, output, [inputs], block]],   output: varnode or -1
+#    "blocks":   [[start rva, stop rva, [successor blocks]]],
+#    "calls":    [[op, target rva or null, callee name or null]]}
+#
+# IRFunction reads one record back for offline passes (callees, memory
+# accesses with their base + offset) without touching Ghidra.
+#
+# Usage:
+#   python pcode_ir.py <group> [--function NAME] [calls|ops|memory]
+
+import io
+import json
+import os
+import sys
+
+from decomp_corpus import SCRIPT_DIR
+
+IR_VERSION = 2
+
+# Ops that pass a pointer through unchanged apart from a constant offset
+_ADDRESS_OPS = ("COPY", "CAST", "INT_ADD", "PTRSUB", "PTRADD")
+MAX_TRACE_DEPTH = 12
+
+
+def ir_dir(c_path):
+    """decompiled_<group>.c -> decompiled_<group>.ir"""
+    return os.path.splitext(c_path)[0] + ".ir"
+
+
+# -- export (inside Ghidra) ----------------------------------------------------
+
+def export_high_function(program, high, name, rva, body_hash):
+    """Serialize a HighFunction into the cached IR dict."""
+    image_base = program.getImageBase().getOffset()
+    ram = program.getAddressFactory().getDefaultAddressSpace()
+    function_manager = program.getFunctionManager()
+
+    highs = []
+    high_index = {}
+    varnodes = []
+    varnode_index = {}
+
+    def to_rva(address):
+        return address.getOffset() - image_base
+
+    def add_high(var):
+        if var is None:
+            return -1
+        key = var    # Java objects hash by identity under both runtimes
+        if key not in high_index:
+            data_type = var.getDataType()
+            kind = "%s" % var.getClass().getSimpleName()
+            highs.append(["%s" % (var.getName() or ""), "%s" % data_type.getName() if data_type else "",
+                          kind[4:] if kind.startswith("High") else kind])
+            high_index[key] = len(highs) - 1
+        return high_index[key]
+
+    def add_varnode(vn):
+        if vn is None:
+            return -1
+        key = vn.getUniqueId() if hasattr(vn, "getUniqueId") else id(vn)
+        if key not in varnode_index:
+            address = vn.getAddress()
+            space = address.getAddressSpace()
+            offset = address.getOffset()
+            if space == ram:
+                offset -= image_base
+            varnodes.append(["%s" % space.getName(), offset, vn.getSize(), add_high(vn.getHigh())])
+            varnode_index[key] = len(varnodes) - 1
+        return varnode_index[key]
+
+    ops = []
+    blocks = []
+    calls = []
+    basic_blocks = list(high.getBasicBlocks())
+    block_number = dict((block.getIndex(), i) for i, block in enumerate(basic_blocks))
+    for i, block in enumerate(basic_blocks):
+        successors = [block_number.get(block.getOut(j).getIndex(), -1) for j in range(block.getOutSize())]
+        blocks.append([to_rva(block.getStart()), to_rva(block.getStop()), successors])
+        iterator = block.getIterator()
+        while iterator.hasNext():
+            op = iterator.next()
+            mnemonic = "%s" % op.getMnemonic()
+            seq = op.getSeqnum()
+            ops.append([to_rva(seq.getTarget()), seq.getTime(), mnemonic, add_varnode(op.getOutput()),
+                        [add_varnode(vn) for vn in op.getInputs()], i])
+            if mnemonic in ("CALL", "CALLIND"):
+                target = op.getInput(0)
+                target_rva = None
+                callee = None
+                if mnemonic == "CALL" and target.getAddress().getAddressSpace() == ram:
+                    target_rva = to_rva(target.getAddress())
+                    func = function_manager.getFunctionAt(target.getAddress())
+                    callee = "%s" % func.getName() if func is not None else None
+                calls.append([len(ops) - 1, target_rva, callee])
+
+    symbols = high.getLocalSymbolMap()
+    params = []
+    for i in range(symbols.getNumParams()):
+        param = symbols.getParamSymbol(i)
+        params.append(["%s" % param.getName(), "%s" % param.getDataType().getName()])
+    return_type = high.getFunctionPrototype().getReturnType()
+    return {
+        "version": IR_VERSION,
+        "name": name,
+        "rva": rva,
+        "hash": body_hash,
+        "return": "%s" % return_type.getName() if return_type is not None else "",
+        "params": params,
+        "highs": highs,
+        "varnodes": varnodes,
+        "ops": ops,
+        "blocks": blocks,
+        "calls": calls,
+    }
+
+
+# -- cache ---------------------------------------------------------------------
+
+class IRCache(object):
+    """decompiled_<group>.ir/<hash>.json files for one group."""
+
+    def __init__(self, c_path):
+        self.c_path = c_path
+        self.directory = ir_dir(c_path)
+
+    def path(self, rva, body_hash):
+        return os.path.join(self.directory, "{:x}_{}.json".format(rva, body_hash))
+
+    def load(self, rva, body_hash):
+        path = self.path(rva, body_hash)
+        if not os.path.exists(path):
+            return None
+        with io.open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if data.get("version") == IR_VERSION else None
+
+    def is_current(self, body_hash, rva):
+        """True if IR for this body was already exported at rva."""
+        return self.load(rva, body_hash) is not None
+
+    def save(self, data):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        path = self.path(data["rva"], data["hash"])
+        prefix = "{:x}_".format(data["rva"])
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(".json") and name != os.path.basename(path):
+                os.remove(os.path.join(self.directory, name))
+        temp_path = path + ".tmp"
+        with io.open(temp_path, "w", encoding="utf-8") as f:
+            f.write(u"%s" % json.dumps(data, separators=(",", ":"), sort_keys=True))
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temp_path, path)
+
+    def records(self):
+        """[(name, rva, hash)] from the group's .jsonl sidecar."""
+        sidecar = os.path.splitext(self.c_path)[0] + ".jsonl"
+        if not os.path.exists(sidecar):
+            return []
+        result = []
+        with io.open(sidecar, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if not record.get("failed") and record.get("hash"):
+                        result.append((record["name"], record["rva"], record["hash"]))
+        return result
+
+    def functions(self):
+        """IRFunction per cached, successfully decompiled function (sidecar order)."""
+        result = []
+        for name, rva, body_hash in self.records():
+            data = self.load(rva, body_hash)
+            if data is not None:
+                result.append(IRFunction(data, name, rva))
+        return result
+
+
+# -- offline reader --------------------------------------------------------------
+
+class Varnode(object):
+    __slots__ = ("index", "space", "offset", "size", "high")
+
+    def __init__(self, index, space, offset, size, high):
+        self.index = index
+        self.space = space
+        self.offset = offset
+        self.size = size
+        self.high = high
+
+    @property
+    def is_constant(self):
+        return self.space == "const"
+
+    def __repr__(self):
+        if self.is_constant:
+            return "0x{:x}".format(self.offset)
+        label = self.high[0] if self.high and self.high[0] else "{}:0x{:x}".format(self.space, self.offset)
+        return "{}:{}".format(label, self.size)
+
+
+class PcodeOp(object):
+    __slots__ = ("index", "rva", "time", "mnemonic", "output", "inputs", "block")
+
+    def __init__(self, index, rva, time, mnemonic, output, inputs, block):
+        self.index = index
+        self.rva = rva
+        self.time = time
+        self.mnemonic = mnemonic
+        self.output = output
+        self.inputs = inputs
+        self.block = block
+
+    def __repr__(self):
+        text = "{} {}".format(self.mnemonic, ", ".join(repr(vn) for vn in self.inputs))
+        return "{!r} = {}".format(self.output, text) if self.output is not None else text
+
+
+class IRFunction(object):
+    """One exported HighFunction with def/use lookups."""
+
+    def __init__(self, data, name=None, rva=None):
+        self.name = name or data["name"]
+        self.rva = data["rva"] if rva is None else rva
+        self.body_hash = data["hash"]
+        self.return_type = data.get("return", "")
+        self.params = [tuple(p) for p in data.get("params", [])]
+        highs = [tuple(h) for h in data.get("highs", [])]
+        self.varnodes = [Varnode(i, space, offset, size, highs[high] if high >= 0 else None)
+                         for i, (space, offset, size, high) in enumerate(data.get("varnodes", []))]
+        self.ops = []
+        self.defining = {}
+        self.users = {}
+        for i, (op_rva, time, mnemonic, output, inputs, block) in enumerate(data.get("ops", [])):
+            op = PcodeOp(i, op_rva, time, mnemonic, self.varnodes[output] if output >= 0 else None,
+                         [self.varnodes[v] for v in inputs], block)
+            self.ops.append(op)
+            if output >= 0:
+                self.defining[output] = op
+            for v in inputs:
+                self.users.setdefault(v, []).append(op)
+        self.blocks = [tuple(b) for b in data.get("blocks", [])]
+        self.calls = [tuple(c) for c in data.get("calls", [])]
+
+    def defining_op(self, varnode):
+        return self.defining.get(varnode.index)
+
+    def uses(self, varnode):
+        return self.users.get(varnode.index, [])
+
+    def callees(self):
+        """[(call rva, target rva or None, callee name or None)] in op order."""
+        return [(self.ops[op].rva, target, callee) for op, target, callee in self.calls]
+
+    def base_and_offset(self, varnode, depth=MAX_TRACE_DEPTH):
+        """Trace a pointer back through copies, casts and constant adds -> (base varnode, offset)."""
+        offset = 0
+        while depth > 0:
+            op = self.defining_op(varnode)
+            if op is None or op.mnemonic not in _ADDRESS_OPS:
+                break
+            if op.mnemonic in ("COPY", "CAST"):
+                varnode = op.inputs[0]
+            elif op.mnemonic == "PTRADD":
+                if not (op.inputs[1].is_constant and op.inputs[2].is_constant):
+                    break
+                offset += op.inputs[1].offset * op.inputs[2].offset
+                varnode = op.inputs[0]
+            else:
+                if not op.inputs[1].is_constant:
+                    break
+                offset += op.inputs[1].offset
+                varnode = op.inputs[0]
+            depth -= 1
+        return varnode, offset
+
+    def memory_accesses(self):
+        """[(op, "load"/"store", base varnode, offset)] for every LOAD and STORE."""
+        accesses = []
+        for op in self.ops:
+            if op.mnemonic in ("LOAD", "STORE") and len(op.inputs) > 1:
+                base, offset = self.base_and_offset(op.inputs[1])
+                accesses.append((op, op.mnemonic.lower(), base, offset))
+        return accesses
+
+
+def main(argv):
+    if not argv or argv[0].startswith("-"):
+        print("usage: python pcode_ir.py <group> [--function NAME] [calls|ops|memory]")
+        return 1
+    group = argv[0]
+    c_path = os.path.join(SCRIPT_DIR, "decompiled_" + group + ".c")
+    wanted = None
+    if "--function" in argv:
+        wanted = argv[argv.index("--function") + 1]
+    view = argv[-1] if argv[-1] in ("calls", "ops", "memory") else "calls"
+
+    cache = IRCache(c_path)
+    functions = [f for f in cache.functions() if wanted is None or f.name == wanted]
+    if not functions:
+        print("No cached IR for {} (run the decompile script for this group first)".format(
+            wanted or "decompiled_" + group))
+        return 1
+    for func in functions:
+        print("{}  (RVA 0x{:X}, {} ops, {} blocks)".format(func.name, func.rva, len(func.ops), len(func.blocks)))
+        if view == "calls":
+            for call_rva, target, callee in func.callees():
+                print("  0x{:X}  -> {}".format(call_rva, callee or ("0x{:X}".format(target) if target is not None
+                                                                       else "(indirect)")))
+        elif view == "ops":
+            for op in func.ops:
+                print("  0x{:X}:{:<3} {!r}".format(op.rva, op.time, op))
+        else:
+            for op, kind, base, offset in func.memory_accesses():
+                print("  0x{:X}  {:<5} {!r} + 0x{:x}".format(op.rva, kind, base, offset))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""Snapshot cache of the analyzed Ghidra project, keyed by GameAssembly.dll hash.
+
+Runs under regular CPython 3 (not inside Ghidra). run_ghidra_analysis.bat
+calls this around import mode, because "-overwrite" throws away a 10-30 minute
+analysis whenever import runs by accident or after switching game versions.
+
+    ensure  Before import. If the project was built from this exact
+            GameAssembly.dll, or a snapshot for its hash exists (which is then
+            restored), exit 0 so the bat can skip the import. Otherwise exit 3.
+            An existing project for a different DLL is snapshotted before it
+            can be overwritten; one with no recorded hash (made before the
+            cache existed) is snapshotted as unknown-<timestamp>. Any error
+            exits 1, and the bat only imports on 3.
+    save    After a successful import. Zips <project>.gpr and <project>.rep into
+            snapshots/<hash>.zip and records which DLL hash the project holds.
+    prune   Drop least recently used snapshots until the total fits the budget.
+    list    Show the snapshots, most recently used first.
+
+The project's DLL hash is kept in <project dir>/<project name>.assembly.sha256.
+Snapshot metadata (size, created, last used) lives in snapshots/index.json.
+
+Usage:
+    python project_snapshots.py ensure --dll GameAssembly.dll --project-dir D:\\ghidra\\projects --project-name FF2_Analysis
+    python project_snapshots.py save   --dll GameAssembly.dll --project-dir ... --project-name ...
+    python project_snapshots.py prune  --project-dir ... --budget-gb 20
+    python project_snapshots.py list   --project-dir ...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+EXIT_READY = 0
+EXIT_IMPORT_NEEDED = 3
+DEFAULT_BUDGET_GB = 20.0
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotStore(object):
+    """snapshots/<hash>.zip files plus an LRU index, next to the Ghidra project."""
+
+    def __init__(self, project_dir, project_name="FF2_Analysis", snapshot_dir=None):
+        self.project_dir = project_dir
+        self.project_name = project_name
+        self.snapshot_dir = snapshot_dir or os.path.join(project_dir, "snapshots")
+        self.index_path = os.path.join(self.snapshot_dir, "index.json")
+
+    # -- project -------------------------------------------------------------
+
+    @property
+    def gpr_path(self):
+        return os.path.join(self.project_dir, self.project_name + ".gpr")
+
+    @property
+    def rep_path(self):
+        return os.path.join(self.project_dir, self.project_name + ".rep")
+
+    @property
+    def marker_path(self):
+        return os.path.join(self.project_dir, self.project_name + ".assembly.sha256")
+
+    def project_exists(self):
+        return os.path.exists(self.gpr_path) and os.path.isdir(self.rep_path)
+
+    def project_hash(self):
+        """DLL hash the current project was built from, or None if unknown."""
+        if not self.project_exists() or not os.path.exists(self.marker_path):
+            return None
+        with open(self.marker_path, encoding="utf-8") as f:
+            return f.read().strip() or None
+
+    def set_project_hash(self, digest):
+        with open(self.marker_path, "w", encoding="utf-8") as f:
+            f.write(digest + "\n")
+
+    # -- index ---------------------------------------------------------------
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_index(self, index):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.index_path)
+
+    def snapshot_path(self, digest):
+        return os.path.join(self.snapshot_dir, digest + ".zip")
+
+    def has_snapshot(self, digest):
+        return digest in self.load_index() and os.path.exists(self.snapshot_path(digest))
+
+    def touch(self, digest):
+        index = self.load_index()
+        if digest in index:
+            index[digest]["last_used"] = time.time()
+            self.save_index(index)
+
+    # -- snapshot / restore --------------------------------------------------
+
+    def save(self, digest, dll_path="", mark=True):
+        """Zip the project as the snapshot for digest (replacing any older one); mark records it as the project hash."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        target = self.snapshot_path(digest)
+        temp_path = target + ".tmp"
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            archive.write(self.gpr_path, os.path.basename(self.gpr_path))
+            for root, _, files in os.walk(self.rep_path):
+                for name in files:
+                    path = os.path.join(root, name)
+                    archive.write(path, os.path.relpath(path, self.project_dir))
+        os.replace(temp_path, target)
+        now = time.time()
+        index = self.load_index()
+        index[digest] = {"file": os.path.basename(target), "size": os.path.getsize(target),
+                         "created": now, "last_used": now, "dll": dll_path}
+        self.save_index(index)
+        if mark:
+            self.set_project_hash(digest)
+        return target
+
+    def restore(self, digest):
+        """Replace the project with the snapshot for digest; the old project is kept until extraction succeeds."""
+        backup = None
+        if self.project_exists():
+            backup = tempfile.mkdtemp(prefix=self.project_name + ".", dir=self.project_dir)
+            shutil.move(self.gpr_path, backup)
+            shutil.move(self.rep_path, backup)
+        try:
+            with zipfile.ZipFile(self.snapshot_path(digest)) as archive:
+                archive.extractall(self.project_dir)
+        except Exception:
+            if os.path.exists(self.rep_path):
+                shutil.rmtree(self.rep_path)
+            if os.path.exists(self.gpr_path):
+                os.remove(self.gpr_path)
+            if backup:
+                shutil.move(os.path.join(backup, os.path.basename(self.gpr_path)), self.gpr_path)
+                shutil.move(os.path.join(backup, os.path.basename(self.rep_path)), self.rep_path)
+                shutil.rmtree(backup)
+            raise
+        if backup:
+            shutil.rmtree(backup)
+        self.set_project_hash(digest)
+        self.touch(digest)
+
+    def prune(self, budget_bytes, keep=()):
+        """Remove least recently used snapshots until the total size fits; returns removed hashes."""
+        index = self.load_index()
+        total = sum(entry["size"] for entry in index.values())
+        removed = []
+        for digest, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= budget_bytes:
+                break
+            if digest in keep:
+                continue
+            path = self.snapshot_path(digest)
+            if os.path.exists(path):
+                os.remove(path)
+            total -= entry["size"]
+            del index[digest]
+            removed.append(digest)
+        if removed:
+            self.save_index(index)
+        return removed
+
+
+def ensure(store, dll_path):
+    """Make the project match dll_path if possible; returns EXIT_READY or EXIT_IMPORT_NEEDED."""
+    digest = file_sha256(dll_path)
+    current = store.project_hash()
+    print("GameAssembly.dll sha256: " + digest[:16])
+    if current == digest:
+        print("Project already analyzed for this GameAssembly.dll - skipping import")
+        store.touch(digest)
+        return EXIT_READY
+    if current is not None and not store.has_snapshot(current):
+        print("Snapshotting existing project ({}) before it is replaced...".format(current[:16]))
+        store.save(current)
+    elif current is None and store.project_exists():
+        key = "unknown-" + time.strftime("%Y%m%d-%H%M%S")
+        print("Existing project has no recorded GameAssembly.dll hash - snapshotting it as {}...".format(key))
+        store.save(key, mark=False)
+    if store.has_snapshot(digest):
+        print("Restoring snapshot " + store.snapshot_path(digest))
+        store.restore(digest)
+        return EXIT_READY
+    print("No snapshot for this GameAssembly.dll - import required")
+    return EXIT_IMPORT_NEEDED
+
+
+def short_key(digest):
+    """First 16 hex digits of a DLL hash; unknown-<timestamp> keys are shown whole."""
+    return digest if digest.startswith("unknown-") else digest[:16]
+
+
+def format_size(size):
+    return "{:.1f} GB".format(size / 1e9) if size >= 1e9 else "{:.0f} MB".format(size / 1e6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ghidra project snapshot cache keyed by GameAssembly.dll hash.")
+    parser.add_argument("command", choices=["ensure", "save", "prune", "list"])
+    parser.add_argument("--dll", help="GameAssembly.dll path (ensure/save)")
+    parser.add_argument("--project-dir", required=True)
+    parser.add_argument("--project-name", default="FF2_Analysis")
+    parser.add_argument("--snapshot-dir", help="default: <project dir>/snapshots")
+    parser.add_argument("--budget-gb", type=float, default=DEFAULT_BUDGET_GB, help="disk budget for prune")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.project_dir, args.project_name, args.snapshot_dir)
+    if args.command in ("ensure", "save") and not args.dll:
+        parser.error("--dll is required for " + args.command)
+
+    if args.command == "ensure":
+        try:
+            return ensure(store, args.dll)
+        except Exception as e:
+            print("ERROR: {}: {}".format(type(e).__name__, e))
+            return 1
+
+    if args.command == "save":
+        if not store.project_exists():
+            print("ERROR: project not found: " + store.gpr_path)
+            return 1
+        digest = file_sha256(args.dll)
+        print("Saving snapshot {}...".format(digest[:16]))
+        path = store.save(digest, os.path.abspath(args.dll))
+        print("  {} ({})".format(path, format_size(os.path.getsize(path))))
+        keep = [digest]
+    else:
+        keep = [store.project_hash()] if store.project_hash() else []
+
+    if args.command in ("save", "prune"):
+        for digest in store.prune(int(args.budget_gb * 1e9), keep):
+            print("Pruned snapshot " + short_key(digest))
+        if args.command == "save":
+            return 0
+
+    index = store.load_index()
+    current = store.project_hash()
+    for digest, entry in sorted(index.items(), key=lambda item: -item[1]["last_used"]):
+        print("{} {}  {:>8}  last used {}  {}".format(
+            "*" if digest == current else " ", short_key(digest), format_size(entry["size"]),
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"])), entry.get("dll", "")))
+    print("Total: {} in {} snapshot(s)".format(format_size(sum(e["size"] for e in index.values())), len(index)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
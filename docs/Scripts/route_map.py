@@ -0,0 +1,350 @@
+"""Reference model of MapRouteSearcher plus a one-pass distance field for PathfindingFilter.
+
+Runs under regular CPython 3 with NumPy (not inside Ghidra).
+
+PathfindingFilter.PassesFilter calls FieldNavigationHelper.FindPathTo for each
+entity every cycle. FindPathTo calls MapRouteSearcher.Search for destination
+layers 2, 1, 0 and then for the 8 cells around the target, so one entity costs
+up to 27 searches. Each search (decompiled_pathfinding.c) does this:
+
+    MakeRouteMapWithCollision     route map [layer, x, y] over a WINDOW x WINDOW
+                                  window of the map: -1 where the collision flags
+                                  are 0, otherwise 0 (unvisited)
+    start cell = 1; then for step = 1, 2, ...:
+        scan every window cell whose value == step and call
+        SearchAroundCellWithCollision, which, for each DIRECTIONS[i]:
+          - needs bit i set in the cell's own flags (exit allowed)
+          - for planar moves also needs the neighbour's flags & entry_mask(i)
+          - calls UpdateRouteMapCellStep: an in-window neighbour still 0
+            becomes step + 1; reaching the destination ends the search
+        stop without a route when a step visits no new cell
+
+search() follows that loop, reproducing the game's full-window rescan per step.
+distance_field() runs the same wavefront once from the player with NumPy
+shifts over the whole window, and find_path_to() answers FindPathTo's layer
+and adjacent-cell retries from it for every entity. Distances match search()
+exactly, because the game's wavefront is a breadth-first search.
+
+Assumptions the decompiled code does not pin down: the order of the static
+direction table (DIRECTIONS; the last two entries are the layer moves the
+entry check skips) and entry_mask() (FUN_180aa1490, taken as the opposite
+direction's bit). The window is centred on the player and clamped to the map;
+the game centres it on the camera, which follows the player.
+
+Collision grids are (layers, width, height) integer arrays of per-cell flags as
+MapRouteSearcher reads them. Load them from .npy, or from .npz with a
+"collision" array.
+
+Usage:
+    python route_map.py bench                                    # synthetic 3 x 96 x 96 map, 40 entities
+    python route_map.py bench --size 128 --entities 80 --density 0.3
+    python route_map.py bench --grid collision_map.npz --start 40 52 0
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+# (dx, dy, dlayer) in the order of MapRouteSearcher's static direction table; bit i = 1 << i
+DIRECTIONS = ((0, -1, 0), (1, 0, 0), (0, 1, 0), (-1, 0, 0), (0, 0, 1), (0, 0, -1))
+PLANAR_DIRECTIONS = len(DIRECTIONS) - 2
+WINDOW = 64
+BLOCKED = -1
+UNVISITED = 0
+DEST_LAYERS = (2, 1, 0)
+# FieldNavigationHelper.FindPathTo adjacent offsets (+16 world y is one cell up, i.e. y - 1)
+ADJACENT_CELLS = ((0, -1), (1, 0), (0, 1), (-1, 0), (1, -1), (1, 1), (-1, 1), (-1, -1))
+
+
+def entry_mask(direction):
+    """Flag bit a planar neighbour needs to be entered from direction (the opposite direction)."""
+    return 1 << ((direction + 2) % PLANAR_DIRECTIONS)
+
+
+def route_window(shape, start, size=WINDOW):
+    """(offset x, offset y, width, height) of the search window around start."""
+    _, width, height = shape
+    w = min(width, size)
+    h = min(height, size)
+    ox = min(max(start[0] - w // 2, 0), width - w)
+    oy = min(max(start[1] - h // 2, 0), height - h)
+    return ox, oy, w, h
+
+
+def make_route_map(collision, window, with_collision=True):
+    """MakeRouteMapWithCollision / MakeRouteMapWithoutCollision for one window."""
+    ox, oy, w, h = window
+    flags = collision[:, ox:ox + w, oy:oy + h]
+    if not with_collision:
+        return np.zeros(flags.shape, dtype=np.int32)
+    return np.where(flags != 0, UNVISITED, BLOCKED).astype(np.int32)
+
+
+# -- reference search (game semantics, one destination at a time) ---------------------
+
+class RouteSearch(object):
+    """State of one MapRouteSearcher.Search call: route map, window and destination."""
+
+    def __init__(self, collision, start, dest, with_collision=True, size=WINDOW):
+        self.collision = collision
+        self.window = route_window(collision.shape, start, size)
+        self.route = make_route_map(collision, self.window, with_collision)
+        self.with_collision = with_collision
+        ox, oy, _, _ = self.window
+        self.start = (start[2], start[0] - ox, start[1] - oy)
+        self.dest = (dest[2], dest[0] - ox, dest[1] - oy)
+        self.visited = 0
+        self.scanned = 0            # cells the per-step rescans touch (the game's dominant cost)
+
+    def in_route(self, layer, x, y):
+        layers, w, h = self.route.shape
+        return 0 <= layer < layers and 0 <= x < w and 0 <= y < h
+
+    def update_cell_step(self, layer, x, y, direction, step):
+        """UpdateRouteMapCellStep: mark the neighbour step + 1; True when it is the destination."""
+        dx, dy, dz = DIRECTIONS[direction]
+        cell = (layer + dz, x + dx, y + dy)
+        if not self.in_route(*cell) or self.route[cell] != UNVISITED:
+            return False
+        self.route[cell] = step + 1
+        self.visited += 1
+        return cell == self.dest
+
+    def search_around_cell(self, layer, x, y, step):
+        """SearchAroundCellWithCollision / WithoutCollision for one cell."""
+        if not self.with_collision:
+            return any(self.update_cell_step(layer, x, y, i, step) for i in range(len(DIRECTIONS)))
+        ox, oy, _, _ = self.window
+        _, width, height = self.collision.shape
+        flags = int(self.collision[layer, x + ox, y + oy])
+        for i, (dx, dy, _) in enumerate(DIRECTIONS):
+            nx, ny = x + ox + dx, y + oy + dy
+            if not (0 <= nx < width and 0 <= ny < height) or not flags & (1 << i):
+                continue
+            if i < PLANAR_DIRECTIONS and not int(self.collision[layer, nx, ny]) & entry_mask(i):
+                continue
+            if self.update_cell_step(layer, x, y, i, step):
+                return True
+        return False
+
+    def run(self):
+        """Steps from start to dest, or None when the wavefront stops first."""
+        if not self.in_route(*self.start) or not self.in_route(*self.dest):
+            return None
+        if self.start == self.dest:
+            return 0
+        self.route[self.start] = 1
+        step = 1
+        while True:
+            before = self.visited
+            self.scanned += self.route.size
+            for layer, x, y in np.argwhere(self.route == step):
+                if self.search_around_cell(int(layer), int(x), int(y), step):
+                    return step
+            if self.visited == before:
+                return None
+            step += 1
+
+
+def search(collision, start, dest, with_collision=True, size=WINDOW, stats=None):
+    """MapRouteSearcher.Search: step count from start to dest (x, y, layer), or None."""
+    route_search = RouteSearch(collision, start, dest, with_collision, size)
+    steps = route_search.run()
+    if stats is not None:
+        stats["searches"] = stats.get("searches", 0) + 1
+        stats["scanned"] = stats.get("scanned", 0) + route_search.scanned
+    return steps
+
+
+# -- distance field (one wavefront for every entity) ----------------------------------
+
+def shift(mask, dx, dy, dz):
+    """mask moved by (dx, dy, dz) on (layer, x, y) axes; cells shifted in are False."""
+    out = np.zeros_like(mask)
+    src = [slice(None)] * 3
+    dst = [slice(None)] * 3
+    for axis, d in ((0, dz), (1, dx), (2, dy)):
+        if d > 0:
+            src[axis], dst[axis] = slice(0, -d), slice(d, None)
+        elif d < 0:
+            src[axis], dst[axis] = slice(-d, None), slice(0, d)
+    out[tuple(dst)] = mask[tuple(src)]
+    return out
+
+
+class DistanceField(object):
+    """Step counts from one start cell to every cell of its search window (-1 = unreachable)."""
+
+    def __init__(self, collision, start, with_collision=True, size=WINDOW):
+        self.window = route_window(collision.shape, start, size)
+        ox, oy, w, h = self.window
+        self.start = start
+        flags = collision[:, ox:ox + w, oy:oy + h].astype(np.int64)
+        open_cells = make_route_map(collision, self.window, with_collision) == UNVISITED
+        self.distance = np.full(flags.shape, -1, dtype=np.int32)
+        self.steps = 0
+        local = (start[2], start[0] - ox, start[1] - oy)
+        if not all(0 <= v < n for v, n in zip(local, flags.shape)):
+            return
+        moves = []
+        for i, (dx, dy, dz) in enumerate(DIRECTIONS):
+            exits = (flags & (1 << i)) != 0 if with_collision else np.ones(flags.shape, dtype=bool)
+            if with_collision and i < PLANAR_DIRECTIONS:
+                enters = (flags & entry_mask(i)) != 0
+                moves.append((exits, (dx, dy, dz), enters & open_cells))
+            else:
+                moves.append((exits, (dx, dy, dz), open_cells))
+        self.distance[local] = 0
+        frontier = np.zeros(flags.shape, dtype=bool)
+        frontier[local] = True
+        while frontier.any():
+            reached = np.zeros_like(frontier)
+            for exits, (dx, dy, dz), allowed in moves:
+                reached |= shift(frontier & exits, dx, dy, dz) & allowed
+            reached &= self.distance < 0
+            self.steps += 1
+            self.distance[reached] = self.steps
+            frontier = reached
+
+    def steps_to(self, dest):
+        """Steps to dest (x, y, layer), or None when unreachable or outside the window."""
+        ox, oy, w, h = self.window
+        layer, x, y = dest[2], dest[0] - ox, dest[1] - oy
+        if not (0 <= layer < self.distance.shape[0] and 0 <= x < w and 0 <= y < h):
+            return None
+        d = int(self.distance[layer, x, y])
+        return d if d >= 0 else None
+
+
+def find_path_to(steps_to, dest_xy, width, height):
+    """FieldNavigationHelper.FindPathTo retry order over any steps_to((x, y, layer)) function.
+
+    Returns (steps, cell) for the first destination that has a route, else (None, None).
+    """
+    x, y = dest_xy
+    for cx, cy in [(x, y)] + [(x + dx, y + dy) for dx, dy in ADJACENT_CELLS]:
+        if not (0 <= cx < width and 0 <= cy < height):
+            continue
+        for layer in DEST_LAYERS:
+            steps = steps_to((cx, cy, layer))
+            if steps is not None:
+                return steps, (cx, cy, layer)
+    return None, None
+
+
+def reachability(collision, start, entities, with_collision=True, size=WINDOW):
+    """[(steps, cell)] for every entity (x, y) from one distance field."""
+    field = DistanceField(collision, start, with_collision, size)
+    _, width, height = collision.shape
+    return [find_path_to(field.steps_to, entity, width, height) for entity in entities]
+
+
+# -- benchmark ------------------------------------------------------------------------
+
+def synthetic_grid(size, layers=3, density=0.25, seed=1):
+    """Random walls on every layer, four-way flags on open cells, a few stairs between layers."""
+    rng = np.random.default_rng(seed)
+    open_cells = rng.random((layers, size, size)) >= density
+    flags = np.zeros((layers, size, size), dtype=np.int32)
+    for i, (dx, dy, _) in enumerate(DIRECTIONS[:PLANAR_DIRECTIONS]):
+        flags |= np.where(open_cells & shift(open_cells, -dx, -dy, 0), 1 << i, 0).astype(np.int32)
+    stairs = rng.random((layers, size, size)) < 0.01
+    for i, (_, _, dz) in enumerate(DIRECTIONS[PLANAR_DIRECTIONS:], PLANAR_DIRECTIONS):
+        flags |= np.where(stairs & open_cells & shift(open_cells, 0, 0, -dz), 1 << i, 0).astype(np.int32)
+    return flags
+
+
+def load_grid(path):
+    data = np.load(path)
+    grid = data["collision"] if hasattr(data, "files") else data
+    if grid.ndim == 2:
+        grid = grid[np.newaxis]
+    return grid.astype(np.int32)
+
+
+def pick_entities(collision, start, count, seed, size=WINDOW):
+    """count open cells inside the start window (what the scanner would list nearby)."""
+    rng = np.random.default_rng(seed + 1)
+    ox, oy, w, h = route_window(collision.shape, start, size)
+    cells = np.argwhere(collision[:, ox:ox + w, oy:oy + h].any(axis=0))
+    chosen = cells[rng.choice(len(cells), size=min(count, len(cells)), replace=False)]
+    return [(int(x) + ox, int(y) + oy) for x, y in chosen]
+
+
+def pick_start(collision, seed):
+    layer0 = np.argwhere(collision[0] != 0)
+    rng = np.random.default_rng(seed + 2)
+    x, y = layer0[rng.integers(len(layer0))]
+    return int(x), int(y), 0
+
+
+def bench(collision, start, entities, repeat, size=WINDOW):
+    _, width, height = collision.shape
+    stats = {}
+    started = time.perf_counter()
+    per_entity = [find_path_to(lambda dest: search(collision, start, dest, size=size, stats=stats),
+                               entity, width, height) for entity in entities]
+    per_entity_seconds = time.perf_counter() - started
+
+    field_seconds = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        field_results = reachability(collision, start, entities, size=size)
+        elapsed = time.perf_counter() - started
+        field_seconds = elapsed if field_seconds is None else min(field_seconds, elapsed)
+    field = DistanceField(collision, start, size=size)
+
+    mismatches = [(entity, a, b) for entity, a, b in zip(entities, per_entity, field_results) if a != b]
+    reachable = sum(1 for steps, _ in field_results if steps is not None)
+    print("Grid: {} layers x {} x {}, window {}, start {}".format(
+        collision.shape[0], width, height, "x".join(str(v) for v in route_window(collision.shape, start, size)[2:]),
+        start))
+    print("Entities: {} ({} reachable)".format(len(entities), reachable))
+    print("")
+    print("{:<22} {:>10} {:>10} {:>14}".format("mode", "seconds", "searches", "cells scanned"))
+    print("{:<22} {:>10.4f} {:>10} {:>14}".format("per-entity Search", per_entity_seconds,
+                                                  stats.get("searches", 0), stats.get("scanned", 0)))
+    print("{:<22} {:>10.4f} {:>10} {:>14}".format("distance field", field_seconds, 1,
+                                                  field.steps * field.distance.size))
+    print("")
+    print("Speedup: {:.1f}x wall clock, {:.1f}x cells scanned".format(
+        per_entity_seconds / max(field_seconds, 1e-9),
+        stats.get("scanned", 0) / float(max(field.steps * field.distance.size, 1))))
+    if mismatches:
+        print("MISMATCH for {} entities, e.g. {}".format(len(mismatches), mismatches[0]))
+        return 1
+    print("Results identical (reachability, step counts and chosen destination cell)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MapRouteSearcher reference model and distance-field benchmark.")
+    commands = parser.add_subparsers(dest="command")
+    bench_parser = commands.add_parser("bench", help="per-entity Search vs one distance field")
+    bench_parser.add_argument("--grid", help="collision grid (.npy, or .npz with 'collision'); default: synthetic")
+    bench_parser.add_argument("--size", type=int, default=96, help="synthetic map width/height")
+    bench_parser.add_argument("--layers", type=int, default=3)
+    bench_parser.add_argument("--density", type=float, default=0.25, help="synthetic wall density")
+    bench_parser.add_argument("--entities", type=int, default=40)
+    bench_parser.add_argument("--start", type=int, nargs=3, metavar=("X", "Y", "LAYER"))
+    bench_parser.add_argument("--window", type=int, default=WINDOW)
+    bench_parser.add_argument("--seed", type=int, default=1)
+    bench_parser.add_argument("--repeat", type=int, default=5, help="distance-field runs (best time kept)")
+    args = parser.parse_args(argv)
+
+    if args.command != "bench":
+        parser.print_help()
+        return 1
+    if args.grid:
+        collision = load_grid(args.grid)
+    else:
+        collision = synthetic_grid(args.size, args.layers, args.density, args.seed)
+    start = tuple(args.start) if args.start else pick_start(collision, args.seed)
+    entities = pick_entities(collision, start, args.entities, args.seed, args.window)
+    return bench(collision, start, entities, args.repeat, args.window)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,18 +9,36 @@ REM     magic        - Decompile magic/ability growth functions
 REM     weapon_skill - Decompile weapon skill growth functions
 REM     skill_level  - Decompile skill level calculation functions (spell level fix)
 REM     status_ui    - Decompile status screen UI functions (weapon skills, combat stats)
+REM     emulate_skill - Emulate skill level functions into exp->level lookup tables
+REM     growth       - Sweep StatusUpProvider growth functions into growth_*.csv tables
+REM     fields       - Annotate decompiled_*.c offsets with IL2CPP field names (*.fields.c/.csv)
+REM     server       - Keep the project open and serve decompile/xref/lookup on 127.0.0.1:18733
+REM     signatures   - Export per-function signature features (signatures_FF2.jsonl) for signature_db.py
+REM     batch        - Run decompile_batch.json (several builds/titles, one session) into batch\
+REM     hot_paths    - Rank patch_targets.json by reachability from Update/LateUpdate/FixedUpdate
 REM   mode:
-REM     import  - Create new project and import GameAssembly.dll (first time)
-REM     analyze - Re-run analysis on existing project (subsequent runs)
+REM     import   - Create new project and import GameAssembly.dll (first time)
+REM                Skipped when the project (or a snapshot) already matches the
+REM                GameAssembly.dll hash - see project_snapshots.py
+REM     reimport - Import even if a matching project or snapshot exists
+REM     analyze  - Re-run analysis on existing project (subsequent runs)
 REM
 REM Examples:
 REM   run_ghidra_analysis.bat                       - Import + decompile pathfinding
 REM   run_ghidra_analysis.bat magic                 - Import + decompile magic
 REM   run_ghidra_analysis.bat weapon_skill          - Import + decompile weapon skills
 REM   run_ghidra_analysis.bat magic analyze         - Re-analyze existing project for magic
+REM   run_ghidra_analysis.bat magic reimport        - Force a fresh import (old -overwrite behaviour)
 REM   run_ghidra_analysis.bat pathfinding analyze
 REM   run_ghidra_analysis.bat skill_level           - Import + decompile skill level functions
 REM   run_ghidra_analysis.bat status_ui             - Import + decompile status screen UI
+REM   run_ghidra_analysis.bat emulate_skill analyze - Emit skill_level_*.csv/.bin tables
+REM   run_ghidra_analysis.bat growth analyze        - Emit growth_*.csv (python sweep_tables.py --all for .npz)
+REM   run_ghidra_analysis.bat fields analyze        - Emit decompiled_*.fields.c/.csv for every group
+REM   run_ghidra_analysis.bat server analyze        - Start the server (query with decompile_client.py)
+REM   run_ghidra_analysis.bat signatures analyze    - Emit signatures_FF2.jsonl (python signature_db.py import ...)
+REM   run_ghidra_analysis.bat batch analyze         - Copy decompile_batch.example.json to decompile_batch.json first
+REM   run_ghidra_analysis.bat hot_paths analyze     - Run python extract_patch_targets.py first (patch_targets.json)
 
 setlocal enabledelayedexpansion
 
@@ -34,6 +52,9 @@ set "GAME_DIR=D:\Games\steamlibrary\steamapps\common\FINAL FANTASY II PR"
 set "GAME_ASSEMBLY=%GAME_DIR%\GameAssembly.dll"
 set "SCRIPT_DIR=%~dp0"
 set "LOG_FILE=%SCRIPT_DIR%ghidra_analysis.log"
+REM Analyzed-project snapshots (project_snapshots.py, needs python on PATH)
+set "USE_SNAPSHOTS=1"
+set "SNAPSHOT_BUDGET_GB=20"
 
 REM ============================================================================
 REM Parse arguments
@@ -51,6 +72,14 @@ if /i "%~1"=="skill" set "SCRIPT_TYPE=skill_level"
 if /i "%~1"=="status_ui" set "SCRIPT_TYPE=status_ui"
 if /i "%~1"=="status" set "SCRIPT_TYPE=status_ui"
 if /i "%~1"=="ui" set "SCRIPT_TYPE=status_ui"
+if /i "%~1"=="emulate_skill" set "SCRIPT_TYPE=emulate_skill"
+if /i "%~1"=="emulate" set "SCRIPT_TYPE=emulate_skill"
+if /i "%~1"=="growth" set "SCRIPT_TYPE=growth"
+if /i "%~1"=="fields" set "SCRIPT_TYPE=fields"
+if /i "%~1"=="server" set "SCRIPT_TYPE=server"
+if /i "%~1"=="signatures" set "SCRIPT_TYPE=signatures"
+if /i "%~1"=="batch" set "SCRIPT_TYPE=batch"
+if /i "%~1"=="hot_paths" set "SCRIPT_TYPE=hot_paths"
 if /i "%~1"=="analyze" (
     set "MODE=analyze"
     goto :skip_second_arg
@@ -59,11 +88,16 @@ if /i "%~1"=="import" (
     set "MODE=import"
     goto :skip_second_arg
 )
+if /i "%~1"=="reimport" (
+    set "MODE=reimport"
+    goto :skip_second_arg
+)
 
 REM Second arg: mode
 if /i "%~2"=="analyze" set "MODE=analyze"
 if /i "%~2"=="reanalyze" set "MODE=analyze"
 if /i "%~2"=="import" set "MODE=import"
+if /i "%~2"=="reimport" set "MODE=reimport"
 
 :skip_second_arg
 
@@ -84,6 +118,34 @@ if "%SCRIPT_TYPE%"=="magic" (
     set "SCRIPT_FILE=%SCRIPT_DIR%decompile_status_ui.py"
     set "OUTPUT_FILE=%SCRIPT_DIR%decompiled_status_ui.c"
     set "SCRIPT_NAME=decompile_status_ui.py"
+) else if "%SCRIPT_TYPE%"=="emulate_skill" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%emulate_skill_level.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%skill_level_spell.bin"
+    set "SCRIPT_NAME=emulate_skill_level.py"
+) else if "%SCRIPT_TYPE%"=="growth" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%emulate_growth.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%growth_calc_additional_parameter.csv"
+    set "SCRIPT_NAME=emulate_growth.py"
+) else if "%SCRIPT_TYPE%"=="fields" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%extract_field_access.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%decompiled_status_ui.fields.c"
+    set "SCRIPT_NAME=extract_field_access.py"
+) else if "%SCRIPT_TYPE%"=="server" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%decompile_server.py"
+    set "OUTPUT_FILE="
+    set "SCRIPT_NAME=decompile_server.py"
+) else if "%SCRIPT_TYPE%"=="signatures" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%export_signatures.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%signatures_FF2.jsonl"
+    set "SCRIPT_NAME=export_signatures.py"
+) else if "%SCRIPT_TYPE%"=="batch" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%decompile_batch.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%batch\batch_summary.json"
+    set "SCRIPT_NAME=decompile_batch.py"
+) else if "%SCRIPT_TYPE%"=="hot_paths" (
+    set "SCRIPT_FILE=%SCRIPT_DIR%classify_hot_paths.py"
+    set "OUTPUT_FILE=%SCRIPT_DIR%hot_paths.json"
+    set "SCRIPT_NAME=classify_hot_paths.py"
 ) else (
     set "SCRIPT_FILE=%SCRIPT_DIR%decompile_pathfinding.py"
     set "OUTPUT_FILE=%SCRIPT_DIR%decompiled_pathfinding.c"
@@ -128,6 +190,7 @@ if not exist "%PROJECT_DIR%" mkdir "%PROJECT_DIR%"
 
 echo Starting Ghidra headless analysis...
 echo This may take 10-30 minutes for initial import/analysis.
+if "%SCRIPT_TYPE%"=="server" echo Server mode: runs until "python decompile_client.py shutdown"
 echo Output will be logged to: %LOG_FILE%
 echo ======================================================================
 echo.
@@ -141,6 +204,30 @@ echo. >> "%LOG_FILE%"
 REM Remove trailing backslash from script dir if present
 set "SCRIPT_DIR_CLEAN=%SCRIPT_DIR:~0,-1%"
 
+REM Snapshot cache: skip the import when the project or a snapshot matches this DLL
+set "SNAPSHOT_ARGS=--dll "%GAME_ASSEMBLY%" --project-dir "%PROJECT_DIR%" --project-name "%PROJECT_NAME%""
+set "HAVE_PYTHON=0"
+if "%USE_SNAPSHOTS%"=="1" (
+    where python >nul 2>&1 && set "HAVE_PYTHON=1"
+)
+if "%MODE%"=="import" if "%HAVE_PYTHON%"=="1" (
+    echo Checking project snapshots for this GameAssembly.dll...
+    python "%SCRIPT_DIR%project_snapshots.py" ensure %SNAPSHOT_ARGS%
+    set "ENSURE_EXIT=!ERRORLEVEL!"
+    if "!ENSURE_EXIT!"=="0" (
+        echo Using existing analysis - switching to analyze mode
+        set "MODE=analyze"
+    ) else if not "!ENSURE_EXIT!"=="3" (
+        REM Only exit 3 ^(import needed^) means the old project is safe to overwrite
+        echo ERROR: project_snapshots.py ensure failed with exit code !ENSURE_EXIT!
+        echo The existing project may not be snapshotted - not overwriting it.
+        echo Fix the error above, or use "reimport" to import anyway.
+        exit /b !ENSURE_EXIT!
+    )
+    echo.
+)
+if "%MODE%"=="reimport" set "MODE=import"
+
 if "%MODE%"=="import" (
     echo Running: Import and analyze GameAssembly.dll
     echo.
@@ -158,6 +245,12 @@ if "%MODE%"=="import" (
 
 set "EXIT_CODE=%ERRORLEVEL%"
 
+REM Snapshot a fresh import so it never has to be redone for this DLL
+if "%MODE%"=="import" if "%EXIT_CODE%"=="0" if "%HAVE_PYTHON%"=="1" (
+    echo Saving project snapshot...
+    python "%SCRIPT_DIR%project_snapshots.py" save %SNAPSHOT_ARGS% --budget-gb %SNAPSHOT_BUDGET_GB%
+)
+
 echo.
 echo ======================================================================
 echo.
@@ -168,7 +261,9 @@ echo ======================================================================
 
 if %EXIT_CODE%==0 (
     echo Analysis completed successfully!
-    if exist "%OUTPUT_FILE%" (
+    if "%OUTPUT_FILE%"=="" (
+        echo.
+    ) else if exist "%OUTPUT_FILE%" (
         echo.
         echo Decompiled output written to:
         echo   %OUTPUT_FILE%
@@ -0,0 +1,309 @@
+"""File-backed function signature database across Pixel Remaster builds.
+
+Runs under regular CPython 3 (not inside Ghidra); sqlite3 is in the standard
+library and NumPy is used for MinHash when installed. export_signatures.py
+writes signatures_<title>.jsonl from an analyzed GameAssembly.dll; this
+imports those files into one signatures.db and answers "which function in
+build B is this function from build A" without Ghidra or a BSim server.
+
+Every function gets a NUM_HASHES MinHash signature over its exported features
+(p-code mnemonic 4-grams and named callees). The signature is split into BANDS
+LSH bands stored as indexed (build, band, bucket) rows, so a lookup is a few
+index probes plus scoring the handful of candidates - milliseconds even with
+every method of several titles imported. An exact name match in the other
+build (same class and method) is always listed, with its signature score.
+
+Usage:
+    python signature_db.py import signatures_FF2.jsonl [--title FF2]
+    python signature_db.py list
+    python signature_db.py query --from FF2 --to FF3 BattleUtility$$GetSkillLevel [--top 5]
+    python signature_db.py query --from FF2 --to FF3 0x913900
+    python signature_db.py map --from FF2 --to FF3 [--out ff2_to_ff3.csv]   # every decompiled_*.c target
+"""
+
+import argparse
+import array
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from decomp_corpus import SCRIPT_DIR
+from decomp_index import read_functions, source_files
+
+DB_PATH = os.path.join(SCRIPT_DIR, "signatures.db")
+NUM_HASHES = 64
+BANDS = 16                  # 16 bands x 4 rows: candidates from ~0.5 Jaccard up
+_PRIME = (1 << 31) - 1      # keeps a * x + b inside uint64 for the NumPy path
+_random = random.Random(0x50525349)
+_HASH_A = [_random.randrange(1, _PRIME) for _ in range(NUM_HASHES)]
+_HASH_B = [_random.randrange(0, _PRIME) for _ in range(NUM_HASHES)]
+if np is not None:
+    _NP_A = np.array(_HASH_A, dtype=np.uint64)[:, None]
+    _NP_B = np.array(_HASH_B, dtype=np.uint64)[:, None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY, title TEXT UNIQUE, program TEXT, sha256 TEXT,
+    image_base INTEGER, imported REAL, functions INTEGER);
+CREATE TABLE IF NOT EXISTS functions (
+    id INTEGER PRIMARY KEY, build_id INTEGER, name TEXT, rva INTEGER, size INTEGER,
+    instructions INTEGER, calls INTEGER, signature BLOB);
+CREATE INDEX IF NOT EXISTS functions_name ON functions (build_id, name);
+CREATE INDEX IF NOT EXISTS functions_rva ON functions (build_id, rva);
+CREATE TABLE IF NOT EXISTS bands (build_id INTEGER, band INTEGER, bucket INTEGER, function_id INTEGER);
+CREATE INDEX IF NOT EXISTS bands_lookup ON bands (build_id, band, bucket);
+"""
+
+
+def minhash(features):
+    """NUM_HASHES minimum hash values of a feature-hash list (empty list for no features)."""
+    if not features:
+        return []
+    if np is not None:
+        values = np.array(features, dtype=np.uint64)[None, :] % np.uint64(_PRIME)
+        return [int(v) for v in ((_NP_A * values + _NP_B) % np.uint64(_PRIME)).min(axis=1)]
+    values = [x % _PRIME for x in features]
+    return [min((a * x + b) % _PRIME for x in values) for a, b in zip(_HASH_A, _HASH_B)]
+
+
+def band_buckets(signature):
+    """[(band, bucket)] with a signed 63-bit bucket id per band (sqlite INTEGER)."""
+    rows = NUM_HASHES // BANDS
+    buckets = []
+    for band in range(BANDS):
+        packed = array.array("I", signature[band * rows:(band + 1) * rows]).tobytes()
+        buckets.append((band, int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little") >> 1))
+    return buckets
+
+
+def pack(signature):
+    return array.array("I", signature).tobytes()
+
+
+def unpack(blob):
+    values = array.array("I")
+    values.frombytes(blob or b"")
+    return values
+
+
+def estimate(sig_a, sig_b):
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / float(NUM_HASHES)
+
+
+class SignatureDB(object):
+    """signatures.db: builds, functions with packed signatures, and LSH band rows."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def build_id(self, title):
+        row = self.conn.execute("SELECT id FROM builds WHERE title = ?", (title,)).fetchone()
+        if row is None:
+            raise KeyError("unknown build: {} (imported: {})".format(title, ", ".join(self.titles()) or "none"))
+        return row[0]
+
+    def titles(self):
+        return [row[0] for row in self.conn.execute("SELECT title FROM builds ORDER BY title")]
+
+    def import_file(self, path, title=None):
+        """Replace the build's rows with the contents of a signatures_<title>.jsonl export."""
+        with io.open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            title = title or header["title"]
+            with self.conn:
+                old = self.conn.execute("SELECT id FROM builds WHERE title = ?", (title,)).fetchone()
+                if old is not None:
+                    for table, column in (("bands", "build_id"), ("functions", "build_id"), ("builds", "id")):
+                        self.conn.execute("DELETE FROM {} WHERE {} = ?".format(table, column), (old[0],))
+                build = self.conn.execute(
+                    "INSERT INTO builds (title, program, sha256, image_base, imported, functions) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (title, header.get("program"), header.get("sha256"), header.get("image_base"), time.time()),
+                ).lastrowid
+                count = 0
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    signature = minhash(record.get("features"))
+                    function_id = self.conn.execute(
+                        "INSERT INTO functions (build_id, name, rva, size, instructions, calls, signature) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (build, record["name"], record["rva"], record.get("size"), record.get("instructions"),
+                         record.get("calls"), pack(signature)),
+                    ).lastrowid
+                    if signature:
+                        self.conn.executemany(
+                            "INSERT INTO bands (build_id, band, bucket, function_id) VALUES (?, ?, ?, ?)",
+                            [(build, band, bucket, function_id) for band, bucket in band_buckets(signature)])
+                    count += 1
+                self.conn.execute("UPDATE builds SET functions = ? WHERE id = ?", (count, build))
+        return title, count
+
+    def find(self, title, key):
+        """[(id, name, rva, signature)] in a build by Class$$Method name or 0x RVA.
+
+        Raises ValueError for a 0x key that is not valid hex.
+        """
+        build = self.build_id(title)
+        if key.lower().startswith("0x"):
+            try:
+                rva = int(key, 16)
+            except ValueError:
+                raise ValueError("not a hex RVA: " + key)
+            rows = self.conn.execute("SELECT id, name, rva, signature FROM functions WHERE build_id = ? AND rva = ?",
+                                     (build, rva))
+        else:
+            rows = self.conn.execute("SELECT id, name, rva, signature FROM functions WHERE build_id = ? AND name = ?",
+                                     (build, key))
+        return [(row[0], row[1], row[2], unpack(row[3])) for row in rows]
+
+    def matches(self, signature, name, title, top=5):
+        """[(score, how, name, rva)] in build title: LSH candidates plus any exact name match."""
+        build = self.build_id(title)
+        candidates = set()
+        if signature:
+            for band, bucket in band_buckets(list(signature)):
+                candidates.update(row[0] for row in self.conn.execute(
+                    "SELECT function_id FROM bands WHERE build_id = ? AND band = ? AND bucket = ?",
+                    (build, band, bucket)))
+        results = {}
+        if candidates:
+            marks = ",".join("?" * len(candidates))
+            for function_id, other_name, rva, blob in self.conn.execute(
+                    "SELECT id, name, rva, signature FROM functions WHERE id IN ({})".format(marks),
+                    list(candidates)):
+                results[function_id] = [estimate(signature, unpack(blob)), "lsh", other_name, rva]
+        for function_id, other_name, rva, blob in self.conn.execute(
+                "SELECT id, name, rva, signature FROM functions WHERE build_id = ? AND name = ?", (build, name)):
+            entry = results.setdefault(function_id, [estimate(signature, unpack(blob)), "name", other_name, rva])
+            entry[1] = "name+lsh" if entry[1] == "lsh" else "name"
+        ranked = sorted(results.values(), key=lambda r: (-r[0], r[1] == "lsh", r[2]))
+        return [tuple(r) for r in ranked[:top]]
+
+
+def corpus_targets(directory=SCRIPT_DIR):
+    """[(name, rva)] of every function in the decompiled_*.c corpus, first occurrence only."""
+    targets = []
+    seen = set()
+    for _, path in sorted(source_files(directory).items()):
+        for name, rva, _ in read_functions(path):
+            if (name, rva) not in seen:
+                seen.add((name, rva))
+                targets.append((name, rva))
+    return targets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Function signature database across Pixel Remaster builds.")
+    parser.add_argument("--db", default=DB_PATH, help="database file (default: signatures.db)")
+    commands = parser.add_subparsers(dest="command")
+    import_parser = commands.add_parser("import", help="import signatures_<title>.jsonl exports")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--title", help="override the title stored in the export")
+    commands.add_parser("list", help="imported builds")
+    query_parser = commands.add_parser("query", help="matches of one function in another build")
+    query_parser.add_argument("function", help="Class$$Method or 0x RVA in the --from build")
+    query_parser.add_argument("--from", dest="source", required=True)
+    query_parser.add_argument("--to", dest="target", required=True)
+    query_parser.add_argument("--top", type=int, default=5)
+    map_parser = commands.add_parser("map", help="best match for every decompiled_*.c target")
+    map_parser.add_argument("--from", dest="source", required=True)
+    map_parser.add_argument("--to", dest="target", required=True)
+    map_parser.add_argument("--dir", default=SCRIPT_DIR, help="directory holding decompiled_*.c")
+    map_parser.add_argument("--out", help="write CSV instead of printing")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    db = SignatureDB(args.db)
+    try:
+        if args.command == "import":
+            if args.title and len(args.files) > 1:
+                parser.error("--title needs a single file")
+            for path in args.files:
+                start = time.time()
+                title, count = db.import_file(path, args.title)
+                print("Imported {} ({} functions, {:.1f}s)".format(title, count, time.time() - start))
+            return 0
+
+        if args.command == "list":
+            for title, program, sha256, count, imported in db.conn.execute(
+                    "SELECT title, program, sha256, functions, imported FROM builds ORDER BY title"):
+                print("{:<12} {:>7} functions  {}  {}  {}".format(
+                    title, count, (sha256 or "")[:16], program,
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(imported))))
+            return 0
+
+        try:
+            if args.command == "query":
+                sources = db.find(args.source, args.function)
+                if not sources:
+                    print("Not found in {}: {}".format(args.source, args.function))
+                    return 1
+                for _, name, rva, signature in sources:
+                    start = time.time()
+                    results = db.matches(signature, name, args.target, args.top)
+                    print("{} (0x{:X} in {}) - {:.1f} ms".format(name, rva, args.source,
+                                                                 (time.time() - start) * 1000))
+                    if not results:
+                        print("  no match in " + args.target)
+                    for score, how, other_name, other_rva in results:
+                        print("  {:.2f}  {:<8} 0x{:<8X} {}".format(score, how, other_rva, other_name))
+                return 0
+
+            start = time.time()
+            rows = []
+            for name, rva in corpus_targets(args.dir):
+                sources = [s for s in db.find(args.source, name) if s[2] == rva] or db.find(args.source, name)
+                if not sources:
+                    rows.append([name, "0x{:X}".format(rva), "", "", "", "not exported"])
+                    continue
+                best = db.matches(sources[0][3], name, args.target, 1)
+                if best:
+                    score, how, other_name, other_rva = best[0]
+                    rows.append([name, "0x{:X}".format(rva), other_name, "0x{:X}".format(other_rva),
+                                 "{:.2f}".format(score), how])
+                else:
+                    rows.append([name, "0x{:X}".format(rva), "", "", "", "no match"])
+        except (KeyError, ValueError) as e:
+            print("ERROR: " + e.args[0])
+            return 1
+        header = ["name", args.source + "_rva", args.target + "_name", args.target + "_rva", "score", "match"]
+        if args.out:
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            print("Mapped {} targets in {:.2f}s -> {}".format(len(rows), time.time() - start, args.out))
+        else:
+            for row in rows:
+                print("{:<60} {:>10} -> {:>10} {:>5} {:<8} {}".format(row[0], row[1], row[3], row[4], row[5],
+                                                                     row[2] if row[2] != row[0] else ""))
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Startup waterfall and regression report from MelonLoader logs.
+
+Runs under regular CPython 3 (not inside Ghidra).
+
+The mod's StartupTimer writes one "[Startup]" line per OnInitializeMelon phase
+(preferences, tolk, sound, translations, input, entity_scanner, harmony and
+one harmony.<PatchClass> per patch group, mod_menu), a begin line carrying the
+build id (assembly version + module MVID, new on every compile) and the DLL
+write time, an end line with the number of patched methods, and a mark when
+the first scene loads:
+
+    [12:00:01.234] [FFII_Screen_Reader] [Startup] phase=harmony.ShopPatches start_ms=301.20 ms=12.75
+
+This reads any number of logs (MelonLoader/Latest.log, MelonLoader/Logs/*.log
+or copies from other machines), splits them into sessions, and
+
+    waterfall   median start/duration of every phase for one build, as bars
+    compare     per-phase medians of two builds, flagging phases that got
+                slower by more than --threshold and more than the noise
+                (--min-ms, and 3x the base build's median absolute deviation)
+    sessions    one line per session found
+
+Builds are ordered by DLL write time; compare defaults to the last two.
+Latest.log duplicates the newest dated log, so identical sessions are merged.
+
+Usage:
+    python startup_timing.py waterfall <logs or dirs...> [--build ID] [--width 60]
+    python startup_timing.py compare <logs or dirs...> [--base ID] [--head ID]
+        [--threshold 0.2] [--min-ms 5] [--json report.json]
+    python startup_timing.py sessions <logs or dirs...>
+
+Exit status of compare is 1 when a phase regressed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+MARKER = re.compile(r"\[Startup\] (.*)$")
+FIELD = re.compile(r"(\w+)=(\S+)")
+MAD_FACTOR = 3.0
+
+
+class Session(object):
+    """One mod start: build identity, {phase: (start ms, duration ms)}, marks and totals."""
+
+    def __init__(self, source, fields):
+        self.source = source
+        self.build = fields.get("build", "unknown")
+        self.built = fields.get("built", "unknown")
+        self.process_ms = to_float(fields.get("process_ms"))
+        self.phases = {}
+        self.order = []
+        self.failed = set()
+        self.marks = {}
+        self.total_ms = None
+        self.patched = None
+        self.lines = []
+
+    def add(self, fields, line):
+        self.lines.append(line)
+        if "phase" in fields:
+            name = fields["phase"]
+            if name not in self.phases:
+                self.order.append(name)
+            self.phases[name] = (to_float(fields.get("start_ms")), to_float(fields.get("ms")))
+            if fields.get("failed") == "1":
+                self.failed.add(name)
+        elif "mark" in fields:
+            self.marks[fields["mark"]] = to_float(fields.get("at_ms"))
+        elif "end" in fields:
+            self.total_ms = to_float(fields.get("ms"))
+            self.patched = int(fields["patched"]) if "patched" in fields else None
+
+    def key(self):
+        return hashlib.sha1("\n".join(self.lines).encode("utf-8")).hexdigest()
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_fields(text):
+    fields = dict(FIELD.findall(text))
+    word = text.split(" ", 1)[0]
+    if "=" not in word:
+        fields[word] = True
+    return fields
+
+
+def log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(".log"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def read_sessions(paths):
+    """Sessions from every log, duplicates (Latest.log vs its dated copy) removed."""
+    sessions = []
+    seen = set()
+    for path in log_files(paths):
+        current = None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = MARKER.search(line.rstrip("\r\n"))
+                if not match:
+                    continue
+                fields = parse_fields(match.group(1))
+                if "begin" in fields:
+                    current = Session(path, fields)
+                    current.lines.append(match.group(1))
+                    sessions.append(current)
+                elif current is not None:
+                    current.add(fields, match.group(1))
+    unique = []
+    for session in sessions:
+        if session.phases and session.key() not in seen:
+            seen.add(session.key())
+            unique.append(session)
+    return unique
+
+
+def builds_in_order(sessions):
+    """Build ids ordered by DLL write time (then first appearance)."""
+    first = {}
+    for i, session in enumerate(sessions):
+        first.setdefault(session.build, (session.built, i))
+    return sorted(first, key=lambda build: first[build])
+
+
+def median(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2.0
+
+
+def mad(values):
+    center = median(values)
+    if center is None:
+        return 0.0
+    return median([abs(v - center) for v in values if v is not None]) or 0.0
+
+
+def phase_table(sessions):
+    """{phase: {"start": [...], "ms": [...]}} and phase order for a set of sessions."""
+    table = {}
+    order = []
+    for session in sessions:
+        for name in session.order:
+            if name not in table:
+                table[name] = {"start": [], "ms": []}
+                order.append(name)
+            start, duration = session.phases[name]
+            table[name]["start"].append(start)
+            table[name]["ms"].append(duration)
+    # Parents start with their first child: keep them first
+    order.sort(key=lambda name: (median(table[name]["start"]) or 0.0, name.count(".")))
+    return table, order
+
+
+def pick_build(sessions, build):
+    builds = builds_in_order(sessions)
+    if build is None:
+        return builds[-1]
+    matches = [b for b in builds if b == build] or [b for b in builds if build in b]
+    if len(matches) != 1:
+        raise SystemExit("build {!r} matches {} builds: {}".format(build, len(matches), ", ".join(builds)))
+    return matches[0]
+
+
+def cmd_waterfall(args, sessions):
+    build = pick_build(sessions, args.build)
+    selected = [s for s in sessions if s.build == build]
+    table, order = phase_table(selected)
+    total = median([s.total_ms for s in selected]) or max(
+        (median(table[n]["start"]) or 0) + (median(table[n]["ms"]) or 0) for n in order)
+    scale = args.width / total if total else 0
+    print("Build {} ({} sessions, built {})".format(build, len(selected), selected[0].built))
+    print("{:<40} {:>9} {:>9}  timeline (0 - {:.0f} ms)".format("phase", "start ms", "ms", total))
+    for name in order:
+        start = median(table[name]["start"]) or 0.0
+        duration = median(table[name]["ms"]) or 0.0
+        depth = name.count(".")
+        label = "  " * depth + name.rsplit(".", 1)[-1]
+        offset = int(round(start * scale))
+        length = max(1, int(round(duration * scale))) if duration > 0 else 0
+        bar = " " * offset + ("#" if depth == 0 else "=") * length
+        print("{:<40} {:>9.1f} {:>9.1f}  |{}".format(label, start, duration, bar))
+    patched = median([s.patched for s in selected])
+    first_scene = median([s.marks.get("first_scene") for s in selected])
+    process = median([s.process_ms for s in selected])
+    print("")
+    print("OnInitializeMelon: {:.1f} ms, {} methods patched".format(total, "?" if patched is None else int(patched)))
+    if process is not None and process >= 0:
+        print("Process start to mod load: {:.0f} ms".format(process))
+    if first_scene is not None:
+        print("Mod load to first scene: {:.0f} ms".format(first_scene))
+    return 0
+
+
+def compare(base_sessions, head_sessions, threshold, min_ms):
+    """[row] per phase with medians, deltas and a regression flag."""
+    base_table, base_order = phase_table(base_sessions)
+    head_table, head_order = phase_table(head_sessions)
+    rows = []
+    for name in base_order + [n for n in head_order if n not in base_table]:
+        base = base_table.get(name, {"ms": []})["ms"]
+        head = head_table.get(name, {"ms": []})["ms"]
+        base_median = median(base)
+        head_median = median(head)
+        row = {"phase": name, "base_ms": base_median, "head_ms": head_median,
+               "base_n": len(base), "head_n": len(head), "delta_ms": None, "ratio": None, "status": ""}
+        if base_median is None:
+            row["status"] = "new"
+        elif head_median is None:
+            row["status"] = "removed"
+        else:
+            delta = head_median - base_median
+            row["delta_ms"] = delta
+            row["ratio"] = head_median / base_median if base_median > 0 else None
+            noise = max(min_ms, MAD_FACTOR * mad(base))
+            if delta > noise and delta > threshold * base_median:
+                row["status"] = "REGRESSED"
+            elif -delta > noise and -delta > threshold * base_median:
+                row["status"] = "improved"
+        rows.append(row)
+    return rows
+
+
+def cmd_compare(args, sessions):
+    builds = builds_in_order(sessions)
+    if len(builds) < 2 and (args.base is None or args.head is None):
+        raise SystemExit("need sessions from two builds, found: " + ", ".join(builds))
+    head = pick_build(sessions, args.head)
+    if args.base:
+        base = pick_build(sessions, args.base)
+    elif builds.index(head) == 0:
+        raise SystemExit("no build before {} to compare against; pass --base".format(head))
+    else:
+        base = builds[builds.index(head) - 1]
+    base_sessions = [s for s in sessions if s.build == base]
+    head_sessions = [s for s in sessions if s.build == head]
+    rows = compare(base_sessions, head_sessions, args.threshold, args.min_ms)
+    base_total = median([s.total_ms for s in base_sessions])
+    head_total = median([s.total_ms for s in head_sessions])
+
+    print("Base {} ({} sessions) -> head {} ({} sessions)".format(base, len(base_sessions), head, len(head_sessions)))
+    if min(len(base_sessions), len(head_sessions)) < 3:
+        print("NOTE: fewer than 3 sessions for a build; medians are noisy")
+    print("{:<40} {:>9} {:>9} {:>9} {:>7}  {}".format("phase", "base ms", "head ms", "delta", "ratio", "status"))
+    fmt = lambda v, spec: "-" if v is None else format(v, spec)
+    for row in rows:
+        print("{:<40} {:>9} {:>9} {:>9} {:>7}  {}".format(
+            row["phase"], fmt(row["base_ms"], ".1f"), fmt(row["head_ms"], ".1f"), fmt(row["delta_ms"], "+.1f"),
+            fmt(row["ratio"], ".2f"), row["status"]))
+    print("{:<40} {:>9} {:>9} {:>9}".format("OnInitializeMelon total", fmt(base_total, ".1f"), fmt(head_total, ".1f"),
+                                              fmt(head_total - base_total if None not in (base_total, head_total) else None, "+.1f")))
+
+    regressed = [row for row in rows if row["status"] == "REGRESSED"]
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"base": base, "head": head, "base_sessions": len(base_sessions),
+                       "head_sessions": len(head_sessions), "base_total_ms": base_total, "head_total_ms": head_total,
+                       "threshold": args.threshold, "min_ms": args.min_ms, "phases": rows}, f, indent=2)
+    print("")
+    print("{} phases regressed".format(len(regressed)) + (": " + ", ".join(r["phase"] for r in regressed) if regressed else ""))
+    return 1 if regressed else 0
+
+
+def cmd_sessions(args, sessions):
+    print("{:<20} {:<22} {:>8} {:>8} {:>10}  {}".format("build", "built", "ms", "patched", "first scene", "log"))
+    for session in sessions:
+        print("{:<20} {:<22} {:>8} {:>8} {:>10}  {}".format(
+            session.build, session.built, "-" if session.total_ms is None else "{:.1f}".format(session.total_ms),
+            "-" if session.patched is None else session.patched,
+            "-" if session.marks.get("first_scene") is None else "{:.0f}".format(session.marks["first_scene"]),
+            session.source))
+        if session.failed:
+            print("    failed phases: " + ", ".join(sorted(session.failed)))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    waterfall = sub.add_parser("waterfall", help="median phase timeline for one build")
+    waterfall.add_argument("logs", nargs="+")
+    waterfall.add_argument("--build", help="build id or part of it, e.g. the MVID (default: newest)")
+    waterfall.add_argument("--width", type=int, default=60)
+    waterfall.set_defaults(func=cmd_waterfall)
+    comp = sub.add_parser("compare", help="flag phases that regressed between two builds")
+    comp.add_argument("logs", nargs="+")
+    comp.add_argument("--base", help="base build (default: the build before --head)")
+    comp.add_argument("--head", help="head build (default: newest)")
+    comp.add_argument("--threshold", type=float, default=0.2, help="relative slowdown to flag (default 0.2)")
+    comp.add_argument("--min-ms", type=float, default=5.0, help="ignore changes below this (default 5)")
+    comp.add_argument("--json", help="write the comparison as JSON")
+    comp.set_defaults(func=cmd_compare)
+    listing = sub.add_parser("sessions", help="list sessions")
+    listing.add_argument("logs", nargs="+")
+    listing.set_defaults(func=cmd_sessions)
+    args = parser.parse_args(argv)
+
+    sessions = read_sessions(args.logs)
+    if not sessions:
+        print("No [Startup] sessions found (logs from a build with StartupTimer are needed)")
+        return 1
+    return args.func(args, sessions)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
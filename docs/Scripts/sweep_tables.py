@@ -0,0 +1,119 @@
+"""Convert emulate_growth.py sweep CSVs into dense NumPy lookup tables.
+
+Runs under regular CPython 3 with NumPy (not inside Ghidra).
+
+Each growth_<sweep>.csv holds one row per (grid point, outcome, probability).
+This collapses it into per-point arrays indexed by axis position:
+
+    expected[i, j, ...]   - expected result (e.g. expected stat increase)
+    p_nonzero[i, j, ...]  - probability the result is non-zero (growth happened)
+
+plus one 1-D array per axis holding its values, saved as growth_<sweep>.npz.
+
+Usage:
+    python sweep_tables.py growth_calc_additional_parameter.csv [...]
+    python sweep_tables.py --all            # every growth_*.csv next to this script
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_sweep_csv(path):
+    """Return (description, axis names, rows) from a sweep CSV."""
+    description = ""
+    with open(path, newline="", encoding="utf-8") as f:
+        lines = []
+        for line in f:
+            if line.startswith("#"):
+                description = line[1:].strip()
+            else:
+                lines.append(line)
+    reader = csv.reader(lines)
+    header = next(reader)
+    axes = header[:-2]
+    rows = [(tuple(int(v) for v in row[:-2]), int(row[-2]), float(row[-1])) for row in reader if row]
+    return description, axes, rows
+
+
+def build_tables(axes, rows):
+    """Build axis value arrays and dense expected / p_nonzero arrays."""
+    axis_values = [np.array(sorted({point[i] for point, _, _ in rows}), dtype=np.int32)
+                   for i in range(len(axes))]
+    shape = tuple(len(values) for values in axis_values)
+    expected = np.full(shape, np.nan, dtype=np.float64)
+    p_nonzero = np.full(shape, np.nan, dtype=np.float64)
+
+    points = np.array([point for point, _, _ in rows], dtype=np.int64).reshape(len(rows), len(axes))
+    results = np.array([result for _, result, _ in rows], dtype=np.float64)
+    probabilities = np.array([p for _, _, p in rows], dtype=np.float64)
+
+    index = tuple(np.searchsorted(axis_values[i], points[:, i]) for i in range(len(axes)))
+    flat = np.ravel_multi_index(index, shape)
+    size = int(np.prod(shape))
+    seen = np.bincount(flat, minlength=size) > 0
+    expected_flat = np.bincount(flat, weights=results * probabilities, minlength=size)
+    nonzero_flat = np.bincount(flat, weights=probabilities * (results != 0), minlength=size)
+    expected.flat[seen] = expected_flat[seen]
+    p_nonzero.flat[seen] = nonzero_flat[seen]
+    return axis_values, expected, p_nonzero
+
+
+def convert(csv_path):
+    description, axes, rows = read_sweep_csv(csv_path)
+    if not rows:
+        print("  SKIPPED (no rows): " + csv_path)
+        return None
+    axis_values, expected, p_nonzero = build_tables(axes, rows)
+    npz_path = os.path.splitext(csv_path)[0] + ".npz"
+    arrays = {"axis_" + name: values for name, values in zip(axes, axis_values)}
+    np.savez_compressed(npz_path, expected=expected, p_nonzero=p_nonzero,
+                        axes=np.array(axes), description=np.array(description), **arrays)
+    print("  {} -> {}  shape={}".format(os.path.basename(csv_path), os.path.basename(npz_path), expected.shape))
+    return npz_path
+
+
+def load(npz_path):
+    """Load a converted table; returns (axes dict, expected, p_nonzero)."""
+    data = np.load(npz_path)
+    axes = {str(name): data["axis_" + str(name)] for name in data["axes"]}
+    return axes, data["expected"], data["p_nonzero"]
+
+
+def lookup(axes, table, **point):
+    """Index a table by axis values, e.g. lookup(axes, p, max_hp=2000, damage=500)."""
+    index = []
+    for name, values in axes.items():
+        position = int(np.searchsorted(values, point[name]))
+        if position >= len(values) or values[position] != point[name]:
+            raise KeyError("{}={} is not on the sweep grid".format(name, point[name]))
+        index.append(position)
+    return table[tuple(index)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="*", help="growth_*.csv files to convert")
+    parser.add_argument("--all", action="store_true", help="convert every growth_*.csv in the script directory")
+    args = parser.parse_args(argv)
+
+    paths = list(args.csv)
+    if args.all:
+        paths.extend(sorted(glob.glob(os.path.join(SCRIPT_DIR, "growth_*.csv"))))
+    if not paths:
+        parser.error("no CSV files given")
+
+    for path in paths:
+        convert(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# Trace parsing checks for announcement_latency.py
+# Run with: python -m pytest docs/Scripts/tests (or python -m unittest discover docs/Scripts/tests)
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import announcement_latency as al
+
+FREQUENCY = 10000000
+
+
+def write_trace(path, records=(), names=()):
+    """Trace file with the header and, if given, one chunk of (timestamp, trace, stage, type) records."""
+    with open(path, "wb") as f:
+        f.write(al.HEADER.pack(al.MAGIC, al.VERSION, FREQUENCY))
+        if records:
+            f.write(al.CHUNK.pack(len(records), len(names)))
+            for name in names:
+                data = name.encode("utf-8")
+                f.write(bytes([len(data)]) + data)
+            array = np.zeros(len(records), dtype=al.RECORD)
+            for i, (timestamp, trace, stage, type_index) in enumerate(records):
+                array[i] = (timestamp, trace, stage, 0, type_index)
+            f.write(array.tobytes())
+
+
+class StageTimesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_header_only_trace(self):
+        path = os.path.join(self.dir, "announcements_empty.trace")
+        write_trace(path)
+        frequency, names, records = al.read_trace(path)
+        types, times = al.stage_times(records, frequency)
+        self.assertEqual(len(types), 0)
+        self.assertEqual(times.shape, (0, len(al.STAGES)))
+
+    def test_header_only_trace_in_directory_report(self):
+        write_trace(os.path.join(self.dir, "announcements_empty.trace"))
+        ms = FREQUENCY // 1000
+        write_trace(os.path.join(self.dir, "announcements_shop.trace"),
+                    [(0, 1, al.EVENT, 0), (1 * ms, 1, al.SPEAK, 0), (3 * ms, 1, al.OUTPUT, 0)], ["Shop"])
+        sessions, by_type = al.analyze([self.dir])
+        self.assertEqual(sessions, 2)
+        self.assertEqual(by_type["Shop"]["spoken"], 1)
+        self.assertAlmostEqual(float(by_type["Shop"]["total"][0][0]), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
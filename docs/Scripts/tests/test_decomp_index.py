@@ -0,0 +1,38 @@
+# Tokenizer checks for decomp_index.py
+# Run with: python -m pytest docs/Scripts/tests (or python -m unittest discover docs/Scripts/tests)
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decomp_index import field_offsets, tokenize
+
+
+class FieldOffsetTest(unittest.TestCase):
+
+    def test_dereference(self):
+        self.assertEqual(field_offsets("lVar1 = *(longlong *)(param_1 + 0x188);"), ["0x188"])
+
+    def test_nested_dereference(self):
+        line = "lVar1 = *(longlong *)(*(longlong *)(param_1 + 0x18) + 0x10);"
+        self.assertEqual(sorted(field_offsets(line)), ["0x10", "0x18"])
+
+    def test_arithmetic_is_not_an_offset(self):
+        line = "for (iVar2 = 0; iVar2 < (int)(iVar3 + 4); iVar2 = (int)(iVar2 + 1)) {"
+        self.assertEqual(field_offsets(line), [])
+        terms = tokenize("Foo$$Bar", line)
+        self.assertNotIn("off:0x4", terms)
+        self.assertIn("const:0x4", terms)
+
+    def test_address_argument_is_not_an_offset(self):
+        self.assertEqual(field_offsets("thunk_FUN_180234e20(lVar8 + 0x60);"), [])
+
+    def test_vcall_slot(self):
+        terms = tokenize("Foo$$Bar", "(**(code **)(*plVar3 + 0x1b8))(plVar3);")
+        self.assertIn("vcall:0x1b8", terms)
+
+
+if __name__ == "__main__":
+    unittest.main()
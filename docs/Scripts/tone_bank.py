@@ -0,0 +1,266 @@
+"""Pre-render the wall tone loops into one packed PCM bank for SoundPlayer.
+
+Runs under regular CPython 3 with NumPy (not inside Ghidra).
+
+SoundPlayer.PlayWallTonesLooped regenerates the sustain tones with the volume
+baked in (GenerateStereoToneSustainWithVolume) and mixes them (MixWavFiles)
+every time the wall directions or the Wall Tone Volume change - a handful of
+MemoryStreams and byte[]s per change, on the game thread. This renders every
+direction combination (bitmask 1-15, same bits as DirectionsToBitmask) at every
+volume step with the same formulas, vectorized, into one file the mod loads
+once at startup (ToneBank.cs); a change then copies a slice of the bank into
+the channel buffer.
+
+Samples match the C# generators exactly: float32 volume and pan math,
+cycle-aligned lengths with Math.Round (half to even), truncation towards zero
+on the (short) casts, and MixWavFiles' 1/sqrt(count) headroom. `verify`
+checks the vectorized bank against a sample-by-sample port of the C# loops.
+
+Bank layout (little-endian):
+
+    header   "FF2T", u16 version, u16 entry count, u32 sample rate, u32 PCM offset
+    entries  u8 direction mask, u8 volume, u16 reserved, u32 offset, u32 length
+             (offset from the start of the PCM block, length in bytes)
+    PCM      16-bit stereo frames, no WAV headers
+
+Volumes not in the bank (hand-edited preferences between steps) fall back to
+runtime synthesis in the mod.
+
+Usage:
+    python tone_bank.py build [-o FF2_tones.bin] [--step 5]
+    python tone_bank.py info FF2_tones.bin
+    python tone_bank.py verify [FF2_tones.bin]
+
+Copy FF2_tones.bin to <game>/UserData/FFII_ScreenReader/.
+"""
+
+import argparse
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "FF2_tones.bin")
+
+MAGIC = b"FF2T"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<BBHII")
+
+SAMPLE_RATE = 22050
+SUSTAIN_MS = 200
+BASE_VOLUME = np.float32(0.12)
+# ModMenu.VolumeItem adjusts by 5
+VOLUME_STEP = 5
+# SoundPlayer channel buffers are 32768 bytes
+MAX_ENTRY_BYTES = 32768
+
+# Direction enum order (bit = 1 << value): frequency, loudness compensation, pan
+DIRECTIONS = (
+    ("North", 330, 1.00, 0.5),
+    ("South", 110, 0.70, 0.5),
+    ("East", 220, 0.85, 1.0),
+    ("West", 200, 0.85, 0.0),
+)
+
+
+def f32(value):
+    return np.float32(value)
+
+
+def sustain_samples(frequency, duration_ms=SUSTAIN_MS):
+    """Cycle-aligned frame count, as GenerateStereoToneSustain computes it."""
+    samples_per_cycle = SAMPLE_RATE / frequency
+    target = (SAMPLE_RATE * duration_ms) // 1000
+    cycles = max(1, int(round(target / samples_per_cycle)))
+    return int(round(cycles * samples_per_cycle))
+
+
+def channel_volumes(base_factor, pan, volume_percent):
+    """(left, right) float32 gains: base volume x loudness factor x preference, constant-power pan."""
+    volume = BASE_VOLUME * f32(base_factor)
+    volume = volume * (f32(volume_percent) / f32(50.0))
+    pan_angle = pan * math.pi / 2
+    return volume * f32(math.cos(pan_angle)), volume * f32(math.sin(pan_angle))
+
+
+def render_sustain(frequency, gains):
+    """Interleaved int16 samples for one direction at several volumes: shape (volumes, frames * 2)."""
+    frames = sustain_samples(frequency)
+    t = np.arange(frames, dtype=np.float64) / SAMPLE_RATE
+    sine = np.sin(2 * np.pi * frequency * t)
+    gains = np.asarray(gains, dtype=np.float32).astype(np.float64)   # (volumes, 2)
+    values = sine[None, :, None] * gains[:, None, :] * 32767
+    return np.trunc(values).astype(np.int16).reshape(len(gains), frames * 2)
+
+
+def mix(tones):
+    """MixWavFiles over int16 arrays of shape (volumes, samples), vectorized across volumes."""
+    length = max(tone.shape[1] for tone in tones)
+    total = np.zeros((tones[0].shape[0], length), dtype=np.int64)
+    count = np.zeros(length, dtype=np.int64)
+    for tone in tones:
+        total[:, :tone.shape[1]] += tone
+        count[:tone.shape[1]] += 1
+    headroom = np.where(count > 1, 1.0 / np.sqrt(np.maximum(count, 1)), 1.0)
+    mixed = np.where(count > 1, np.trunc(total * headroom), total)
+    return np.clip(mixed, -32768, 32767).astype(np.int16)
+
+
+def volume_steps(step):
+    volumes = list(range(0, 101, step))
+    if volumes[-1] != 100:
+        volumes.append(100)
+    return volumes
+
+
+def render_bank(volumes):
+    """{(mask, volume): int16 array} for every direction combination and volume."""
+    per_direction = []
+    for _, frequency, factor, pan in DIRECTIONS:
+        gains = [channel_volumes(factor, pan, v) for v in volumes]
+        per_direction.append(render_sustain(frequency, gains))
+    bank = {}
+    for mask in range(1, 1 << len(DIRECTIONS)):
+        tones = [per_direction[bit] for bit in range(len(DIRECTIONS)) if mask & (1 << bit)]
+        rendered = tones[0] if len(tones) == 1 else mix(tones)
+        for i, volume in enumerate(volumes):
+            bank[(mask, volume)] = rendered[i]
+    return bank
+
+
+def pack(bank):
+    """Serialize {(mask, volume): samples} into bank file bytes."""
+    keys = sorted(bank)
+    entries = []
+    offset = 0
+    for key in keys:
+        length = bank[key].nbytes
+        if length > MAX_ENTRY_BYTES:
+            raise ValueError("tone {} is {} bytes, channel buffers hold {}".format(key, length, MAX_ENTRY_BYTES))
+        entries.append(ENTRY.pack(key[0], key[1], 0, offset, length))
+        offset += length
+    pcm_offset = HEADER.size + ENTRY.size * len(keys)
+    header = HEADER.pack(MAGIC, VERSION, len(keys), SAMPLE_RATE, pcm_offset)
+    pcm = b"".join(bank[key].astype("<i2").tobytes() for key in keys)
+    return header + b"".join(entries) + pcm
+
+
+def load(path):
+    """(sample rate, {(mask, volume): int16 array}) from a bank file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, count, sample_rate, pcm_offset = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{}: not a version {} tone bank".format(path, VERSION))
+    bank = {}
+    for i in range(count):
+        mask, volume, _, offset, length = ENTRY.unpack_from(data, HEADER.size + i * ENTRY.size)
+        start = pcm_offset + offset
+        bank[(mask, volume)] = np.frombuffer(data, dtype="<i2", count=length // 2, offset=start)
+    return sample_rate, bank
+
+
+def reference_sustain(frequency, factor, pan, volume_percent):
+    """Sample-by-sample port of GenerateStereoToneSustainWithVolume."""
+    left, right = channel_volumes(factor, pan, volume_percent)
+    samples = []
+    for i in range(sustain_samples(frequency)):
+        value = math.sin(2 * math.pi * frequency * (i / SAMPLE_RATE))
+        samples.append(int(value * float(left) * 32767))
+        samples.append(int(value * float(right) * 32767))
+    return samples
+
+
+def reference_mix(tones):
+    """Sample-by-sample port of MixWavFiles."""
+    mixed = []
+    for i in range(max(len(tone) for tone in tones)):
+        value = 0
+        count = 0
+        for tone in tones:
+            if i < len(tone):
+                value += tone[i]
+                count += 1
+        if count > 1:
+            value = int(value * (1.0 / math.sqrt(count)))
+        mixed.append(max(-32768, min(32767, value)))
+    return mixed
+
+
+def reference_tone(mask, volume):
+    tones = [reference_sustain(frequency, factor, pan, volume)
+             for bit, (_, frequency, factor, pan) in enumerate(DIRECTIONS) if mask & (1 << bit)]
+    return tones[0] if len(tones) == 1 else reference_mix(tones)
+
+
+def mask_name(mask):
+    return "+".join(name for bit, (name, _, _, _) in enumerate(DIRECTIONS) if mask & (1 << bit))
+
+
+def cmd_build(args):
+    volumes = volume_steps(args.step)
+    bank = render_bank(volumes)
+    data = pack(bank)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print("Wrote {} tones ({} direction sets x {} volumes), {:.1f} MB: {}".format(
+        len(bank), (1 << len(DIRECTIONS)) - 1, len(volumes), len(data) / 1e6, args.output))
+    return 0
+
+
+def cmd_info(args):
+    sample_rate, bank = load(args.bank)
+    volumes = sorted({volume for _, volume in bank})
+    print("{}: {} tones at {} Hz".format(args.bank, len(bank), sample_rate))
+    print("Volumes: " + ", ".join(str(v) for v in volumes))
+    for mask in sorted({mask for mask, _ in bank}):
+        samples = bank[(mask, volumes[-1])]
+        print("  {:>2} {:<22} {:>5} frames  peak {:>5} at volume {}".format(
+            mask, mask_name(mask), len(samples) // 2, int(np.abs(samples.astype(np.int32)).max()), volumes[-1]))
+    return 0
+
+
+def cmd_verify(args):
+    if args.bank:
+        _, bank = load(args.bank)
+    else:
+        bank = render_bank(volume_steps(VOLUME_STEP))
+    mismatched = 0
+    for mask, volume in sorted(bank):
+        expected = np.array(reference_tone(mask, volume), dtype=np.int16)
+        actual = bank[(mask, volume)]
+        if expected.shape != actual.shape or not np.array_equal(expected, actual):
+            mismatched += 1
+            diff = "length {} != {}".format(len(actual), len(expected)) if expected.shape != actual.shape else \
+                "{} samples differ, max {}".format(int(np.count_nonzero(expected != actual)),
+                                                   int(np.abs(expected.astype(np.int32) - actual).max()))
+            print("MISMATCH {} ({}) volume {}: {}".format(mask, mask_name(mask), volume, diff))
+    print("{} of {} tones match the reference".format(len(bank) - mismatched, len(bank)))
+    return 1 if mismatched else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="render and pack the tone bank")
+    build.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    build.add_argument("--step", type=int, default=VOLUME_STEP, help="volume step (default: the mod menu's 5)")
+    build.set_defaults(func=cmd_build)
+    info = sub.add_parser("info", help="list a bank's tones")
+    info.add_argument("bank")
+    info.set_defaults(func=cmd_info)
+    verify = sub.add_parser("verify", help="compare a bank (or a fresh render) with the scalar C# port")
+    verify.add_argument("bank", nargs="?")
+    verify.set_defaults(func=cmd_verify)
+    args = parser.parse_args(argv)
+    if getattr(args, "step", 1) < 1:
+        parser.error("--step must be at least 1")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
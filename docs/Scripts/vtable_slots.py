@@ -0,0 +1,447 @@
+# Resolve virtual and interface calls in decompiled_*.c to method names
+# Runs under CPython 3 and Jython 2.7 (no Ghidra imports)
+#
+# A virtual call in the decompiler output is a load from the receiver's klass
+# followed by an indirect call, with the slot's MethodInfo passed last:
+#
+#   (**(code **)(*plVar10 + 0x1c0))(plVar10,*(undefined8 *)(*plVar10 + 0x1c8));
+#
+# Il2CppClass.vtable is an array of VirtualInvokeData {methodPtr, method}
+# starting at klass + 0x130 (the same base the inlined interface lookup uses:
+# ((interface offset + 0x13) * 0x10 + klass)), so 0x1c0 is slot 9. Interface
+# calls go through the invoke-data helper with the interface's TypeInfo and
+# the method's index in that interface:
+#
+#   puVar12 = (undefined8 *)FUN_1801f5470(plVar20,DAT_18225d128,0);
+#   lVar10 = (*(code *)*puVar12)(plVar20,puVar12[1]);
+#
+# `build` reads il2cpp_ghidra.h (Foo_VTable structs: VirtualInvokeData
+# _<slot>_<method>, Foo_Fields base classes) and script.json (method RVAs and
+# signatures, TypeInfo globals) once and writes vtable_index.json:
+#
+#   classes   Foo -> base class and [method, RVA] per slot; the RVA is Foo's own
+#             implementation or the nearest base class's (override resolution)
+#   methods   RVA -> name, return class, parameter classes (receiver typing)
+#   types     TypeInfo global RVA -> class (interface calls)
+#
+# Loaded, (class, klass offset) -> method is a list index and every other
+# lookup is a dict hit. `annotate` types each call's receiver from the
+# enclosing method's signature (param_N), the last assignment from a call
+# (return type) or a field load (decompiled_<group>.fields.csv from
+# extract_field_access.py, when present), and writes decompiled_<group>.vcalls.c
+# with a /* vcall ... */ note on every call line. Lines are not added or
+# removed, so line numbers match the source file. A receiver that cannot be
+# typed is still named when every class with that slot has the same method
+# there (Equals, Finalize, GetHashCode, ToString, ...).
+#
+# Usage:
+#   python vtable_slots.py build [--script-json PATH] [--header PATH]
+#   python vtable_slots.py lookup BattlePlayerEntity 0x1c0
+#   python vtable_slots.py annotate [decompiled_magic.c ...]      # default: every decompiled_*.c
+
+import argparse
+import codecs
+import csv
+import io
+import json
+import os
+import re
+import sys
+
+from decomp_corpus import SCRIPT_DIR, corpus_files, parse_file
+
+INDEX_PATH = os.path.join(SCRIPT_DIR, "vtable_index.json")
+INDEX_VERSION = 1
+
+# Default locations (same as il2cpp_program.py)
+SCRIPT_JSON_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\script.json"
+IL2CPP_HEADER_PATH = "D:\\Games\\Dev\\Unity\\FFPR\\ff2\\il2cpp_ghidra.h"
+
+# Il2CppClass layout in this build (FF2 PR GameAssembly.dll)
+VTABLE_OFFSET = 0x130
+SLOT_SIZE = 0x10
+
+# il2cpp_codegen_get_interface_invoke_data(obj, interface klass, slot) in this build
+INTERFACE_INVOKE_HELPERS = frozenset(["FUN_1801f5470"])
+
+_VTABLE_STRUCT = re.compile(r"struct (\w+)_VTable \{([^}]*)\}")
+_VTABLE_SLOT = re.compile(r"VirtualInvokeData _(\d+)_(\w+);")
+_FIELDS_BASE = re.compile(r"struct (\w+)_Fields \{\s*(?:struct )?(\w+)_Fields _;")
+_CLASS_POINTER = re.compile(r"^(?:struct )?(\w+)_o ?\*$")
+_TYPE_INFO = re.compile(r"^(\w+)_TypeInfo$")
+_NON_WORD = re.compile(r"\W")
+
+_NUMBER = r"(0x[0-9a-fA-F]+|\d+)"
+_VCALL = re.compile(r"\(\*\*\(code \*\*\)\(\*(\w+) \+ " + _NUMBER + r"\)\)")
+_ICALL_HELPER = re.compile(r"(\w+) = \(undefined8 \*\)(\w+)\((\w+),DAT_([0-9a-fA-F]+),(\d+)\)")
+_ICALL = re.compile(r"\(\*\(code \*\)\*(\w+)\)\(")
+_CALLEE = re.compile(r"^(?:\([^()]*\))?\s*(?:thunk_)?FUN_([0-9a-fA-F]+)\(")
+_FIELD_LOAD = re.compile(r"^\*\((?:longlong|undefined8) \*\*?\)\(.* \+ " + _NUMBER + r"\)$")
+_PARAM = re.compile(r"^(?:\([^()]*\))?\s*param_(\d+)$")
+
+
+def clean_name(name):
+    """Header struct spelling of a script.json name: 'System.Collections.IEnumerator.get_Current' -> '..._get_Current'."""
+    return _NON_WORD.sub("_", name)
+
+
+def class_of(ctype):
+    """'Foo_o*' / 'Foo_o *' -> 'Foo'; None for anything that is not an object pointer."""
+    match = _CLASS_POINTER.match((ctype or "").replace("const ", "").strip())
+    return match.group(1) if match else None
+
+
+def signature_types(signature):
+    """(return C type, [parameter C types]) of a script.json signature."""
+    if not signature or "(" not in signature:
+        return "", []
+    head = signature[:signature.index("(")].strip()
+    cut = max(head.rfind(" "), head.rfind("*"))
+    returns = head[:cut + 1].strip() if cut >= 0 else ""
+    inner = signature[signature.index("(") + 1:signature.rindex(")")].strip()
+    params = []
+    for param in inner.split(",") if inner else []:
+        param = param.strip()
+        cut = max(param.rfind(" "), param.rfind("*"))
+        params.append(param[:cut + 1].strip() if cut >= 0 else param)
+    return returns, params
+
+
+# --- build -------------------------------------------------------------------
+
+def parse_header(path):
+    """({class: [method per slot]}, {class: base class}) from il2cpp_ghidra.h."""
+    with io.open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    vtables = {}
+    for match in _VTABLE_STRUCT.finditer(text):
+        slots = {}
+        for slot, method in _VTABLE_SLOT.findall(match.group(2)):
+            slots[int(slot)] = method
+        if slots:
+            vtables[match.group(1)] = [slots.get(i) for i in range(max(slots) + 1)]
+    bases = dict(_FIELDS_BASE.findall(text))
+    return vtables, bases
+
+
+def script_methods(data):
+    """({(class, method): RVA}, {RVA: [name, return class, [parameter classes]]}) from ScriptMethod."""
+    by_name = {}
+    methods = {}
+    for method in data.get("ScriptMethod", []):
+        rva, name = method.get("Address"), method.get("Name")
+        if not rva or not name or "$$" not in name:
+            continue
+        owner, _, member = name.partition("$$")
+        for key in (clean_name(owner), clean_name(owner.rsplit(".", 1)[-1])):
+            by_name.setdefault((key, clean_name(member)), rva)
+        returns, params = signature_types(method.get("Signature"))
+        methods["0x{:x}".format(rva)] = [name, class_of(returns) or "", [class_of(p) or "" for p in params]]
+    return by_name, methods
+
+
+def build_index(script_json_path, header_path):
+    with codecs.open(script_json_path, "r", "utf-8") as f:
+        data = json.load(f)
+    vtables, bases = parse_header(header_path)
+    by_name, methods = script_methods(data)
+
+    def implementation(class_name, method):
+        seen = set()
+        while class_name and class_name not in seen:
+            seen.add(class_name)
+            rva = by_name.get((class_name, method))
+            if rva:
+                return rva
+            class_name = bases.get(class_name)
+        return None
+
+    classes = {}
+    for class_name, slots in vtables.items():
+        classes[class_name] = {
+            "base": bases.get(class_name),
+            "slots": [[method, implementation(class_name, method) if method else None] for method in slots],
+        }
+    types = {}
+    for entry in data.get("ScriptMetadata", []):
+        match = _TYPE_INFO.match(entry.get("Name") or "")
+        if match and entry.get("Address"):
+            types["0x{:x}".format(entry["Address"])] = match.group(1)
+    return {"version": INDEX_VERSION, "vtable_offset": VTABLE_OFFSET, "slot_size": SLOT_SIZE,
+            "script_json": script_json_path, "header": header_path,
+            "classes": classes, "methods": methods, "types": types}
+
+
+class SlotIndex(object):
+    """Loaded vtable_index.json with constant-time lookups."""
+
+    def __init__(self, data):
+        self.data = data
+        self.base = data["vtable_offset"]
+        self.slot_size = data["slot_size"]
+        self.classes = data["classes"]
+        self.types = data["types"]
+        self.methods = data["methods"]
+        self._slot_names = None
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with codecs.open(path, "r", "utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("{} is from another version; run: python vtable_slots.py build".format(path))
+        return cls(data)
+
+    def slot_of(self, offset):
+        """vtable slot for a klass-relative offset, or None if it is not a slot's method pointer."""
+        delta = offset - self.base
+        if delta < 0 or delta % self.slot_size:
+            return None
+        return delta // self.slot_size
+
+    def resolve(self, class_name, offset):
+        """(method, RVA or None) at a klass offset of class_name, or None."""
+        slot = self.slot_of(offset)
+        entry = self.classes.get(class_name)
+        if slot is None or entry is None or slot >= len(entry["slots"]):
+            return None
+        method, rva = entry["slots"][slot]
+        return (method, rva) if method else None
+
+    def interface_method(self, interface, slot):
+        entry = self.classes.get(interface)
+        if entry is None or slot >= len(entry["slots"]):
+            return None
+        return entry["slots"][slot][0]
+
+    def method(self, rva):
+        """[name, return class, [parameter classes]] for an RVA, or None."""
+        return self.methods.get("0x{:x}".format(rva))
+
+    def slot_names(self, slot):
+        """{method: class count} over every class that has the slot (built on first use)."""
+        if self._slot_names is None:
+            self._slot_names = {}
+            for entry in self.classes.values():
+                for index, (method, _) in enumerate(entry["slots"]):
+                    if method:
+                        names = self._slot_names.setdefault(index, {})
+                        names[method] = names.get(method, 0) + 1
+        return self._slot_names.get(slot, {})
+
+
+# --- annotate ----------------------------------------------------------------
+
+def load_field_types(path):
+    """{function RVA: {offset: class}} for object-typed fields in a .fields.csv; ambiguous offsets are dropped."""
+    result = {}
+    if not os.path.exists(path):
+        return result
+    with io.open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            field_class = class_of(row.get("type"))
+            if not field_class:
+                continue
+            offsets = result.setdefault(int(row["rva"], 16), {})
+            offset = int(row["offset"], 16)
+            offsets[offset] = field_class if offsets.get(offset, field_class) == field_class else ""
+    return result
+
+
+def assigned_value(line, start):
+    """Right-hand side starting at line[start], up to ';' or ',' at depth 0 or the enclosing ')'."""
+    depth = 0
+    for i in range(start, len(line)):
+        char = line[i]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                return line[start:i].strip()
+            depth -= 1
+        elif char in ";," and depth == 0:
+            return line[start:i].strip()
+    return line[start:].strip()
+
+
+class Annotator(object):
+    """Types receivers and labels the call sites of one function."""
+
+    def __init__(self, index, func, field_types):
+        self.index = index
+        self.func = func
+        self.image_base = func.address - func.rva
+        self.field_types = field_types.get(func.rva, {})
+        own = index.method(func.rva)
+        self.params = own[2] if own else []
+
+    def param_class(self, number):
+        number = int(number)
+        return self.params[number - 1] or None if 0 < number <= len(self.params) else None
+
+    def receiver_class(self, lines, line_index, receiver):
+        """(class, how) for the receiver variable of a call on lines[line_index]."""
+        param = _PARAM.match(receiver)
+        if param:
+            found = self.param_class(param.group(1))
+            return (found, "param") if found else (None, None)
+        assignment = re.compile(r"\b" + re.escape(receiver) + r" = ")
+        for i in range(line_index, -1, -1):
+            match = assignment.search(lines[i])
+            if not match:
+                continue
+            value = assigned_value(lines[i], match.end())
+            callee = _CALLEE.match(value)
+            if callee:
+                method = self.index.method(int(callee.group(1), 16) - self.image_base)
+                return (method[1], "return") if method and method[1] else (None, None)
+            field = _FIELD_LOAD.match(value)
+            if field:
+                found = self.field_types.get(int(field.group(1), 0))
+                return (found, "field") if found else (None, None)
+            param = _PARAM.match(value)
+            if param:
+                found = self.param_class(param.group(1))
+                return (found, "param") if found else (None, None)
+            return None, None
+        return None, None
+
+    def virtual_note(self, lines, line_index, receiver, offset):
+        """(note, outcome) for one klass-slot call; outcome is exact/named/slot/unresolved."""
+        slot = self.index.slot_of(offset)
+        if slot is None:
+            return "/* vcall klass+0x{:x}: not a slot method pointer */".format(offset), "unresolved"
+        class_name, how = self.receiver_class(lines, line_index, receiver)
+        if class_name:
+            found = self.index.resolve(class_name, offset)
+            if found:
+                method, rva = found
+                if rva:
+                    return "/* vcall {}.{} @0x{:x} (slot {}, {}) */".format(class_name, method, rva, slot, how), \
+                        "exact"
+                return "/* vcall {}.{} (slot {}, {}) */".format(class_name, method, slot, how), "named"
+        names = self.index.slot_names(slot)
+        if len(names) == 1:
+            method = list(names)[0]
+            return "/* vcall {} (slot {}, same in all {} classes) */".format(method, slot, names[method]), "slot"
+        common = sorted(names, key=lambda name: (-names[name], name))[:3]
+        return "/* vcall slot {}: receiver {} untyped, {} candidates{} */".format(
+            slot, receiver, len(names), (" e.g. " + ", ".join(common)) if common else ""), "unresolved"
+
+    def annotate(self, lines):
+        """(annotated lines, {outcome: count})."""
+        counts = {}
+        interface_calls = {}
+        notes = {}
+        for i, line in enumerate(lines):
+            for var, helper, receiver, address, slot in _ICALL_HELPER.findall(line):
+                if helper not in INTERFACE_INVOKE_HELPERS:
+                    continue
+                interface = self.index.types.get("0x{:x}".format(int(address, 16) - self.image_base))
+                method = self.index.interface_method(interface, int(slot)) if interface else None
+                if method:
+                    label, outcome = "{}.{}".format(interface, method), "named"
+                else:
+                    label, outcome = "{} slot {}".format(interface or "DAT_" + address, slot), "unresolved"
+                interface_calls[var] = label
+                notes.setdefault(i, []).append("/* icall {} */".format(label))
+                counts[outcome] = counts.get(outcome, 0) + 1
+        for i, line in enumerate(lines):
+            for receiver, offset in _VCALL.findall(line):
+                note, outcome = self.virtual_note(lines, i, receiver, int(offset, 0))
+                notes.setdefault(i, []).append(note)
+                counts[outcome] = counts.get(outcome, 0) + 1
+            for var in _ICALL.findall(line):
+                if var in interface_calls:
+                    notes.setdefault(i, []).append("/* icall {} */".format(interface_calls[var]))
+        out = list(lines)
+        for i, line_notes in notes.items():
+            out[i] = out[i] + " " + " ".join(line_notes)
+        return out, counts
+
+
+def annotate_file(index, path):
+    """Write decompiled_<group>.vcalls.c next to path; returns {outcome: count}."""
+    lines, functions = parse_file(path)
+    base = os.path.splitext(path)[0]
+    field_types = load_field_types(base + ".fields.csv")
+    out = list(lines)
+    totals = {}
+    for func in functions:
+        if func.failed:
+            continue
+        annotated, counts = Annotator(index, func, field_types).annotate(func.code_lines)
+        out[func.code_start:func.code_end] = annotated
+        for outcome, count in counts.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+    with io.open(base + ".vcalls.c", "w", encoding="utf-8", newline="\n") as f:
+        f.write(u"\n".join(out))
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve IL2CPP vtable and interface calls in decompiled_*.c.")
+    parser.add_argument("--index", default=INDEX_PATH, help="index file (default: vtable_index.json)")
+    commands = parser.add_subparsers(dest="command")
+    build_parser = commands.add_parser("build", help="build the slot index from script.json and il2cpp_ghidra.h")
+    build_parser.add_argument("--script-json", default=SCRIPT_JSON_PATH)
+    build_parser.add_argument("--header", default=IL2CPP_HEADER_PATH)
+    lookup_parser = commands.add_parser("lookup", help="method at a klass offset (or slot) of a class")
+    lookup_parser.add_argument("class_name")
+    lookup_parser.add_argument("offset", help="klass offset such as 0x1c0, or slot:9")
+    annotate_parser = commands.add_parser("annotate", help="write decompiled_<group>.vcalls.c")
+    annotate_parser.add_argument("files", nargs="*", help="decompiled_*.c files (default: all)")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    if args.command == "build":
+        for path in (args.script_json, args.header):
+            if not os.path.exists(path):
+                print("Not found: " + path)
+                return 1
+        data = build_index(args.script_json, args.header)
+        with codecs.open(args.index, "w", "utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), sort_keys=True)
+        slots = sum(len(entry["slots"]) for entry in data["classes"].values())
+        bound = sum(1 for entry in data["classes"].values() for _, rva in entry["slots"] if rva)
+        print("{} classes, {} slots ({} with an implementation RVA), {} TypeInfo globals -> {}".format(
+            len(data["classes"]), slots, bound, len(data["types"]), args.index))
+        return 0
+
+    if not os.path.exists(args.index):
+        print("{} not found; run: python vtable_slots.py build".format(args.index))
+        return 1
+    index = SlotIndex.load(args.index)
+
+    if args.command == "lookup":
+        if args.offset.startswith("slot:"):
+            offset = index.base + int(args.offset[len("slot:"):], 0) * index.slot_size
+        else:
+            offset = int(args.offset, 0)
+        found = index.resolve(args.class_name, offset)
+        if found is None:
+            print("{} +0x{:x}: no slot".format(args.class_name, offset))
+            return 1
+        method, rva = found
+        print("{}.{} slot {} {}".format(args.class_name, method, index.slot_of(offset),
+                                        "@0x{:x}".format(rva) if rva else "(no RVA)"))
+        return 0
+
+    totals = {}
+    for path in args.files or corpus_files():
+        counts = annotate_file(index, path)
+        for outcome, count in counts.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+        print("{:<32} {:>4} exact {:>4} named {:>4} by slot {:>4} unresolved".format(
+            os.path.basename(path), counts.get("exact", 0), counts.get("named", 0), counts.get("slot", 0),
+            counts.get("unresolved", 0)))
+    print("{:<32} {:>4} exact {:>4} named {:>4} by slot {:>4} unresolved".format(
+        "total", totals.get("exact", 0), totals.get("named", 0), totals.get("slot", 0), totals.get("unresolved", 0)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())